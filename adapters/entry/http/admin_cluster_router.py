@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from fastapi import APIRouter, Depends
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from adapters.external.database.cluster_node_repository_mongodb import ClusterNodeRepositoryMongoDB
+from adapters.external.database.ingestion_stream_repository_mongodb import IngestionStreamRepositoryMongoDB
+from adapters.external.database.stream_lease_repository_mongodb import StreamLeaseRepositoryMongoDB
+from config.settings import settings
+from workers.cluster_coordinator import ClusterCoordinator, stream_id
+
+from .deps import get_cluster, get_db
+from .dtos.cluster_dtos import ClusterNodeOutDTO, ClusterOutDTO, StreamLeaseOutDTO
+
+
+router = APIRouter(prefix="/admin/cluster", tags=["admin-cluster"])
+
+
+def _utc(v: datetime) -> datetime:
+    # Motor returns naive UTC datetimes unless tz_aware is set on the client
+    return v if v.tzinfo is not None else v.replace(tzinfo=timezone.utc)
+
+
+@router.get("", response_model=ClusterOutDTO)
+async def get_cluster_view(
+    db: AsyncIOMotorDatabase = Depends(get_db),
+    cluster: Optional[ClusterCoordinator] = Depends(get_cluster),
+) -> ClusterOutDTO:
+    """
+    Which node owns which stream.
+
+    Nodes are alive while their heartbeat is younger than CLUSTER_LEASE_TTL_S;
+    `unassigned` lists enabled streams without a live lease (being handed over, or
+    no node running).
+    """
+    now = datetime.now(tz=timezone.utc)
+    alive_since = now - timedelta(seconds=settings.CLUSTER_LEASE_TTL_S)
+
+    nodes = await ClusterNodeRepositoryMongoDB(db).list_all()
+    leases = await StreamLeaseRepositoryMongoDB(db).list_all()
+    streams = await IngestionStreamRepositoryMongoDB(db).list_enabled()
+
+    live_leases = {str(x.id) for x in leases if _utc(x.expires_at) >= now}
+    return ClusterOutDTO(
+        enabled=cluster is not None,
+        node_id=cluster.node_id if cluster is not None else None,
+        nodes=[
+            ClusterNodeOutDTO(
+                node_id=str(n.id),
+                host=n.host,
+                pid=n.pid,
+                started_at=_utc(n.started_at),
+                heartbeat_at=_utc(n.heartbeat_at),
+                alive=_utc(n.heartbeat_at) >= alive_since,
+                streams=n.streams,
+            )
+            for n in nodes
+        ],
+        leases=[
+            StreamLeaseOutDTO(
+                stream_id=str(x.id),
+                owner=x.owner,
+                acquired_at=_utc(x.acquired_at),
+                expires_at=_utc(x.expires_at),
+                expired=_utc(x.expires_at) < now,
+            )
+            for x in leases
+        ],
+        unassigned=sorted({stream_id(s) for s in streams} - live_leases),
+    )
@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+from typing import Any, Dict, Optional
+
+from fastapi import APIRouter, Depends
+
+from adapters.external.binance.binance_combined_stream_manager import BinanceCombinedStreamManager
+from adapters.external.database.indicator_set_repository_cached import CachedIndicatorSetRepositoryMongoDB
+from adapters.external.signals.signals_dispatcher import SignalsDispatcher
+from core.repositories.indicator_set_repository import IndicatorSetRepository
+from core.repositories.tick_archive_repository import TickArchiveRepository
+from core.services.candle_ring_buffer import CandleRingBufferRegistry
+from core.usecases.token_pricing_use_case import TokenPricingUseCase
+from workers.stream_reconciler import StreamReconciler
+from workers.thegraph_poll_scheduler import TheGraphPollScheduler
+from workers.token_price_oracle import LatestTokenPrices
+
+from .deps import (
+    get_binance_ws,
+    get_candle_buffer,
+    get_indicator_set_repo,
+    get_signals_dispatcher,
+    get_stream_reconciler,
+    get_thegraph_poller,
+    get_tick_archive,
+    get_token_price_oracle,
+    get_token_pricing,
+)
+
+
+router = APIRouter(prefix="/admin/metrics", tags=["admin-metrics"])
+
+
+@router.get("/candle-buffer")
+async def get_candle_buffer_metrics(
+    candle_buffer: Optional[CandleRingBufferRegistry] = Depends(get_candle_buffer),
+) -> Dict[str, Any]:
+    """
+    Hit/miss counters and per-stream fill of the recent-candle ring buffers.
+    """
+    if candle_buffer is None:
+        return {"enabled": False}
+    return {"enabled": True, **candle_buffer.stats()}
+
+
+@router.get("/indicator-sets")
+async def get_indicator_set_registry_metrics(
+    indicator_set_repo: Optional[IndicatorSetRepository] = Depends(get_indicator_set_repo),
+) -> Dict[str, Any]:
+    """
+    State of the in-memory ACTIVE indicator-set registry (change stream or polling).
+    """
+    if not isinstance(indicator_set_repo, CachedIndicatorSetRepositoryMongoDB):
+        return {"enabled": False}
+    return {"enabled": True, **indicator_set_repo.stats()}
+
+
+@router.get("/binance-ws")
+async def get_binance_ws_metrics(
+    managers: Dict[str, BinanceCombinedStreamManager] = Depends(get_binance_ws),
+) -> Dict[str, Any]:
+    """
+    Connections, streams per connection and dispatch counters of the Binance WS multiplexer.
+    """
+    return {url: m.stats() for url, m in managers.items()}
+
+
+@router.get("/tick-archive")
+async def get_tick_archive_metrics(
+    tick_archive: Optional[TickArchiveRepository] = Depends(get_tick_archive),
+) -> Dict[str, Any]:
+    """
+    Archived range and tick counts per stream of the columnar tick archive.
+    """
+    if tick_archive is None or not hasattr(tick_archive, "stats"):
+        return {"enabled": False}
+    return {"enabled": True, **tick_archive.stats()}
+
+
+@router.get("/thegraph-poll")
+async def get_thegraph_poll_metrics(
+    poller: Optional[TheGraphPollScheduler] = Depends(get_thegraph_poller),
+) -> Dict[str, Any]:
+    """
+    Pools, cycles and queries per poll group of the batched The Graph scheduler.
+    """
+    if poller is None:
+        return {"enabled": False}
+    return {"enabled": True, **poller.stats()}
+
+
+@router.get("/token-pricing")
+async def get_token_pricing_metrics(
+    token_pricing: TokenPricingUseCase = Depends(get_token_pricing),
+) -> Dict[str, Any]:
+    """
+    Hit/stale/miss/coalesced counters of the token price and pool state caches.
+    """
+    return token_pricing.stats()
+
+
+@router.get("/token-price-oracle")
+async def get_token_price_oracle_metrics(
+    oracle: Optional[LatestTokenPrices] = Depends(get_token_price_oracle),
+) -> Dict[str, Any]:
+    """
+    Tokens held, refresh cycles and history writes of the background price oracle.
+    """
+    if oracle is None:
+        return {"enabled": False}
+    return {"enabled": True, **oracle.stats()}
+
+
+@router.get("/signals")
+async def get_signals_metrics(
+    signals: Optional[SignalsDispatcher] = Depends(get_signals_dispatcher),
+) -> Dict[str, Any]:
+    """
+    Queue depth, delivery outcomes and delivery latency of candle-closed triggers.
+    """
+    if signals is None:
+        return {"enabled": False}
+    return {"enabled": True, **signals.stats()}
+
+
+@router.get("/stream-reload")
+async def get_stream_reload_metrics(
+    reconciler: Optional[StreamReconciler] = Depends(get_stream_reconciler),
+) -> Dict[str, Any]:
+    """
+    Watch mode and started/stopped/restarted counters of the ingestion_streams reconciler.
+    """
+    if reconciler is None:
+        return {"enabled": False}
+    return {"enabled": True, **reconciler.stats()}
@@ -1,32 +1,26 @@
 from __future__ import annotations
 
-from typing import List
+from typing import List, Optional
 
 from fastapi import APIRouter, Depends, HTTPException
 from motor.motor_asyncio import AsyncIOMotorDatabase
 
-from adapters.external.database.system_config_repository_mongodb import SystemConfigRepositoryMongoDB
 from adapters.external.database.token_registry_repository_mongodb import TokenRegistryRepositoryMongoDB
 from core.usecases.token_pricing_use_case import TokenPricingUseCase
+from workers.token_price_oracle import LatestTokenPrices
 
-from .deps import get_db
+from .deps import get_db, get_token_price_oracle, get_token_pricing
 from .dtos.token_registry_dtos import TokenRegisterFromPoolDTO, TokenRegistryOutDTO
 
 
 router = APIRouter(prefix="/admin/tokens", tags=["admin-tokens"])
 
 
-def _uc(db: AsyncIOMotorDatabase) -> TokenPricingUseCase:
-    return TokenPricingUseCase(
-        system_config_repo=SystemConfigRepositoryMongoDB(db),
-        token_registry_repo=TokenRegistryRepositoryMongoDB(db),
-    )
-
-
 @router.post("/register-from-pool", response_model=TokenRegistryOutDTO)
 async def register_token_from_pool(
     dto: TokenRegisterFromPoolDTO,
-    db: AsyncIOMotorDatabase = Depends(get_db),
+    uc: TokenPricingUseCase = Depends(get_token_pricing),
+    oracle: Optional[LatestTokenPrices] = Depends(get_token_price_oracle),
 ) -> TokenRegistryOutDTO:
     """
     Register (or update) a token pricing source using a V3 pool.
@@ -35,7 +29,6 @@ async def register_token_from_pool(
     - check if token is registered
     - fetch price on-demand via The Graph using only the stored data
     """
-    uc = _uc(db)
     try:
         ent = await uc.register_from_pool(
             chain=dto.chain,
@@ -45,6 +38,8 @@ async def register_token_from_pool(
             subgraph_id=dto.subgraph_id,
             quote_token_is_usd_stable=dto.quote_token_is_usd_stable,
         )
+        if oracle is not None:
+            oracle.invalidate(chain=ent.chain, token_address=ent.token_address)
         return TokenRegistryOutDTO.model_validate(ent.model_dump())
     except ValueError as exc:
         raise HTTPException(status_code=400, detail=str(exc))
@@ -58,7 +53,6 @@ async def get_registered_token(
     chain: str = "base",
     db: AsyncIOMotorDatabase = Depends(get_db),
 ) -> TokenRegistryOutDTO:
-    uc = _uc(db)
     repo = TokenRegistryRepositoryMongoDB(db)
 
     ent = await repo.get_by_token_address(chain=chain.lower(), token_address=token_address.lower())
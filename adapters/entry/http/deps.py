@@ -1,9 +1,70 @@
+from typing import Dict, Optional
+
 from fastapi import Request
 from motor.motor_asyncio import AsyncIOMotorDatabase
 
+from adapters.external.binance.binance_combined_stream_manager import BinanceCombinedStreamManager
+from adapters.external.signals.signals_dispatcher import SignalsDispatcher
+from core.repositories.indicator_set_repository import IndicatorSetRepository
+from core.repositories.tick_archive_repository import TickArchiveRepository
+from core.services.candle_ring_buffer import CandleRingBufferRegistry
+from core.usecases.token_pricing_use_case import TokenPricingUseCase
+from workers.cluster_coordinator import ClusterCoordinator
+from workers.indicator_recompute_worker import IndicatorRecomputeWorker
+from workers.stream_reconciler import StreamReconciler
+from workers.thegraph_poll_scheduler import TheGraphPollScheduler
+from workers.token_price_oracle import LatestTokenPrices
+
 
 def get_db(request: Request) -> AsyncIOMotorDatabase:
     db = getattr(request.app.state, "db", None)
     if db is None:
         raise RuntimeError("Database is not initialized in app.state.db")
     return db
+
+
+def get_indicator_recompute_worker(request: Request) -> Optional[IndicatorRecomputeWorker]:
+    return getattr(request.app.state, "indicator_recompute", None)
+
+
+def get_candle_buffer(request: Request) -> Optional[CandleRingBufferRegistry]:
+    return getattr(request.app.state, "candle_buffer", None)
+
+
+def get_indicator_set_repo(request: Request) -> Optional[IndicatorSetRepository]:
+    return getattr(request.app.state, "indicator_sets", None)
+
+
+def get_binance_ws(request: Request) -> Dict[str, BinanceCombinedStreamManager]:
+    return getattr(request.app.state, "binance_ws", None) or {}
+
+
+def get_tick_archive(request: Request) -> Optional[TickArchiveRepository]:
+    return getattr(request.app.state, "tick_archive", None)
+
+
+def get_thegraph_poller(request: Request) -> Optional[TheGraphPollScheduler]:
+    return getattr(request.app.state, "thegraph_poller", None)
+
+
+def get_token_pricing(request: Request) -> TokenPricingUseCase:
+    uc = getattr(request.app.state, "token_pricing", None)
+    if uc is None:
+        raise RuntimeError("Token pricing is not initialized in app.state.token_pricing")
+    return uc
+
+
+def get_token_price_oracle(request: Request) -> Optional[LatestTokenPrices]:
+    return getattr(request.app.state, "token_price_oracle", None)
+
+
+def get_signals_dispatcher(request: Request) -> Optional[SignalsDispatcher]:
+    return getattr(request.app.state, "signals", None)
+
+
+def get_cluster(request: Request) -> Optional[ClusterCoordinator]:
+    return getattr(request.app.state, "cluster", None)
+
+
+def get_stream_reconciler(request: Request) -> Optional[StreamReconciler]:
+    return getattr(request.app.state, "stream_reconciler", None)
@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+
+class ClusterNodeOutDTO(BaseModel):
+    """
+    Response DTO for an ingestion replica.
+    """
+    node_id: str
+    host: Optional[str] = None
+    pid: Optional[int] = None
+    started_at: datetime
+    heartbeat_at: datetime
+    alive: bool
+    streams: List[str] = []
+
+
+class StreamLeaseOutDTO(BaseModel):
+    """
+    Response DTO for a stream lease.
+    """
+    stream_id: str
+    owner: str
+    acquired_at: datetime
+    expires_at: datetime
+    expired: bool
+
+
+class ClusterOutDTO(BaseModel):
+    """
+    Response DTO for the cluster view: nodes, stream ownership, unowned streams.
+    """
+    enabled: bool
+    node_id: Optional[str] = None
+    nodes: List[ClusterNodeOutDTO]
+    leases: List[StreamLeaseOutDTO]
+    unassigned: List[str]
@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class IndicatorRecomputeJobOutDTO(BaseModel):
+    """
+    Response DTO for a historical indicator recompute job.
+    """
+    cfg_hash: str
+    stream_key: str
+    status: str
+
+    total: int = 0
+    processed: int = 0
+    written: int = 0
+    progress_pct: float = 0.0
+
+    last_open_time: Optional[int] = None
+    started_at: Optional[int] = None
+    finished_at: Optional[int] = None
+    rate_per_s: Optional[float] = None
+    error: Optional[str] = None
+
+    running: bool = False
+    updated_at: Optional[int] = None
+    updated_at_iso: Optional[str] = None
@@ -14,6 +14,10 @@ class IndicatorSetCreateDTO(BaseModel):
     ema_slow: int
     atr_window: int
     source: Optional[str] = Field(default="binance", description="Ingestion source identifier")
+    interval: Optional[str] = Field(
+        default="1m",
+        description="Candle interval: 1m or a materialized rollup (e.g. 5m, 15m, 1h, 4h, 1d)",
+    )
 
     pool_address: Optional[str] = Field(
         default=None,
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import Optional
+from typing import List, Optional
 
 from pydantic import BaseModel, Field, field_validator
 
@@ -86,4 +86,47 @@ class TokenPriceOutDTO(BaseModel):
     price_in_quote: str = Field(..., description="Decimal string")
     pool_address: str
 
-    decimals: int = Field(..., description="Token decimals (from registry/pool)")
\ No newline at end of file
+    decimals: int = Field(..., description="Token decimals (from registry/pool)")
+
+
+class TokenPriceQueryDTO(BaseModel):
+    chain: str = Field(default="base")
+    token_address: str
+
+    @field_validator("chain")
+    @classmethod
+    def _chain(cls, v: str) -> str:
+        v = (v or "").strip()
+        if not v:
+            raise ValueError("field is required")
+        return v.lower()
+
+    @field_validator("token_address")
+    @classmethod
+    def _addr(cls, v: str) -> str:
+        return _norm_addr(v)
+
+
+class TokenPriceBatchInDTO(BaseModel):
+    items: List[TokenPriceQueryDTO] = Field(..., min_length=1, max_length=500)
+
+
+class TokenPriceBatchItemOutDTO(BaseModel):
+    chain: str
+    token_address: str
+
+    status: int = Field(..., description="HTTP status the single-token endpoint would return")
+    price: Optional[TokenPriceOutDTO] = None
+    error: Optional[str] = None
+
+
+class TokenPriceBatchOutDTO(BaseModel):
+    items: List[TokenPriceBatchItemOutDTO]
+
+
+class TokenPricePointOutDTO(BaseModel):
+    ts: int = Field(..., description="ms since epoch")
+    price_usd: float
+    price_in_quote: float
+    quote_token_address: str
+    pool_address: str
@@ -1,32 +1,81 @@
 from __future__ import annotations
 
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from motor.motor_asyncio import AsyncIOMotorDatabase
 
 from adapters.entry.http.dtos.price_tick_dtos import PriceTickOutDTO
 from adapters.external.database.candle_repository_mongodb import CandleRepositoryMongoDB
+from adapters.external.database.candle_repository_ring_buffer import RingBufferedCandleRepository
+from adapters.external.database.indicator_recompute_job_repository_mongodb import IndicatorRecomputeJobRepositoryMongoDB
 from adapters.external.database.indicator_repository_mongodb import IndicatorRepositoryMongoDB
 from adapters.external.database.indicator_set_repository_mongodb import IndicatorSetRepositoryMongoDB
 from adapters.external.database.price_tick_repository_mongodb import PriceTickRepositoryMongoDB
 
+from config.settings import settings
+from core.domain.entities.candle_entity import CandleEntity
+from core.domain.entities.indicator_entity import IndicatorSnapshotEntity
+from core.domain.entities.price_tick_entity import PriceTickEntity
+from core.repositories.indicator_set_repository import IndicatorSetRepository
+from core.repositories.tick_archive_repository import TickArchiveRepository
+from core.services.candle_ring_buffer import CandleRingBufferRegistry
+from core.services.interval_service import IntervalService
 from core.usecases.market_data_use_case import MarketDataUseCase
+from core.usecases.read_price_ticks_use_case import ReadPriceTicksUseCase
+from workers.indicator_recompute_worker import IndicatorRecomputeWorker
 
-from .deps import get_db
+from .deps import get_candle_buffer, get_db, get_indicator_recompute_worker, get_indicator_set_repo, get_tick_archive
 from .dtos.candle_dtos import CandleOutDTO
 from .dtos.indicator_dtos import IndicatorSnapshotOutDTO
+from .dtos.indicator_recompute_dtos import IndicatorRecomputeJobOutDTO
 from .dtos.indicator_set_dtos import IndicatorSetCreateDTO, IndicatorSetOutDTO
+from .streaming import iter_list, json_rows_response, stream_rows, wants_ndjson
 
 
 router = APIRouter(prefix="/market-data", tags=["market-data"])
 
+# Default row shapes of the read endpoints (same keys as the response DTOs); `fields=`
+# may select any stored field of the entity instead.
+CANDLE_ROW_FIELDS = tuple(CandleOutDTO.model_fields)
+PRICE_TICK_ROW_FIELDS = tuple(PriceTickOutDTO.model_fields)
+INDICATOR_ROW_FIELDS = tuple(IndicatorSnapshotOutDTO.model_fields)
 
-def get_use_case(db: AsyncIOMotorDatabase) -> MarketDataUseCase:
+_FIELDS_DESCRIPTION = "Comma-separated fields to return (default: the DTO fields)"
+
+
+def _parse_fields(raw: Optional[str], default: Tuple[str, ...], entity: type, dto: type) -> Tuple[str, ...]:
+    """
+    Validate a `fields=` query parameter against the stored entity/DTO fields.
+    """
+    if not raw:
+        return default
+    allowed = (set(entity.model_fields) | set(dto.model_fields)) - {"id"}
+    fields = tuple(dict.fromkeys(f.strip() for f in raw.split(",") if f.strip()))
+    unknown = [f for f in fields if f not in allowed]
+    if unknown or not fields:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown fields: {', '.join(unknown) or '(empty)'}. Allowed: {', '.join(sorted(allowed))}",
+        )
+    return fields
+
+
+def get_use_case(
+    db: AsyncIOMotorDatabase,
+    candle_buffer: Optional[CandleRingBufferRegistry] = None,
+    indicator_set_repo: Optional[IndicatorSetRepository] = None,
+) -> MarketDataUseCase:
+    candle_repo = CandleRepositoryMongoDB(db)
     return MarketDataUseCase(
-        candle_repo=CandleRepositoryMongoDB(db),
+        candle_repo=RingBufferedCandleRepository(candle_repo, candle_buffer) if candle_buffer else candle_repo,
         indicator_repo=IndicatorRepositoryMongoDB(db),
-        indicator_set_repo=IndicatorSetRepositoryMongoDB(db),
+        indicator_set_repo=indicator_set_repo or IndicatorSetRepositoryMongoDB(db),
+        materialized_intervals=(
+            IntervalService.BASE_INTERVAL,
+            *IntervalService.parse_rollups(settings.CANDLE_ROLLUP_INTERVALS),
+        ),
+        candle_buffer=candle_buffer,
     )
 
 
@@ -34,17 +83,20 @@ def get_use_case(db: AsyncIOMotorDatabase) -> MarketDataUseCase:
 async def create_indicator_set(
     dto: IndicatorSetCreateDTO,
     db: AsyncIOMotorDatabase = Depends(get_db),
+    recompute: Optional[IndicatorRecomputeWorker] = Depends(get_indicator_recompute_worker),
+    indicator_set_repo: Optional[IndicatorSetRepository] = Depends(get_indicator_set_repo),
 ) -> IndicatorSetOutDTO:
     """
     Create (or reuse) an ACTIVE indicator set.
 
     This endpoint is safe to call multiple times with the same params:
     it will always return the same cfg_hash.
+
+    When INDICATOR_RECOMPUTE_ON_CREATE is enabled, a background job fills indicator
+    history for a set that was never recomputed before.
     """
     try:
-        uc = get_use_case(db)
-        await uc.ensure_indexes()
-
+        uc = get_use_case(db, indicator_set_repo=indicator_set_repo)
         stored = await uc.upsert_active_indicator_set(
             symbol=dto.symbol,
             ema_fast=dto.ema_fast,
@@ -52,7 +104,10 @@ async def create_indicator_set(
             atr_window=dto.atr_window,
             source=dto.source,
             pool_address=dto.pool_address,
+            interval=dto.interval,
         )
+        if recompute is not None and settings.INDICATOR_RECOMPUTE_ON_CREATE and stored.cfg_hash:
+            await recompute.submit(stored.cfg_hash, only_if_new=True)
         return IndicatorSetOutDTO.model_validate(stored.model_dump())
     except ValueError as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from exc
@@ -66,13 +121,12 @@ async def list_indicator_sets(
     status: Optional[str] = Query("ACTIVE"),
     limit: int = Query(5000, ge=1, le=5000),
     db: AsyncIOMotorDatabase = Depends(get_db),
+    indicator_set_repo: Optional[IndicatorSetRepository] = Depends(get_indicator_set_repo),
 ) -> List[IndicatorSetOutDTO]:
     """
     List indicator sets with optional filters.
     """
-    uc = get_use_case(db)
-    await uc.ensure_indexes()
-
+    uc = get_use_case(db, indicator_set_repo=indicator_set_repo)
     items = await uc.list_indicator_sets(stream_key=stream_key, status=status, limit=int(limit))
     return [IndicatorSetOutDTO.model_validate(x.model_dump()) for x in items]
 
@@ -86,28 +140,96 @@ async def get_indicator_set(
     Fetch a single indicator set by cfg_hash.
     """
     uc = get_use_case(db)
-    await uc.ensure_indexes()
-
     ent = await uc.get_indicator_set(cfg_hash=cfg_hash)
     if not ent:
         raise HTTPException(status_code=404, detail="Indicator set not found.")
     return IndicatorSetOutDTO.model_validate(ent.model_dump())
 
 
+def _recompute_job_out(job, *, running: bool) -> IndicatorRecomputeJobOutDTO:
+    data = job.model_dump()
+    total = int(job.total or 0)
+    data["progress_pct"] = round(100.0 * int(job.processed or 0) / total, 2) if total > 0 else 0.0
+    data["running"] = running
+    return IndicatorRecomputeJobOutDTO.model_validate(data)
+
+
+@router.post("/indicator-sets/{cfg_hash}/recompute", response_model=IndicatorRecomputeJobOutDTO, status_code=202)
+async def start_indicator_recompute(
+    cfg_hash: str,
+    resume: bool = Query(True, description="Continue an unfinished job instead of starting over"),
+    db: AsyncIOMotorDatabase = Depends(get_db),
+    recompute: Optional[IndicatorRecomputeWorker] = Depends(get_indicator_recompute_worker),
+) -> IndicatorRecomputeJobOutDTO:
+    """
+    Recompute indicator snapshots over the full candle history of an indicator set (background job).
+    """
+    if recompute is None:
+        raise HTTPException(status_code=503, detail="Indicator recompute worker is not running.")
+
+    ent = await get_use_case(db).get_indicator_set(cfg_hash=cfg_hash)
+    if not ent:
+        raise HTTPException(status_code=404, detail="Indicator set not found.")
+
+    await recompute.submit(cfg_hash, resume=resume)
+
+    jobs = IndicatorRecomputeJobRepositoryMongoDB(db)
+    job = await jobs.get_by_cfg_hash(cfg_hash)
+    if job is None:
+        return IndicatorRecomputeJobOutDTO(cfg_hash=cfg_hash, stream_key=ent.stream_key, status="PENDING", running=True)
+    return _recompute_job_out(job, running=await recompute.is_running_anywhere(cfg_hash))
+
+
+@router.get("/indicator-sets/{cfg_hash}/recompute", response_model=IndicatorRecomputeJobOutDTO)
+async def get_indicator_recompute(
+    cfg_hash: str,
+    db: AsyncIOMotorDatabase = Depends(get_db),
+    recompute: Optional[IndicatorRecomputeWorker] = Depends(get_indicator_recompute_worker),
+) -> IndicatorRecomputeJobOutDTO:
+    """
+    Progress of the historical recompute job of an indicator set.
+    """
+    job = await IndicatorRecomputeJobRepositoryMongoDB(db).get_by_cfg_hash(cfg_hash)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Recompute job not found.")
+    return _recompute_job_out(job, running=recompute is not None and await recompute.is_running_anywhere(cfg_hash))
+
+
 @router.get("/candles", response_model=List[CandleOutDTO])
 async def list_candles(
-    stream_key: str = Query(..., description="e.g. binance:BTCUSDT:1m"),
+    request: Request,
+    stream_key: str = Query(..., description="e.g. binance:btcusdt:1m (or a rollup, e.g. binance:btcusdt:1h)"),
     limit: int = Query(500, ge=1, le=5000),
+    fields: Optional[str] = Query(None, description=_FIELDS_DESCRIPTION),
     db: AsyncIOMotorDatabase = Depends(get_db),
+    candle_buffer: Optional[CandleRingBufferRegistry] = Depends(get_candle_buffer),
 ) -> List[CandleOutDTO]:
     """
     List latest closed candles for a stream_key.
+
+    Served from the in-memory ring buffer when the window fits (rows are already in
+    CandleOutDTO shape); otherwise streamed from MongoDB with a projection on the
+    requested fields. Send `Accept: application/x-ndjson` for newline-delimited JSON.
     """
-    uc = get_use_case(db)
-    await uc.ensure_indexes()
+    row_fields = _parse_fields(fields, CANDLE_ROW_FIELDS, CandleEntity, CandleOutDTO)
+    uc = get_use_case(db, candle_buffer)
+    ndjson = wants_ndjson(request)
 
-    candles = await uc.list_candles(stream_key=stream_key, limit=int(limit))
-    return [CandleOutDTO.model_validate(c.model_dump()) for c in candles]
+    # The buffer only holds the default (DTO) fields
+    rows = None
+    if set(row_fields) <= set(CANDLE_ROW_FIELDS):
+        rows = uc.list_recent_candle_rows(stream_key=stream_key, limit=int(limit))
+    if rows is not None:
+        if fields:
+            rows = [{f: r.get(f) for f in row_fields} for r in rows]
+        if not ndjson:
+            return json_rows_response(rows)
+        return await stream_rows(iter_list(rows), ndjson=True)
+
+    return await stream_rows(
+        uc.iter_candle_rows(stream_key=stream_key, limit=int(limit), fields=row_fields),
+        ndjson=ndjson,
+    )
 
 
 @router.get("/indicators", response_model=List[IndicatorSnapshotOutDTO])
@@ -115,40 +237,54 @@ async def list_indicators(
     stream_key: str = Query(..., description="e.g. binance:BTCUSDT:1m"),
     cfg_hash: Optional[str] = Query(None, description="Filter by indicator-set cfg_hash"),
     limit: int = Query(500, ge=1, le=5000),
+    fields: Optional[str] = Query(None, description=_FIELDS_DESCRIPTION),
     db: AsyncIOMotorDatabase = Depends(get_db),
 ) -> List[IndicatorSnapshotOutDTO]:
     """
     List latest indicator snapshots for a stream_key (optionally filtered by cfg_hash).
+
+    Documents are projected on the requested fields and encoded as-is (no per-row
+    entity/DTO validation).
     """
+    row_fields = _parse_fields(fields, INDICATOR_ROW_FIELDS, IndicatorSnapshotEntity, IndicatorSnapshotOutDTO)
     uc = get_use_case(db)
-    await uc.ensure_indexes()
-
-    snaps = await uc.list_indicators(stream_key=stream_key, cfg_hash=cfg_hash, limit=int(limit))
-    return [IndicatorSnapshotOutDTO.model_validate(s.model_dump()) for s in snaps]
+    rows = await uc.list_indicator_rows(stream_key=stream_key, cfg_hash=cfg_hash, limit=int(limit), fields=row_fields)
+    return json_rows_response(rows)
 
 
 @router.get("/price-ticks", response_model=List[PriceTickOutDTO])
 async def list_price_ticks(
+    request: Request,
     stream_key: str = Query(...),
     ts_from: int = Query(..., description="ms since epoch"),
     ts_to: int = Query(..., description="ms since epoch"),
     limit: int = Query(5000, ge=1, le=200_000),
+    fields: Optional[str] = Query(None, description=_FIELDS_DESCRIPTION),
     db: AsyncIOMotorDatabase = Depends(get_db),
+    tick_archive: Optional[TickArchiveRepository] = Depends(get_tick_archive),
 ) -> List[PriceTickOutDTO]:
     """
     List price ticks in an arbitrary time range.
     Used by APR calculations (in-range seconds) and analytics.
+
+    Closed days are read from the columnar tick archive when enabled (those rows carry
+    no per-tick extras); the recent tail comes from MongoDB. The response is streamed
+    (JSON array, or NDJSON with `Accept: application/x-ndjson`).
     """
+    row_fields = _parse_fields(fields, PRICE_TICK_ROW_FIELDS, PriceTickEntity, PriceTickOutDTO)
     try:
-        repo = PriceTickRepositoryMongoDB(db)
-        await repo.ensure_indexes()
-
-        ticks = await repo.list_ticks_range(
+        repo = PriceTickRepositoryMongoDB(
+            db,
+            timeseries=settings.PRICE_TICKS_TIMESERIES,
+            expire_after_seconds=settings.PRICE_TICKS_EXPIRE_AFTER_S,
+        )
+        rows = ReadPriceTicksUseCase(tick_repository=repo, tick_archive=tick_archive).iter_rows(
             stream_key=str(stream_key),
             ts_from=int(ts_from),
             ts_to=int(ts_to),
             limit=int(limit),
+            fields=row_fields,
         )
-        return [PriceTickOutDTO.model_validate(t.model_dump()) for t in ticks]
+        return await stream_rows(rows, ndjson=wants_ndjson(request))
     except Exception as exc:
-        raise HTTPException(status_code=500, detail=f"Failed to list price ticks: {exc}") from exc
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"Failed to list price ticks: {exc}") from exc
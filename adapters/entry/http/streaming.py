@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import json
+import logging
+from typing import Any, AsyncIterator, Callable, Dict, List
+
+from fastapi import Request
+from fastapi.responses import Response, StreamingResponse
+
+try:  # optional fast encoder
+    import orjson
+except ImportError:  # pragma: no cover - fallback when orjson is not installed
+    orjson = None  # type: ignore[assignment]
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+# Rows encoded per written chunk (bounds per-request memory).
+_CHUNK_ROWS = 1_000
+
+_logger = logging.getLogger(__name__)
+
+
+def _json_dumps(value: Any) -> bytes:
+    # Same output as fastapi.responses.JSONResponse (compact, UTF-8)
+    return json.dumps(value, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+
+dumps: Callable[[Any], bytes] = orjson.dumps if orjson is not None else _json_dumps
+
+
+def wants_ndjson(request: Request) -> bool:
+    """
+    True when the client asked for newline-delimited JSON (Accept: application/x-ndjson).
+    """
+    accept = request.headers.get("accept") or ""
+    return any(part.split(";")[0].strip() == NDJSON_MEDIA_TYPE for part in accept.split(","))
+
+
+def json_rows_response(rows: List[Dict[str, Any]]) -> Response:
+    """
+    Encode plain rows in one pass (no response_model validation).
+    """
+    return Response(content=dumps(rows), media_type="application/json")
+
+
+async def iter_list(rows: List[Dict[str, Any]]) -> AsyncIterator[Dict[str, Any]]:
+    """Adapt an in-memory row list to stream_rows."""
+    for row in rows:
+        yield row
+
+
+async def stream_rows(rows: AsyncIterator[Dict[str, Any]], *, ndjson: bool) -> StreamingResponse:
+    """
+    Stream rows as NDJSON or as one JSON array, encoded chunk by chunk.
+
+    The first chunk is read before the response starts, so query errors still surface
+    as a regular HTTP error instead of a truncated 200 body.
+    """
+    it = rows.__aiter__()
+    first: List[Dict[str, Any]] = []
+    async for row in it:
+        first.append(row)
+        if len(first) >= _CHUNK_ROWS:
+            break
+    exhausted = len(first) < _CHUNK_ROWS
+
+    if ndjson:
+        sep, head, tail = b"\n", b"", b"\n"
+    else:
+        sep, head, tail = b",", b"[", b"]"
+
+    async def _body() -> AsyncIterator[bytes]:
+        wrote = bool(first)
+        yield head + sep.join(dumps(r) for r in first)
+        if not exhausted:
+            chunk: List[bytes] = []
+            try:
+                async for row in it:
+                    chunk.append(dumps(row))
+                    if len(chunk) >= _CHUNK_ROWS:
+                        yield (sep if wrote else b"") + sep.join(chunk)
+                        wrote = True
+                        chunk = []
+            except Exception as exc:
+                # Headers are already sent: end the body (clients see a truncated document).
+                _logger.exception("Streaming response aborted: %s", exc)
+                return
+            if chunk:
+                yield (sep if wrote else b"") + sep.join(chunk)
+                wrote = True
+        yield tail if (wrote or not ndjson) else b""
+
+    return StreamingResponse(_body(), media_type=NDJSON_MEDIA_TYPE if ndjson else "application/json")
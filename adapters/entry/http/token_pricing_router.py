@@ -1,31 +1,60 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Dict, List, Optional, Tuple, Union
+
+from fastapi import APIRouter, Depends, HTTPException, Query
 from motor.motor_asyncio import AsyncIOMotorDatabase
 
-from adapters.external.database.system_config_repository_mongodb import SystemConfigRepositoryMongoDB
-from adapters.external.database.token_registry_repository_mongodb import TokenRegistryRepositoryMongoDB
-from core.usecases.token_pricing_use_case import TokenPricingUseCase
+from adapters.external.database.token_price_repository_mongodb import TokenPriceRepositoryMongoDB
+from core.usecases.token_pricing_use_case import TokenPriceResult, TokenPricingUseCase
+from workers.token_price_oracle import LatestTokenPrices
 
-from .deps import get_db
-from .dtos.token_registry_dtos import TokenPriceOutDTO
+from .deps import get_db, get_token_price_oracle, get_token_pricing
+from .dtos.token_registry_dtos import (
+    TokenPriceBatchInDTO,
+    TokenPriceBatchItemOutDTO,
+    TokenPriceBatchOutDTO,
+    TokenPriceOutDTO,
+    TokenPricePointOutDTO,
+)
 
 
 router = APIRouter(prefix="/pricing", tags=["pricing"])
 
 
-def _uc(db: AsyncIOMotorDatabase) -> TokenPricingUseCase:
-    return TokenPricingUseCase(
-        system_config_repo=SystemConfigRepositoryMongoDB(db),
-        token_registry_repo=TokenRegistryRepositoryMongoDB(db),
+def _price_out(res: TokenPriceResult) -> TokenPriceOutDTO:
+    return TokenPriceOutDTO(
+        chain=res.chain,
+        token_address=res.token_address,
+        price_usd=str(res.price_usd),
+        quote_token_address=res.quote_token_address,
+        quote_token_is_usd_stable=res.quote_token_is_usd_stable,
+        price_in_quote=str(res.price_in_quote),
+        pool_address=res.pool_address,
+        decimals=int(res.decimals),
     )
 
 
+def _error_status(exc: Exception) -> Tuple[int, str]:
+    """
+    Map a pricing error to (HTTP status, detail).
+    """
+    if isinstance(exc, LookupError):
+        msg = str(exc)
+        if msg == "quote_token_not_registered":
+            return 409, msg
+        return 404, msg
+    if isinstance(exc, ValueError):
+        return 400, str(exc)
+    return 500, f"failed_to_resolve_price: {exc}"
+
+
 @router.get("/tokens/{token_address}/usd", response_model=TokenPriceOutDTO)
 async def get_token_price_usd(
     token_address: str,
     chain: str = "base",
-    db: AsyncIOMotorDatabase = Depends(get_db),
+    uc: TokenPricingUseCase = Depends(get_token_pricing),
+    oracle: Optional[LatestTokenPrices] = Depends(get_token_price_oracle),
 ) -> TokenPriceOutDTO:
     """
     Returns the current USD price for a registered token.
@@ -34,28 +63,96 @@ async def get_token_price_usd(
     - checks Mongo token registry
     - queries The Graph for current pool spot price
     - resolves USD (direct if quote is stable; otherwise resolves quote token USD recursively)
+
+    Prices are cached for TOKEN_PRICE_CACHE_TTL_S (then served stale while refreshing,
+    up to TOKEN_PRICE_CACHE_STALE_S); concurrent requests share one upstream lookup.
+    With the price oracle enabled, its latest price is served directly while fresh.
     """
-    uc = _uc(db)
+    if oracle is not None:
+        hit = oracle.get(chain=chain, token_address=token_address)
+        if hit is not None:
+            return _price_out(hit)
     try:
         res = await uc.get_token_usd_price(chain=chain, token_address=token_address)
-        return TokenPriceOutDTO(
-            chain=res.chain,
-            token_address=res.token_address,
-            price_usd=str(res.price_usd),
-            quote_token_address=res.quote_token_address,
-            quote_token_is_usd_stable=res.quote_token_is_usd_stable,
-            price_in_quote=str(res.price_in_quote),
-            pool_address=res.pool_address,
-            decimals=int(res.decimals),
+    except Exception as exc:
+        status, detail = _error_status(exc)
+        raise HTTPException(status_code=status, detail=detail)
+    return _price_out(res)
+
+
+@router.post("/tokens/usd", response_model=TokenPriceBatchOutDTO)
+async def get_token_prices_usd(
+    dto: TokenPriceBatchInDTO,
+    uc: TokenPricingUseCase = Depends(get_token_pricing),
+    oracle: Optional[LatestTokenPrices] = Depends(get_token_price_oracle),
+) -> TokenPriceBatchOutDTO:
+    """
+    Returns the current USD price of many registered tokens.
+
+    Registry entries are loaded in one query per quote level, all pools are fetched
+    with one batched subgraph query, and shared quote tokens (e.g. WETH) are priced
+    once. Errors are reported per token (`status` + `error`). Tokens with a fresh
+    oracle price are not looked up at all.
+    """
+    results: Dict[int, Union[TokenPriceResult, Exception]] = {}
+    if oracle is not None:
+        for i, x in enumerate(dto.items):
+            hit = oracle.get(chain=x.chain, token_address=x.token_address)
+            if hit is not None:
+                results[i] = hit
+
+    missing = [i for i in range(len(dto.items)) if i not in results]
+    if missing:
+        try:
+            resolved = await uc.get_token_usd_prices(
+                items=[(dto.items[i].chain, dto.items[i].token_address) for i in missing]
+            )
+        except Exception as exc:
+            raise HTTPException(status_code=500, detail=f"failed_to_resolve_prices: {exc}")
+        results.update(zip(missing, resolved))
+
+    items = []
+    for i, query in enumerate(dto.items):
+        res = results[i]
+        if isinstance(res, Exception):
+            status, detail = _error_status(res)
+            items.append(
+                TokenPriceBatchItemOutDTO(chain=query.chain, token_address=query.token_address, status=status, error=detail)
+            )
+        else:
+            items.append(
+                TokenPriceBatchItemOutDTO(
+                    chain=query.chain,
+                    token_address=query.token_address,
+                    status=200,
+                    price=_price_out(res),
+                )
+            )
+    return TokenPriceBatchOutDTO(items=items)
+
+
+@router.get("/tokens/{token_address}/usd/history", response_model=List[TokenPricePointOutDTO])
+async def get_token_price_usd_history(
+    token_address: str,
+    chain: str = "base",
+    ts_from: int = Query(..., description="ms since epoch"),
+    ts_to: int = Query(..., description="ms since epoch"),
+    limit: int = Query(5000, ge=1, le=50_000),
+    db: AsyncIOMotorDatabase = Depends(get_db),
+) -> List[TokenPricePointOutDTO]:
+    """
+    USD price history of a token recorded by the price oracle (ascending by ts).
+
+    A point is written only when the price changed since the previous one.
+    """
+    try:
+        points = await TokenPriceRepositoryMongoDB(db).list_range(
+            chain=chain,
+            token_address=token_address,
+            ts_from=int(ts_from),
+            ts_to=int(ts_to),
+            limit=int(limit),
         )
-    except LookupError as exc:
-        msg = str(exc)
-        if msg == "token_not_registered":
-            raise HTTPException(status_code=404, detail=msg)
-        if msg == "quote_token_not_registered":
-            raise HTTPException(status_code=409, detail=msg)
-        raise HTTPException(status_code=404, detail=msg)
-    except ValueError as exc:
-        raise HTTPException(status_code=400, detail=str(exc))
     except Exception as exc:
-        raise HTTPException(status_code=500, detail=f"failed_to_resolve_price: {exc}")
+        raise HTTPException(status_code=500, detail=f"failed_to_list_price_history: {exc}")
+    return [TokenPricePointOutDTO.model_validate(p.model_dump()) for p in points]
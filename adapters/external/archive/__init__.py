@@ -0,0 +1,6 @@
+# adapters/external/archive/__init__.py
+from adapters.external.archive.tick_archive_numpy import TickArchiveNumpy
+
+__all__ = [
+    "TickArchiveNumpy",
+]
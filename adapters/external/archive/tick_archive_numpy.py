@@ -0,0 +1,197 @@
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+from urllib.parse import quote
+
+import numpy as np
+
+from core.repositories.price_tick_repository import TickColumns
+from core.repositories.tick_archive_repository import TickArchiveRepository
+
+DAY_MS = 86_400_000
+
+# One record per tick; fields are read as strided zero-copy views of the memory map.
+TICK_DTYPE = np.dtype([("ts", "<i8"), ("price", "<f8"), ("volume", "<f8")])
+
+
+class TickArchiveNumpy(TickArchiveRepository):
+    """
+    Local-filesystem tick archive: one .npy file per (stream_key, UTC day).
+
+    Layout:
+        {root}/{quoted stream_key}/index.json
+        {root}/{quoted stream_key}/{day_open_time}.npy   (TICK_DTYPE, sorted by ts)
+
+    index.json maps each archived day to its file, tick count and ts bounds, and
+    records `archived_until` (days are archived in order, so the archive covers one
+    contiguous range; empty days are indexed without a file).
+
+    Reads memory-map the day files (kept open in a small LRU) and slice them with a
+    binary search on ts; a range inside one day is returned without copying.
+
+    A read-only archive (another process writes it) reloads index.json whenever its
+    mtime changes, so newly archived days are served as soon as they are indexed.
+    """
+
+    def __init__(self, root_dir: str, *, max_open_files: int = 64, read_only: bool = False) -> None:
+        """
+        Args:
+            root_dir: Archive root directory (created if missing).
+            max_open_files: Memory-mapped day files kept open.
+            read_only: True when another process writes the archive.
+        """
+        self._root = os.path.abspath(root_dir)
+        self._max_open = max(1, int(max_open_files))
+        self._read_only = bool(read_only)
+        self._indexes: Dict[str, Dict[str, Any]] = {}
+        self._index_mtimes: Dict[str, int] = {}  # read-only: mtime_ns of the loaded index.json
+        self._maps: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        # write_day runs in a worker thread while the event loop reads.
+        self._lock = threading.Lock()
+        os.makedirs(self._root, exist_ok=True)
+
+    def archived_until(self, stream_key: str) -> Optional[int]:
+        until = self._index(stream_key).get("archived_until")
+        return int(until) if until is not None else None
+
+    def write_day(self, stream_key: str, day_open_time: int, ticks: TickColumns) -> None:
+        day = (int(day_open_time) // DAY_MS) * DAY_MS
+        stream_dir = self._stream_dir(stream_key)
+        os.makedirs(stream_dir, exist_ok=True)
+
+        n = len(ticks)
+        entry: Dict[str, Any] = {"count": n}
+        if n:
+            arr = np.empty(n, dtype=TICK_DTYPE)
+            arr["ts"] = np.asarray(ticks.ts, dtype=np.int64)
+            arr["price"] = np.asarray(ticks.price, dtype=np.float64)
+            arr["volume"] = np.asarray(ticks.volume, dtype=np.float64)
+            arr.sort(order="ts", kind="stable")
+
+            file_name = f"{day}.npy"
+            self._atomic_write(os.path.join(stream_dir, file_name), lambda f: np.save(f, arr))
+            entry.update(file=file_name, ts_min=int(arr["ts"][0]), ts_max=int(arr["ts"][-1]))
+
+        with self._lock:
+            index = dict(self._index(stream_key))
+            days = dict(index.get("days") or {})
+            days[str(day)] = entry
+            index["stream_key"] = str(stream_key)
+            index["days"] = days
+            index["archived_until"] = max(int(index.get("archived_until") or 0), day + DAY_MS)
+            index.setdefault("archived_from", day)
+            index["archived_from"] = min(int(index["archived_from"]), day)
+
+            payload = json.dumps(index, separators=(",", ":")).encode()
+            self._atomic_write(os.path.join(stream_dir, "index.json"), lambda f: f.write(payload))
+            self._indexes[str(stream_key)] = index
+            self._maps.pop(os.path.join(stream_dir, f"{day}.npy"), None)
+
+    def read_range(self, stream_key: str, ts_from: int, ts_to: int, limit: int) -> TickColumns:
+        index = self._index(stream_key)
+        days: Dict[str, Any] = index.get("days") or {}
+        until = index.get("archived_until")
+        limit = max(0, int(limit))
+        if not days or until is None or limit == 0:
+            return TickColumns()
+
+        lo_ts = int(ts_from)
+        hi_ts = min(int(ts_to), int(until) - 1)
+        parts: List[np.ndarray] = []
+        remaining = limit
+
+        day = (lo_ts // DAY_MS) * DAY_MS
+        while day <= hi_ts and remaining > 0:
+            entry = days.get(str(day))
+            if entry and entry.get("count") and entry.get("file"):
+                arr = self._open(os.path.join(self._stream_dir(stream_key), entry["file"]))
+                ts = arr["ts"]
+                i = int(np.searchsorted(ts, lo_ts, side="left"))
+                j = int(np.searchsorted(ts, hi_ts, side="right"))
+                j = min(j, i + remaining)
+                if j > i:
+                    parts.append(arr[i:j])
+                    remaining -= j - i
+            day += DAY_MS
+
+        if not parts:
+            return TickColumns()
+        out = parts[0] if len(parts) == 1 else np.concatenate(parts)
+        return TickColumns(ts=out["ts"], price=out["price"], volume=out["volume"])
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for observability."""
+        return {
+            "root": self._root,
+            "streams": {
+                k: {
+                    "archived_from": v.get("archived_from"),
+                    "archived_until": v.get("archived_until"),
+                    "days": len(v.get("days") or {}),
+                    "ticks": sum(int(d.get("count") or 0) for d in (v.get("days") or {}).values()),
+                }
+                for k, v in self._indexes.items()
+            },
+            "open_files": len(self._maps),
+        }
+
+    def _stream_dir(self, stream_key: str) -> str:
+        return os.path.join(self._root, quote(str(stream_key), safe=""))
+
+    def _index(self, stream_key: str) -> Dict[str, Any]:
+        key = str(stream_key)
+        index = self._indexes.get(key)
+        if index is not None and not self._read_only:
+            return index
+        stream_dir = self._stream_dir(key)
+        path = os.path.join(stream_dir, "index.json")
+
+        if self._read_only:
+            try:
+                mtime = os.stat(path).st_mtime_ns
+            except FileNotFoundError:
+                return {}  # not archived yet: checked again on the next read
+            if index is not None and self._index_mtimes.get(key) == mtime:
+                return index
+            # Day files may have been rewritten along with the index
+            with self._lock:
+                for p in [p for p in self._maps if os.path.dirname(p) == stream_dir]:
+                    self._maps.pop(p, None)
+            self._index_mtimes[key] = mtime
+
+        try:
+            with open(path, "rb") as f:
+                index = json.loads(f.read())
+        except FileNotFoundError:
+            index = {}
+        self._indexes[key] = index
+        return index
+
+    def _open(self, path: str) -> np.ndarray:
+        with self._lock:
+            arr = self._maps.get(path)
+            if arr is not None:
+                self._maps.move_to_end(path)
+                return arr
+            arr = np.load(path, mmap_mode="r")
+            self._maps[path] = arr
+            while len(self._maps) > self._max_open:
+                self._maps.popitem(last=False)
+            return arr
+
+    @staticmethod
+    def _atomic_write(path: str, write) -> None:
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                write(f)
+            os.replace(tmp, path)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
@@ -0,0 +1,303 @@
+import asyncio
+import contextlib
+import json
+import logging
+import random
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+
+import websockets
+from websockets.exceptions import ConnectionClosed, ConnectionClosedError
+
+KlineCallback = Callable[[dict], Awaitable[None]]
+
+
+class _CombinedStreamShard:
+    """
+    One Binance combined-stream connection carrying up to `capacity` streams.
+
+    - Connects to: {base}/stream?streams=a@kline_1m/b@kline_1m/...
+    - Streams added/removed while connected are sent as SUBSCRIBE/UNSUBSCRIBE
+      (coalesced, to stay under the per-connection message rate).
+    - Reconnects with exponential backoff + jitter, re-subscribing the current set.
+    """
+
+    # Binance accepts 5 incoming messages per second per connection.
+    _CONTROL_MIN_INTERVAL_S = 0.25
+
+    def __init__(self, *, shard_id: int, base_ws_url: str, capacity: int, route: Callable[[str, dict], None]) -> None:
+        self._logger = logging.getLogger(f"{self.__class__.__name__}[{shard_id}]")
+        self.shard_id = shard_id
+        self.capacity = capacity
+        self._base_ws_url = base_ws_url
+        self._route = route
+
+        self.streams: Set[str] = set()
+        self._pending_sub: Set[str] = set()
+        self._pending_unsub: Set[str] = set()
+        self._control = asyncio.Event()
+        self._stop_event = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._ws: Any = None
+        self._next_id = 1
+
+        self.connects = 0
+        self.messages = 0
+
+    @property
+    def free(self) -> int:
+        return self.capacity - len(self.streams)
+
+    def add(self, stream: str) -> None:
+        self.streams.add(stream)
+        self._pending_unsub.discard(stream)
+        self._pending_sub.add(stream)
+        self._control.set()
+        if self._task is None or self._task.done():
+            self._stop_event.clear()
+            self._task = asyncio.create_task(self._run_loop())
+
+    def remove(self, stream: str) -> None:
+        self.streams.discard(stream)
+        self._pending_sub.discard(stream)
+        self._pending_unsub.add(stream)
+        self._control.set()
+
+    async def close(self) -> None:
+        self._stop_event.set()
+        self._control.set()
+        if self._task is None:
+            return
+        ws = self._ws
+        if ws is not None:
+            with contextlib.suppress(Exception):
+                await ws.close()
+        try:
+            await asyncio.wait_for(self._task, timeout=5)
+        except asyncio.TimeoutError:
+            self._logger.warning("Timeout waiting WS shard to stop; cancelling task.")
+            self._task.cancel()
+        except Exception:
+            pass
+        finally:
+            self._task = None
+
+    async def _run_loop(self) -> None:
+        backoff = 1
+        backoff_max = 30
+
+        while not self._stop_event.is_set():
+            if not self.streams:
+                # Nothing to carry: park until a stream is added (or close()).
+                self._control.clear()
+                await self._control.wait()
+                continue
+
+            url_streams = set(self.streams)
+            url = f"{self._base_ws_url}/stream?streams={'/'.join(sorted(url_streams))}"
+            try:
+                self._logger.info("Connecting combined WS: streams=%s", len(self.streams))
+                async with websockets.connect(
+                    url,
+                    open_timeout=30,
+                    close_timeout=5,
+                    ping_interval=15,
+                    ping_timeout=15,
+                    max_queue=1000,
+                    max_size=None,
+                ) as ws:
+                    self._ws = ws
+                    # Streams changed while connecting are reconciled through the control loop.
+                    self._pending_sub = self.streams - url_streams
+                    self._pending_unsub = url_streams - self.streams
+                    if self._pending_sub or self._pending_unsub:
+                        self._control.set()
+                    self.connects += 1
+                    self._logger.info("Combined WS connected: streams=%s", len(self.streams))
+                    backoff = 1
+
+                    control = asyncio.create_task(self._control_loop(ws))
+                    try:
+                        async for message in ws:
+                            if self._stop_event.is_set():
+                                break
+                            self._handle_message(message)
+                    finally:
+                        control.cancel()
+                        with contextlib.suppress(asyncio.CancelledError, Exception):
+                            await control
+
+            except asyncio.CancelledError:
+                raise
+
+            except asyncio.TimeoutError as exc:
+                self._logger.warning("WS timeout during handshake/connection: %s. Reconnecting...", exc)
+
+            except (ConnectionClosed, ConnectionClosedError) as exc:
+                self._logger.warning("WS closed/error: %s. Reconnecting...", exc)
+
+            except Exception as exc:
+                self._logger.warning("WS error: %s. Reconnecting...", exc)
+
+            finally:
+                self._ws = None
+
+            if self._stop_event.is_set():
+                break
+
+            jitter = random.uniform(0, 0.5)
+            await asyncio.sleep(min(backoff, backoff_max) + jitter)
+            backoff = min(backoff * 2, backoff_max)
+
+    async def _control_loop(self, ws: Any) -> None:
+        """
+        Send pending SUBSCRIBE/UNSUBSCRIBE requests on the live connection.
+        """
+        while True:
+            await self._control.wait()
+            self._control.clear()
+            # Coalesce bursts (e.g. many streams started together) into one request each.
+            await asyncio.sleep(self._CONTROL_MIN_INTERVAL_S)
+
+            for method, pending in (("UNSUBSCRIBE", self._pending_unsub), ("SUBSCRIBE", self._pending_sub)):
+                if not pending:
+                    continue
+                params = sorted(pending)
+                pending.clear()
+                await ws.send(json.dumps({"method": method, "params": params, "id": self._next_id}))
+                self._next_id += 1
+                self._logger.info("%s sent: %s", method, len(params))
+                await asyncio.sleep(self._CONTROL_MIN_INTERVAL_S)
+
+    def _handle_message(self, message: str) -> None:
+        try:
+            payload = json.loads(message)
+        except Exception as exc:
+            self._logger.warning("Invalid WS message: %s", exc)
+            return
+
+        stream = payload.get("stream")
+        if stream is None:
+            # Response to a SUBSCRIBE/UNSUBSCRIBE request.
+            if payload.get("error"):
+                self._logger.warning("WS request failed: %s", payload)
+            return
+
+        self.messages += 1
+        data = payload.get("data")
+        if isinstance(data, dict):
+            self._route(str(stream), data)
+
+
+class BinanceCombinedStreamManager:
+    """
+    Multiplexes many Binance kline_1m subscriptions over a few combined-stream connections.
+
+    - Streams are packed into shards of at most `max_streams_per_connection`.
+    - Messages are routed to the callback registered for their stream.
+    - Callbacks run in background tasks: sequential per stream (ordered), concurrent
+      across streams, so one slow consumer does not hold up the connection.
+    - Only CLOSED klines (kline.x == true) are dispatched.
+
+    The subscribe_kline_1m/unsubscribe_kline_1m interface matches BinanceWebsocketClient.
+    """
+
+    def __init__(
+        self,
+        base_ws_url: str = "wss://stream.binance.com:9443",
+        *,
+        max_streams_per_connection: int = 200,
+    ) -> None:
+        """
+        :param base_ws_url: Binance base WebSocket URL.
+        :param max_streams_per_connection: Streams per connection (Binance allows up to 1024).
+        """
+        self._logger = logging.getLogger(self.__class__.__name__)
+        self._base_ws_url = base_ws_url.rstrip("/")
+        self._capacity = max(1, min(1024, int(max_streams_per_connection)))
+
+        self._shards: List[_CombinedStreamShard] = []
+        self._callbacks: Dict[str, KlineCallback] = {}
+        self._shard_of: Dict[str, _CombinedStreamShard] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._inflight: Set[asyncio.Task] = set()
+        self._dispatched = 0
+
+    async def subscribe_kline_1m(self, symbol: str, on_kline_closed: KlineCallback) -> None:
+        """
+        Route closed {symbol}@kline_1m candles to `on_kline_closed`.
+
+        :param symbol: Trading symbol (e.g., 'ethusdt').
+        :param on_kline_closed: Async callback receiving the kline event dict.
+        """
+        stream = f"{symbol.lower()}@kline_1m"
+        self._callbacks[stream] = on_kline_closed
+        if stream in self._shard_of:
+            return
+
+        shard = next((s for s in self._shards if s.free > 0), None)
+        if shard is None:
+            shard = _CombinedStreamShard(
+                shard_id=len(self._shards),
+                base_ws_url=self._base_ws_url,
+                capacity=self._capacity,
+                route=self._route,
+            )
+            self._shards.append(shard)
+        shard.add(stream)
+        self._shard_of[stream] = shard
+        self._logger.info("Subscribed %s (shard=%s)", stream, shard.shard_id)
+
+    async def unsubscribe_kline_1m(self, symbol: str) -> None:
+        """
+        Stop routing {symbol}@kline_1m (UNSUBSCRIBE on the live connection).
+        """
+        stream = f"{symbol.lower()}@kline_1m"
+        self._callbacks.pop(stream, None)
+        self._locks.pop(stream, None)
+        shard = self._shard_of.pop(stream, None)
+        if shard is not None:
+            shard.remove(stream)
+            self._logger.info("Unsubscribed %s (shard=%s)", stream, shard.shard_id)
+
+    async def close(self) -> None:
+        """
+        Close all connections and wait for in-flight callbacks.
+        """
+        for shard in self._shards:
+            await shard.close()
+        if self._inflight:
+            await asyncio.gather(*list(self._inflight), return_exceptions=True)
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for observability."""
+        return {
+            "connections": len(self._shards),
+            "streams": len(self._shard_of),
+            "dispatched": self._dispatched,
+            "inflight": len(self._inflight),
+            "shards": [
+                {"id": s.shard_id, "streams": len(s.streams), "connects": s.connects, "messages": s.messages}
+                for s in self._shards
+            ],
+        }
+
+    def _route(self, stream: str, event: dict) -> None:
+        k = event.get("k")
+        if not k or k.get("x") is not True:
+            return
+        cb = self._callbacks.get(stream)
+        if cb is None:
+            return
+
+        lock = self._locks.setdefault(stream, asyncio.Lock())
+        task = asyncio.create_task(self._dispatch(lock, cb, event))
+        self._inflight.add(task)
+        task.add_done_callback(self._inflight.discard)
+
+    async def _dispatch(self, lock: asyncio.Lock, cb: KlineCallback, event: dict) -> None:
+        async with lock:
+            try:
+                await cb(event)
+                self._dispatched += 1
+            except Exception as exc:
+                self._logger.exception("Error handling WS message: %s", exc)
@@ -0,0 +1,91 @@
+import asyncio
+import logging
+import time
+from typing import Any, Dict, Optional
+
+
+class BinanceRateLimiter:
+    """
+    Process-wide token bucket on Binance REST request weight.
+
+    Design:
+      - Capacity is the per-minute weight budget (keep it below the exchange limit,
+        e.g. 4800 of 6000) and refills continuously at capacity / 60 per second.
+      - Callers acquire the weight of a request before sending it.
+      - The used-weight header returned by Binance tightens the local bucket, so other
+        processes sharing the same IP are accounted for.
+      - A 429/418 response blocks every caller until Retry-After has elapsed.
+    """
+
+    def __init__(self, weight_per_minute: int = 4800) -> None:
+        """
+        :param weight_per_minute: Request-weight budget per rolling minute.
+        """
+        self._logger = logging.getLogger(self.__class__.__name__)
+        self._capacity = float(max(1, int(weight_per_minute)))
+        self._rate = self._capacity / 60.0
+        self._tokens = self._capacity
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = asyncio.Lock()
+
+        self._acquired_weight = 0
+        self._waited_s = 0.0
+        self._penalties = 0
+
+    async def acquire(self, weight: int = 1) -> None:
+        """
+        Wait until `weight` tokens are available (and no ban/back-off is active), then take them.
+        """
+        need = min(float(max(1, int(weight))), self._capacity)
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self._blocked_until:
+                    wait_s = self._blocked_until - now
+                else:
+                    self._refill(now)
+                    if self._tokens >= need:
+                        self._tokens -= need
+                        self._acquired_weight += int(need)
+                        return
+                    wait_s = (need - self._tokens) / self._rate
+                self._waited_s += wait_s
+                await asyncio.sleep(wait_s)
+
+    def observe_used_weight(self, used_weight_1m: Optional[int]) -> None:
+        """
+        Align the bucket with the server-side counter (X-MBX-USED-WEIGHT-1M).
+        """
+        if used_weight_1m is None:
+            return
+        self._refill(time.monotonic())
+        self._tokens = min(self._tokens, max(0.0, self._capacity - float(used_weight_1m)))
+
+    def penalize(self, retry_after_s: Optional[float]) -> None:
+        """
+        Block all callers after a 429/418 (Retry-After seconds, default 60s).
+        """
+        wait_s = float(retry_after_s) if retry_after_s and retry_after_s > 0 else 60.0
+        self._blocked_until = max(self._blocked_until, time.monotonic() + wait_s)
+        self._tokens = 0.0
+        self._penalties += 1
+        self._logger.warning("Binance rate limit hit; pausing REST calls for %.1fs", wait_s)
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for observability."""
+        self._refill(time.monotonic())
+        return {
+            "capacity": int(self._capacity),
+            "tokens": round(self._tokens, 1),
+            "acquired_weight": self._acquired_weight,
+            "waited_s": round(self._waited_s, 3),
+            "penalties": self._penalties,
+            "blocked_for_s": round(max(0.0, self._blocked_until - time.monotonic()), 3),
+        }
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._updated
+        if elapsed > 0:
+            self._tokens = min(self._capacity, self._tokens + elapsed * self._rate)
+            self._updated = now
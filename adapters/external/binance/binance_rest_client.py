@@ -5,6 +5,7 @@ from typing import Any, Dict, List, Optional
 
 import httpx
 
+from adapters.external.binance.binance_rate_limiter import BinanceRateLimiter
 from config.settings import settings  # type: ignore
 
 
@@ -18,24 +19,32 @@ class BinanceRestClient:
     Design:
       - Uses a shared httpx.AsyncClient with sane defaults.
       - Retries on transient errors with exponential backoff + jitter.
+      - Optionally shares a request-weight token bucket (BinanceRateLimiter) across clients;
+        429/418 responses then pause every caller until Retry-After.
       - Does NOT require API key for public endpoints.
     """
 
+    # GET /api/v3/klines request weight (any limit)
+    KLINES_WEIGHT = 2
+
     def __init__(
         self,
         base_url: str | None = None,
         timeout: float = 10.0,
         max_retries: int = 3,
+        rate_limiter: BinanceRateLimiter | None = None,
     ) -> None:
         """
         :param base_url: Binance REST base URL (default from settings).
         :param timeout: Request timeout in seconds.
         :param max_retries: Number of retries for transient errors.
+        :param rate_limiter: Optional shared request-weight limiter.
         """
         self._logger = logging.getLogger(self.__class__.__name__)
         self._base_url = (base_url or settings.BOOTSTRAP_BINANCE_REST_BASE_URL).rstrip("/")
         self._timeout = timeout
         self._max_retries = max_retries
+        self._rate_limiter = rate_limiter
 
         self._client = httpx.AsyncClient(
             base_url=self._base_url,
@@ -92,7 +101,11 @@ class BinanceRestClient:
 
         for attempt in range(1, self._max_retries + 1):
             try:
+                if self._rate_limiter is not None:
+                    await self._rate_limiter.acquire(self.KLINES_WEIGHT)
                 resp = await self._client.get(url, params=params)
+                if self._rate_limiter is not None:
+                    self._rate_limiter.observe_used_weight(self._header_int(resp, "X-MBX-USED-WEIGHT-1M"))
                 resp.raise_for_status()
                 data = resp.json()
 
@@ -134,6 +147,10 @@ class BinanceRestClient:
                     symbol,
                     exc,
                 )
+                if status in (418, 429) and self._rate_limiter is not None:
+                    # The shared limiter waits for Retry-After on the next acquire().
+                    self._rate_limiter.penalize(self._header_int(exc.response, "Retry-After"))
+                    continue
             except Exception as exc:  # noqa: BLE001
                 self._logger.warning(
                     "Binance klines unexpected error (attempt %s/%s) for %s: %s",
@@ -158,3 +175,14 @@ class BinanceRestClient:
             self._max_retries,
         )
         return []
+
+    @staticmethod
+    def _header_int(resp: httpx.Response, name: str) -> Optional[int]:
+        """
+        Parse an integer response header (None if missing/invalid).
+        """
+        raw = resp.headers.get(name)
+        try:
+            return int(raw) if raw is not None else None
+        except (TypeError, ValueError):
+            return None
@@ -44,6 +44,12 @@ class BinanceWebsocketClient:
         self._runner_task = asyncio.create_task(self._run_loop())
         self._logger.info("WS runner started for %s@kline_1m", self._symbol)
 
+    async def unsubscribe_kline_1m(self, symbol: str):
+        """
+        Stop consuming the stream (this client carries a single symbol).
+        """
+        await self.close()
+
     async def close(self):
         """
         Signal the background task to stop and wait for completion.
@@ -1,12 +1,13 @@
 from __future__ import annotations
 
 from datetime import datetime, timezone
-from typing import List
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Tuple
 
 from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import IndexModel, UpdateOne
 
 from core.domain.entities.candle_entity import CandleEntity
-from core.repositories.candle_repository import CandleRepository
+from core.repositories.candle_repository import CandleColumns, CandleRepository
 
 
 class CandleRepositoryMongoDB(CandleRepository):
@@ -21,6 +22,13 @@ class CandleRepositoryMongoDB(CandleRepository):
 
     COLLECTION = "candles_1m"
 
+    INDEXES = (
+        IndexModel([("stream_key", 1), ("open_time", 1)], unique=True),
+        IndexModel([("stream_key", 1), ("open_time", -1)]),
+        IndexModel([("stream_key", 1), ("is_closed", 1), ("open_time", -1)]),
+        IndexModel([("source", 1), ("symbol", 1), ("interval", 1), ("open_time", -1)]),
+    )
+
     def __init__(self, db: AsyncIOMotorDatabase):
         """
         Args:
@@ -32,11 +40,7 @@ class CandleRepositoryMongoDB(CandleRepository):
         """
         Ensure uniqueness by (stream_key, open_time) and allow efficient recent queries.
         """
-        col = self._db[self.COLLECTION]
-        await col.create_index([("stream_key", 1), ("open_time", 1)], unique=True)
-        await col.create_index([("stream_key", 1), ("open_time", -1)])
-        await col.create_index([("stream_key", 1), ("is_closed", 1), ("open_time", -1)])
-        await col.create_index([("source", 1), ("symbol", 1), ("interval", 1), ("open_time", -1)])
+        await self._db[self.COLLECTION].create_indexes(list(self.INDEXES))
 
     async def upsert_closed_candle(self, candle: CandleEntity) -> None:
         """
@@ -69,6 +73,40 @@ class CandleRepositoryMongoDB(CandleRepository):
             upsert=True,
         )
 
+    async def upsert_closed_candles(self, candles: List[CandleEntity]) -> int:
+        """
+        Upsert many closed candles by (stream_key, open_time) with one unordered bulk_write.
+
+        Timestamps follow upsert_closed_candle.
+        """
+        if not candles:
+            return 0
+        col = self._db[self.COLLECTION]
+
+        now_ms = int(datetime.now(tz=timezone.utc).timestamp() * 1000)
+        now_iso = datetime.now(tz=timezone.utc).isoformat().replace("+00:00", "Z")
+
+        ops = []
+        for c in candles:
+            payload = c.to_mongo()
+            payload["updated_at"] = now_ms
+            payload["updated_at_iso"] = now_iso
+            ops.append(
+                UpdateOne(
+                    {"stream_key": c.stream_key, "open_time": int(c.open_time)},
+                    {
+                        "$set": payload,
+                        "$setOnInsert": {
+                            "created_at": now_ms,
+                            "created_at_iso": now_iso,
+                        },
+                    },
+                    upsert=True,
+                )
+            )
+        await col.bulk_write(ops, ordered=False)
+        return len(ops)
+
     async def get_last_n_closed(self, stream_key: str, n: int) -> List[CandleEntity]:
         """
         Fetch the last N closed candles for a stream_key in ascending order.
@@ -85,3 +123,144 @@ class CandleRepositoryMongoDB(CandleRepository):
         out = [e for e in entities if e is not None]
         out.reverse()
         return out
+
+    async def iter_last_n_closed_rows(
+        self,
+        stream_key: str,
+        n: int,
+        *,
+        fields: Sequence[str],
+        batch_size: int = 2_000,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream the last N closed candles (ascending) as projected rows.
+
+        The window start is located with one index-only lookup; the window is then
+        read ascending through the cursor batch by batch.
+        """
+        if int(n) <= 0:
+            return
+        col = self._db[self.COLLECTION]
+        q: dict[str, object] = {"stream_key": stream_key, "is_closed": True}
+
+        first = await (
+            col.find(q, {"_id": 0, "open_time": 1}).sort("open_time", -1).skip(int(n) - 1).limit(1).to_list(length=1)
+        )
+        if first:
+            q["open_time"] = {"$gte": int(first[0]["open_time"])}
+
+        projection = {"_id": 0, **{f: 1 for f in fields}}
+        cursor = col.find(q, projection).sort("open_time", 1).batch_size(max(1, int(batch_size)))
+        async for d in cursor:
+            yield {f: d.get(f) for f in fields}
+
+    async def count_closed(self, stream_key: str, *, after_open_time: Optional[int] = None) -> int:
+        """
+        Count closed candles for a stream_key (optionally strictly after an open_time).
+        """
+        col = self._db[self.COLLECTION]
+        q: dict[str, object] = {"stream_key": stream_key, "is_closed": True}
+        if after_open_time is not None:
+            q["open_time"] = {"$gt": int(after_open_time)}
+        return int(await col.count_documents(q))
+
+    async def iter_closed_columns(
+        self,
+        stream_key: str,
+        *,
+        after_open_time: Optional[int] = None,
+        batch_size: int = 50_000,
+    ) -> AsyncIterator[CandleColumns]:
+        """
+        Stream closed candles (ascending open_time) as column batches.
+
+        Only OHLCV fields are projected; no entity validation is done per document.
+        """
+        col = self._db[self.COLLECTION]
+        q: dict[str, object] = {"stream_key": stream_key, "is_closed": True}
+        if after_open_time is not None:
+            q["open_time"] = {"$gt": int(after_open_time)}
+
+        projection = {
+            "_id": 0,
+            "open_time": 1,
+            "close_time": 1,
+            "open": 1,
+            "high": 1,
+            "low": 1,
+            "close": 1,
+            "volume": 1,
+            "trades": 1,
+        }
+        size = max(1, int(batch_size))
+        cursor = col.find(q, projection).sort("open_time", 1).batch_size(min(size, 10_000))
+
+        batch = CandleColumns()
+        async for d in cursor:
+            batch.open_time.append(int(d["open_time"]))
+            batch.close_time.append(int(d["close_time"]))
+            batch.open.append(float(d["open"]))
+            batch.high.append(float(d["high"]))
+            batch.low.append(float(d["low"]))
+            batch.close.append(float(d["close"]))
+            batch.volume.append(float(d.get("volume") or 0.0))
+            batch.trades.append(int(d.get("trades") or 0))
+            if len(batch) >= size:
+                yield batch
+                batch = CandleColumns()
+
+        if len(batch):
+            yield batch
+
+    async def find_gaps(
+        self,
+        stream_key: str,
+        *,
+        interval_ms: int,
+        start_open_time: int,
+        end_open_time: int,
+    ) -> List[Tuple[int, int]]:
+        """
+        Detect missing candle ranges server-side.
+
+        Inner gaps come from one aggregation using $setWindowFields/$shift (MongoDB 5.0+)
+        over the (stream_key, open_time) index; leading/trailing gaps from the first/last
+        candle of the window.
+        """
+        col = self._db[self.COLLECTION]
+        step = int(interval_ms)
+        start = int(start_open_time)
+        end = int(end_open_time)
+        if end < start:
+            return []
+
+        q = {"stream_key": stream_key, "open_time": {"$gte": start, "$lte": end}}
+        first = await col.find_one(q, {"_id": 0, "open_time": 1}, sort=[("open_time", 1)])
+        if first is None:
+            return [(start, end)]
+        last = await col.find_one(q, {"_id": 0, "open_time": 1}, sort=[("open_time", -1)])
+
+        gaps: List[Tuple[int, int]] = []
+        first_ot = int(first["open_time"])
+        last_ot = int((last or first)["open_time"])
+        if first_ot > start:
+            gaps.append((start, first_ot - step))
+
+        pipeline = [
+            {"$match": q},
+            {"$project": {"_id": 0, "open_time": 1}},
+            {
+                "$setWindowFields": {
+                    "sortBy": {"open_time": 1},
+                    "output": {"prev": {"$shift": {"output": "$open_time", "by": -1}}},
+                }
+            },
+            {"$match": {"prev": {"$ne": None}, "$expr": {"$gt": [{"$subtract": ["$open_time", "$prev"]}, step]}}},
+            {"$project": {"from": {"$add": ["$prev", step]}, "to": {"$subtract": ["$open_time", step]}}},
+        ]
+        async for d in col.aggregate(pipeline, allowDiskUse=True):
+            gaps.append((int(d["from"]), int(d["to"])))
+
+        if last_ot < end:
+            gaps.append((last_ot + step, end))
+        return gaps
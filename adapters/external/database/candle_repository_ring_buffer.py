@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Tuple
+
+from core.domain.entities.candle_entity import CandleEntity
+from core.repositories.candle_repository import CandleColumns, CandleRepository
+from core.services.candle_ring_buffer import CandleRingBufferRegistry
+
+
+class RingBufferedCandleRepository(CandleRepository):
+    """
+    Write-through decorator that keeps the in-memory ring buffers in sync with a
+    persistent CandleRepository.
+
+    - Writes go to the inner repository first, then to the ring buffer.
+    - get_last_n_closed is served from memory when the window fits; on a miss for a
+      buffered stream the buffer is reloaded from the inner repository once.
+    """
+
+    def __init__(self, inner: CandleRepository, buffers: CandleRingBufferRegistry):
+        """
+        Args:
+            inner: Persistent candle repository (e.g. CandleRepositoryMongoDB).
+            buffers: Process-wide ring buffer registry.
+        """
+        self._inner = inner
+        self._buffers = buffers
+
+    @property
+    def buffers(self) -> CandleRingBufferRegistry:
+        return self._buffers
+
+    async def ensure_indexes(self) -> None:
+        await self._inner.ensure_indexes()
+
+    async def upsert_closed_candle(self, candle: CandleEntity) -> None:
+        await self._inner.upsert_closed_candle(candle)
+        self._buffers.append(candle)
+
+    async def upsert_closed_candles(self, candles: List[CandleEntity]) -> int:
+        written = await self._inner.upsert_closed_candles(candles)
+        for c in sorted(candles, key=lambda x: (x.stream_key, int(x.open_time))):
+            self._buffers.append(c)
+        return written
+
+    async def get_last_n_closed(self, stream_key: str, n: int) -> List[CandleEntity]:
+        cached = self._buffers.last_n_entities(stream_key, n)
+        if cached is not None:
+            return cached
+
+        buf = self._buffers.get(stream_key)
+        if buf is None or int(n) > buf.capacity:
+            return await self._inner.get_last_n_closed(stream_key, n)
+
+        # Reload the whole window once; skip it if a write raced with the read.
+        version = buf.version
+        candles = await self._inner.get_last_n_closed(stream_key, buf.capacity)
+        if buf.version == version:
+            self._buffers.warm(stream_key, candles)
+        return candles[-int(n) :] if int(n) > 0 else []
+
+    async def warm(self, stream_key: str) -> None:
+        """
+        Load a stream's buffer from the inner repository (startup pre-warm).
+        """
+        candles = await self._inner.get_last_n_closed(stream_key, self._buffers.capacity)
+        self._buffers.warm(stream_key, candles)
+
+    async def count_closed(self, stream_key: str, *, after_open_time: Optional[int] = None) -> int:
+        return await self._inner.count_closed(stream_key, after_open_time=after_open_time)
+
+    def iter_closed_columns(
+        self,
+        stream_key: str,
+        *,
+        after_open_time: Optional[int] = None,
+        batch_size: int = 50_000,
+    ) -> AsyncIterator[CandleColumns]:
+        return self._inner.iter_closed_columns(stream_key, after_open_time=after_open_time, batch_size=batch_size)
+
+    def iter_last_n_closed_rows(
+        self,
+        stream_key: str,
+        n: int,
+        *,
+        fields: Sequence[str],
+        batch_size: int = 2_000,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        return self._inner.iter_last_n_closed_rows(stream_key, n, fields=fields, batch_size=batch_size)
+
+    async def find_gaps(
+        self,
+        stream_key: str,
+        *,
+        interval_ms: int,
+        start_open_time: int,
+        end_open_time: int,
+    ) -> List[Tuple[int, int]]:
+        return await self._inner.find_gaps(
+            stream_key,
+            interval_ms=interval_ms,
+            start_open_time=start_open_time,
+            end_open_time=end_open_time,
+        )
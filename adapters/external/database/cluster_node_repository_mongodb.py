@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import List
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import IndexModel
+
+from core.domain.entities.cluster_node_entity import ClusterNodeEntity
+from core.repositories.cluster_node_repository import ClusterNodeRepository
+
+# Nodes that stopped heartbeating are removed by MongoDB after this long
+NODE_EXPIRE_AFTER_S = 86_400
+
+
+class ClusterNodeRepositoryMongoDB(ClusterNodeRepository):
+    """
+    MongoDB repository for ingestion replica heartbeats.
+    """
+
+    COLLECTION = "cluster_nodes"
+
+    INDEXES = (IndexModel([("heartbeat_at", 1)], expireAfterSeconds=NODE_EXPIRE_AFTER_S),)
+
+    def __init__(self, db: AsyncIOMotorDatabase):
+        self._db = db
+
+    async def ensure_indexes(self) -> None:
+        await self._db[self.COLLECTION].create_indexes(list(self.INDEXES))
+
+    async def heartbeat(self, node: ClusterNodeEntity) -> None:
+        doc = node.to_mongo()
+        node_id = doc.pop("_id")
+        started_at = doc.pop("started_at")
+        await self._db[self.COLLECTION].update_one(
+            {"_id": node_id},
+            {"$set": doc, "$setOnInsert": {"started_at": started_at}},
+            upsert=True,
+        )
+
+    async def list_alive(self, *, since: datetime) -> List[ClusterNodeEntity]:
+        docs = await self._db[self.COLLECTION].find({"heartbeat_at": {"$gte": since}}).to_list(length=10_000)
+        out = [ClusterNodeEntity.from_mongo(d) for d in docs]
+        return [x for x in out if x is not None]
+
+    async def list_all(self) -> List[ClusterNodeEntity]:
+        docs = await self._db[self.COLLECTION].find({}).sort("_id", 1).to_list(length=10_000)
+        out = [ClusterNodeEntity.from_mongo(d) for d in docs]
+        return [x for x in out if x is not None]
+
+    async def delete(self, node_id: str) -> None:
+        await self._db[self.COLLECTION].delete_one({"_id": node_id})
@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Sequence
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from adapters.external.database.candle_repository_mongodb import CandleRepositoryMongoDB
+from adapters.external.database.cluster_node_repository_mongodb import ClusterNodeRepositoryMongoDB
+from adapters.external.database.indicator_recompute_job_repository_mongodb import IndicatorRecomputeJobRepositoryMongoDB
+from adapters.external.database.indicator_recompute_lease_repository_mongodb import IndicatorRecomputeLeaseRepositoryMongoDB
+from adapters.external.database.indicator_repository_mongodb import IndicatorRepositoryMongoDB
+from adapters.external.database.indicator_set_repository_mongodb import IndicatorSetRepositoryMongoDB
+from adapters.external.database.ingestion_stream_repository_mongodb import IngestionStreamRepositoryMongoDB
+from adapters.external.database.price_tick_repository_mongodb import PriceTickRepositoryMongoDB
+from adapters.external.database.processing_offset_repository_mongodb import ProcessingOffsetRepositoryMongoDB
+from adapters.external.database.stream_lease_repository_mongodb import StreamLeaseRepositoryMongoDB
+from adapters.external.database.token_latest_price_repository_mongodb import TokenLatestPriceRepositoryMongoDB
+from adapters.external.database.token_price_repository_mongodb import TokenPriceRepositoryMongoDB
+from adapters.external.database.token_registry_repository_mongodb import TokenRegistryRepositoryMongoDB
+from config.settings import settings
+
+SCHEMA_MIGRATIONS_COLLECTION = "schema_migrations"
+INDEXES_STATE_ID = "indexes"
+
+logger = logging.getLogger("IndexRegistry")
+
+
+class IndexRegistry:
+    """
+    Declared indexes of every MongoDB repository, applied once per schema change.
+
+    - Each repository declares its indexes (`INDEXES`, or the `indexes` property when
+      they depend on configuration) and applies them with one createIndexes command.
+    - apply() runs all repositories concurrently and records a fingerprint of the
+      declared specs in `schema_migrations`; when the stored fingerprint matches,
+      no DDL is sent at all.
+    - Request handlers never create indexes: run at startup or through
+      `python -m workers.migrate_indexes`.
+    """
+
+    def __init__(self, db: AsyncIOMotorDatabase, repositories: Optional[Sequence[Any]] = None):
+        """
+        Args:
+            db: Motor database handle.
+            repositories: Repositories exposing COLLECTION/INDEXES/ensure_indexes()
+                (defaults to every MongoDB repository of the service).
+        """
+        self._db = db
+        self._repositories = list(repositories) if repositories is not None else default_repositories(db)
+
+    def describe(self) -> List[Dict[str, Any]]:
+        """Declared collections and index specs (JSON-serializable)."""
+        out = []
+        for repo in self._repositories:
+            indexes = getattr(repo, "indexes", None) or repo.INDEXES
+            out.append(
+                {
+                    "collection": repo.COLLECTION,
+                    "indexes": [_index_doc(ix.document) for ix in indexes],
+                    "options": getattr(repo, "storage_options", {}),
+                }
+            )
+        return out
+
+    def fingerprint(self) -> str:
+        payload = json.dumps(self.describe(), sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    async def applied_fingerprint(self) -> Optional[str]:
+        doc = await self._db[SCHEMA_MIGRATIONS_COLLECTION].find_one({"_id": INDEXES_STATE_ID})
+        return (doc or {}).get("fingerprint")
+
+    async def apply(self, *, force: bool = False) -> bool:
+        """
+        Create missing indexes on all collections concurrently.
+
+        Returns:
+            True when DDL was sent, False when the recorded state was already current.
+        """
+        fingerprint = self.fingerprint()
+        if not force and await self.applied_fingerprint() == fingerprint:
+            logger.info("Indexes up to date (fingerprint=%s)", fingerprint[:12])
+            return False
+
+        await asyncio.gather(*(repo.ensure_indexes() for repo in self._repositories))
+
+        await self._db[SCHEMA_MIGRATIONS_COLLECTION].update_one(
+            {"_id": INDEXES_STATE_ID},
+            {
+                "$set": {
+                    "fingerprint": fingerprint,
+                    "collections": [r.COLLECTION for r in self._repositories],
+                    "applied_at": datetime.now(tz=timezone.utc),
+                }
+            },
+            upsert=True,
+        )
+        logger.info("Indexes applied: collections=%s fingerprint=%s", len(self._repositories), fingerprint[:12])
+        return True
+
+
+def default_repositories(db: AsyncIOMotorDatabase) -> List[Any]:
+    return [
+        CandleRepositoryMongoDB(db),
+        IndicatorRepositoryMongoDB(db),
+        IndicatorSetRepositoryMongoDB(db),
+        IndicatorRecomputeJobRepositoryMongoDB(db),
+        IndicatorRecomputeLeaseRepositoryMongoDB(db),
+        ProcessingOffsetRepositoryMongoDB(db),
+        PriceTickRepositoryMongoDB(
+            db,
+            timeseries=settings.PRICE_TICKS_TIMESERIES,
+            expire_after_seconds=settings.PRICE_TICKS_EXPIRE_AFTER_S,
+        ),
+        IngestionStreamRepositoryMongoDB(db),
+        TokenRegistryRepositoryMongoDB(db),
+        TokenPriceRepositoryMongoDB(db),
+        TokenLatestPriceRepositoryMongoDB(db),
+        ClusterNodeRepositoryMongoDB(db),
+        StreamLeaseRepositoryMongoDB(db),
+    ]
+
+
+def _index_doc(document: Dict[str, Any]) -> Dict[str, Any]:
+    doc = dict(document)
+    doc["key"] = [[k, v] for k, v in doc["key"].items()]
+    return doc
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from typing import List, Optional
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import IndexModel
+
+from core.domain.entities.indicator_recompute_job_entity import IndicatorRecomputeJobEntity
+from core.repositories.indicator_recompute_job_repository import IndicatorRecomputeJobRepository
+
+
+class IndicatorRecomputeJobRepositoryMongoDB(IndicatorRecomputeJobRepository):
+    """
+    MongoDB implementation for indicator recompute jobs (one document per cfg_hash).
+    """
+
+    COLLECTION = "indicator_recompute_jobs"
+
+    INDEXES = (
+        IndexModel([("cfg_hash", 1)], unique=True),
+        IndexModel([("status", 1)]),
+    )
+
+    def __init__(self, db: AsyncIOMotorDatabase):
+        """
+        Args:
+            db: Motor database handle.
+        """
+        self._db = db
+
+    async def ensure_indexes(self) -> None:
+        """
+        Ensure uniqueness by cfg_hash and allow listing by status.
+        """
+        await self._db[self.COLLECTION].create_indexes(list(self.INDEXES))
+
+    async def get_by_cfg_hash(self, cfg_hash: str) -> Optional[IndicatorRecomputeJobEntity]:
+        col = self._db[self.COLLECTION]
+        doc = await col.find_one({"cfg_hash": str(cfg_hash)})
+        return IndicatorRecomputeJobEntity.from_mongo(doc)
+
+    async def upsert(self, job: IndicatorRecomputeJobEntity) -> None:
+        """
+        Upsert by cfg_hash (updated_at on every write).
+        """
+        col = self._db[self.COLLECTION]
+        now = datetime.now(tz=timezone.utc)
+        payload = job.to_mongo()
+        payload.pop("_id", None)
+        payload["updated_at"] = int(now.timestamp() * 1000)
+        payload["updated_at_iso"] = now.isoformat().replace("+00:00", "Z")
+
+        unset = {k: "" for k in ("last_open_time", "state", "finished_at", "error") if getattr(job, k) is None}
+        update: dict[str, object] = {"$set": payload}
+        if unset:
+            update["$unset"] = unset
+        await col.update_one({"cfg_hash": job.cfg_hash}, update, upsert=True)
+
+    async def list_by_status(self, status: str) -> List[IndicatorRecomputeJobEntity]:
+        col = self._db[self.COLLECTION]
+        docs = await col.find({"status": str(status).upper()}).to_list(length=10_000)
+        out = [IndicatorRecomputeJobEntity.from_mongo(d) for d in docs]
+        return [x for x in out if x is not None]
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Optional
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import IndexModel
+from pymongo.errors import DuplicateKeyError
+
+from core.repositories.indicator_recompute_lease_repository import IndicatorRecomputeLeaseRepository
+
+# Leases left behind by crashed processes are removed by MongoDB after this long
+LEASE_EXPIRE_AFTER_S = 86_400
+
+
+class IndicatorRecomputeLeaseRepositoryMongoDB(IndicatorRecomputeLeaseRepository):
+    """
+    MongoDB repository for recompute job leases (`_id` = cfg_hash).
+
+    Acquisition is a conditional upsert: it matches only a lease that is expired or
+    already ours; a lease held by another process makes the upsert collide on `_id`,
+    which is how a claim loses.
+    """
+
+    COLLECTION = "indicator_recompute_leases"
+
+    INDEXES = (IndexModel([("expires_at", 1)], expireAfterSeconds=LEASE_EXPIRE_AFTER_S),)
+
+    def __init__(self, db: AsyncIOMotorDatabase):
+        self._db = db
+
+    async def ensure_indexes(self) -> None:
+        await self._db[self.COLLECTION].create_indexes(list(self.INDEXES))
+
+    async def acquire(self, cfg_hash: str, *, owner: str, now: datetime, expires_at: datetime) -> bool:
+        try:
+            await self._db[self.COLLECTION].update_one(
+                {"_id": str(cfg_hash), "$or": [{"owner": owner}, {"expires_at": {"$lt": now}}]},
+                {"$set": {"owner": owner, "acquired_at": now, "expires_at": expires_at}},
+                upsert=True,
+            )
+        except DuplicateKeyError:
+            return False
+        return True
+
+    async def renew(self, cfg_hash: str, *, owner: str, expires_at: datetime) -> bool:
+        res = await self._db[self.COLLECTION].update_one(
+            {"_id": str(cfg_hash), "owner": owner},
+            {"$set": {"expires_at": expires_at}},
+        )
+        return res.matched_count > 0
+
+    async def release(self, cfg_hash: str, *, owner: str) -> None:
+        await self._db[self.COLLECTION].delete_one({"_id": str(cfg_hash), "owner": owner})
+
+    async def holder(self, cfg_hash: str, *, now: datetime) -> Optional[str]:
+        doc = await self._db[self.COLLECTION].find_one({"_id": str(cfg_hash), "expires_at": {"$gte": now}})
+        return str(doc["owner"]) if doc else None
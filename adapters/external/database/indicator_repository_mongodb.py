@@ -1,9 +1,10 @@
 # adapters/external/database/indicator_repository_mongodb.py
 from __future__ import annotations
 
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Sequence
 
 from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import IndexModel, UpdateOne
 
 from core.domain.entities.indicator_entity import IndicatorSnapshotEntity
 from core.repositories.indicator_repository import IndicatorRepository
@@ -16,6 +17,12 @@ class IndicatorRepositoryMongoDB(IndicatorRepository):
 
     COLLECTION = "indicators_1m"
 
+    INDEXES = (
+        IndexModel([("stream_key", 1), ("ts", 1), ("cfg_hash", 1)], unique=True),
+        IndexModel([("stream_key", 1), ("ts", -1)]),
+        IndexModel([("stream_key", 1), ("cfg_hash", 1), ("ts", -1)]),
+    )
+
     def __init__(self, db: AsyncIOMotorDatabase):
         """
         Args:
@@ -27,10 +34,7 @@ class IndicatorRepositoryMongoDB(IndicatorRepository):
         """
         Ensure uniqueness by (stream_key, ts, cfg_hash) and allow efficient recent queries.
         """
-        col = self._db[self.COLLECTION]
-        await col.create_index([("stream_key", 1), ("ts", 1), ("cfg_hash", 1)], unique=True)
-        await col.create_index([("stream_key", 1), ("ts", -1)])
-        await col.create_index([("stream_key", 1), ("cfg_hash", 1), ("ts", -1)])
+        await self._db[self.COLLECTION].create_indexes(list(self.INDEXES))
 
     async def upsert_snapshot(self, snapshot: IndicatorSnapshotEntity) -> None:
         """
@@ -45,6 +49,43 @@ class IndicatorRepositoryMongoDB(IndicatorRepository):
         }
         await col.update_one(key, {"$set": doc}, upsert=True)
 
+    async def upsert_snapshots(self, snapshots: List[IndicatorSnapshotEntity]) -> None:
+        """
+        Upsert many snapshots with one unordered bulk_write.
+        """
+        if not snapshots:
+            return
+        col = self._db[self.COLLECTION]
+        ops = [
+            UpdateOne(
+                {"stream_key": s.stream_key, "ts": int(s.ts), "cfg_hash": s.cfg_hash},
+                {"$set": s.to_mongo()},
+                upsert=True,
+            )
+            for s in snapshots
+        ]
+        await col.bulk_write(ops, ordered=False)
+
+    async def upsert_snapshot_docs(self, docs: List[Dict[str, Any]]) -> int:
+        """
+        Bulk upsert raw snapshot documents by (stream_key, ts, cfg_hash), unordered.
+
+        Used by historical recomputes: no entity is built per document.
+        """
+        if not docs:
+            return 0
+        col = self._db[self.COLLECTION]
+        ops = [
+            UpdateOne(
+                {"stream_key": d["stream_key"], "ts": d["ts"], "cfg_hash": d["cfg_hash"]},
+                {"$set": d},
+                upsert=True,
+            )
+            for d in docs
+        ]
+        await col.bulk_write(ops, ordered=False)
+        return len(ops)
+
     async def list_last(
         self,
         stream_key: str,
@@ -65,3 +106,25 @@ class IndicatorRepositoryMongoDB(IndicatorRepository):
         out = [e for e in entities if e is not None]
         out.reverse()
         return out
+
+    async def list_last_rows(
+        self,
+        stream_key: str,
+        cfg_hash: Optional[str],
+        limit: int,
+        *,
+        fields: Sequence[str],
+    ) -> List[Dict[str, Any]]:
+        """
+        Last snapshots (ascending by ts) as projected rows, without entity validation.
+        """
+        col = self._db[self.COLLECTION]
+        q: dict[str, object] = {"stream_key": stream_key}
+        if cfg_hash:
+            q["cfg_hash"] = cfg_hash
+
+        projection = {"_id": 0, **{f: 1 for f in fields}}
+        cursor = col.find(q, projection).sort("ts", -1).limit(int(limit)).batch_size(max(1, min(int(limit), 5_000)))
+        out = [{f: d.get(f) for f in fields} async for d in cursor]
+        out.reverse()
+        return out
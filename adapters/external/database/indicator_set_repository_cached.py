@@ -0,0 +1,238 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo.errors import OperationFailure
+
+from adapters.external.database.indicator_set_repository_mongodb import IndicatorSetRepositoryMongoDB
+from core.domain.entities.indicator_set_entity import IndicatorSetEntity
+from core.repositories.indicator_set_repository import IndicatorSetRepository
+
+# Server error codes meaning "change streams are not available here" (standalone mongod, etc.)
+_CHANGE_STREAM_UNSUPPORTED = {40573, 136}
+
+
+class CachedIndicatorSetRepositoryMongoDB(IndicatorSetRepository):
+    """
+    In-memory registry of ACTIVE indicator sets keyed by stream_key, backed by MongoDB.
+
+    - get_active_by_stream is answered from memory once start() loaded the registry.
+    - upsert_active updates the registry immediately (in-process writes).
+    - Writes from other replicas arrive through a change stream on indicator_sets; when
+      change streams are unavailable, the registry polls `updated_at` (plus a periodic
+      full reload to catch deletes).
+
+    All other reads go to MongoDB.
+    """
+
+    def __init__(
+        self,
+        db: AsyncIOMotorDatabase,
+        *,
+        poll_interval_s: float = 10.0,
+        full_reload_every: int = 30,
+        logger: logging.Logger | None = None,
+    ):
+        """
+        Args:
+            db: Motor database handle.
+            poll_interval_s: Polling period when change streams are unavailable.
+            full_reload_every: Number of polls between full reloads (polling mode).
+        """
+        self._db = db
+        self._inner = IndicatorSetRepositoryMongoDB(db)
+        self._poll_interval_s = float(poll_interval_s)
+        self._full_reload_every = max(1, int(full_reload_every))
+        self._logger = logger or logging.getLogger(self.__class__.__name__)
+
+        self._by_stream: Dict[str, Dict[str, IndicatorSetEntity]] = {}
+        self._by_id: Dict[str, Tuple[str, str]] = {}  # _id -> (stream_key, cfg_hash)
+        self._loaded = False
+        self._watermark: Optional[int] = None  # max updated_at seen (polling mode)
+
+        self._task: asyncio.Task | None = None
+        self._stop = asyncio.Event()
+        self._mode = "stopped"
+        self._reloads = 0
+        self._changes = 0
+
+    async def start(self) -> None:
+        """
+        Load the registry and start following changes in background.
+        """
+        await self.reload()
+        if self._task is None:
+            self._stop.clear()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """
+        Stop following changes (the registry keeps its last state).
+        """
+        self._stop.set()
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError, Exception):
+                await self._task
+            self._task = None
+        self._mode = "stopped"
+
+    async def reload(self) -> None:
+        """
+        Rebuild the registry from all ACTIVE indicator sets.
+        """
+        col = self._db[self._inner.COLLECTION]
+        docs = await col.find({"status": "ACTIVE"}).to_list(length=None)
+
+        by_stream: Dict[str, Dict[str, IndicatorSetEntity]] = {}
+        by_id: Dict[str, Tuple[str, str]] = {}
+        watermark: Optional[int] = None
+        for d in docs:
+            ent = IndicatorSetEntity.from_mongo(d)
+            if ent is None or not ent.cfg_hash:
+                continue
+            by_stream.setdefault(ent.stream_key, {})[ent.cfg_hash] = ent
+            if ent.id:
+                by_id[ent.id] = (ent.stream_key, ent.cfg_hash)
+            if ent.updated_at is not None:
+                watermark = max(watermark or 0, int(ent.updated_at))
+
+        self._by_stream = by_stream
+        self._by_id = by_id
+        if watermark is not None:
+            self._watermark = max(self._watermark or 0, watermark)
+        self._loaded = True
+        self._reloads += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for observability."""
+        return {
+            "mode": self._mode,
+            "streams": len(self._by_stream),
+            "active_sets": sum(len(v) for v in self._by_stream.values()),
+            "reloads": self._reloads,
+            "changes_applied": self._changes,
+        }
+
+    async def ensure_indexes(self) -> None:
+        await self._inner.ensure_indexes()
+
+    async def upsert_active(self, indset: IndicatorSetEntity) -> IndicatorSetEntity:
+        stored = await self._inner.upsert_active(indset)
+        self._apply_entity(stored)
+        return stored
+
+    async def get_active_by_stream(self, stream_key: str) -> List[IndicatorSetEntity]:
+        if not self._loaded:
+            return await self._inner.get_active_by_stream(stream_key)
+        return list(self._by_stream.get(str(stream_key), {}).values())
+
+    async def get_by_id(self, cfg_hash: str) -> Optional[IndicatorSetEntity]:
+        return await self._inner.get_by_id(cfg_hash)
+
+    async def filter(
+        self,
+        *,
+        stream_key: Optional[str] = None,
+        status: Optional[str] = None,
+        limit: int = 5000,
+    ) -> List[IndicatorSetEntity]:
+        return await self._inner.filter(stream_key=stream_key, status=status, limit=limit)
+
+    async def _run(self) -> None:
+        backoff_s = 1.0
+        while not self._stop.is_set():
+            try:
+                await self._watch()
+                backoff_s = 1.0
+            except asyncio.CancelledError:
+                raise
+            except OperationFailure as exc:
+                if exc.code in _CHANGE_STREAM_UNSUPPORTED:
+                    self._logger.info("Change streams unavailable (%s); indicator-set registry polls instead.", exc)
+                    await self._poll_loop()
+                    return
+                self._logger.warning("Indicator-set change stream failed: %s", exc)
+            except Exception as exc:
+                self._logger.warning("Indicator-set change stream error: %s", exc)
+
+            if self._stop.is_set():
+                return
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self._stop.wait(), timeout=backoff_s)
+            backoff_s = min(backoff_s * 2.0, 30.0)
+
+    async def _watch(self) -> None:
+        col = self._db[self._inner.COLLECTION]
+        async with col.watch(full_document="updateLookup") as stream:
+            self._mode = "change_stream"
+            # Reload after the stream is open so no change is lost in between.
+            await self.reload()
+            async for change in stream:
+                self._apply_change(change)
+
+    async def _poll_loop(self) -> None:
+        self._mode = "polling"
+        col = self._db[self._inner.COLLECTION]
+        polls = 0
+        while not self._stop.is_set():
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self._stop.wait(), timeout=self._poll_interval_s)
+            if self._stop.is_set():
+                return
+            try:
+                polls += 1
+                if polls % self._full_reload_every == 0 or self._watermark is None:
+                    await self.reload()
+                    continue
+
+                docs = await col.find({"updated_at": {"$gte": int(self._watermark)}}).to_list(length=None)
+                for d in docs:
+                    self._apply_doc(d)
+            except Exception as exc:
+                self._logger.warning("Indicator-set registry poll failed: %s", exc)
+
+    def _apply_change(self, change: Dict[str, Any]) -> None:
+        op = change.get("operationType")
+        if op in ("insert", "update", "replace"):
+            doc = change.get("fullDocument")
+            if doc:
+                self._apply_doc(doc)
+            return
+        if op == "delete":
+            key = self._by_id.pop(str((change.get("documentKey") or {}).get("_id")), None)
+            if key is not None:
+                self._by_stream.get(key[0], {}).pop(key[1], None)
+                self._changes += 1
+            return
+        if op in ("drop", "rename", "dropDatabase", "invalidate"):
+            self._by_stream = {}
+            self._by_id = {}
+
+    def _apply_doc(self, doc: Dict[str, Any]) -> None:
+        ent = IndicatorSetEntity.from_mongo(doc)
+        if ent is None:
+            return
+        if ent.updated_at is not None:
+            self._watermark = max(self._watermark or 0, int(ent.updated_at))
+        self._apply_entity(ent)
+
+    def _apply_entity(self, ent: IndicatorSetEntity) -> None:
+        if not ent.cfg_hash:
+            return
+        sets = self._by_stream.setdefault(ent.stream_key, {})
+        if str(ent.status).upper() == "ACTIVE":
+            sets[ent.cfg_hash] = ent
+            if ent.id:
+                self._by_id[ent.id] = (ent.stream_key, ent.cfg_hash)
+        else:
+            sets.pop(ent.cfg_hash, None)
+            if ent.id:
+                self._by_id.pop(ent.id, None)
+        if not sets:
+            self._by_stream.pop(ent.stream_key, None)
+        self._changes += 1
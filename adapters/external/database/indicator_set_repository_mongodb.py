@@ -4,6 +4,7 @@ from datetime import datetime, timezone
 from typing import List, Optional
 
 from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import IndexModel
 
 from core.domain.entities.indicator_set_entity import IndicatorSetEntity
 from core.repositories.indicator_set_repository import IndicatorSetRepository
@@ -16,6 +17,21 @@ class IndicatorSetRepositoryMongoDB(IndicatorSetRepository):
 
     COLLECTION = "indicator_sets"
 
+    INDEXES = (
+        IndexModel([("cfg_hash", 1)], unique=True),
+        IndexModel([("stream_key", 1), ("status", 1)]),
+        IndexModel(
+            [
+                ("stream_key", 1),
+                ("ema_fast", 1),
+                ("ema_slow", 1),
+                ("atr_window", 1),
+                ("status", 1),
+            ]
+        ),
+        IndexModel([("updated_at", 1)]),
+    )
+
     def __init__(self, db: AsyncIOMotorDatabase):
         """
         Args:
@@ -25,20 +41,10 @@ class IndicatorSetRepositoryMongoDB(IndicatorSetRepository):
 
     async def ensure_indexes(self) -> None:
         """
-        Ensure uniqueness for cfg_hash and support common filtering queries.
+        Ensure uniqueness for cfg_hash and support common filtering queries
+        (updated_at backs change polling of the cached registry).
         """
-        col = self._db[self.COLLECTION]
-        await col.create_index([("cfg_hash", 1)], unique=True)
-        await col.create_index([("stream_key", 1), ("status", 1)])
-        await col.create_index(
-            [
-                ("stream_key", 1),
-                ("ema_fast", 1),
-                ("ema_slow", 1),
-                ("atr_window", 1),
-                ("status", 1),
-            ]
-        )
+        await self._db[self.COLLECTION].create_indexes(list(self.INDEXES))
 
     async def upsert_active(self, indset: IndicatorSetEntity) -> IndicatorSetEntity:
         """
@@ -3,6 +3,7 @@ from __future__ import annotations
 from typing import List, Optional
 
 from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import IndexModel
 
 from core.domain.entities.ingestion_stream_entity import IngestionStreamEntity
 from core.repositories.ingestion_stream_repository import IngestionStreamRepository
@@ -18,6 +19,14 @@ class IngestionStreamRepositoryMongoDB(IngestionStreamRepository):
 
     COLLECTION = "ingestion_streams"
 
+    INDEXES = (
+        IndexModel(
+            [("source_type", 1), ("source_name", 1), ("symbol", 1), ("interval", 1), ("pool_address", 1)],
+            unique=True,
+        ),
+        IndexModel([("enabled", 1), ("source_type", 1)]),
+    )
+
     def __init__(self, db: AsyncIOMotorDatabase):
         self._db = db
 
@@ -25,12 +34,7 @@ class IngestionStreamRepositoryMongoDB(IngestionStreamRepository):
         """
         Ensure uniqueness and efficient listing.
         """
-        col = self._db[self.COLLECTION]
-        await col.create_index(
-            [("source_type", 1), ("source_name", 1), ("symbol", 1), ("interval", 1), ("pool_address", 1)],
-            unique=True,
-        )
-        await col.create_index([("enabled", 1), ("source_type", 1)])
+        await self._db[self.COLLECTION].create_indexes(list(self.INDEXES))
 
     async def list_enabled(self) -> List[IngestionStreamEntity]:
         col = self._db[self.COLLECTION]
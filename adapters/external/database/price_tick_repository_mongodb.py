@@ -1,12 +1,31 @@
 from __future__ import annotations
 
-from datetime import datetime, timezone
-from typing import List
+from datetime import datetime, timedelta, timezone
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Tuple
 
 from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import IndexModel
 
 from core.domain.entities.price_tick_entity import PriceTickEntity
-from core.repositories.price_tick_repository import PriceTickRepository
+from core.repositories.price_tick_repository import PriceTickRepository, TickColumns
+
+_EPOCH = datetime(1970, 1, 1)
+
+# Tick fields that are constant per stream and go into the time-series metaField.
+TIMESERIES_META_FIELDS = ("stream_key", "source", "symbol", "interval")
+TIMESERIES_META_EXTRAS = ("chain", "dex", "pool_address")
+
+
+def ms_to_datetime(ms: int) -> datetime:
+    """Epoch milliseconds -> naive UTC datetime (BSON date)."""
+    return _EPOCH + timedelta(milliseconds=int(ms))
+
+
+def datetime_to_ms(dt: datetime) -> int:
+    """Naive/aware UTC datetime -> epoch milliseconds."""
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(timezone.utc).replace(tzinfo=None)
+    return (dt - _EPOCH) // timedelta(milliseconds=1)
 
 
 class PriceTickRepositoryMongoDB(PriceTickRepository):
@@ -15,40 +34,95 @@ class PriceTickRepositoryMongoDB(PriceTickRepository):
 
     Collection is separate from candles to avoid write amplification on candles_1m
     and to allow fast aggregation per minute.
+
+    Storage modes:
+      - regular (default): one document per tick, two compound indexes.
+      - time-series: `price_ticks` is a MongoDB time-series collection (timeField `ts`
+        as a BSON date, metaField `meta` = stream_key + static pool fields), optionally
+        expiring after `expire_after_seconds`. Ticks are mapped back to the same
+        PriceTickEntity shape on read. Existing regular collections are converted with
+        `python -m workers.migrate_price_ticks_timeseries`.
     """
 
     COLLECTION = "price_ticks"
 
-    def __init__(self, db: AsyncIOMotorDatabase):
+    INDEXES = (
+        # Fast range queries for building a candle
+        IndexModel([("stream_key", 1), ("minute_open_time", 1), ("ts", 1)]),
+        # Fast range queries for episode/tick analytics (APR in-range time)
+        IndexModel([("stream_key", 1), ("ts", 1)]),
+    )
+    TIMESERIES_INDEXES = (IndexModel([("meta.stream_key", 1), ("ts", 1)]),)
+
+    def __init__(
+        self,
+        db: AsyncIOMotorDatabase,
+        *,
+        timeseries: bool = False,
+        expire_after_seconds: Optional[int] = None,
+    ):
+        """
+        Args:
+            db: Motor database handle.
+            timeseries: Use the time-series document layout (MongoDB 5.0+).
+            expire_after_seconds: Time-series TTL (None/0 keeps ticks forever).
+        """
         self._db = db
+        self._timeseries = bool(timeseries)
+        self._expire_after_seconds = int(expire_after_seconds) if expire_after_seconds else None
 
-    async def ensure_indexes(self) -> None:
-        col = self._db[self.COLLECTION]
+    @property
+    def timeseries(self) -> bool:
+        return self._timeseries
 
-        # Fast range queries for building a candle
-        await col.create_index([("stream_key", 1), ("minute_open_time", 1), ("ts", 1)])
+    @property
+    def indexes(self) -> Tuple[IndexModel, ...]:
+        """Indexes of the configured storage mode."""
+        return self.TIMESERIES_INDEXES if self._timeseries else self.INDEXES
 
-        # Fast range queries for episode/tick analytics (APR in-range time)
-        await col.create_index([("stream_key", 1), ("ts", 1)])
+    @property
+    def storage_options(self) -> Dict[str, Any]:
+        """Collection options that are part of the applied schema state."""
+        return {"timeseries": self._timeseries, "expire_after_seconds": self._expire_after_seconds}
+
+    async def ensure_indexes(self) -> None:
+        if self._timeseries:
+            await self._ensure_timeseries_collection()
+        await self._db[self.COLLECTION].create_indexes(list(self.indexes))
 
     async def insert_tick(self, tick: PriceTickEntity) -> None:
         now_iso = datetime.now(tz=timezone.utc).isoformat().replace("+00:00", "Z")
         tick.created_at_iso = now_iso
 
         col = self._db[self.COLLECTION]
-        payload = tick.to_mongo()
+        payload = self._to_doc(tick)
 
         # do NOT upsert by minute: we want every sample tick
         await col.insert_one(payload)
 
+    async def insert_ticks(self, ticks: List[PriceTickEntity]) -> int:
+        if not ticks:
+            return 0
+
+        now_iso = datetime.now(tz=timezone.utc).isoformat().replace("+00:00", "Z")
+        payloads = []
+        for tick in ticks:
+            tick.created_at_iso = now_iso
+            payloads.append(self._to_doc(tick))
+
+        col = self._db[self.COLLECTION]
+        res = await col.insert_many(payloads, ordered=False)
+        return len(res.inserted_ids)
+
     async def list_ticks_for_minute(self, stream_key: str, minute_open_time: int) -> List[PriceTickEntity]:
         col = self._db[self.COLLECTION]
-        cur = (
-            col.find({"stream_key": stream_key, "minute_open_time": int(minute_open_time)})
-            .sort("ts", 1)
-        )
+        if self._timeseries:
+            q = self._ts_range_query(stream_key, int(minute_open_time), int(minute_open_time) + 60_000 - 1)
+        else:
+            q = {"stream_key": stream_key, "minute_open_time": int(minute_open_time)}
+        cur = col.find(q).sort("ts", 1)
         docs = await cur.to_list(length=10_000)
-        return [PriceTickEntity.from_mongo(d) for d in docs if d]
+        return [self._from_doc(d) for d in docs if d]
 
     async def list_ticks_range(
         self,
@@ -58,19 +132,143 @@ class PriceTickRepositoryMongoDB(PriceTickRepository):
         limit: int = 5000,
     ) -> List[PriceTickEntity]:
         col = self._db[self.COLLECTION]
+        if self._timeseries:
+            q = self._ts_range_query(str(stream_key), int(ts_from), int(ts_to))
+        else:
+            q = {
+                "stream_key": str(stream_key),
+                "ts": {"$gte": int(ts_from), "$lte": int(ts_to)},
+            }
+        cur = col.find(q).sort("ts", 1).limit(int(limit))
+        docs = await cur.to_list(length=int(limit))
+        return [self._from_doc(d) for d in docs if d]
+
+    async def list_tick_columns_range(self, stream_key: str, ts_from: int, ts_to: int, limit: int) -> TickColumns:
+        col = self._db[self.COLLECTION]
+        if self._timeseries:
+            q = self._ts_range_query(str(stream_key), int(ts_from), int(ts_to))
+        else:
+            q = {"stream_key": str(stream_key), "ts": {"$gte": int(ts_from), "$lte": int(ts_to)}}
+
+        out = TickColumns(ts=[], price=[], volume=[])
         cur = (
-            col.find(
-                {
-                    "stream_key": str(stream_key),
-                    "ts": {"$gte": int(ts_from), "$lte": int(ts_to)},
-                }
-            )
+            col.find(q, {"_id": 0, "ts": 1, "price": 1, "volume": 1})
             .sort("ts", 1)
             .limit(int(limit))
+            .batch_size(10_000)
         )
-        docs = await cur.to_list(length=int(limit))
-        return [PriceTickEntity.from_mongo(d) for d in docs if d]
+        async for d in cur:
+            ts = d["ts"]
+            out.ts.append(datetime_to_ms(ts) if isinstance(ts, datetime) else int(ts))
+            out.price.append(float(d["price"]))
+            out.volume.append(float(d.get("volume") or 0.0))
+        return out
+
+    async def iter_tick_rows_range(
+        self,
+        stream_key: str,
+        ts_from: int,
+        ts_to: int,
+        limit: int,
+        *,
+        fields: Sequence[str],
+        batch_size: int = 5_000,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        col = self._db[self.COLLECTION]
+        if self._timeseries:
+            q = self._ts_range_query(str(stream_key), int(ts_from), int(ts_to))
+            projection = None  # meta is needed to restore the regular layout
+        else:
+            q = {"stream_key": str(stream_key), "ts": {"$gte": int(ts_from), "$lte": int(ts_to)}}
+            projection = {"_id": 0, **{f: 1 for f in fields}}
+
+        cursor = col.find(q, projection).sort("ts", 1).limit(int(limit)).batch_size(max(1, int(batch_size)))
+        async for d in cursor:
+            if "meta" in d:
+                d = self.from_timeseries_doc(d)
+            yield {f: d.get(f) for f in fields}
 
     async def delete_ticks_for_minute(self, stream_key: str, minute_open_time: int) -> None:
         col = self._db[self.COLLECTION]
-        await col.delete_many({"stream_key": stream_key, "minute_open_time": int(minute_open_time)})
\ No newline at end of file
+        if self._timeseries:
+            # Time-series deletes may only filter on the metaField (MongoDB < 7.0):
+            # expiry is handled by expireAfterSeconds instead.
+            return
+        await col.delete_many({"stream_key": stream_key, "minute_open_time": int(minute_open_time)})
+
+    async def _ensure_timeseries_collection(self) -> None:
+        existing = await self._db.list_collections(filter={"name": self.COLLECTION}).to_list(length=1)
+        if not existing:
+            opts: Dict[str, Any] = {
+                "timeseries": {"timeField": "ts", "metaField": "meta", "granularity": "seconds"},
+            }
+            if self._expire_after_seconds:
+                opts["expireAfterSeconds"] = self._expire_after_seconds
+            await self._db.create_collection(self.COLLECTION, **opts)
+        else:
+            info = existing[0]
+            if info.get("type") != "timeseries":
+                raise RuntimeError(
+                    f"'{self.COLLECTION}' is a regular collection; run "
+                    "`python -m workers.migrate_price_ticks_timeseries` before enabling PRICE_TICKS_TIMESERIES."
+                )
+            current = (info.get("options") or {}).get("expireAfterSeconds")
+            if current != self._expire_after_seconds:
+                await self._db.command(
+                    {"collMod": self.COLLECTION, "expireAfterSeconds": self._expire_after_seconds or "off"}
+                )
+
+    def _ts_range_query(self, stream_key: str, ts_from: int, ts_to: int) -> Dict[str, Any]:
+        return {
+            "meta.stream_key": str(stream_key),
+            "ts": {"$gte": ms_to_datetime(ts_from), "$lte": ms_to_datetime(ts_to)},
+        }
+
+    def _to_doc(self, tick: PriceTickEntity) -> Dict[str, Any]:
+        payload = tick.to_mongo()
+        if not self._timeseries:
+            return payload
+        return self.to_timeseries_doc(payload)
+
+    def _from_doc(self, doc: Dict[str, Any]) -> PriceTickEntity:
+        if "meta" in doc:
+            doc = self.from_timeseries_doc(doc)
+        return PriceTickEntity.from_mongo(doc)
+
+    @staticmethod
+    def to_timeseries_doc(payload: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Regular tick document -> time-series layout (meta + BSON date `ts`).
+        """
+        doc = dict(payload)
+        extras = dict(doc.get("extras") or {})
+        meta = {k: doc.pop(k) for k in TIMESERIES_META_FIELDS if k in doc}
+        for k in TIMESERIES_META_EXTRAS:
+            if extras.get(k) is not None:
+                meta[k] = extras.pop(k)
+        if extras:
+            doc["extras"] = extras
+        else:
+            doc.pop("extras", None)
+        doc["meta"] = meta
+        doc["ts"] = ms_to_datetime(int(doc["ts"]))
+        return doc
+
+    @staticmethod
+    def from_timeseries_doc(doc: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Time-series document -> regular tick layout (inverse of to_timeseries_doc).
+        """
+        data = dict(doc)
+        meta = dict(data.pop("meta", None) or {})
+        extras = dict(data.get("extras") or {})
+        for k in TIMESERIES_META_EXTRAS:
+            if k in meta:
+                extras[k] = meta.pop(k)
+        data.update(meta)
+        if extras:
+            data["extras"] = extras
+        ts = data.get("ts")
+        if isinstance(ts, datetime):
+            data["ts"] = datetime_to_ms(ts)
+        return data
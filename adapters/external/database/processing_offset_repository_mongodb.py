@@ -4,6 +4,7 @@ from __future__ import annotations
 from typing import Optional
 
 from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import IndexModel
 
 from core.domain.entities.processing_offset_entity import ProcessingOffsetEntity
 from core.repositories.processing_offset_repository import ProcessingOffsetRepository
@@ -16,6 +17,8 @@ class ProcessingOffsetRepositoryMongoDB(ProcessingOffsetRepository):
 
     COLLECTION = "processing_offsets"
 
+    INDEXES = (IndexModel([("stream_key", 1)], unique=True),)
+
     def __init__(self, db: AsyncIOMotorDatabase):
         """
         Args:
@@ -27,8 +30,7 @@ class ProcessingOffsetRepositoryMongoDB(ProcessingOffsetRepository):
         """
         Ensure uniqueness by stream_key.
         """
-        col = self._db[self.COLLECTION]
-        await col.create_index([("stream_key", 1)], unique=True)
+        await self._db[self.COLLECTION].create_indexes(list(self.INDEXES))
 
     async def get_by_stream(self, stream_key: str) -> Optional[ProcessingOffsetEntity]:
         """
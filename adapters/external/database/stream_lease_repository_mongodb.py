@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import List, Sequence, Set
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import IndexModel, UpdateOne
+from pymongo.errors import BulkWriteError
+
+from core.domain.entities.stream_lease_entity import StreamLeaseEntity
+from core.repositories.stream_lease_repository import StreamLeaseRepository
+
+
+class StreamLeaseRepositoryMongoDB(StreamLeaseRepository):
+    """
+    MongoDB repository for stream leases (`_id` = stream id).
+
+    Acquisition is a conditional upsert: it matches only a lease that is expired or
+    already ours; a lease held by another node makes the upsert collide on `_id`,
+    which is how a claim loses.
+    """
+
+    COLLECTION = "stream_leases"
+
+    INDEXES = (IndexModel([("owner", 1)]),)
+
+    def __init__(self, db: AsyncIOMotorDatabase):
+        self._db = db
+
+    async def ensure_indexes(self) -> None:
+        await self._db[self.COLLECTION].create_indexes(list(self.INDEXES))
+
+    async def acquire(self, *, owner: str, stream_ids: Sequence[str], now: datetime, expires_at: datetime) -> Set[str]:
+        ids = list(stream_ids)
+        if not ids:
+            return set()
+        ops = [
+            UpdateOne(
+                {"_id": sid, "$or": [{"owner": owner}, {"expires_at": {"$lt": now}}]},
+                {"$set": {"owner": owner, "acquired_at": now, "expires_at": expires_at}},
+                upsert=True,
+            )
+            for sid in ids
+        ]
+        try:
+            await self._db[self.COLLECTION].bulk_write(ops, ordered=False)
+        except BulkWriteError as exc:
+            failed = {e["index"] for e in exc.details.get("writeErrors", []) if e.get("code") == 11000}
+            if len(failed) != len(exc.details.get("writeErrors", [])):
+                raise
+            return {sid for i, sid in enumerate(ids) if i not in failed}
+        return set(ids)
+
+    async def renew(self, *, owner: str, stream_ids: Sequence[str], expires_at: datetime) -> Set[str]:
+        ids = list(stream_ids)
+        if not ids:
+            return set()
+        col = self._db[self.COLLECTION]
+        q = {"_id": {"$in": ids}, "owner": owner}
+        await col.update_many(q, {"$set": {"expires_at": expires_at}})
+        docs = await col.find(q, {"_id": 1}).to_list(length=len(ids))
+        return {str(d["_id"]) for d in docs}
+
+    async def release(self, *, owner: str, stream_ids: Sequence[str] | None = None) -> None:
+        q = {"owner": owner}
+        if stream_ids is not None:
+            q["_id"] = {"$in": list(stream_ids)}
+        await self._db[self.COLLECTION].delete_many(q)
+
+    async def list_all(self) -> List[StreamLeaseEntity]:
+        docs = await self._db[self.COLLECTION].find({}).sort("_id", 1).to_list(length=100_000)
+        out = [StreamLeaseEntity.from_mongo(d) for d in docs]
+        return [x for x in out if x is not None]
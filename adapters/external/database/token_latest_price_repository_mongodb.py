@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import List
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import IndexModel, UpdateOne
+
+from core.domain.entities.token_latest_price_entity import TokenLatestPriceEntity
+from core.repositories.token_latest_price_repository import TokenLatestPriceRepository
+
+# Tokens no longer refreshed (removed from the registry) are removed by MongoDB after this long
+LATEST_PRICE_EXPIRE_AFTER_S = 86_400
+
+
+class TokenLatestPriceRepositoryMongoDB(TokenLatestPriceRepository):
+    """
+    MongoDB repository for the latest token prices (one document per token).
+    """
+
+    COLLECTION = "token_prices_latest"
+
+    INDEXES = (IndexModel([("refreshed_at", 1)], expireAfterSeconds=LATEST_PRICE_EXPIRE_AFTER_S),)
+
+    def __init__(self, db: AsyncIOMotorDatabase):
+        self._db = db
+
+    async def ensure_indexes(self) -> None:
+        await self._db[self.COLLECTION].create_indexes(list(self.INDEXES))
+
+    async def upsert_many(self, prices: List[TokenLatestPriceEntity]) -> None:
+        if not prices:
+            return
+        ops = []
+        for p in prices:
+            doc = p.to_mongo()
+            doc.pop("_id", None)
+            ops.append(UpdateOne({"_id": f"{p.chain}:{p.token_address}"}, {"$set": doc}, upsert=True))
+        await self._db[self.COLLECTION].bulk_write(ops, ordered=False)
+
+    async def list_since(self, *, since: datetime) -> List[TokenLatestPriceEntity]:
+        docs = await self._db[self.COLLECTION].find({"refreshed_at": {"$gte": since}}).to_list(length=100_000)
+        out = [TokenLatestPriceEntity.from_mongo(d) for d in docs]
+        return [x for x in out if x is not None]
@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+from typing import List
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import IndexModel
+
+from core.domain.entities.token_price_entity import TokenPriceEntity
+from core.repositories.token_price_repository import TokenPriceRepository
+
+
+class TokenPriceRepositoryMongoDB(TokenPriceRepository):
+    """
+    MongoDB repository for token USD price history (append-only).
+    """
+
+    COLLECTION = "token_prices"
+
+    INDEXES = (IndexModel([("chain", 1), ("token_address", 1), ("ts", 1)]),)
+
+    def __init__(self, db: AsyncIOMotorDatabase):
+        self._db = db
+
+    async def ensure_indexes(self) -> None:
+        await self._db[self.COLLECTION].create_indexes(list(self.INDEXES))
+
+    async def insert_prices(self, prices: List[TokenPriceEntity]) -> int:
+        if not prices:
+            return 0
+        col = self._db[self.COLLECTION]
+        res = await col.insert_many([p.to_mongo() for p in prices], ordered=False)
+        return len(res.inserted_ids)
+
+    async def list_range(
+        self,
+        *,
+        chain: str,
+        token_address: str,
+        ts_from: int,
+        ts_to: int,
+        limit: int = 5000,
+    ) -> List[TokenPriceEntity]:
+        col = self._db[self.COLLECTION]
+        q = {
+            "chain": str(chain).strip().lower(),
+            "token_address": str(token_address).strip().lower(),
+            "ts": {"$gte": int(ts_from), "$lte": int(ts_to)},
+        }
+        docs = await col.find(q, {"_id": 0}).sort("ts", 1).limit(int(limit)).to_list(length=int(limit))
+        out = [TokenPriceEntity.from_mongo(d) for d in docs]
+        return [x for x in out if x is not None]
@@ -3,6 +3,7 @@ from __future__ import annotations
 from typing import List, Optional
 
 from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import IndexModel
 
 from core.domain.entities.token_registry_entity import TokenRegistryEntity
 from core.repositories.token_registry_repository import TokenRegistryRepository
@@ -18,13 +19,16 @@ class TokenRegistryRepositoryMongoDB(TokenRegistryRepository):
 
     COLLECTION = "token_registry"
 
+    INDEXES = (
+        IndexModel([("chain", 1), ("token_address", 1)], unique=True),
+        IndexModel([("pool_address", 1)]),
+    )
+
     def __init__(self, db: AsyncIOMotorDatabase):
         self._db = db
 
     async def ensure_indexes(self) -> None:
-        col = self._db[self.COLLECTION]
-        await col.create_index([("chain", 1), ("token_address", 1)], unique=True)
-        await col.create_index([("pool_address", 1)])
+        await self._db[self.COLLECTION].create_indexes(list(self.INDEXES))
 
     async def upsert(self, token: TokenRegistryEntity) -> None:
         col = self._db[self.COLLECTION]
@@ -36,6 +40,16 @@ class TokenRegistryRepositoryMongoDB(TokenRegistryRepository):
         doc = await col.find_one({"chain": str(chain).strip().lower(), "token_address": str(token_address).strip().lower()})
         return TokenRegistryEntity.from_mongo(doc) if doc else None
 
+    async def list_by_token_addresses(self, *, chain: str, token_addresses: List[str]) -> List[TokenRegistryEntity]:
+        col = self._db[self.COLLECTION]
+        addrs = sorted({str(a).strip().lower() for a in token_addresses if a})
+        if not addrs:
+            return []
+        q = {"chain": str(chain).strip().lower(), "token_address": {"$in": addrs}}
+        docs = await col.find(q).to_list(length=len(addrs))
+        out = [TokenRegistryEntity.from_mongo(d) for d in docs]
+        return [x for x in out if x is not None]
+
     async def list_all(self, *, chain: Optional[str] = None) -> List[TokenRegistryEntity]:
         col = self._db[self.COLLECTION]
         q = {}
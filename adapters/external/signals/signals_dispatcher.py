@@ -0,0 +1,289 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import random
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional
+
+import httpx
+
+from adapters.external.signals.signals_http_client import SignalsHttpClient
+
+OVERFLOW_POLICIES = ("drop_oldest", "drop_newest", "block")
+
+# Batch endpoint responses meaning "not supported by this api-signals"
+_BATCH_UNSUPPORTED = (404, 405, 415, 501)
+
+
+@dataclass
+class _Delivery:
+    indicator_set_id: str
+    ts: int
+    indicator_set: Optional[Dict[str, Any]]
+    indicator_snapshot: Optional[Dict[str, Any]]
+    enqueued_at: float = field(default_factory=time.monotonic)
+
+    def payload(self) -> Dict[str, Any]:
+        return {
+            "indicator_set_id": self.indicator_set_id,
+            "ts": self.ts,
+            "indicator_set": self.indicator_set,
+            "indicator_snapshot": self.indicator_snapshot,
+        }
+
+
+@dataclass
+class _Target:
+    sem: asyncio.Semaphore
+    users: int = 0
+
+
+def _retryable(exc: Exception) -> bool:
+    if isinstance(exc, httpx.HTTPStatusError):
+        code = exc.response.status_code
+        return code == 429 or code >= 500
+    return isinstance(exc, httpx.TransportError)
+
+
+class SignalsDispatcher:
+    """
+    Bounded, retrying delivery of candle-closed triggers to api-signals.
+
+    - candle_closed() only enqueues: ingestion never waits on api-signals (except with
+      the "block" overflow policy, which applies backpressure instead of dropping).
+    - A fixed pool of workers delivers the queue; at most `max_inflight_per_target`
+      deliveries run at once per indicator set, so one set's triggers do not race.
+    - Transport errors, 429 and 5xx are retried with capped exponential backoff
+      (full jitter) up to `max_attempts`; other errors fail the delivery at once.
+    - When the queue is full: "drop_oldest" discards the oldest pending trigger,
+      "drop_newest" discards the new one, "block" waits for room.
+    - Batch mode (`batch_max_size` > 1): each worker collects up to `batch_max_size`
+      triggers, waiting at most `batch_linger_s` after the first one, and sends them in
+      one gzip-compressed request to the batch endpoint (no per-set limit: one request
+      carries many sets). If api-signals has no batch endpoint, the dispatcher falls
+      back to single triggers.
+    - stop() drains the queue (bounded by `drain_timeout_s`) before cancelling workers.
+    """
+
+    def __init__(
+        self,
+        *,
+        client: SignalsHttpClient,
+        max_queue: int = 10_000,
+        workers: int = 8,
+        max_inflight_per_target: int = 1,
+        max_attempts: int = 5,
+        backoff_base_s: float = 0.5,
+        backoff_max_s: float = 30.0,
+        overflow: str = "drop_oldest",
+        drain_timeout_s: float = 10.0,
+        batch_max_size: int = 1,
+        batch_linger_s: float = 0.0,
+        batch_compress: bool = True,
+        logger: logging.Logger | None = None,
+    ) -> None:
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"invalid_overflow_policy:{overflow}")
+        self._client = client
+        self._queue: asyncio.Queue[_Delivery] = asyncio.Queue(maxsize=max(1, int(max_queue)))
+        self._workers_n = max(1, int(workers))
+        self._max_inflight_per_target = max(1, int(max_inflight_per_target))
+        self._max_attempts = max(1, int(max_attempts))
+        self._backoff_base_s = max(0.0, float(backoff_base_s))
+        self._backoff_max_s = max(self._backoff_base_s, float(backoff_max_s))
+        self._overflow = overflow
+        self._drain_timeout_s = max(0.0, float(drain_timeout_s))
+        self._batch_max_size = max(1, int(batch_max_size))
+        self._batch_linger_s = max(0.0, float(batch_linger_s))
+        self._batch_compress = bool(batch_compress)
+        self._batch_supported = self._batch_max_size > 1
+        self._logger = logger or logging.getLogger(self.__class__.__name__)
+
+        self._workers: List[asyncio.Task] = []
+        self._targets: Dict[str, _Target] = {}  # indicator_set_id -> in-flight limit
+        self._closed = False
+
+        self.enqueued = 0
+        self.delivered = 0
+        self.failed = 0
+        self.retries = 0
+        self.dropped = 0
+        self.batches = 0
+        self.max_depth = 0
+        self._latencies_ms: Deque[float] = deque(maxlen=1000)
+
+    def start(self) -> None:
+        """Start the delivery workers."""
+        self._closed = False
+        while len(self._workers) < self._workers_n:
+            self._workers.append(asyncio.create_task(self._run()))
+
+    async def stop(self) -> None:
+        """Stop accepting triggers, deliver what is queued (bounded), then stop workers."""
+        self._closed = True
+        # join() also waits for triggers already taken by workers (in flight, in retry
+        # backoff or in a lingering batch); it returns at once when nothing is pending
+        if self._workers:
+            try:
+                await asyncio.wait_for(self._queue.join(), timeout=self._drain_timeout_s)
+            except asyncio.TimeoutError:
+                self._logger.warning("Signals drain timed out: %s triggers not delivered", self._queue.qsize())
+        for task in self._workers:
+            task.cancel()
+        for task in self._workers:
+            with contextlib.suppress(asyncio.CancelledError, Exception):
+                await task
+        self._workers.clear()
+
+    async def candle_closed(
+        self,
+        *,
+        indicator_set_id: str,
+        ts: int,
+        indicator_set: Optional[Dict[str, Any]] = None,
+        indicator_snapshot: Optional[Dict[str, Any]] = None,
+    ) -> bool:
+        """
+        Queue a candle-closed trigger (same arguments as SignalsHttpClient.candle_closed).
+
+        Returns:
+            False when the trigger was dropped (dispatcher stopped or queue full).
+        """
+        if self._closed:
+            self.dropped += 1
+            return False
+
+        item = _Delivery(
+            indicator_set_id=str(indicator_set_id),
+            ts=int(ts),
+            indicator_set=indicator_set,
+            indicator_snapshot=indicator_snapshot,
+        )
+        if self._queue.full():
+            if self._overflow == "block":
+                await self._queue.put(item)
+                return self._enqueued()
+            self.dropped += 1
+            if self._overflow == "drop_newest":
+                return False
+            with contextlib.suppress(asyncio.QueueEmpty):
+                self._queue.get_nowait()
+                self._queue.task_done()
+        self._queue.put_nowait(item)
+        return self._enqueued()
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for observability."""
+        lat = sorted(self._latencies_ms)
+        return {
+            "queue_depth": self._queue.qsize(),
+            "queue_max_depth": self.max_depth,
+            "queue_capacity": self._queue.maxsize,
+            "workers": len(self._workers),
+            "overflow": self._overflow,
+            "batch_mode": self._batch_supported,
+            "batches": self.batches,
+            "enqueued": self.enqueued,
+            "delivered": self.delivered,
+            "failed": self.failed,
+            "retries": self.retries,
+            "dropped": self.dropped,
+            "latency_ms_p50": lat[len(lat) // 2] if lat else None,
+            "latency_ms_p99": lat[min(len(lat) - 1, (len(lat) * 99) // 100)] if lat else None,
+            "latency_ms_max": lat[-1] if lat else None,
+        }
+
+    def _enqueued(self) -> bool:
+        self.enqueued += 1
+        self.max_depth = max(self.max_depth, self._queue.qsize())
+        return True
+
+    async def _run(self) -> None:
+        while True:
+            batch = await self._next_batch()
+            try:
+                if len(batch) > 1 and self._batch_supported:
+                    outcomes = await self._deliver_batch(batch)
+                else:
+                    outcomes = await asyncio.gather(*(self._deliver_one(d) for d in batch), return_exceptions=True)
+                now = time.monotonic()
+                for item, res in zip(batch, outcomes):
+                    if isinstance(res, BaseException):
+                        self.failed += 1
+                        self._logger.warning(
+                            "Signals delivery failed indicator_set_id=%s ts=%s: %s", item.indicator_set_id, item.ts, res
+                        )
+                    else:
+                        self.delivered += 1
+                        self._latencies_ms.append(round((now - item.enqueued_at) * 1000, 1))
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    async def _next_batch(self) -> List[_Delivery]:
+        """
+        Wait for one trigger, then collect more until `batch_max_size` or until
+        `batch_linger_s` elapsed (triggers of one candle close arrive together).
+        """
+        batch = [await self._queue.get()]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self._batch_linger_s
+        while len(batch) < self._batch_max_size:
+            if not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+                continue
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout=remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _deliver_batch(self, batch: List[_Delivery]) -> List[Optional[BaseException]]:
+        items = [d.payload() for d in batch]
+        try:
+            await self._with_retry(lambda: self._client.candle_closed_batch(items, compress=self._batch_compress))
+        except httpx.HTTPStatusError as exc:
+            if exc.response.status_code not in _BATCH_UNSUPPORTED:
+                return [exc] * len(batch)
+            # api-signals without the batch endpoint: fall back to single triggers for good
+            self._batch_supported = False
+            self._logger.warning("Signals batch endpoint unavailable (%s): using single triggers", exc.response.status_code)
+        except Exception as exc:
+            return [exc] * len(batch)
+        else:
+            self.batches += 1
+            return [None] * len(batch)
+        return await asyncio.gather(*(self._deliver_one(d) for d in batch), return_exceptions=True)
+
+    async def _deliver_one(self, item: _Delivery) -> None:
+        key = item.indicator_set_id
+        target = self._targets.get(key)
+        if target is None:
+            target = self._targets[key] = _Target(asyncio.Semaphore(self._max_inflight_per_target))
+        target.users += 1
+        try:
+            async with target.sem:
+                await self._with_retry(lambda: self._client.candle_closed(**item.payload()))
+        finally:
+            target.users -= 1
+            if target.users == 0:
+                self._targets.pop(key, None)
+
+    async def _with_retry(self, send: Callable[[], Awaitable[Any]]) -> None:
+        for attempt in range(1, self._max_attempts + 1):
+            try:
+                await send()
+                return
+            except Exception as exc:
+                if attempt >= self._max_attempts or not _retryable(exc):
+                    raise
+                self.retries += 1
+                delay = min(self._backoff_max_s, self._backoff_base_s * 2 ** (attempt - 1))
+                await asyncio.sleep(random.uniform(0, delay))
@@ -1,9 +1,14 @@
 from __future__ import annotations
 
-from typing import Any, Dict, Optional
+import gzip
+import json
+from typing import Any, Dict, List, Optional
 
 import httpx
 
+# Bodies smaller than this are sent uncompressed (gzip overhead outweighs the gain)
+_GZIP_MIN_BYTES = 1024
+
 
 class SignalsHttpClient:
     def __init__(self, *, base_url: str, timeout_s: float = 30.0):
@@ -34,3 +39,20 @@ class SignalsHttpClient:
         r = await self._client.post(f"{self._base_url}/api/triggers/candle-closed", json=payload)
         r.raise_for_status()
         return r.json()
+
+    async def candle_closed_batch(self, items: List[Dict[str, Any]], *, compress: bool = True) -> Dict[str, Any]:
+        """
+        Send many candle-closed triggers in one request (gzip-compressed JSON body).
+
+        Each item has the payload of candle_closed(): indicator_set_id, ts,
+        indicator_set, indicator_snapshot.
+        """
+        body = json.dumps({"items": items}, separators=(",", ":"), default=str).encode("utf-8")
+        headers = {"Content-Type": "application/json"}
+        if compress and len(body) >= _GZIP_MIN_BYTES:
+            body = gzip.compress(body, compresslevel=5)
+            headers["Content-Encoding"] = "gzip"
+
+        r = await self._client.post(f"{self._base_url}/api/triggers/candle-closed/batch", content=body, headers=headers)
+        r.raise_for_status()
+        return r.json()
@@ -1,10 +1,29 @@
 from __future__ import annotations
 
-from typing import Any, Dict, Optional
+import asyncio
+from typing import Any, Dict, List, Optional, Sequence
 
 from adapters.external.thegraph.thegraph_http_client import TheGraphHttpClient
 from config.settings import settings
 
+# Common V3 pool fields (schema fields may vary across subgraphs; missing ones are absent)
+_POOL_FIELDS = """
+            id
+            feeTier
+            liquidity
+            sqrtPrice
+            tick
+            token0Price
+            token1Price
+            volumeUSD
+            totalValueLockedUSD
+            token0 { id symbol decimals }
+            token1 { id symbol decimals }
+"""
+
+# The Graph caps `first` at 1000 entities per query
+MAX_POOLS_PER_QUERY = 1000
+
 
 class PancakeSwapV3BasePoolClient:
     """
@@ -44,21 +63,42 @@ class PancakeSwapV3BasePoolClient:
         """
         q = """
         query Pool($id: ID!) {
-          pool(id: $id) {
-            id
-            feeTier
-            liquidity
-            sqrtPrice
-            tick
-            token0Price
-            token1Price
-            volumeUSD
-            totalValueLockedUSD
-            token0 { id symbol decimals }
-            token1 { id symbol decimals }
-          }
+          pool(id: $id) {%s}
         }
-        """
+        """ % _POOL_FIELDS
         pool_id = str(pool_address).lower().strip()
         res = await self._http.query(query=q, variables={"id": pool_id})
         return (res or {}).get("data", {}).get("pool") or {}
+
+    async def get_pools(
+        self,
+        *,
+        pool_addresses: Sequence[str],
+        page_size: int = MAX_POOLS_PER_QUERY,
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Fetch the state of many pools with `pools(where: {id_in: [...]})` queries.
+
+        Addresses are split into pages of at most `page_size` ids (one query each,
+        sent concurrently). Pools unknown to the subgraph are absent from the result.
+
+        Returns:
+            pool id (lowercase address) -> pool fields (same shape as get_pool).
+        """
+        ids = sorted({str(a).lower().strip() for a in pool_addresses if str(a).strip()})
+        if not ids:
+            return {}
+        size = max(1, min(MAX_POOLS_PER_QUERY, int(page_size)))
+
+        q = """
+        query Pools($ids: [ID!]!, $first: Int!) {
+          pools(first: $first, where: { id_in: $ids }) {%s}
+        }
+        """ % _POOL_FIELDS
+
+        async def _page(page: List[str]) -> List[Dict[str, Any]]:
+            res = await self._http.query(query=q, variables={"ids": page, "first": len(page)})
+            return (res or {}).get("data", {}).get("pools") or []
+
+        pages = await asyncio.gather(*(_page(ids[i : i + size]) for i in range(0, len(ids), size)))
+        return {str(p.get("id") or "").lower(): p for page in pages for p in page if p}
@@ -0,0 +1,89 @@
+"""
+Benchmark pool price math (sqrtPriceX96 -> token1 per token0).
+
+Usage:
+    python -m benchmarks.price_math [--pools 10000] [--repeat 5]
+
+Compares the previous Decimal path (80-digit context) with the exact integer/Fraction
+path of core.services.price_math, its batch variant and the float64 array variant,
+and reports the largest relative difference against the exact result.
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from decimal import Decimal, localcontext
+from fractions import Fraction
+from typing import Callable, List, Tuple
+
+from core.services.price_math import (
+    price_token1_per_token0,
+    prices_token1_per_token0,
+    prices_token1_per_token0_array,
+    to_decimal,
+)
+
+
+def _legacy_decimal(sqrt_price_x96: int, decimals0: int, decimals1: int) -> Decimal:
+    # Same operations as the former _price_token1_per_token0_from_sqrt_price (prec=80)
+    with localcontext() as ctx:
+        ctx.prec = 80
+        sp = Decimal(sqrt_price_x96)
+        ratio = (sp * sp) / (Decimal(2) ** Decimal(192))
+        scale = Decimal(10) ** Decimal(decimals0 - decimals1)
+        return ratio * scale
+
+
+def _sample(n: int, seed: int = 7) -> List[Tuple[int, int, int]]:
+    rnd = random.Random(seed)
+    pairs = [(18, 6), (6, 18), (18, 18), (8, 18), (18, 8)]
+    out = []
+    for _ in range(n):
+        d0, d1 = rnd.choice(pairs)
+        # sqrtPriceX96 spans roughly 2^32 .. 2^160 in practice
+        out.append((rnd.getrandbits(rnd.randint(40, 160)) | 1, d0, d1))
+    return out
+
+
+def _best_of(repeat: int, fn: Callable[[], object]) -> Tuple[float, object]:
+    best, res = float("inf"), None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        res = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best, res
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--pools", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    pools = _sample(args.pools)
+    sp = [p[0] for p in pools]
+    d0 = [p[1] for p in pools]
+    d1 = [p[2] for p in pools]
+
+    exact: List[Fraction] = [price_token1_per_token0(sqrt_price_x96=a, decimals0=b, decimals1=c) for a, b, c in pools]
+
+    cases = {
+        "legacy Decimal(prec=80)": lambda: [_legacy_decimal(a, b, c) for a, b, c in pools],
+        "exact Fraction -> Decimal": lambda: [
+            to_decimal(price_token1_per_token0(sqrt_price_x96=a, decimals0=b, decimals1=c)) for a, b, c in pools
+        ],
+        "batch exact -> Decimal": lambda: prices_token1_per_token0(sqrt_prices_x96=sp, decimals0=d0, decimals1=d1),
+        "numpy float64": lambda: prices_token1_per_token0_array(sqrt_prices_x96=sp, decimals0=d0, decimals1=d1),
+    }
+
+    print(f"pools={len(pools)} repeat={args.repeat}")
+    for name, fn in cases.items():
+        elapsed, res = _best_of(args.repeat, fn)
+        values = res.tolist() if hasattr(res, "tolist") else res
+        worst = max(abs(Fraction(v) - e) / e for v, e in zip(values, exact) if e != 0)
+        print(f"{name:<28} {elapsed * 1e3:9.2f} ms  {elapsed / len(pools) * 1e6:7.2f} us/pool  max rel err {float(worst):.2e}")
+
+
+if __name__ == "__main__":
+    main()
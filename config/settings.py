@@ -26,9 +26,40 @@ class Settings:
     MONGODB_URL: str = os.getenv("MONGODB_URL", "mongodb://mongo-market-data:27017")
     MONGODB_DB_NAME: str = os.getenv("MONGODB_DB_NAME", "api_market_data")
 
+    # Mongo indexes: apply declared indexes at startup (else: python -m workers.migrate_indexes)
+    INDEX_BOOTSTRAP_ON_START: bool = os.getenv("INDEX_BOOTSTRAP_ON_START", "true").lower() == "true"
+
+    # Run ingestion inside the API process (false: API only, ingestion via python -m workers.ingestion_worker)
+    API_INGESTION_ENABLED: bool = os.getenv("API_INGESTION_ENABLED", "true").lower() == "true"
+
+    # Cluster: split enabled streams across replicas with Mongo leases (node id defaults to host-pid)
+    CLUSTER_ENABLED: bool = os.getenv("CLUSTER_ENABLED", "false").lower() == "true"
+    CLUSTER_NODE_ID: str = os.getenv("CLUSTER_NODE_ID", "").strip()
+    CLUSTER_HEARTBEAT_S: float = float(os.getenv("CLUSTER_HEARTBEAT_S", "5"))
+    CLUSTER_LEASE_TTL_S: float = float(os.getenv("CLUSTER_LEASE_TTL_S", "20"))
+
+    # Streams hot reload: follow ingestion_streams (change stream, else polling) and apply edits live
+    STREAM_RELOAD_ENABLED: bool = os.getenv("STREAM_RELOAD_ENABLED", "true").lower() == "true"
+    STREAM_RELOAD_POLL_S: float = float(os.getenv("STREAM_RELOAD_POLL_S", "10"))
+
     # Fallback only (if Mongo system_config not defined yet)
     SIGNALS_BASE_URL: str = os.getenv("SIGNALS_BASE_URL", "http://host.docker.internal:8080")
 
+    # Signals dispatch: bounded trigger queue, delivery workers, retries, overflow policy
+    # (drop_oldest | drop_newest | block) and drain time on shutdown
+    SIGNALS_QUEUE_SIZE: int = int(os.getenv("SIGNALS_QUEUE_SIZE", "10000"))
+    SIGNALS_WORKERS: int = int(os.getenv("SIGNALS_WORKERS", "8"))
+    SIGNALS_MAX_INFLIGHT_PER_TARGET: int = int(os.getenv("SIGNALS_MAX_INFLIGHT_PER_TARGET", "1"))
+    SIGNALS_MAX_ATTEMPTS: int = int(os.getenv("SIGNALS_MAX_ATTEMPTS", "5"))
+    SIGNALS_BACKOFF_BASE_S: float = float(os.getenv("SIGNALS_BACKOFF_BASE_S", "0.5"))
+    SIGNALS_BACKOFF_MAX_S: float = float(os.getenv("SIGNALS_BACKOFF_MAX_S", "30"))
+    SIGNALS_OVERFLOW: str = os.getenv("SIGNALS_OVERFLOW", "drop_oldest").strip().lower()
+    SIGNALS_DRAIN_TIMEOUT_S: float = float(os.getenv("SIGNALS_DRAIN_TIMEOUT_S", "10"))
+
+    # Signals batch mode: triggers per gzip batch request (1 disables) and max wait for a batch to fill
+    SIGNALS_BATCH_MAX_SIZE: int = int(os.getenv("SIGNALS_BATCH_MAX_SIZE", "1"))
+    SIGNALS_BATCH_LINGER_MS: int = int(os.getenv("SIGNALS_BATCH_LINGER_MS", "250"))
+
     # Bootstrap defaults (optional; used only if Mongo has no ingestion_streams yet)
     BOOTSTRAP_BINANCE_WS_BASE_URL: str = os.getenv("BOOTSTRAP_BINANCE_WS_BASE_URL", "wss://stream.binance.com:9443")
     BOOTSTRAP_BINANCE_REST_BASE_URL: str = os.getenv("BOOTSTRAP_BINANCE_REST_BASE_URL", "https://api.binance.com")
@@ -36,6 +67,48 @@ class Settings:
     BOOTSTRAP_BINANCE_STREAM_SYMBOLS: str = os.getenv("BOOTSTRAP_BINANCE_STREAM_SYMBOLS", "btcusdt")
     BOOTSTRAP_ENABLE_BACKFILL_ON_START: bool = os.getenv("BOOTSTRAP_ENABLE_BACKFILL_ON_START", "true").lower() == "true"
 
+    # Binance REST: request-weight budget per minute shared by all REST calls of the process
+    BINANCE_REQUEST_WEIGHT_BUDGET: int = int(os.getenv("BINANCE_REQUEST_WEIGHT_BUDGET", "4800"))
+
+    # Binance WS: kline streams multiplexed per combined-stream connection (Binance max 1024)
+    BINANCE_WS_MAX_STREAMS_PER_CONNECTION: int = int(os.getenv("BINANCE_WS_MAX_STREAMS_PER_CONNECTION", "200"))
+
+    # Backfill on start: concurrent streams, history for new streams, gap scan window
+    BACKFILL_MAX_CONCURRENCY: int = int(os.getenv("BACKFILL_MAX_CONCURRENCY", "8"))
+    BACKFILL_INITIAL_HISTORY_MINUTES: int = int(os.getenv("BACKFILL_INITIAL_HISTORY_MINUTES", "1440"))
+    BACKFILL_GAP_LOOKBACK_MINUTES: int = int(os.getenv("BACKFILL_GAP_LOOKBACK_MINUTES", "10080"))
+
+    # Candles: higher-timeframe rollups materialized from 1m candles (empty disables)
+    CANDLE_ROLLUP_INTERVALS: str = os.getenv("CANDLE_ROLLUP_INTERVALS", "5m,15m,1h,4h,1d")
+
+    # Candles: in-memory ring buffer of the latest closed candles per stream_key
+    CANDLE_BUFFER_ENABLED: bool = os.getenv("CANDLE_BUFFER_ENABLED", "true").lower() == "true"
+    CANDLE_BUFFER_SIZE: int = int(os.getenv("CANDLE_BUFFER_SIZE", "1000"))
+
+    # Price ticks: MongoDB time-series storage (5.0+) with optional expiry (0 keeps ticks forever)
+    PRICE_TICKS_TIMESERIES: bool = os.getenv("PRICE_TICKS_TIMESERIES", "false").lower() == "true"
+    PRICE_TICKS_EXPIRE_AFTER_S: int = int(os.getenv("PRICE_TICKS_EXPIRE_AFTER_S", "0"))
+
+    # Price ticks: columnar per-day archive on local disk (read path for closed days)
+    TICK_ARCHIVE_ENABLED: bool = os.getenv("TICK_ARCHIVE_ENABLED", "false").lower() == "true"
+    TICK_ARCHIVE_DIR: str = os.getenv("TICK_ARCHIVE_DIR", "/data/tick_archive")
+    TICK_ARCHIVE_INTERVAL_S: float = float(os.getenv("TICK_ARCHIVE_INTERVAL_S", "3600"))
+
+    # Indicator sets: in-memory ACTIVE registry (change stream, polling fallback)
+    INDICATOR_SET_CACHE_ENABLED: bool = os.getenv("INDICATOR_SET_CACHE_ENABLED", "true").lower() == "true"
+    INDICATOR_SET_CACHE_POLL_S: float = float(os.getenv("INDICATOR_SET_CACHE_POLL_S", "10"))
+
+    # Indicators: keep running EMA/ATR state in memory and advance it per closed candle
+    INCREMENTAL_INDICATORS_ENABLED: bool = os.getenv("INCREMENTAL_INDICATORS_ENABLED", "true").lower() == "true"
+
+    # Indicators: full-history recompute (vectorized) for new indicator sets
+    INDICATOR_RECOMPUTE_ON_CREATE: bool = os.getenv("INDICATOR_RECOMPUTE_ON_CREATE", "true").lower() == "true"
+    INDICATOR_RECOMPUTE_BATCH_SIZE: int = int(os.getenv("INDICATOR_RECOMPUTE_BATCH_SIZE", "100000"))
+    INDICATOR_RECOMPUTE_MAX_CONCURRENCY: int = int(os.getenv("INDICATOR_RECOMPUTE_MAX_CONCURRENCY", "2"))
+    # Job leases (one process per job across replicas) and the scan for interrupted jobs
+    INDICATOR_RECOMPUTE_LEASE_TTL_S: float = float(os.getenv("INDICATOR_RECOMPUTE_LEASE_TTL_S", "60"))
+    INDICATOR_RECOMPUTE_SWEEP_S: float = float(os.getenv("INDICATOR_RECOMPUTE_SWEEP_S", "30"))
+
     # The Graph (defaults for adapters)
     THEGRAPH_GATEWAY_BASE_URL: str = os.getenv(
         "THEGRAPH_GATEWAY_BASE_URL",
@@ -44,6 +117,9 @@ class Settings:
     THEGRAPH_DEFAULT_TIMEOUT_S: float = float(os.getenv("THEGRAPH_DEFAULT_TIMEOUT_S", "20.0"))
     THEGRAPH_HTTP_CONNECT_TIMEOUT_S: float = float(os.getenv("THEGRAPH_HTTP_CONNECT_TIMEOUT_S", "5.0"))
 
+    # The Graph: pools per batched `pools(where: {id_in: ...})` poll query (max 1000)
+    THEGRAPH_POOLS_PER_QUERY: int = int(os.getenv("THEGRAPH_POOLS_PER_QUERY", "1000"))
+
     # PancakeSwap V3 (Base) subgraph id (default used across the service)
     THEGRAPH_PANCAKESWAP_V3_BASE_SUBGRAPH_ID: str = os.getenv(
         "THEGRAPH_PANCAKESWAP_V3_BASE_SUBGRAPH_ID",
@@ -56,5 +132,18 @@ class Settings:
         [s.strip().upper() for s in os.getenv("USD_STABLE_SYMBOLS", "USDC,USDT,DAI,USDBC").split(",") if s.strip()]
     )
 
+    # Token USD pricing cache: fresh TTL, extra stale-while-revalidate window, runtime config TTL
+    TOKEN_PRICE_CACHE_TTL_S: float = float(os.getenv("TOKEN_PRICE_CACHE_TTL_S", "5"))
+    TOKEN_PRICE_CACHE_STALE_S: float = float(os.getenv("TOKEN_PRICE_CACHE_STALE_S", "30"))
+    TOKEN_PRICE_CACHE_MAX_ENTRIES: int = int(os.getenv("TOKEN_PRICE_CACHE_MAX_ENTRIES", "10000"))
+    TOKEN_PRICE_RUNTIME_CONFIG_TTL_S: float = float(os.getenv("TOKEN_PRICE_RUNTIME_CONFIG_TTL_S", "30"))
+
+    # Token USD price oracle: background refresh of every registered token, served from memory
+    # (API-only processes reload what the oracle publishes to Mongo every interval)
+    TOKEN_PRICE_ORACLE_ENABLED: bool = os.getenv("TOKEN_PRICE_ORACLE_ENABLED", "false").lower() == "true"
+    TOKEN_PRICE_ORACLE_INTERVAL_S: float = float(os.getenv("TOKEN_PRICE_ORACLE_INTERVAL_S", "15"))
+    TOKEN_PRICE_ORACLE_MAX_AGE_S: float = float(os.getenv("TOKEN_PRICE_ORACLE_MAX_AGE_S", "60"))
+    TOKEN_PRICE_HISTORY_ENABLED: bool = os.getenv("TOKEN_PRICE_HISTORY_ENABLED", "true").lower() == "true"
+
 
 settings = Settings()
@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import List, Optional
+
+from core.domain.entities.base_entity import MongoEntity
+
+
+class ClusterNodeEntity(MongoEntity):
+    """
+    A running ingestion replica (`id` = node id), refreshed by its heartbeat.
+
+    A node is alive while `heartbeat_at` is more recent than the lease TTL.
+    """
+
+    host: Optional[str] = None
+    pid: Optional[int] = None
+
+    started_at: datetime
+    heartbeat_at: datetime
+
+    streams: List[str] = []  # stream ids currently run by the node
@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+from typing import Any, Dict, Optional
+
+from core.domain.entities.base_entity import MongoEntity
+
+
+class IndicatorRecomputeJobEntity(MongoEntity):
+    """
+    Progress of a historical indicator recompute for one indicator set.
+
+    One document per cfg_hash. `last_open_time` + `state` are only advanced after the
+    snapshots of a batch were written, so an interrupted job resumes from there.
+    """
+
+    cfg_hash: str
+    stream_key: str
+
+    status: str = "PENDING"  # PENDING | RUNNING | DONE | FAILED
+
+    total: int = 0  # candles to process (at start / resume)
+    processed: int = 0  # candles consumed
+    written: int = 0  # snapshots upserted
+
+    last_open_time: Optional[int] = None
+    state: Optional[Dict[str, Any]] = None
+
+    started_at: Optional[int] = None
+    finished_at: Optional[int] = None
+    rate_per_s: Optional[float] = None
+    error: Optional[str] = None
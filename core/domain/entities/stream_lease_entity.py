@@ -0,0 +1,18 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from core.domain.entities.base_entity import MongoEntity
+
+
+class StreamLeaseEntity(MongoEntity):
+    """
+    Exclusive, expiring claim of one ingestion stream (`id` = stream id) by a node.
+
+    The owner renews it on every heartbeat; once `expires_at` passes, any node may
+    take the stream over.
+    """
+
+    owner: str
+    acquired_at: datetime
+    expires_at: datetime
@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from core.domain.entities.base_entity import MongoEntity
+
+
+class TokenLatestPriceEntity(MongoEntity):
+    """
+    Latest USD price of a token published by the price oracle (`id` = "<chain>:<token_address>").
+
+    Prices are kept as decimal strings so readers rebuild the exact oracle result.
+    """
+
+    chain: str
+    token_address: str
+
+    price_usd: str
+    price_in_quote: str
+    quote_token_address: str
+    quote_token_is_usd_stable: bool
+    pool_address: str
+    decimals: int
+
+    refreshed_at: datetime
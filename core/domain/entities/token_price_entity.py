@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+from core.domain.entities.base_entity import MongoEntity
+
+
+class TokenPriceEntity(MongoEntity):
+    """
+    One point of a token's USD price history (written by the background price oracle).
+
+    Kept compact: floats instead of decimal strings (the exact latest price is served
+    from memory), no timestamps besides `ts`.
+    """
+
+    chain: str
+    token_address: str
+
+    ts: int  # ms since epoch (oracle cycle time)
+
+    price_usd: float
+    price_in_quote: float
+    quote_token_address: str
+    pool_address: str
@@ -2,11 +2,33 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from typing import List
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Tuple
 
 from core.domain.entities.candle_entity import CandleEntity
 
 
+@dataclass
+class CandleColumns:
+    """
+    Column-oriented batch of closed candles (ascending open_time).
+
+    Used by bulk/historical jobs to avoid building one entity per candle.
+    """
+
+    open_time: List[int] = field(default_factory=list)
+    close_time: List[int] = field(default_factory=list)
+    open: List[float] = field(default_factory=list)
+    high: List[float] = field(default_factory=list)
+    low: List[float] = field(default_factory=list)
+    close: List[float] = field(default_factory=list)
+    volume: List[float] = field(default_factory=list)
+    trades: List[int] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.open_time)
+
+
 class CandleRepository(ABC):
     """
    Persistence interface for candles.
@@ -22,7 +44,58 @@ class CandleRepository(ABC):
         """Insert/update a closed candle (idempotent)."""
         raise NotImplementedError
 
+    @abstractmethod
+    async def upsert_closed_candles(self, candles: List[CandleEntity]) -> int:
+        """Insert/update many closed candles (idempotent). Returns the number of candles written."""
+        raise NotImplementedError
+
     @abstractmethod
     async def get_last_n_closed(self, stream_key: str, n: int) -> List[CandleEntity]:
         """Return the last N closed candles in ascending open_time order."""
         raise NotImplementedError
+
+    @abstractmethod
+    async def count_closed(self, stream_key: str, *, after_open_time: Optional[int] = None) -> int:
+        """Count closed candles for a stream_key (optionally strictly after an open_time)."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def iter_closed_columns(
+        self,
+        stream_key: str,
+        *,
+        after_open_time: Optional[int] = None,
+        batch_size: int = 50_000,
+    ) -> AsyncIterator[CandleColumns]:
+        """Stream closed candles in ascending open_time order as column batches."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def iter_last_n_closed_rows(
+        self,
+        stream_key: str,
+        n: int,
+        *,
+        fields: Sequence[str],
+        batch_size: int = 2_000,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream the last N closed candles in ascending open_time order as plain rows
+        holding `fields` (missing fields are None), without loading the window in memory.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def find_gaps(
+        self,
+        stream_key: str,
+        *,
+        interval_ms: int,
+        start_open_time: int,
+        end_open_time: int,
+    ) -> List[Tuple[int, int]]:
+        """
+        Return missing candle ranges in [start_open_time, end_open_time] as inclusive
+        (first_missing_open_time, last_missing_open_time) pairs, ascending.
+        """
+        raise NotImplementedError
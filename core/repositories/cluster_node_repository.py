@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import List
+
+from core.domain.entities.cluster_node_entity import ClusterNodeEntity
+
+
+class ClusterNodeRepository(ABC):
+    """
+    Persistence interface for ingestion replica heartbeats.
+    """
+
+    @abstractmethod
+    async def ensure_indexes(self) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def heartbeat(self, node: ClusterNodeEntity) -> None:
+        """Insert or refresh a node (started_at is kept from the first heartbeat)."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def list_alive(self, *, since: datetime) -> List[ClusterNodeEntity]:
+        """Nodes whose last heartbeat is at or after `since`."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def list_all(self) -> List[ClusterNodeEntity]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def delete(self, node_id: str) -> None:
+        raise NotImplementedError
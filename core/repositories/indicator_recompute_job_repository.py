@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from typing import List, Optional
+
+from core.domain.entities.indicator_recompute_job_entity import IndicatorRecomputeJobEntity
+
+
+class IndicatorRecomputeJobRepository(ABC):
+    """
+    Persistence interface for historical indicator recompute jobs.
+    """
+
+    @abstractmethod
+    async def ensure_indexes(self) -> None:
+        """Ensure all required indexes exist."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_by_cfg_hash(self, cfg_hash: str) -> Optional[IndicatorRecomputeJobEntity]:
+        """Return the job for an indicator set (or None)."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def upsert(self, job: IndicatorRecomputeJobEntity) -> None:
+        """Create or replace the job document for job.cfg_hash."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def list_by_status(self, status: str) -> List[IndicatorRecomputeJobEntity]:
+        """List jobs with a given status."""
+        raise NotImplementedError
@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Optional
+
+
+class IndicatorRecomputeLeaseRepository(ABC):
+    """
+    Persistence interface for expiring recompute job leases (one per cfg_hash), so a
+    job runs in one process at a time whatever the number of replicas.
+    """
+
+    @abstractmethod
+    async def ensure_indexes(self) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def acquire(self, cfg_hash: str, *, owner: str, now: datetime, expires_at: datetime) -> bool:
+        """
+        Claim a job whose lease is free, expired or already owned by `owner`.
+
+        Returns:
+            True if the job is now leased to `owner`.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def renew(self, cfg_hash: str, *, owner: str, expires_at: datetime) -> bool:
+        """
+        Extend a lease still held by `owner`.
+
+        Returns:
+            False if the lease was taken over.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def release(self, cfg_hash: str, *, owner: str) -> None:
+        """Drop the lease if `owner` holds it."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def holder(self, cfg_hash: str, *, now: datetime) -> Optional[str]:
+        """Owner of the unexpired lease of a job (None when free)."""
+        raise NotImplementedError
@@ -2,7 +2,7 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Sequence
 
 from core.domain.entities.indicator_entity import IndicatorSnapshotEntity
 
@@ -22,6 +22,21 @@ class IndicatorRepository(ABC):
         """Insert/update a snapshot (idempotent)."""
         raise NotImplementedError
 
+    @abstractmethod
+    async def upsert_snapshots(self, snapshots: List[IndicatorSnapshotEntity]) -> None:
+        """Insert/update many snapshots in a single write (idempotent)."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def upsert_snapshot_docs(self, docs: List[Dict[str, Any]]) -> int:
+        """
+        Bulk upsert raw snapshot documents (already in storage shape), unordered.
+
+        Returns:
+            Number of documents written.
+        """
+        raise NotImplementedError
+
     @abstractmethod
     async def list_last(
         self,
@@ -31,3 +46,18 @@ class IndicatorRepository(ABC):
     ) -> List[IndicatorSnapshotEntity]:
         """List the last snapshots in ascending ts order."""
         raise NotImplementedError
+
+    @abstractmethod
+    async def list_last_rows(
+        self,
+        stream_key: str,
+        cfg_hash: Optional[str],
+        limit: int,
+        *,
+        fields: Sequence[str],
+    ) -> List[Dict[str, Any]]:
+        """
+        List the last snapshots in ascending ts order as plain rows holding `fields`
+        (projected server-side, missing fields are None; no entity validation).
+        """
+        raise NotImplementedError
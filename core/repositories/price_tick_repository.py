@@ -1,9 +1,24 @@
 from __future__ import annotations
 from abc import ABC, abstractmethod
-from typing import List
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Dict, List, Sequence
 from core.domain.entities.price_tick_entity import PriceTickEntity
 
 
+@dataclass
+class TickColumns:
+    """
+    Column-oriented ticks (ascending ts): lists from MongoDB, numpy arrays from the archive.
+    """
+
+    ts: Sequence[int] = field(default_factory=list)
+    price: Sequence[float] = field(default_factory=list)
+    volume: Sequence[float] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.ts)
+
+
 class PriceTickRepository(ABC):
     """Repository interface for tick persistence and retrieval."""
 
@@ -13,8 +28,43 @@ class PriceTickRepository(ABC):
     @abstractmethod
     async def insert_tick(self, tick: PriceTickEntity) -> None: ...
 
+    @abstractmethod
+    async def insert_ticks(self, ticks: List[PriceTickEntity]) -> int:
+        """Insert many ticks in one round-trip; returns the number inserted."""
+        ...
+
     @abstractmethod
     async def list_ticks_for_minute(self, stream_key: str, minute_open_time: int) -> List[PriceTickEntity]: ...
 
+    @abstractmethod
+    async def list_ticks_range(
+        self,
+        stream_key: str,
+        ts_from: int,
+        ts_to: int,
+        limit: int = 5000,
+    ) -> List[PriceTickEntity]:
+        """Ticks with ts in [ts_from, ts_to] (ascending, at most `limit`)."""
+        ...
+
+    @abstractmethod
+    async def list_tick_columns_range(self, stream_key: str, ts_from: int, ts_to: int, limit: int) -> TickColumns:
+        """Ticks with ts in [ts_from, ts_to] as columns (ts/price/volume only)."""
+        ...
+
+    @abstractmethod
+    def iter_tick_rows_range(
+        self,
+        stream_key: str,
+        ts_from: int,
+        ts_to: int,
+        limit: int,
+        *,
+        fields: Sequence[str],
+        batch_size: int = 5_000,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Stream ticks with ts in [ts_from, ts_to] (ascending) as plain rows holding `fields`."""
+        ...
+
     @abstractmethod
     async def delete_ticks_for_minute(self, stream_key: str, minute_open_time: int) -> None: ...
@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import List, Sequence, Set
+
+from core.domain.entities.stream_lease_entity import StreamLeaseEntity
+
+
+class StreamLeaseRepository(ABC):
+    """
+    Persistence interface for expiring stream leases.
+    """
+
+    @abstractmethod
+    async def ensure_indexes(self) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def acquire(self, *, owner: str, stream_ids: Sequence[str], now: datetime, expires_at: datetime) -> Set[str]:
+        """
+        Claim streams that are free, expired or already owned by `owner`.
+
+        Returns:
+            The stream ids now leased to `owner`.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def renew(self, *, owner: str, stream_ids: Sequence[str], expires_at: datetime) -> Set[str]:
+        """
+        Extend the leases still held by `owner`.
+
+        Returns:
+            The stream ids still leased to `owner` (the others were taken over).
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def release(self, *, owner: str, stream_ids: Sequence[str] | None = None) -> None:
+        """Drop leases held by `owner` (all of them when stream_ids is None)."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def list_all(self) -> List[StreamLeaseEntity]:
+        raise NotImplementedError
@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from typing import Optional
+
+from core.repositories.price_tick_repository import TickColumns
+
+
+class TickArchiveRepository(ABC):
+    """
+    Immutable per-day columnar archive of ticks (closed UTC days only).
+    """
+
+    @abstractmethod
+    def archived_until(self, stream_key: str) -> Optional[int]:
+        """End (exclusive, ms) of the contiguous archived range of a stream, or None."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def write_day(self, stream_key: str, day_open_time: int, ticks: TickColumns) -> None:
+        """Store the ticks of one closed UTC day (replaces an existing file)."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def read_range(self, stream_key: str, ts_from: int, ts_to: int, limit: int) -> TickColumns:
+        """Archived ticks with ts in [ts_from, ts_to] (at most `limit`, ascending)."""
+        raise NotImplementedError
@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import List
+
+from core.domain.entities.token_latest_price_entity import TokenLatestPriceEntity
+
+
+class TokenLatestPriceRepository(ABC):
+    """
+    Persistence interface for the latest token prices published by the price oracle.
+    """
+
+    @abstractmethod
+    async def ensure_indexes(self) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def upsert_many(self, prices: List[TokenLatestPriceEntity]) -> None:
+        """Insert or replace the latest price of each token in one round-trip."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def list_since(self, *, since: datetime) -> List[TokenLatestPriceEntity]:
+        """Latest prices refreshed at or after `since`."""
+        raise NotImplementedError
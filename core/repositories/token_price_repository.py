@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from typing import List
+
+from core.domain.entities.token_price_entity import TokenPriceEntity
+
+
+class TokenPriceRepository(ABC):
+    """
+    Persistence interface for token USD price history.
+    """
+
+    @abstractmethod
+    async def ensure_indexes(self) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def insert_prices(self, prices: List[TokenPriceEntity]) -> int:
+        """Append price points in one round-trip; returns the number inserted."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def list_range(
+        self,
+        *,
+        chain: str,
+        token_address: str,
+        ts_from: int,
+        ts_to: int,
+        limit: int = 5000,
+    ) -> List[TokenPriceEntity]:
+        """Price points of a token with ts in [ts_from, ts_to], ascending."""
+        raise NotImplementedError
@@ -19,6 +19,11 @@ class TokenRegistryRepository(ABC):
     async def get_by_token_address(self, *, chain: str, token_address: str) -> Optional[TokenRegistryEntity]:
         raise NotImplementedError
 
+    @abstractmethod
+    async def list_by_token_addresses(self, *, chain: str, token_addresses: List[str]) -> List[TokenRegistryEntity]:
+        """Registered tokens among `token_addresses` (one query); unknown addresses are absent."""
+        raise NotImplementedError
+
     @abstractmethod
     async def list_all(self, *, chain: Optional[str] = None) -> List[TokenRegistryEntity]:
         raise NotImplementedError
@@ -0,0 +1,322 @@
+# core/services/candle_ring_buffer.py
+from __future__ import annotations
+
+from array import array
+from typing import Any, Dict, List, Optional
+
+from core.domain.entities.candle_entity import CandleEntity
+from core.repositories.candle_repository import CandleColumns
+
+# Stream-level candle fields kept next to the arrays (taken from the last appended candle).
+_META_FIELDS = ("source", "symbol", "interval", "chain", "dex", "pool_address", "token0_symbol", "token1_symbol")
+
+
+class CandleRingBuffer:
+    """
+    Fixed-capacity ring of the most recent closed candles of one stream_key.
+
+    Columns are stored in typed arrays (int64 times/trades, float64 OHLCV).
+    Per-candle enrichments (token prices, liquidity, extras...) are not kept: rows
+    rebuilt from the buffer carry OHLCV plus the stream-level fields only.
+
+    `complete` is True while the buffer is known to hold the latest stored candles
+    without holes (after warm(), kept by in-order appends).
+    """
+
+    def __init__(self, stream_key: str, capacity: int) -> None:
+        cap = max(1, int(capacity))
+        self.stream_key = str(stream_key)
+        self.capacity = cap
+
+        self._open_time = array("q", bytes(8 * cap))
+        self._close_time = array("q", bytes(8 * cap))
+        self._open = array("d", bytes(8 * cap))
+        self._high = array("d", bytes(8 * cap))
+        self._low = array("d", bytes(8 * cap))
+        self._close = array("d", bytes(8 * cap))
+        self._volume = array("d", bytes(8 * cap))
+        self._trades = array("q", bytes(8 * cap))
+
+        self._start = 0
+        self._size = 0
+
+        self.meta: Dict[str, Any] = {}
+        self.complete = False
+        self.version = 0  # bumped on every mutation
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def last_open_time(self) -> Optional[int]:
+        if self._size == 0:
+            return None
+        return int(self._open_time[(self._start + self._size - 1) % self.capacity])
+
+    def clear(self) -> None:
+        self._start = 0
+        self._size = 0
+        self.complete = False
+        self.version += 1
+
+    def load(self, candles: List[CandleEntity]) -> None:
+        """
+        Replace the content with `candles` (ascending open_time; last `capacity` kept).
+        """
+        self._start = 0
+        self._size = 0
+        for c in candles[-self.capacity :]:
+            self._push(c)
+        if candles:
+            self._set_meta(candles[-1])
+        self.complete = True
+        self.version += 1
+
+    def append(self, candle: CandleEntity) -> bool:
+        """
+        Apply a closed candle.
+
+        Returns:
+            False when the candle is older than the buffered range and not held in it
+            (the buffer can no longer vouch for being complete).
+        """
+        ot = int(candle.open_time)
+        last = self.last_open_time
+        self.version += 1
+
+        if last is None or ot > last:
+            self._push(candle)
+            self._set_meta(candle)
+            return True
+
+        # Same or older open_time: overwrite in place when held.
+        for k in range(self._size - 1, -1, -1):
+            i = (self._start + k) % self.capacity
+            cur = int(self._open_time[i])
+            if cur == ot:
+                self._write(i, candle)
+                return True
+            if cur < ot:
+                break
+        return False
+
+    def last_n_columns(self, n: int) -> CandleColumns:
+        """
+        Last n candles (ascending) as column lists.
+        """
+        m = min(max(0, int(n)), self._size)
+        first = (self._start + self._size - m) % self.capacity
+        end = first + m
+        if end <= self.capacity:
+            sl = slice(first, end)
+            return CandleColumns(
+                open_time=self._open_time[sl].tolist(),
+                close_time=self._close_time[sl].tolist(),
+                open=self._open[sl].tolist(),
+                high=self._high[sl].tolist(),
+                low=self._low[sl].tolist(),
+                close=self._close[sl].tolist(),
+                volume=self._volume[sl].tolist(),
+                trades=self._trades[sl].tolist(),
+            )
+
+        a = slice(first, self.capacity)
+        b = slice(0, end - self.capacity)
+
+        def _cat(arr: array) -> list:
+            return arr[a].tolist() + arr[b].tolist()
+
+        return CandleColumns(
+            open_time=_cat(self._open_time),
+            close_time=_cat(self._close_time),
+            open=_cat(self._open),
+            high=_cat(self._high),
+            low=_cat(self._low),
+            close=_cat(self._close),
+            volume=_cat(self._volume),
+            trades=_cat(self._trades),
+        )
+
+    def _push(self, c: CandleEntity) -> None:
+        if self._size < self.capacity:
+            i = (self._start + self._size) % self.capacity
+            self._size += 1
+        else:
+            i = self._start
+            self._start = (self._start + 1) % self.capacity
+        self._write(i, c)
+
+    def _write(self, i: int, c: CandleEntity) -> None:
+        self._open_time[i] = int(c.open_time)
+        self._close_time[i] = int(c.close_time)
+        self._open[i] = float(c.open)
+        self._high[i] = float(c.high)
+        self._low[i] = float(c.low)
+        self._close[i] = float(c.close)
+        self._volume[i] = float(c.volume)
+        self._trades[i] = int(c.trades)
+
+    def _set_meta(self, c: CandleEntity) -> None:
+        self.meta = {k: getattr(c, k) for k in _META_FIELDS if getattr(c, k, None) is not None}
+
+
+class CandleRingBufferRegistry:
+    """
+    Ring buffers for all streams of the process, with hit/miss counters.
+
+    Only streams that were warmed or written by this process get a buffer, so
+    arbitrary stream_keys from the API never allocate memory.
+    """
+
+    def __init__(self, capacity: int = 1000) -> None:
+        self._capacity = max(1, int(capacity))
+        self._buffers: Dict[str, CandleRingBuffer] = {}
+
+        self._hits = 0
+        self._misses = 0
+        self._warms = 0
+        self._invalidations = 0
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    def get(self, stream_key: str) -> Optional[CandleRingBuffer]:
+        return self._buffers.get(str(stream_key))
+
+    def warm(self, stream_key: str, candles: List[CandleEntity]) -> None:
+        """
+        (Re)load a stream's buffer from storage (latest candles, ascending open_time).
+        """
+        buf = self._buffer(stream_key)
+        buf.load(candles)
+        self._warms += 1
+
+    def append(self, candle: CandleEntity) -> None:
+        """
+        Write-through hook for a persisted closed candle.
+        """
+        buf = self._buffer(candle.stream_key)
+        if not buf.append(candle):
+            buf.clear()
+            self._invalidations += 1
+
+    def drop(self, stream_key: str) -> None:
+        """
+        Forget a stream's buffer (e.g. its ingestion moved to another process): reads go
+        back to storage instead of a buffer nobody writes to anymore.
+        """
+        self._buffers.pop(str(stream_key), None)
+
+    def can_serve(self, stream_key: str, n: int) -> bool:
+        """
+        True if the last n closed candles of stream_key are fully held in memory.
+        """
+        buf = self._buffers.get(str(stream_key))
+        if buf is None or not buf.complete:
+            return False
+        # A buffer below capacity holds every stored candle of the stream.
+        return int(n) <= len(buf) or len(buf) < buf.capacity
+
+    def last_n_columns(self, stream_key: str, n: int) -> Optional[CandleColumns]:
+        """
+        Last n closed candles as columns, or None on miss (counted).
+        """
+        if not self.can_serve(stream_key, n):
+            self._misses += 1
+            return None
+        self._hits += 1
+        return self._buffers[str(stream_key)].last_n_columns(n)
+
+    def last_n_entities(self, stream_key: str, n: int) -> Optional[List[CandleEntity]]:
+        """
+        Last n closed candles as entities (ascending), or None on miss (counted).
+        """
+        cols = self.last_n_columns(stream_key, n)
+        if cols is None:
+            return None
+        meta = self._buffers[str(stream_key)].meta
+        return [
+            CandleEntity(
+                stream_key=str(stream_key),
+                open_time=ot,
+                close_time=ct,
+                open=o,
+                high=h,
+                low=l,
+                close=c,
+                volume=v,
+                trades=t,
+                is_closed=True,
+                **meta,
+            )
+            for ot, ct, o, h, l, c, v, t in zip(
+                cols.open_time,
+                cols.close_time,
+                cols.open,
+                cols.high,
+                cols.low,
+                cols.close,
+                cols.volume,
+                cols.trades,
+            )
+        ]
+
+    def last_n_rows(self, stream_key: str, n: int) -> Optional[List[Dict[str, Any]]]:
+        """
+        Last n closed candles as plain JSON-safe rows (CandleOutDTO shape), or None on miss.
+        """
+        cols = self.last_n_columns(stream_key, n)
+        if cols is None:
+            return None
+        meta = self._buffers[str(stream_key)].meta
+        symbol = meta.get("symbol")
+        interval = meta.get("interval")
+        return [
+            {
+                "symbol": symbol,
+                "interval": interval,
+                "open_time": ot,
+                "close_time": ct,
+                "open": o,
+                "high": h,
+                "low": l,
+                "close": c,
+                "volume": v,
+                "trades": t,
+                "is_closed": True,
+                "cfg_hash": None,  # not stored on candles: the MongoDB rows carry null too
+            }
+            for ot, ct, o, h, l, c, v, t in zip(
+                cols.open_time,
+                cols.close_time,
+                cols.open,
+                cols.high,
+                cols.low,
+                cols.close,
+                cols.volume,
+                cols.trades,
+            )
+        ]
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for observability."""
+        total = self._hits + self._misses
+        return {
+            "capacity": self._capacity,
+            "streams": len(self._buffers),
+            "hits": self._hits,
+            "misses": self._misses,
+            "hit_ratio": round(self._hits / total, 4) if total else None,
+            "warms": self._warms,
+            "invalidations": self._invalidations,
+            "sizes": {k: {"size": len(b), "complete": b.complete} for k, b in self._buffers.items()},
+        }
+
+    def _buffer(self, stream_key: str) -> CandleRingBuffer:
+        key = str(stream_key)
+        buf = self._buffers.get(key)
+        if buf is None:
+            buf = CandleRingBuffer(key, self._capacity)
+            self._buffers[key] = buf
+        return buf
@@ -0,0 +1,256 @@
+# core/services/candle_rollup_service.py
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from core.domain.entities.candle_entity import CandleEntity
+from core.repositories.candle_repository import CandleColumns
+from core.services.interval_service import IntervalService
+from core.services.stream_key_service import StreamKeyService
+
+# Candle fields copied from the 1m candles onto the rolled-up candles.
+ROLLUP_STATIC_FIELDS = ("chain", "dex", "pool_address", "token0_symbol", "token1_symbol")
+
+
+@dataclass
+class RollupBucket:
+    """
+    In-progress higher-timeframe candle for one (stream_key, interval).
+    """
+
+    open_time: int
+    last_open_time: int  # open_time of the last 1m candle applied
+
+    open: float
+    high: float
+    low: float
+    close: float
+    volume: float = 0.0
+    trades: int = 0
+
+    static_fields: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class RolledColumns:
+    """
+    Column-oriented higher-timeframe candles produced from 1m columns.
+    """
+
+    open_time: np.ndarray
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+    trades: np.ndarray
+
+    def __len__(self) -> int:
+        return int(self.open_time.shape[0])
+
+
+class CandleRollupService:
+    """
+    Rolls closed 1m candles into higher-timeframe candles (no I/O).
+
+    Live mode keeps one in-progress bucket per (1m stream_key, interval):
+      - A bucket is emitted when its last minute is applied.
+      - A bucket with missing minutes is emitted when a candle of a later bucket arrives.
+      - Duplicates and out-of-order candles are ignored.
+
+    Rolled-up candles use the same stream_key with the interval segment swapped
+    (e.g. "binance:btcusdt:1m" -> "binance:btcusdt:1h").
+    """
+
+    def __init__(self, intervals: List[str], logger: logging.Logger | None = None) -> None:
+        self._intervals = IntervalService.parse_rollups(intervals)
+        self._logger = logger or logging.getLogger(self.__class__.__name__)
+        self._buckets: Dict[Tuple[str, str], RollupBucket] = {}
+
+    @property
+    def intervals(self) -> List[str]:
+        """Materialized rollup intervals (ascending duration)."""
+        return list(self._intervals)
+
+    def drop(self, stream_key: str) -> None:
+        """
+        Forget the in-progress buckets of a 1m stream (e.g. its ingestion moved to another
+        process): when it comes back, its buckets are reseeded from stored 1m candles.
+        """
+        for key in [k for k in self._buckets if k[0] == stream_key]:
+            self._buckets.pop(key, None)
+
+    def missing_buckets(self, candle: CandleEntity) -> List[str]:
+        """
+        Intervals for which `candle` lands in the middle of a bucket that is not held in
+        memory (e.g. after a restart). Those buckets should be seeded from stored 1m candles.
+        """
+        out: List[str] = []
+        base_ms = IntervalService.INTERVAL_MS[IntervalService.BASE_INTERVAL]
+        for itv in self._intervals:
+            b_open = IntervalService.bucket_open(candle.open_time, itv)
+            if int(candle.open_time) < b_open + base_ms:
+                continue  # first minute of the bucket: nothing to seed
+            cur = self._buckets.get((candle.stream_key, itv))
+            if cur is None or cur.open_time != b_open:
+                out.append(itv)
+        return out
+
+    def seed_bucket(self, template: CandleEntity, interval: str, cols: CandleColumns) -> None:
+        """
+        (Re)build the in-progress bucket of `interval` for template's stream from stored
+        1m candles. Only candles of that bucket strictly before `template` are used.
+        """
+        b_open = IntervalService.bucket_open(template.open_time, interval)
+        key = (template.stream_key, interval)
+        self._buckets.pop(key, None)
+
+        bucket: Optional[RollupBucket] = None
+        for i in range(len(cols)):
+            ot = int(cols.open_time[i])
+            if ot < b_open or ot >= int(template.open_time):
+                continue
+            if bucket is None:
+                bucket = RollupBucket(
+                    open_time=b_open,
+                    last_open_time=ot,
+                    open=float(cols.open[i]),
+                    high=float(cols.high[i]),
+                    low=float(cols.low[i]),
+                    close=float(cols.close[i]),
+                    volume=float(cols.volume[i]),
+                    trades=int(cols.trades[i]),
+                    static_fields=self._static_fields(template),
+                )
+                continue
+            bucket.last_open_time = ot
+            bucket.high = max(bucket.high, float(cols.high[i]))
+            bucket.low = min(bucket.low, float(cols.low[i]))
+            bucket.close = float(cols.close[i])
+            bucket.volume += float(cols.volume[i])
+            bucket.trades += int(cols.trades[i])
+
+        if bucket is not None:
+            self._buckets[key] = bucket
+
+    def apply(self, candle: CandleEntity) -> List[CandleEntity]:
+        """
+        Apply one closed 1m candle to every rollup interval.
+
+        Returns:
+            Higher-timeframe candles closed by this candle (ascending interval duration).
+        """
+        if str(candle.interval) != IntervalService.BASE_INTERVAL:
+            return []
+
+        closed: List[CandleEntity] = []
+        ot = int(candle.open_time)
+        for itv in self._intervals:
+            ms = int(IntervalService.INTERVAL_MS[itv])
+            b_open = (ot // ms) * ms
+            key = (candle.stream_key, itv)
+            cur = self._buckets.get(key)
+
+            if cur is not None and cur.open_time != b_open:
+                if cur.open_time > b_open:
+                    continue  # out-of-order candle from an older bucket
+                # Bucket ended with missing minutes: emit what we have.
+                closed.append(self._to_candle(candle, itv, cur))
+                self._buckets.pop(key, None)
+                cur = None
+
+            if cur is None:
+                cur = RollupBucket(
+                    open_time=b_open,
+                    last_open_time=ot,
+                    open=float(candle.open),
+                    high=float(candle.high),
+                    low=float(candle.low),
+                    close=float(candle.close),
+                    volume=float(candle.volume),
+                    trades=int(candle.trades),
+                    static_fields=self._static_fields(candle),
+                )
+                self._buckets[key] = cur
+            elif ot <= cur.last_open_time:
+                continue  # duplicate
+            else:
+                cur.last_open_time = ot
+                cur.high = max(cur.high, float(candle.high))
+                cur.low = min(cur.low, float(candle.low))
+                cur.close = float(candle.close)
+                cur.volume += float(candle.volume)
+                cur.trades += int(candle.trades)
+
+            if ot + IntervalService.INTERVAL_MS[IntervalService.BASE_INTERVAL] >= b_open + ms:
+                closed.append(self._to_candle(candle, itv, cur))
+                self._buckets.pop(key, None)
+
+        return closed
+
+    @staticmethod
+    def aggregate_columns(cols: CandleColumns, interval: str) -> RolledColumns:
+        """
+        Vectorized rollup of 1m columns (ascending open_time) into `interval` buckets.
+
+        Every bucket present in `cols` is returned, including a possibly incomplete last one;
+        callers decide which buckets are final.
+        """
+        ms = IntervalService.to_ms(interval)
+        if ms is None:
+            raise ValueError(f"Unsupported interval: {interval}")
+
+        ot = np.asarray(cols.open_time, dtype=np.int64)
+        if ot.shape[0] == 0:
+            e_f = np.empty(0, dtype=np.float64)
+            return RolledColumns(
+                open_time=np.empty(0, dtype=np.int64),
+                open=e_f,
+                high=e_f,
+                low=e_f,
+                close=e_f,
+                volume=e_f,
+                trades=np.empty(0, dtype=np.int64),
+            )
+
+        bucket = (ot // ms) * ms
+        starts = np.flatnonzero(np.concatenate(([True], bucket[1:] != bucket[:-1])))
+        ends = np.concatenate((starts[1:], [ot.shape[0]])) - 1
+
+        return RolledColumns(
+            open_time=bucket[starts],
+            open=np.asarray(cols.open, dtype=np.float64)[starts],
+            high=np.maximum.reduceat(np.asarray(cols.high, dtype=np.float64), starts),
+            low=np.minimum.reduceat(np.asarray(cols.low, dtype=np.float64), starts),
+            close=np.asarray(cols.close, dtype=np.float64)[ends],
+            volume=np.add.reduceat(np.asarray(cols.volume, dtype=np.float64), starts),
+            trades=np.add.reduceat(np.asarray(cols.trades, dtype=np.int64), starts),
+        )
+
+    @staticmethod
+    def _static_fields(candle: CandleEntity) -> Dict[str, Any]:
+        return {k: getattr(candle, k) for k in ROLLUP_STATIC_FIELDS if getattr(candle, k, None) is not None}
+
+    @staticmethod
+    def _to_candle(template: CandleEntity, interval: str, bucket: RollupBucket) -> CandleEntity:
+        ms = int(IntervalService.INTERVAL_MS[interval])
+        return CandleEntity(
+            stream_key=StreamKeyService.with_interval(template.stream_key, interval),
+            source=template.source,
+            symbol=template.symbol,
+            interval=interval,
+            open_time=int(bucket.open_time),
+            close_time=int(bucket.open_time) + ms - 1,
+            open=bucket.open,
+            high=bucket.high,
+            low=bucket.low,
+            close=bucket.close,
+            volume=bucket.volume,
+            trades=int(bucket.trades),
+            is_closed=True,
+            **bucket.static_fields,
+        )
@@ -0,0 +1,250 @@
+# core/services/incremental_indicator_engine.py
+from __future__ import annotations
+
+import logging
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Deque, Dict, List, Optional, Tuple
+
+from core.domain.entities.candle_entity import CandleEntity
+from core.domain.entities.indicator_entity import IndicatorSnapshotEntity
+from core.services.indicator_calculation_service import IndicatorCalculationService, IndicatorParams
+from core.services.interval_service import IntervalService
+
+
+@dataclass
+class IndicatorState:
+    """
+    Running EMA-fast / EMA-slow / ATR state for one (stream_key, cfg_hash).
+
+    ATR keeps the same definition as IndicatorCalculationService (SMA of the last
+    `atr_window` true ranges), so the TR window and its running sum are kept too.
+    """
+
+    ema_fast_period: int
+    ema_slow_period: int
+    atr_window: int
+
+    last_open_time: int
+    prev_close: float
+
+    ema_fast: float
+    ema_slow: float
+
+    trs: Deque[float] = field(default_factory=deque)
+    tr_sum: float = 0.0
+    updates_since_resync: int = 0
+
+
+class IncrementalIndicatorEngine:
+    """
+    In-memory incremental indicator engine (no I/O).
+
+    State is seeded once from history (same math as IndicatorCalculationService) and then
+    advanced with a single candle per close in O(1).
+
+    Rules:
+      - The next candle must be exactly one interval after the last applied candle.
+      - Any gap, duplicate or out-of-order candle drops the state; the caller must reseed
+        from history (full recompute).
+    """
+
+    def __init__(
+        self,
+        indicator_service: IndicatorCalculationService,
+        logger: logging.Logger | None = None,
+    ) -> None:
+        self._svc = indicator_service
+        self._logger = logger or logging.getLogger(self.__class__.__name__)
+        self._states: Dict[Tuple[str, str], IndicatorState] = {}
+
+        self._advances = 0
+        self._seeds = 0
+        self._resets = 0
+
+    def has_state(self, stream_key: str, cfg_hash: str) -> bool:
+        """Return True if a running state exists for (stream_key, cfg_hash)."""
+        return (str(stream_key), str(cfg_hash)) in self._states
+
+    def invalidate(self, stream_key: str, cfg_hash: Optional[str] = None) -> None:
+        """
+        Drop state for a stream (all indicator sets) or a single indicator set.
+        """
+        sk = str(stream_key)
+        if cfg_hash is not None:
+            self._states.pop((sk, str(cfg_hash)), None)
+            return
+        for key in [k for k in self._states if k[0] == sk]:
+            self._states.pop(key, None)
+
+    def stats(self) -> Dict[str, int]:
+        """Counters for observability."""
+        return {
+            "states": len(self._states),
+            "advances": self._advances,
+            "seeds": self._seeds,
+            "resets": self._resets,
+        }
+
+    def seed(
+        self,
+        candles: List[CandleEntity],
+        *,
+        stream_key: str,
+        ema_fast: int,
+        ema_slow: int,
+        atr_window: int,
+        indicator_set_id: str,
+        cfg_hash: str,
+    ) -> Optional[IndicatorSnapshotEntity]:
+        """
+        Full recompute from history and (re)initialize the running state.
+
+        Args:
+            candles: Closed candles in ascending open_time order (typically the last
+                `ComputeIndicatorsUseCase.required_bars_for(...)` candles).
+
+        Returns:
+            Snapshot for the last candle, or None if not enough candles.
+            State is only kept when every indicator could be computed.
+        """
+        params = IndicatorParams(
+            indicator_set_id=str(indicator_set_id),
+            cfg_hash=str(cfg_hash),
+            ema_fast=int(ema_fast),
+            ema_slow=int(ema_slow),
+            atr_window=int(atr_window),
+        )
+        return self.seed_many(candles, stream_key=stream_key, params=[params]).get(params.cfg_hash)
+
+    def seed_many(
+        self,
+        candles: List[CandleEntity],
+        *,
+        stream_key: str,
+        params: List[IndicatorParams],
+    ) -> Dict[str, IndicatorSnapshotEntity]:
+        """
+        Seed many indicator sets of one stream from a single shared candle window.
+
+        Each distinct EMA period / ATR window is computed once.
+
+        Returns:
+            Dict cfg_hash -> snapshot for the last candle (sets without enough candles are omitted).
+        """
+        sk = str(stream_key)
+        for p in params:
+            self._states.pop((sk, p.cfg_hash), None)
+
+        if not candles or not params:
+            return {}
+
+        ema_by_period, _, trs = self._svc.compute_last_values(
+            candles,
+            ema_periods=[x for p in params for x in (p.ema_fast, p.ema_slow)],
+            atr_windows=[],
+        )
+        snapshots = self._svc.compute_snapshots_for_last(candles, params)
+
+        last = candles[-1]
+        for p in params:
+            if p.cfg_hash not in snapshots:
+                continue
+
+            ema_f = ema_by_period.get(int(p.ema_fast))
+            ema_s = ema_by_period.get(int(p.ema_slow))
+            window = int(p.atr_window)
+            if ema_f is None or ema_s is None or window <= 0 or len(trs) < window:
+                continue
+
+            tail = trs[-window:]
+            self._states[(sk, p.cfg_hash)] = IndicatorState(
+                ema_fast_period=int(p.ema_fast),
+                ema_slow_period=int(p.ema_slow),
+                atr_window=window,
+                last_open_time=int(last.open_time),
+                prev_close=float(last.close),
+                ema_fast=float(ema_f),
+                ema_slow=float(ema_s),
+                trs=deque(tail),
+                tr_sum=float(sum(tail)),
+            )
+            self._seeds += 1
+
+        return snapshots
+
+    def advance(
+        self,
+        candle: CandleEntity,
+        *,
+        indicator_set_id: str,
+        cfg_hash: str,
+    ) -> Optional[IndicatorSnapshotEntity]:
+        """
+        Apply one newly closed candle to the running state in O(1).
+
+        Returns:
+            The snapshot for `candle`, or None when there is no state or when the candle
+            is not the direct successor of the last applied candle (state is dropped).
+        """
+        key = (str(candle.stream_key), str(cfg_hash))
+        st = self._states.get(key)
+        if st is None:
+            return None
+
+        step = self._interval_ms(candle)
+        if int(candle.open_time) != st.last_open_time + step:
+            self._logger.debug(
+                "Indicator state reset (gap/out-of-order) stream_key=%s cfg_hash=%s last=%s got=%s",
+                candle.stream_key,
+                cfg_hash,
+                st.last_open_time,
+                candle.open_time,
+            )
+            self._states.pop(key, None)
+            self._resets += 1
+            return None
+
+        h = float(candle.high)
+        l = float(candle.low)
+        c = float(candle.close)
+        prev_c = st.prev_close
+
+        tr = max(h - l, abs(h - prev_c), abs(l - prev_c))
+        st.trs.append(tr)
+        st.tr_sum += tr
+        if len(st.trs) > st.atr_window:
+            st.tr_sum -= st.trs.popleft()
+
+        # Re-sum once per full window to keep float drift bounded (amortized O(1)).
+        st.updates_since_resync += 1
+        if st.updates_since_resync >= st.atr_window:
+            st.tr_sum = float(sum(st.trs))
+            st.updates_since_resync = 0
+
+        k_fast = 2.0 / (st.ema_fast_period + 1.0)
+        k_slow = 2.0 / (st.ema_slow_period + 1.0)
+        st.ema_fast = (c - st.ema_fast) * k_fast + st.ema_fast
+        st.ema_slow = (c - st.ema_slow) * k_slow + st.ema_slow
+
+        st.prev_close = c
+        st.last_open_time = int(candle.open_time)
+        self._advances += 1
+
+        return self._svc.build_snapshot(
+            candle,
+            ema_fast=st.ema_fast,
+            ema_slow=st.ema_slow,
+            atr=st.tr_sum / float(st.atr_window),
+            indicator_set_id=indicator_set_id,
+            cfg_hash=cfg_hash,
+        )
+
+    def _interval_ms(self, candle: CandleEntity) -> int:
+        """
+        Resolve the candle interval in ms (falls back to the candle's own span).
+        """
+        ms = IntervalService.to_ms(candle.interval)
+        if ms is not None:
+            return ms
+        return int(candle.close_time) - int(candle.open_time) + 1
@@ -1,11 +1,36 @@
 # core/services/indicator_calculation_service.py
 from __future__ import annotations
 
+from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import List, Optional
+from typing import Dict, Iterable, List, Optional, Tuple
 
 from core.domain.entities.candle_entity import CandleEntity
 from core.domain.entities.indicator_entity import IndicatorSnapshotEntity
+from core.domain.entities.indicator_set_entity import IndicatorSetEntity
+
+
+@dataclass(frozen=True)
+class IndicatorParams:
+    """
+    Minimal indicator-set parameters needed for calculation.
+    """
+
+    indicator_set_id: str
+    cfg_hash: str
+    ema_fast: int
+    ema_slow: int
+    atr_window: int
+
+    @classmethod
+    def from_indicator_set(cls, indset: IndicatorSetEntity) -> "IndicatorParams":
+        return cls(
+            indicator_set_id=str(indset.cfg_hash),
+            cfg_hash=str(indset.cfg_hash),
+            ema_fast=int(indset.ema_fast),
+            ema_slow=int(indset.ema_slow),
+            atr_window=int(indset.atr_window),
+        )
 
 
 class IndicatorCalculationService:
@@ -52,7 +77,110 @@ class IndicatorCalculationService:
         ema_s = self._ema(closes, int(ema_slow))
         atr = self._atr(highs, lows, closes, int(atr_window))
 
-        last = candles[-1]
+        return self.build_snapshot(
+            candles[-1],
+            ema_fast=ema_f,
+            ema_slow=ema_s,
+            atr=atr,
+            indicator_set_id=indicator_set_id,
+            cfg_hash=cfg_hash,
+        )
+
+    def compute_last_values(
+        self,
+        candles: List[CandleEntity],
+        *,
+        ema_periods: Iterable[int],
+        atr_windows: Iterable[int],
+    ) -> Tuple[Dict[int, Optional[float]], Dict[int, Optional[float]], List[float]]:
+        """
+        Compute each distinct EMA period and ATR window once over a shared candle window.
+
+        Args:
+            candles: Closed candles in ascending open_time order.
+            ema_periods: EMA periods needed (duplicates are computed once).
+            atr_windows: ATR windows needed (duplicates are computed once).
+
+        Returns:
+            (ema_by_period, atr_by_window, true_ranges)
+        """
+        closes = [float(c.close) for c in candles]
+        highs = [float(c.high) for c in candles]
+        lows = [float(c.low) for c in candles]
+
+        trs = self._true_ranges(highs, lows, closes)
+
+        ema_by_period: Dict[int, Optional[float]] = {}
+        for p in {int(x) for x in ema_periods}:
+            ema_by_period[p] = self._ema(closes, p)
+
+        atr_by_window: Dict[int, Optional[float]] = {}
+        for w in {int(x) for x in atr_windows}:
+            if w <= 0 or len(trs) < w:
+                atr_by_window[w] = None
+            else:
+                atr_by_window[w] = sum(trs[-w:]) / float(w)
+
+        return ema_by_period, atr_by_window, trs
+
+    def compute_snapshots_for_last(
+        self,
+        candles: List[CandleEntity],
+        params: List[IndicatorParams],
+    ) -> Dict[str, IndicatorSnapshotEntity]:
+        """
+        Compute snapshots for the last candle for many indicator sets sharing one window.
+
+        Returns:
+            Dict cfg_hash -> snapshot (sets without enough candles are omitted).
+        """
+        if not candles or not params:
+            return {}
+
+        ema_by_period, atr_by_window, _ = self.compute_last_values(
+            candles,
+            ema_periods=[x for p in params for x in (p.ema_fast, p.ema_slow)],
+            atr_windows=[p.atr_window for p in params],
+        )
+
+        out: Dict[str, IndicatorSnapshotEntity] = {}
+        for p in params:
+            if len(candles) < max(int(p.ema_slow), int(p.atr_window)):
+                continue
+            out[p.cfg_hash] = self.build_snapshot(
+                candles[-1],
+                ema_fast=ema_by_period.get(int(p.ema_fast)),
+                ema_slow=ema_by_period.get(int(p.ema_slow)),
+                atr=atr_by_window.get(int(p.atr_window)),
+                indicator_set_id=p.indicator_set_id,
+                cfg_hash=p.cfg_hash,
+            )
+        return out
+
+    def build_snapshot(
+        self,
+        last: CandleEntity,
+        *,
+        ema_fast: Optional[float],
+        ema_slow: Optional[float],
+        atr: Optional[float],
+        indicator_set_id: str,
+        cfg_hash: str,
+    ) -> IndicatorSnapshotEntity:
+        """
+        Build a snapshot entity for `last` from already computed indicator values.
+
+        Args:
+            last: The candle the snapshot refers to.
+            ema_fast: EMA fast value (None -> 0.0).
+            ema_slow: EMA slow value (None -> 0.0).
+            atr: ATR value in price units (None -> atr_pct 0.0).
+            indicator_set_id: Indicator set identifier.
+            cfg_hash: Config hash.
+
+        Returns:
+            A typed snapshot entity.
+        """
         close = float(last.close)
 
         atr_pct = 0.0
@@ -68,8 +196,8 @@ class IndicatorCalculationService:
             interval=str(last.interval),
             ts=int(last.close_time),
             close=float(close),
-            ema_fast=float(ema_f) if ema_f is not None else 0.0,
-            ema_slow=float(ema_s) if ema_s is not None else 0.0,
+            ema_fast=float(ema_fast) if ema_fast is not None else 0.0,
+            ema_slow=float(ema_slow) if ema_slow is not None else 0.0,
             atr_pct=float(atr_pct),
             indicator_set_id=str(indicator_set_id),
             cfg_hash=str(cfg_hash),
@@ -94,6 +222,16 @@ class IndicatorCalculationService:
         """
         if period <= 0 or len(closes) < period + 1:
             return None
+        trs = self._true_ranges(highs, lows, closes)
+
+        window = trs[-period:]
+        return sum(window) / float(period)
+
+    @staticmethod
+    def _true_ranges(highs: List[float], lows: List[float], closes: List[float]) -> List[float]:
+        """
+        Compute the true range series (one value per candle after the first).
+        """
         trs: List[float] = []
         for i in range(1, len(closes)):
             h = highs[i]
@@ -101,6 +239,4 @@ class IndicatorCalculationService:
             prev_c = closes[i - 1]
             tr = max(h - l, abs(h - prev_c), abs(l - prev_c))
             trs.append(tr)
-
-        window = trs[-period:]
-        return sum(window) / float(period)
+        return trs
@@ -0,0 +1,60 @@
+# core/services/interval_service.py
+from __future__ import annotations
+
+from typing import Iterable, List, Optional
+
+
+class IntervalService:
+    """
+    Candle interval helpers (Binance-style interval strings).
+
+    Buckets are aligned to the Unix epoch in UTC (same alignment as Binance klines),
+    so "4h" buckets start at 00:00, 04:00, ... and "1d" at 00:00 UTC.
+    """
+
+    BASE_INTERVAL = "1m"
+
+    INTERVAL_MS = {
+        "1m": 60_000,
+        "5m": 5 * 60_000,
+        "15m": 15 * 60_000,
+        "1h": 60 * 60_000,
+        "4h": 4 * 60 * 60_000,
+        "1d": 24 * 60 * 60_000,
+    }
+
+    @classmethod
+    def to_ms(cls, interval: str) -> Optional[int]:
+        """
+        Convert a supported interval to milliseconds (None if unsupported).
+        """
+        return cls.INTERVAL_MS.get(str(interval).strip().lower())
+
+    @classmethod
+    def bucket_open(cls, ts_ms: int, interval: str) -> int:
+        """
+        Open time of the bucket containing ts_ms.
+
+        Raises:
+            ValueError: If the interval is not supported.
+        """
+        ms = cls.to_ms(interval)
+        if ms is None:
+            raise ValueError(f"Unsupported interval: {interval}")
+        return (int(ts_ms) // ms) * ms
+
+    @classmethod
+    def parse_rollups(cls, raw: Optional[str] | Iterable[str]) -> List[str]:
+        """
+        Parse a rollup interval list ("5m,15m,1h") keeping only supported intervals
+        above the base interval, ordered by duration.
+        """
+        if raw is None:
+            return []
+        items = raw.split(",") if isinstance(raw, str) else list(raw)
+        out = {
+            str(x).strip().lower()
+            for x in items
+            if str(x).strip().lower() in cls.INTERVAL_MS and str(x).strip().lower() != cls.BASE_INTERVAL
+        }
+        return sorted(out, key=lambda x: cls.INTERVAL_MS[x])
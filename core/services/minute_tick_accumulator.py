@@ -0,0 +1,47 @@
+# core/services/minute_tick_accumulator.py
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional
+
+from core.domain.entities.price_tick_entity import PriceTickEntity
+
+
+@dataclass
+class MinuteTickAccumulator:
+    """
+    Running OHLCV of the ticks of one 1-minute bucket, in arrival (ts) order.
+
+    Holds exactly what BuildCandleFromTicksUseCase derives from the stored ticks:
+    first/last/min/max price, summed volume and trades, and the last tick's extras.
+    """
+
+    minute_open_time: int
+
+    open: Optional[float] = None
+    high: Optional[float] = None
+    low: Optional[float] = None
+    close: Optional[float] = None
+    volume: float = 0.0
+    trades: int = 0
+    count: int = 0
+
+    last_ts: Optional[int] = None
+    last_extras: Dict[str, Any] = field(default_factory=dict)
+
+    def add(self, tick: PriceTickEntity) -> None:
+        """
+        Apply a tick of this minute (ticks must arrive with non-decreasing ts).
+        """
+        price = float(tick.price)
+        if self.count == 0:
+            self.open = self.high = self.low = price
+        else:
+            self.high = max(float(self.high), price)
+            self.low = min(float(self.low), price)
+        self.close = price
+        self.volume += float(tick.volume or 0.0)
+        self.trades += int(tick.trades or 0)
+        self.count += 1
+        self.last_ts = int(tick.ts)
+        self.last_extras = dict(tick.extras or {})
@@ -0,0 +1,101 @@
+# core/services/price_math.py
+from __future__ import annotations
+
+from decimal import Decimal, localcontext
+from fractions import Fraction
+from typing import List, Sequence, Union
+
+import numpy as np
+
+Q96 = 1 << 96
+Q192 = 1 << 192
+
+# Significant digits of prices returned as Decimal (rounded once, at the end)
+PRICE_PRECISION = 40
+
+_POW10 = [10**k for k in range(78)]
+
+Number = Union[int, str, float, Decimal, Fraction]
+
+
+def _pow10(k: int) -> int:
+    return _POW10[k] if 0 <= k < len(_POW10) else 10**k
+
+
+def price_token1_per_token0(*, sqrt_price_x96: int, decimals0: int, decimals1: int) -> Fraction:
+    """
+    Exact Uniswap V3 spot price:
+      price(token1/token0) = (sqrtPriceX96^2 / 2^192) * 10^(decimals0 - decimals1)
+    """
+    sp = int(sqrt_price_x96)
+    if sp < 0:
+        raise ValueError("invalid_sqrt_price")
+    shift = int(decimals0) - int(decimals1)
+    if shift >= 0:
+        return Fraction(sp * sp * _pow10(shift), Q192)
+    return Fraction(sp * sp, Q192 * _pow10(-shift))
+
+
+def to_fraction(v: Number) -> Fraction:
+    """Exact conversion of ints, decimal strings, floats and Decimals."""
+    if isinstance(v, Fraction):
+        return v
+    if isinstance(v, str):
+        return Fraction(Decimal(v.strip()))
+    return Fraction(v)
+
+
+def to_decimal(v: Fraction, *, precision: int = PRICE_PRECISION) -> Decimal:
+    """
+    Round an exact price to `precision` significant digits (local context only:
+    the process-wide Decimal context is left untouched).
+    """
+    with localcontext() as ctx:
+        ctx.prec = int(precision)
+        return Decimal(v.numerator) / Decimal(v.denominator)
+
+
+def prices_token1_per_token0(
+    *,
+    sqrt_prices_x96: Sequence[int],
+    decimals0: Union[int, Sequence[int]],
+    decimals1: Union[int, Sequence[int]],
+    precision: int = PRICE_PRECISION,
+) -> List[Decimal]:
+    """
+    Exact prices of many pools, rounded to `precision` significant digits.
+
+    Decimals may be scalars (same token pair, e.g. history of one pool) or one per pool.
+    """
+    n = len(sqrt_prices_x96)
+    d0 = [int(decimals0)] * n if isinstance(decimals0, int) else [int(x) for x in decimals0]
+    d1 = [int(decimals1)] * n if isinstance(decimals1, int) else [int(x) for x in decimals1]
+    if len(d0) != n or len(d1) != n:
+        raise ValueError("decimals_length_mismatch")
+
+    out: List[Decimal] = []
+    with localcontext() as ctx:
+        ctx.prec = int(precision)
+        q192 = Decimal(Q192)
+        for sp, a, b in zip(sqrt_prices_x96, d0, d1):
+            sp = int(sp)
+            shift = a - b
+            if shift >= 0:
+                out.append(Decimal(sp * sp * _pow10(shift)) / q192)
+            else:
+                out.append(Decimal(sp * sp) / Decimal(Q192 * _pow10(-shift)))
+    return out
+
+
+def prices_token1_per_token0_array(
+    *,
+    sqrt_prices_x96: Sequence[int],
+    decimals0: Union[int, Sequence[int]],
+    decimals1: Union[int, Sequence[int]],
+) -> np.ndarray:
+    """
+    float64 prices of many pools at once (analytics / charts, ~15 significant digits).
+    """
+    sqrt_ratio = np.fromiter((float(x) for x in sqrt_prices_x96), dtype=np.float64) * 2.0**-96
+    shift = np.asarray(decimals0, dtype=np.int64) - np.asarray(decimals1, dtype=np.int64)
+    return sqrt_ratio * sqrt_ratio * np.power(10.0, shift.astype(np.float64))
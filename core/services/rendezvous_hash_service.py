@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+import hashlib
+from typing import Dict, Iterable, List, Optional, Sequence
+
+
+class RendezvousHashService:
+    """
+    Highest-random-weight (rendezvous) hashing of keys onto nodes.
+
+    Every node computes the same owner for a key from the same node list, without
+    coordination; when a node joins or leaves, only the keys it wins or owned move.
+    """
+
+    @staticmethod
+    def _weight(node: str, key: str) -> int:
+        digest = hashlib.blake2b(f"{node}\x00{key}".encode("utf-8"), digest_size=8).digest()
+        return int.from_bytes(digest, "big")
+
+    @staticmethod
+    def owner(key: str, nodes: Sequence[str]) -> Optional[str]:
+        """Node owning `key` (None when there are no nodes)."""
+        if not nodes:
+            return None
+        return max(nodes, key=lambda n: (RendezvousHashService._weight(n, key), n))
+
+    @staticmethod
+    def assign(keys: Iterable[str], nodes: Sequence[str]) -> Dict[str, List[str]]:
+        """Keys per node (every node present, possibly with no keys)."""
+        out: Dict[str, List[str]] = {n: [] for n in nodes}
+        for key in keys:
+            node = RendezvousHashService.owner(key, nodes)
+            if node is not None:
+                out[node].append(key)
+        return out
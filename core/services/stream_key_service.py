@@ -30,3 +30,34 @@ class StreamKeyService:
             return f"{src}:{sym}:{itv}:{pool}"
 
         return f"{src}:{sym}:{itv}"
+
+    @staticmethod
+    def stream_id(
+        *,
+        source_type: str,
+        source: str,
+        symbol: str,
+        interval: str,
+        pool_address: Optional[str] = None,
+    ) -> str:
+        """
+        Identity of an ingestion stream definition: "{source_type}|{stream_key}".
+
+        Stable across replicas (used as the stream lease id).
+        """
+        stype = (source_type or "").strip().lower()
+        return f"{stype}|{StreamKeyService.build(source=source, symbol=symbol, interval=interval, pool_address=pool_address)}"
+
+    @staticmethod
+    def with_interval(stream_key: str, interval: str) -> str:
+        """
+        Key of the same stream on another interval (replaces the interval segment).
+
+        Raises:
+            ValueError: If stream_key is not a "{source}:{symbol}:{interval}[:{pool}]" key.
+        """
+        parts = str(stream_key).strip().split(":")
+        if len(parts) < 3:
+            raise ValueError(f"Invalid stream_key: {stream_key}")
+        parts[2] = (interval or "").strip().lower()
+        return ":".join(parts)
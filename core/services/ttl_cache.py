@@ -0,0 +1,132 @@
+# core/services/ttl_cache.py
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Generic, Hashable, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+@dataclass
+class _Entry(Generic[T]):
+    value: T
+    loaded_at: float
+
+
+class AsyncTTLCache(Generic[T]):
+    """
+    In-memory async cache with TTL, stale-while-revalidate and single-flight loads.
+
+    - Fresh entries (age <= ttl_s) are returned as-is.
+    - Stale entries (ttl_s < age <= ttl_s + stale_s) are returned immediately and
+      refreshed in background (one refresh per key at a time).
+    - Misses (or entries older than ttl_s + stale_s) wait for the loader; concurrent
+      callers of the same key share one in-flight load.
+    - Loader errors are not cached; every waiter of that load gets the exception.
+    - At most `max_entries` keys are kept (least recently used evicted first).
+    """
+
+    def __init__(
+        self,
+        *,
+        ttl_s: float,
+        stale_s: float = 0.0,
+        max_entries: int = 10_000,
+        logger: logging.Logger | None = None,
+    ) -> None:
+        self._ttl_s = max(0.0, float(ttl_s))
+        self._stale_s = max(0.0, float(stale_s))
+        self._max_entries = max(1, int(max_entries))
+        self._logger = logger or logging.getLogger(self.__class__.__name__)
+
+        self._entries: "OrderedDict[Hashable, _Entry[T]]" = OrderedDict()
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.load_errors = 0
+
+    async def get_or_load(self, key: Hashable, loader: Callable[[], Awaitable[T]]) -> T:
+        """
+        Return the cached value of `key`, loading it with `loader()` when needed.
+        """
+        now = time.monotonic()
+        entry = self._entries.get(key)
+        if entry is not None:
+            age = now - entry.loaded_at
+            if age <= self._ttl_s:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return entry.value
+            if age <= self._ttl_s + self._stale_s:
+                self.stale_hits += 1
+                self._entries.move_to_end(key)
+                if key not in self._inflight:
+                    self._start_load(key, loader).add_done_callback(self._log_refresh_error)
+                return entry.value
+
+        task = self._inflight.get(key)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            self.misses += 1
+            task = self._start_load(key, loader)
+        # Shielded: a cancelled caller must not cancel the load shared with other callers.
+        return await asyncio.shield(task)
+
+    def put(self, key: Hashable, value: T) -> None:
+        """Store a value loaded elsewhere (e.g. by a batched query)."""
+        self._store(key, value)
+
+    def invalidate(self, key: Optional[Hashable] = None) -> None:
+        """Drop one key (or everything when key is None)."""
+        if key is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(key, None)
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for observability."""
+        return {
+            "entries": len(self._entries),
+            "inflight": len(self._inflight),
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "load_errors": self.load_errors,
+        }
+
+    def _start_load(self, key: Hashable, loader: Callable[[], Awaitable[T]]) -> asyncio.Task:
+        task = asyncio.create_task(self._run_loader(key, loader))
+        self._inflight[key] = task
+        task.add_done_callback(lambda t: self._inflight.pop(key, None) if self._inflight.get(key) is t else None)
+        return task
+
+    async def _run_loader(self, key: Hashable, loader: Callable[[], Awaitable[T]]) -> T:
+        try:
+            value = await loader()
+        except Exception:
+            self.load_errors += 1
+            raise
+        self._store(key, value)
+        return value
+
+    def _log_refresh_error(self, task: asyncio.Task) -> None:
+        if task.cancelled():
+            return
+        exc = task.exception()
+        if exc is not None:
+            self._logger.warning("Background refresh failed: %s", exc)
+
+    def _store(self, key: Hashable, value: T) -> None:
+        self._entries[key] = _Entry(value=value, loaded_at=time.monotonic())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
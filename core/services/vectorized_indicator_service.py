@@ -0,0 +1,207 @@
+# core/services/vectorized_indicator_service.py
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from core.repositories.candle_repository import CandleColumns
+
+
+@dataclass
+class RecomputeState:
+    """
+    Carried state between batches of a full-history recompute.
+
+    Persisting this next to the last processed open_time makes the job resumable.
+    """
+
+    count: int = 0  # candles consumed so far
+    prev_close: Optional[float] = None
+    ema_fast: Optional[float] = None
+    ema_slow: Optional[float] = None
+    tr_tail: List[float] = field(default_factory=list)  # last (atr_window) true ranges
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "count": int(self.count),
+            "prev_close": self.prev_close,
+            "ema_fast": self.ema_fast,
+            "ema_slow": self.ema_slow,
+            "tr_tail": [float(x) for x in self.tr_tail],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Optional[Dict[str, Any]]) -> "RecomputeState":
+        data = data or {}
+        return cls(
+            count=int(data.get("count") or 0),
+            prev_close=data.get("prev_close"),
+            ema_fast=data.get("ema_fast"),
+            ema_slow=data.get("ema_slow"),
+            tr_tail=[float(x) for x in (data.get("tr_tail") or [])],
+        )
+
+
+@dataclass
+class IndicatorSeries:
+    """
+    Indicator values for the candles of one batch that produce a snapshot.
+    """
+
+    index: np.ndarray  # positions inside the batch
+    ema_fast: np.ndarray
+    ema_slow: np.ndarray
+    atr_pct: np.ndarray
+
+
+class VectorizedIndicatorService:
+    """
+    NumPy implementation of the indicator math over full candle series (no I/O).
+
+    Definitions match IndicatorCalculationService:
+      - EMA seeded with the SMA of the first `period` closes, then ema = (v - ema) * k + ema.
+      - ATR = SMA of the last `atr_window` true ranges.
+      - A snapshot exists for the i-th candle once i + 1 >= max(ema_slow, atr_window).
+
+    The EMA recurrence is evaluated in blocks with a closed form:
+      y[i] = a^(i+1) * y0 + k * a^i * cumsum(x[j] * a^-j)
+    where the block length keeps a^-j below ~1e200 (no overflow; terms grow
+    geometrically so the cumsum stays dominated by its last terms).
+    """
+
+    _MAX_GROWTH = 1e200
+
+    def compute_batch(
+        self,
+        cols: CandleColumns,
+        state: RecomputeState,
+        *,
+        ema_fast: int,
+        ema_slow: int,
+        atr_window: int,
+    ) -> IndicatorSeries:
+        """
+        Advance `state` over one batch and return the snapshot values for this batch.
+
+        Note:
+            Batches must be consumed in ascending open_time order and the first batch
+            must hold at least max(ema_fast, ema_slow) candles (or be the whole series).
+        """
+        closes = np.asarray(cols.close, dtype=np.float64)
+        highs = np.asarray(cols.high, dtype=np.float64)
+        lows = np.asarray(cols.low, dtype=np.float64)
+        n = int(closes.shape[0])
+
+        empty = np.empty(0, dtype=np.float64)
+        if n == 0:
+            return IndicatorSeries(index=np.empty(0, dtype=np.int64), ema_fast=empty, ema_slow=empty, atr_pct=empty)
+
+        start_count = int(state.count)
+        global_idx = start_count + np.arange(n, dtype=np.int64)
+
+        ema_f_vals, state.ema_fast = self._ema_series(closes, int(ema_fast), start_count, state.ema_fast)
+        ema_s_vals, state.ema_slow = self._ema_series(closes, int(ema_slow), start_count, state.ema_slow)
+
+        # True ranges (the very first candle of the series has none)
+        if state.prev_close is None:
+            prev = closes[:-1]
+            tr = np.maximum.reduce(
+                [highs[1:] - lows[1:], np.abs(highs[1:] - prev), np.abs(lows[1:] - prev)]
+            )
+            tr_owner = np.arange(1, n, dtype=np.int64)
+        else:
+            prev = np.concatenate(([float(state.prev_close)], closes[:-1]))
+            tr = np.maximum.reduce([highs - lows, np.abs(highs - prev), np.abs(lows - prev)])
+            tr_owner = np.arange(n, dtype=np.int64)
+
+        w = int(atr_window)
+        atr_vals = np.full(n, np.nan, dtype=np.float64)
+        tail = np.asarray(state.tr_tail, dtype=np.float64)
+        if w > 0:
+            full = np.concatenate((tail, tr))
+            cs = np.concatenate(([0.0], np.cumsum(full)))
+            pos = tail.shape[0] + np.arange(tr.shape[0], dtype=np.int64)  # position of each TR in `full`
+            ok = pos + 1 >= w
+            ends = pos[ok] + 1
+            atr_vals[tr_owner[ok]] = (cs[ends] - cs[ends - w]) / float(w)
+            state.tr_tail = [float(x) for x in full[-w:]]
+
+        state.prev_close = float(closes[-1])
+        state.count = start_count + n
+
+        need = max(int(ema_slow), int(atr_window))
+        mask = global_idx + 1 >= need
+        idx = np.nonzero(mask)[0]
+
+        close_sel = closes[idx]
+        atr_sel = atr_vals[idx]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            atr_pct = np.where((close_sel > 0) & ~np.isnan(atr_sel), atr_sel / close_sel, 0.0)
+
+        return IndicatorSeries(
+            index=idx,
+            ema_fast=np.nan_to_num(ema_f_vals[idx], nan=0.0),
+            ema_slow=np.nan_to_num(ema_s_vals[idx], nan=0.0),
+            atr_pct=atr_pct,
+        )
+
+    def _ema_series(
+        self,
+        values: np.ndarray,
+        period: int,
+        start_count: int,
+        ema0: Optional[float],
+    ) -> tuple[np.ndarray, Optional[float]]:
+        """
+        EMA values for every element of `values` (NaN while not yet defined).
+
+        Returns:
+            (values, carried_last_ema)
+        """
+        n = int(values.shape[0])
+        out = np.full(n, np.nan, dtype=np.float64)
+        if period <= 0:
+            return out, None
+
+        offset = 0
+        prev = ema0
+        if prev is None:
+            # The SMA seed (global index period - 1) must fall inside the first batch.
+            seed_local = period - 1
+            if start_count != 0 or seed_local >= n:
+                return out, None
+            prev = float(values[:period].mean())
+            out[seed_local] = prev
+            offset = period
+
+        rest = values[offset:]
+        if rest.shape[0]:
+            out[offset:] = self._ema_from(rest, 2.0 / (period + 1.0), float(prev))
+            prev = float(out[-1])
+        return out, prev
+
+    def _ema_from(self, x: np.ndarray, k: float, y0: float) -> np.ndarray:
+        """
+        Evaluate y[i] = (1 - k) * y[i-1] + k * x[i] with y[-1] = y0, block-wise.
+        """
+        a = 1.0 - k
+        m_total = int(x.shape[0])
+        if a <= 0.0:
+            return x.astype(np.float64, copy=True)
+
+        block = max(1, int(math.log(self._MAX_GROWTH) / -math.log(a)))
+        out = np.empty(m_total, dtype=np.float64)
+        prev = float(y0)
+        for s in range(0, m_total, block):
+            seg = x[s : s + block]
+            m = int(seg.shape[0])
+            j = np.arange(m, dtype=np.float64)
+            a_pow = np.power(a, j)  # a^i
+            acc = np.cumsum(seg * np.power(a, -j))
+            y = a_pow * a * prev + k * a_pow * acc
+            out[s : s + m] = y
+            prev = float(y[-1])
+        return out
@@ -1,13 +1,28 @@
 # core/usecases/backfill_candles_use_case.py
 from __future__ import annotations
 
+import asyncio
 import logging
-from typing import Any, List, Optional
+import time
+from dataclasses import dataclass, field
+from typing import Any, List, Optional, Tuple
 
 from adapters.external.binance.binance_rest_client import BinanceRestClient  # type: ignore
 from core.domain.entities.candle_entity import CandleEntity
 from core.repositories.candle_repository import CandleRepository
 from core.repositories.processing_offset_repository import ProcessingOffsetRepository
+from core.services.interval_service import IntervalService
+from core.services.stream_key_service import StreamKeyService
+
+
+@dataclass
+class GapFillResult:
+    """
+    Outcome of BackfillCandlesUseCase.execute_with_gaps.
+    """
+
+    written: int = 0
+    ranges: List[Tuple[int, int]] = field(default_factory=list)  # [from, to] open_times of filled gaps
 
 
 class BackfillCandlesUseCase:
@@ -27,17 +42,22 @@ class BackfillCandlesUseCase:
         self._offsets = processing_offset_repository
         self._logger = logger or logging.getLogger(self.__class__.__name__)
 
-    async def execute_for_symbol(self, *, source: str, symbol: str, interval: str) -> None:
+    async def execute_for_symbol(self, *, source: str, symbol: str, interval: str) -> int:
         """
         Backfill candles for a (source, symbol, interval) stream based on stored offsets.
+
+        Each REST page is written with one bulk upsert, then the offset is committed once
+        for the page. The next page is fetched while the current one is being written.
+
+        Returns:
+            Number of candles written.
         """
-        symbol_upper = symbol.upper()
         interval = str(interval)
         stream_key = self._build_stream_key(source=source, symbol=symbol, interval=interval)
 
         interval_ms = self._interval_to_ms(interval)
         if interval_ms is None:
-            return
+            return 0
 
         offset_ent = await self._offsets.get_by_stream(stream_key)
         last_open_time: Optional[int] = None
@@ -46,74 +66,216 @@ class BackfillCandlesUseCase:
 
         if last_open_time is None:
             self._logger.info("No existing offset for %s; skipping backfill.", stream_key)
-            return
+            return 0
 
         start_time = last_open_time + interval_ms
         if start_time <= 0:
-            return
+            return 0
 
-        limit = 1000
-        while True:
-            klines: List[List[Any]] = await self._binance.get_klines(
-                symbol=symbol_upper,
+        t0 = time.monotonic()
+        total = await self._backfill_range(
+            stream_key=stream_key,
+            source=source,
+            symbol=symbol.upper(),
+            interval=interval,
+            start_time=start_time,
+            end_time=None,
+            commit_offset=True,
+        )
+        self._log_done(stream_key, total, t0)
+        return total
+
+    async def execute_with_gaps(
+        self,
+        *,
+        source: str,
+        symbol: str,
+        interval: str,
+        initial_history_ms: int = 0,
+        gap_lookback_ms: int = 7 * 24 * 60 * 60_000,
+    ) -> GapFillResult:
+        """
+        Fill every missing candle range of a stream, not only the tail after the offset.
+
+        Rules:
+          - Streams without candles get `initial_history_ms` of history (0 disables).
+          - Existing streams are scanned for holes over the last `gap_lookback_ms`
+            (bounded by their first candle), plus the tail up to the last closed candle.
+          - The offset is only moved forward (by ranges past the current offset).
+
+        Returns:
+            Candles written and the gap ranges that received candles (derived data such
+            as rollups covering them must be recomputed).
+        """
+        interval = str(interval)
+        stream_key = self._build_stream_key(source=source, symbol=symbol, interval=interval)
+        result = GapFillResult()
+
+        interval_ms = self._interval_to_ms(interval)
+        if interval_ms is None:
+            return result
+
+        now_ms = int(time.time() * 1000)
+        end = (now_ms // interval_ms) * interval_ms - interval_ms  # last closed open_time
+
+        offset_ent = await self._offsets.get_by_stream(stream_key)
+        offset = int(offset_ent.last_closed_open_time) if offset_ent is not None else None
+
+        last = await self._candles.get_last_n_closed(stream_key, 1)
+        if not last:
+            if initial_history_ms <= 0:
+                self._logger.info("No candles for %s and no initial history configured; skipping backfill.", stream_key)
+                return result
+            gaps = [(end - (int(initial_history_ms) // interval_ms - 1) * interval_ms, end)]
+        else:
+            scan_from = end - int(gap_lookback_ms)
+            first = await self._first_open_time(stream_key, scan_from)
+            gaps = await self._candles.find_gaps(
+                stream_key,
+                interval_ms=interval_ms,
+                start_open_time=max(scan_from, first if first is not None else scan_from),
+                end_open_time=end,
+            )
+
+        if not gaps:
+            return result
+
+        t0 = time.monotonic()
+        for gap_from, gap_to in gaps:
+            n = await self._backfill_range(
+                stream_key=stream_key,
+                source=source,
+                symbol=symbol.upper(),
                 interval=interval,
-                start_time=start_time,
-                end_time=None,
-                limit=limit,
+                start_time=int(gap_from),
+                end_time=int(gap_to) + interval_ms - 1,
+                commit_offset=offset is None or int(gap_to) > offset,
             )
+            if n:
+                result.written += n
+                result.ranges.append((int(gap_from), int(gap_to)))
+
+        self._logger.info("Backfill gaps stream_key=%s ranges=%s", stream_key, len(gaps))
+        self._log_done(stream_key, result.written, t0)
+        return result
+
+    async def _first_open_time(self, stream_key: str, scan_from: int) -> Optional[int]:
+        """
+        open_time of the first stored candle at or after scan_from (None if none).
+        """
+        async for cols in self._candles.iter_closed_columns(stream_key, after_open_time=scan_from - 1, batch_size=1):
+            return int(cols.open_time[0]) if len(cols) else None
+        return None
+
+    async def _backfill_range(
+        self,
+        *,
+        stream_key: str,
+        source: str,
+        symbol: str,
+        interval: str,
+        start_time: int,
+        end_time: Optional[int],
+        commit_offset: bool,
+    ) -> int:
+        """
+        Fetch and store closed klines in [start_time, end_time] page by page.
 
-            if not klines:
-                break
-
-            last_batch_open_time: Optional[int] = None
-
-            for k in klines:
-                open_time = int(k[0])
-                close_time = int(k[6])
-                o = float(k[1])
-                h = float(k[2])
-                l = float(k[3])
-                c = float(k[4])
-                v = float(k[5])
-                trades = int(k[8]) if len(k) > 8 else 0
-
-                candle = CandleEntity(
-                    stream_key=stream_key,
-                    source=str(source),
-                    symbol=symbol_upper,
+        Returns:
+            Number of candles written.
+        """
+        interval_ms = int(self._interval_to_ms(interval) or 0)
+        limit = 1000
+        total = 0
+
+        def _fetch(start: int) -> asyncio.Task:
+            return asyncio.create_task(
+                self._binance.get_klines(
+                    symbol=symbol,
                     interval=interval,
-                    open_time=open_time,
-                    close_time=close_time,
-                    open=o,
-                    high=h,
-                    low=l,
-                    close=c,
-                    volume=v,
-                    trades=trades,
-                    is_closed=True,
+                    start_time=start,
+                    end_time=end_time,
+                    limit=limit,
                 )
+            )
+
+        next_page: Optional[asyncio.Task] = _fetch(start_time)
+        try:
+            while next_page is not None:
+                klines: List[List[Any]] = await next_page
+                next_page = None
+
+                # The last kline of the latest page is still open: keep closed ones only.
+                now_ms = int(time.time() * 1000)
+                candles = [
+                    self._to_candle(k, stream_key=stream_key, source=source, symbol=symbol, interval=interval)
+                    for k in klines
+                    if int(k[6]) < now_ms
+                ]
+                if not candles:
+                    break
 
-                await self._candles.upsert_closed_candle(candle)
-                await self._offsets.set_last_closed_open_time(stream_key, open_time)
-                last_batch_open_time = open_time
+                next_start = int(candles[-1].open_time) + interval_ms
+                if (
+                    len(klines) >= limit
+                    and len(candles) == len(klines)
+                    and (end_time is None or next_start <= end_time)
+                ):
+                    next_page = _fetch(next_start)
 
-            if last_batch_open_time is None:
-                break
+                await self._candles.upsert_closed_candles(candles)
+                if commit_offset:
+                    await self._offsets.set_last_closed_open_time(stream_key, int(candles[-1].open_time))
+                total += len(candles)
+        finally:
+            if next_page is not None and not next_page.done():
+                next_page.cancel()
 
-            start_time = last_batch_open_time + interval_ms
-            if len(klines) < limit:
-                break
+        return total
+
+    def _log_done(self, stream_key: str, total: int, t0: float) -> None:
+        if not total:
+            return
+        elapsed = max(time.monotonic() - t0, 1e-9)
+        self._logger.info(
+            "Backfill done stream_key=%s candles=%s elapsed_s=%.2f candles_per_s=%.0f",
+            stream_key,
+            total,
+            elapsed,
+            total / elapsed,
+        )
+
+    @staticmethod
+    def _to_candle(k: List[Any], *, stream_key: str, source: str, symbol: str, interval: str) -> CandleEntity:
+        """
+        Map a raw Binance kline to a closed CandleEntity.
+        """
+        return CandleEntity(
+            stream_key=stream_key,
+            source=str(source),
+            symbol=symbol,
+            interval=interval,
+            open_time=int(k[0]),
+            close_time=int(k[6]),
+            open=float(k[1]),
+            high=float(k[2]),
+            low=float(k[3]),
+            close=float(k[4]),
+            volume=float(k[5]),
+            trades=int(k[8]) if len(k) > 8 else 0,
+            is_closed=True,
+        )
 
     @staticmethod
     def _interval_to_ms(interval: str) -> Optional[int]:
         """
         Convert supported intervals to milliseconds.
         """
-        return {"1m": 60_000}.get(interval)
+        return IntervalService.to_ms(interval)
 
     @staticmethod
     def _build_stream_key(*, source: str, symbol: str, interval: str) -> str:
         """
         Build a canonical stream key for multi-source ingestion.
         """
-        return f"{source.lower()}:{symbol.lower()}_{interval}"
+        return StreamKeyService.build(source=source, symbol=symbol, interval=interval)
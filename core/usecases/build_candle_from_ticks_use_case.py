@@ -6,6 +6,7 @@ from typing import Optional
 from core.domain.entities.candle_entity import CandleEntity
 from core.repositories.candle_repository import CandleRepository
 from core.repositories.price_tick_repository import PriceTickRepository
+from core.services.minute_tick_accumulator import MinuteTickAccumulator
 
 
 class BuildCandleFromTicksUseCase:
@@ -15,6 +16,9 @@ class BuildCandleFromTicksUseCase:
     Behavior:
       - If no ticks exist for the minute, returns None.
       - Candle OHLC is derived from tick prices ordered by ts.
+      - execute_from_accumulator builds the same candle from an in-memory
+        MinuteTickAccumulator (no tick reads); execute reloads the minute's ticks
+        from storage (recovery path after a restart).
       - Writes candle to CandleRepository (candles_1m).
       - Optionally deletes ticks for that minute after successful write.
     """
@@ -46,17 +50,72 @@ class BuildCandleFromTicksUseCase:
         if not ticks:
             return None
                 
-        open_time = int(minute_open_time)
-        close_time = int(minute_open_time) + 60_000 - 1
-
         prices = [float(t.price) for t in ticks]
-        o = float(prices[0])
-        h = float(max(prices))
-        l = float(min(prices))
-        c = float(prices[-1])
 
-        volume = float(sum(float(t.volume or 0.0) for t in ticks))
-        trades = int(sum(int(t.trades or 0) for t in ticks))
+        return await self._persist(
+            stream_key=stream_key,
+            source=source,
+            symbol=symbol,
+            interval=interval,
+            minute_open_time=int(minute_open_time),
+            o=float(prices[0]),
+            h=float(max(prices)),
+            l=float(min(prices)),
+            c=float(prices[-1]),
+            volume=float(sum(float(t.volume or 0.0) for t in ticks)),
+            trades=int(sum(int(t.trades or 0) for t in ticks)),
+            extras=ticks[-1].extras or {},
+            static_fields=static_fields,
+        )
+
+    async def execute_from_accumulator(
+        self,
+        *,
+        stream_key: str,
+        source: str,
+        symbol: str,
+        interval: str,
+        accumulator: MinuteTickAccumulator,
+        static_fields: dict | None = None,
+    ) -> Optional[CandleEntity]:
+        if accumulator.count == 0:
+            return None
+
+        return await self._persist(
+            stream_key=stream_key,
+            source=source,
+            symbol=symbol,
+            interval=interval,
+            minute_open_time=int(accumulator.minute_open_time),
+            o=float(accumulator.open),
+            h=float(accumulator.high),
+            l=float(accumulator.low),
+            c=float(accumulator.close),
+            volume=float(accumulator.volume),
+            trades=int(accumulator.trades),
+            extras=accumulator.last_extras,
+            static_fields=static_fields,
+        )
+
+    async def _persist(
+        self,
+        *,
+        stream_key: str,
+        source: str,
+        symbol: str,
+        interval: str,
+        minute_open_time: int,
+        o: float,
+        h: float,
+        l: float,
+        c: float,
+        volume: float,
+        trades: int,
+        extras: dict,
+        static_fields: dict | None,
+    ) -> CandleEntity:
+        open_time = int(minute_open_time)
+        close_time = int(minute_open_time) + 60_000 - 1
 
         candle = CandleEntity(
             stream_key=stream_key,
@@ -74,9 +133,6 @@ class BuildCandleFromTicksUseCase:
             is_closed=True,
         )
 
-        last_tick = ticks[-1]
-        extras = last_tick.extras or {}
-
         # Apply pool metadata fields into candle (keeps candle "complete")
         for k, v in extras.items():
             setattr(candle, k, v)
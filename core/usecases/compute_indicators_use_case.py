@@ -2,17 +2,24 @@
 from __future__ import annotations
 
 import logging
-from typing import Optional
+from typing import Dict, List, Optional, Tuple
 
+from core.domain.entities.candle_entity import CandleEntity
 from core.domain.entities.indicator_entity import IndicatorSnapshotEntity
+from core.domain.entities.indicator_set_entity import IndicatorSetEntity
 from core.repositories.candle_repository import CandleRepository
 from core.repositories.indicator_repository import IndicatorRepository
-from core.services.indicator_calculation_service import IndicatorCalculationService
+from core.services.incremental_indicator_engine import IncrementalIndicatorEngine
+from core.services.indicator_calculation_service import IndicatorCalculationService, IndicatorParams
 
 
 class ComputeIndicatorsUseCase:
     """
    Computes and persists indicator snapshots for a given indicator set and stream.
+
+    When an IncrementalIndicatorEngine is provided and the closed candle is passed in,
+    indicators are advanced in O(1) from in-memory state; history is only read to
+    (re)seed the state (first close, gaps, out-of-order candles).
     """
 
     def __init__(
@@ -21,10 +28,12 @@ class ComputeIndicatorsUseCase:
         indicator_repository: IndicatorRepository,
         indicator_service: IndicatorCalculationService,
         logger: logging.Logger | None = None,
+        indicator_engine: Optional[IncrementalIndicatorEngine] = None,
     ):
         self._candle_repo = candle_repository
         self._indicator_repo = indicator_repository
         self._svc = indicator_service
+        self._engine = indicator_engine
         self._logger = logger or logging.getLogger(self.__class__.__name__)
 
     @staticmethod
@@ -50,27 +59,116 @@ class ComputeIndicatorsUseCase:
         indicator_set_id: str,
         cfg_hash: str,
         ts: int | None = None,
+        candle: CandleEntity | None = None,
     ) -> Optional[IndicatorSnapshotEntity]:
         """
         Compute and upsert indicator snapshot using the last closed candle for the stream.
+
+        Args:
+            candle: The candle that just closed. Required for the incremental path;
+                without it (or without an engine) the snapshot is recomputed from history.
         """
-        need = self.required_bars_for(ema_slow, atr_window)
-        candles = await self._candle_repo.get_last_n_closed(stream_key, need)
-
-        snapshot = self._svc.compute_snapshot_for_last(
-            candles,
-            ema_fast=int(ema_fast),
-            ema_slow=int(ema_slow),
-            atr_window=int(atr_window),
-            indicator_set_id=indicator_set_id,
-            cfg_hash=cfg_hash,
-        )
+        snapshot: Optional[IndicatorSnapshotEntity] = None
+        if self._engine is not None and candle is not None:
+            snapshot = self._engine.advance(candle, indicator_set_id=indicator_set_id, cfg_hash=cfg_hash)
+
         if snapshot is None:
-            self._logger.debug("Not enough candles for indicators: have=%s need=%s", len(candles), need)
-            return None
+            need = self.required_bars_for(ema_slow, atr_window)
+            candles = await self._candle_repo.get_last_n_closed(stream_key, need)
+
+            if self._engine is not None:
+                snapshot = self._engine.seed(
+                    candles,
+                    stream_key=stream_key,
+                    ema_fast=int(ema_fast),
+                    ema_slow=int(ema_slow),
+                    atr_window=int(atr_window),
+                    indicator_set_id=indicator_set_id,
+                    cfg_hash=cfg_hash,
+                )
+            else:
+                snapshot = self._svc.compute_snapshot_for_last(
+                    candles,
+                    ema_fast=int(ema_fast),
+                    ema_slow=int(ema_slow),
+                    atr_window=int(atr_window),
+                    indicator_set_id=indicator_set_id,
+                    cfg_hash=cfg_hash,
+                )
+            if snapshot is None:
+                self._logger.debug("Not enough candles for indicators: have=%s need=%s", len(candles), need)
+                return None
 
         if ts is not None:
             snapshot.ts = int(ts)
         
         await self._indicator_repo.upsert_snapshot(snapshot)
         return snapshot
+
+    async def execute_for_stream(
+        self,
+        *,
+        stream_key: str,
+        indicator_sets: List[IndicatorSetEntity],
+        ts: int | None = None,
+        candle: CandleEntity | None = None,
+    ) -> List[Tuple[IndicatorSetEntity, IndicatorSnapshotEntity]]:
+        """
+        Evaluate all indicator sets of one stream after a candle close.
+
+        - Sets with incremental state are advanced in O(1).
+        - The rest share a single history read (largest window needed); each distinct
+          EMA period / ATR window is computed once over that window.
+        - All snapshots are persisted with one bulk write.
+
+        Returns:
+            (indicator_set, snapshot) pairs in the same order as `indicator_sets`
+            (sets without enough history are omitted).
+        """
+        if not indicator_sets:
+            return []
+
+        snapshots: Dict[str, IndicatorSnapshotEntity] = {}
+        pending: List[IndicatorParams] = []
+
+        for indset in indicator_sets:
+            params = IndicatorParams.from_indicator_set(indset)
+            snap: Optional[IndicatorSnapshotEntity] = None
+            if self._engine is not None and candle is not None:
+                snap = self._engine.advance(candle, indicator_set_id=params.indicator_set_id, cfg_hash=params.cfg_hash)
+            if snap is None:
+                pending.append(params)
+            else:
+                snapshots[params.cfg_hash] = snap
+
+        if pending:
+            need = max(self.required_bars_for(p.ema_slow, p.atr_window) for p in pending)
+            candles = await self._candle_repo.get_last_n_closed(stream_key, need)
+
+            if self._engine is not None:
+                computed = self._engine.seed_many(candles, stream_key=stream_key, params=pending)
+            else:
+                computed = self._svc.compute_snapshots_for_last(candles, pending)
+
+            if len(computed) < len(pending):
+                self._logger.debug(
+                    "Not enough candles for some indicator sets: stream_key=%s have=%s need=%s missing=%s",
+                    stream_key,
+                    len(candles),
+                    need,
+                    len(pending) - len(computed),
+                )
+            snapshots.update(computed)
+
+        out: List[Tuple[IndicatorSetEntity, IndicatorSnapshotEntity]] = []
+        for indset in indicator_sets:
+            snap = snapshots.get(str(indset.cfg_hash))
+            if snap is None:
+                continue
+            if ts is not None:
+                snap.ts = int(ts)
+            out.append((indset, snap))
+
+        if out:
+            await self._indicator_repo.upsert_snapshots([snap for _, snap in out])
+        return out
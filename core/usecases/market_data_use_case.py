@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Tuple
 
 from core.domain.entities.candle_entity import CandleEntity
 from core.domain.entities.indicator_entity import IndicatorSnapshotEntity
@@ -9,6 +9,7 @@ from core.domain.entities.indicator_set_entity import IndicatorSetEntity
 from core.repositories.candle_repository import CandleRepository
 from core.repositories.indicator_repository import IndicatorRepository
 from core.repositories.indicator_set_repository import IndicatorSetRepository
+from core.services.candle_ring_buffer import CandleRingBufferRegistry
 from core.services.stream_key_service import StreamKeyService
 
 
@@ -22,11 +23,8 @@ class MarketDataUseCase:
     candle_repo: CandleRepository
     indicator_repo: IndicatorRepository
     indicator_set_repo: IndicatorSetRepository
-
-    async def ensure_indexes(self) -> None:
-        await self.candle_repo.ensure_indexes()
-        await self.indicator_repo.ensure_indexes()
-        await self.indicator_set_repo.ensure_indexes()
+    materialized_intervals: Tuple[str, ...] = ("1m",)
+    candle_buffer: Optional[CandleRingBufferRegistry] = None
 
     async def upsert_active_indicator_set(
         self,
@@ -37,13 +35,21 @@ class MarketDataUseCase:
         atr_window: int,
         source: Optional[str] = "binance",
         pool_address: Optional[str] = None,
+        interval: Optional[str] = "1m",
     ) -> IndicatorSetEntity:
         """
         Create (or reuse) an ACTIVE indicator set.
 
         Idempotency is guaranteed by cfg_hash (derived from stream_key + params).
+
+        Raises:
+            ValueError: If the interval is not materialized (1m or a configured rollup).
         """
-        interval = "1m"
+        interval = (interval or "1m").strip().lower()
+        if interval not in self.materialized_intervals:
+            raise ValueError(
+                f"Unsupported interval '{interval}'. Materialized intervals: {', '.join(self.materialized_intervals)}"
+            )
         src = (source or "binance").lower().strip()
 
         stream_key = StreamKeyService.build(
@@ -85,6 +91,42 @@ class MarketDataUseCase:
     async def list_candles(self, *, stream_key: str, limit: int) -> List[CandleEntity]:
         return await self.candle_repo.get_last_n_closed(stream_key=stream_key, n=int(limit))
 
+    def iter_candle_rows(
+        self,
+        *,
+        stream_key: str,
+        limit: int,
+        fields: Sequence[str],
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Latest closed candles streamed from storage as plain rows (ascending open_time).
+        """
+        return self.candle_repo.iter_last_n_closed_rows(stream_key, int(limit), fields=fields)
+
+    async def list_indicator_rows(
+        self,
+        *,
+        stream_key: str,
+        cfg_hash: Optional[str],
+        limit: int,
+        fields: Sequence[str],
+    ) -> List[Dict[str, Any]]:
+        """
+        Latest indicator snapshots as plain projected rows (ascending ts).
+        """
+        return await self.indicator_repo.list_last_rows(stream_key, cfg_hash, int(limit), fields=fields)
+
+    def list_recent_candle_rows(self, *, stream_key: str, limit: int) -> Optional[List[Dict[str, Any]]]:
+        """
+        Latest closed candles as plain rows straight from the in-memory ring buffer.
+
+        Returns:
+            Rows in ascending open_time order, or None when the window is not buffered.
+        """
+        if self.candle_buffer is None:
+            return None
+        return self.candle_buffer.last_n_rows(stream_key, int(limit))
+
     async def list_indicators(
         self,
         *,
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import logging
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence
+
+from core.repositories.price_tick_repository import PriceTickRepository
+from core.repositories.tick_archive_repository import TickArchiveRepository
+
+
+def _to_list(values: Any) -> List[Any]:
+    # numpy -> Python scalars in one pass (JSON-safe)
+    return values.tolist() if hasattr(values, "tolist") else list(values)
+
+
+class ReadPriceTicksUseCase:
+    """
+    Reads ticks over an arbitrary time range.
+
+    - The archived part of the range (closed days) is sliced from the columnar
+      archive; archived ticks carry ts/price/volume only (no per-tick extras).
+    - The hot tail after `archived_until` is read from MongoDB.
+
+    Rows are streamed as plain dicts (no entity/DTO per tick), so memory stays flat
+    whatever the size of the range.
+    """
+
+    def __init__(
+        self,
+        *,
+        tick_repository: PriceTickRepository,
+        tick_archive: Optional[TickArchiveRepository] = None,
+        logger: logging.Logger | None = None,
+    ):
+        self._ticks = tick_repository
+        self._archive = tick_archive
+        self._logger = logger or logging.getLogger(self.__class__.__name__)
+
+    async def iter_rows(
+        self,
+        *,
+        stream_key: str,
+        ts_from: int,
+        ts_to: int,
+        limit: int,
+        fields: Sequence[str],
+        chunk_size: int = 5_000,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream rows (holding `fields`, ascending ts) without materializing the range.
+        """
+        stream_key = str(stream_key)
+        ts_from = int(ts_from)
+        ts_to = int(ts_to)
+        remaining = int(limit)
+
+        until = self._archive.archived_until(stream_key) if self._archive is not None else None
+
+        if until is not None and ts_from < until:
+            cols = self._archive.read_range(stream_key, ts_from, ts_to, remaining)
+            for i in range(0, len(cols), chunk_size):
+                ts_chunk = _to_list(cols.ts[i : i + chunk_size])
+                price_chunk = _to_list(cols.price[i : i + chunk_size])
+                volume_chunk = _to_list(cols.volume[i : i + chunk_size])
+                for ts, price, volume in zip(ts_chunk, price_chunk, volume_chunk):
+                    row = {
+                        "stream_key": stream_key,
+                        "ts": ts,
+                        "minute_open_time": ts - ts % 60_000,
+                        "price": price,
+                        "volume": volume,
+                    }
+                    yield {f: row.get(f) for f in fields}
+            remaining -= len(cols)
+            ts_from = int(until)
+
+        if remaining <= 0 or ts_from > ts_to:
+            return
+
+        async for row in self._ticks.iter_tick_rows_range(
+            stream_key,
+            ts_from,
+            ts_to,
+            remaining,
+            fields=fields,
+            batch_size=chunk_size,
+        ):
+            yield row
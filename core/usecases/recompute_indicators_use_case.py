@@ -0,0 +1,234 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from core.domain.entities.indicator_recompute_job_entity import IndicatorRecomputeJobEntity
+from core.domain.entities.indicator_set_entity import IndicatorSetEntity
+from core.repositories.candle_repository import CandleColumns, CandleRepository
+from core.repositories.indicator_recompute_job_repository import IndicatorRecomputeJobRepository
+from core.repositories.indicator_repository import IndicatorRepository
+from core.repositories.indicator_set_repository import IndicatorSetRepository
+from core.services.vectorized_indicator_service import IndicatorSeries, RecomputeState, VectorizedIndicatorService
+from core.usecases.compute_indicators_use_case import ComputeIndicatorsUseCase
+
+
+class RecomputeIndicatorsUseCase:
+    """
+    Recomputes indicator snapshots over the full candle history of an indicator set.
+
+    Behavior:
+      - Streams closed candles of the set's stream_key in column batches.
+      - Computes EMA fast/slow and ATR% per batch with NumPy, carrying state across batches.
+      - Bulk-upserts the snapshots of a batch (unordered) while the next batch is read.
+      - Persists progress (last_open_time + carried state) after each successful write,
+        so a job interrupted by a restart resumes where it stopped.
+    """
+
+    def __init__(
+        self,
+        *,
+        candle_repository: CandleRepository,
+        indicator_repository: IndicatorRepository,
+        indicator_set_repository: IndicatorSetRepository,
+        job_repository: IndicatorRecomputeJobRepository,
+        vectorized_service: Optional[VectorizedIndicatorService] = None,
+        batch_size: int = 100_000,
+        logger: logging.Logger | None = None,
+    ):
+        self._candles = candle_repository
+        self._indicators = indicator_repository
+        self._sets = indicator_set_repository
+        self._jobs = job_repository
+        self._svc = vectorized_service or VectorizedIndicatorService()
+        self._batch_size = int(batch_size)
+        self._logger = logger or logging.getLogger(self.__class__.__name__)
+
+    async def execute(self, cfg_hash: str, *, resume: bool = True) -> IndicatorRecomputeJobEntity:
+        """
+        Run (or resume) the recompute for one indicator set.
+
+        Args:
+            cfg_hash: Indicator set id.
+            resume: Continue from the stored progress when the previous run did not finish.
+
+        Returns:
+            The final job entity (status DONE or FAILED).
+        """
+        indset = await self._sets.get_by_id(cfg_hash)
+        if indset is None:
+            raise LookupError("indicator_set_not_found")
+
+        stream_key = indset.stream_key
+        prev = await self._jobs.get_by_cfg_hash(cfg_hash)
+
+        state = RecomputeState()
+        after: Optional[int] = None
+        processed = 0
+        written = 0
+        if resume and prev is not None and prev.status != "DONE" and prev.last_open_time is not None and prev.state:
+            state = RecomputeState.from_dict(prev.state)
+            after = int(prev.last_open_time)
+            processed = int(prev.processed)
+            written = int(prev.written)
+
+        remaining = await self._candles.count_closed(stream_key, after_open_time=after)
+        job = IndicatorRecomputeJobEntity(
+            cfg_hash=str(cfg_hash),
+            stream_key=stream_key,
+            status="RUNNING",
+            total=processed + remaining,
+            processed=processed,
+            written=written,
+            last_open_time=after,
+            state=state.to_dict() if after is not None else None,
+            started_at=int(time.time() * 1000),
+        )
+        await self._jobs.upsert(job)
+
+        self._logger.info(
+            "Indicator recompute started cfg_hash=%s stream_key=%s resume_from=%s remaining=%s",
+            cfg_hash,
+            stream_key,
+            after,
+            remaining,
+        )
+
+        ema_fast = int(indset.ema_fast)
+        ema_slow = int(indset.ema_slow)
+        atr_window = int(indset.atr_window)
+        batch_size = max(
+            self._batch_size,
+            ema_fast,
+            ComputeIndicatorsUseCase.required_bars_for(ema_slow, atr_window),
+        )
+
+        created_at_iso = datetime.now(tz=timezone.utc).isoformat().replace("+00:00", "Z")
+        t0 = time.monotonic()
+        run_processed = 0
+
+        pending: Optional[asyncio.Task] = None
+        pending_progress: Optional[Dict[str, Any]] = None
+
+        async def _commit() -> None:
+            nonlocal pending, pending_progress, written, run_processed
+            if pending is None or pending_progress is None:
+                return
+            written += int(await pending)
+            run_processed += int(pending_progress["n"])
+            job.processed = int(pending_progress["processed"])
+            job.written = written
+            job.last_open_time = int(pending_progress["last_open_time"])
+            job.state = pending_progress["state"]
+            elapsed = max(time.monotonic() - t0, 1e-9)
+            job.rate_per_s = round(run_processed / elapsed, 1)
+            await self._jobs.upsert(job)
+            pending = None
+            pending_progress = None
+
+        try:
+            async for cols in self._candles.iter_closed_columns(
+                stream_key,
+                after_open_time=after,
+                batch_size=batch_size,
+            ):
+                series = self._svc.compute_batch(
+                    cols,
+                    state,
+                    ema_fast=ema_fast,
+                    ema_slow=ema_slow,
+                    atr_window=atr_window,
+                )
+                docs = self._build_docs(indset, cols, series, created_at_iso=created_at_iso)
+                processed += len(cols)
+
+                # Keep at most one write in flight: commit the previous batch first.
+                await _commit()
+                pending = asyncio.create_task(self._indicators.upsert_snapshot_docs(docs))
+                pending_progress = {
+                    "n": len(cols),
+                    "processed": processed,
+                    "last_open_time": int(cols.open_time[-1]),
+                    "state": state.to_dict(),
+                }
+
+            await _commit()
+
+        except asyncio.CancelledError:
+            # Shutdown: the job stays RUNNING with its last committed progress and is resumed on start.
+            if pending is not None:
+                pending.cancel()
+            raise
+
+        except Exception as exc:
+            if pending is not None:
+                pending.cancel()
+            self._logger.exception("Indicator recompute failed cfg_hash=%s: %s", cfg_hash, exc)
+            job.status = "FAILED"
+            job.error = str(exc)
+            job.finished_at = int(time.time() * 1000)
+            await self._jobs.upsert(job)
+            return job
+
+        job.status = "DONE"
+        job.error = None
+        job.finished_at = int(time.time() * 1000)
+        await self._jobs.upsert(job)
+
+        self._logger.info(
+            "Indicator recompute done cfg_hash=%s candles=%s snapshots=%s rate_per_s=%s",
+            cfg_hash,
+            run_processed,
+            job.written,
+            job.rate_per_s,
+        )
+        return job
+
+    @staticmethod
+    def _build_docs(
+        indset: IndicatorSetEntity,
+        cols: CandleColumns,
+        series: IndicatorSeries,
+        *,
+        created_at_iso: str,
+    ) -> List[Dict[str, Any]]:
+        """
+        Build snapshot documents (IndicatorSnapshotEntity storage shape) for one batch.
+        """
+        if series.index.shape[0] == 0:
+            return []
+
+        stream_key = indset.stream_key
+        source = indset.source
+        symbol = str(indset.symbol).upper()
+        interval = str(indset.interval)
+        cfg_hash = str(indset.cfg_hash)
+
+        close_times = cols.close_time
+        closes = cols.close
+
+        return [
+            {
+                "stream_key": stream_key,
+                "source": source,
+                "symbol": symbol,
+                "interval": interval,
+                "ts": int(close_times[i]),
+                "close": float(closes[i]),
+                "ema_fast": ef,
+                "ema_slow": es,
+                "atr_pct": ap,
+                "indicator_set_id": cfg_hash,
+                "cfg_hash": cfg_hash,
+                "created_at_iso": created_at_iso,
+            }
+            for i, ef, es, ap in zip(
+                series.index.tolist(),
+                series.ema_fast.tolist(),
+                series.ema_slow.tolist(),
+                series.atr_pct.tolist(),
+            )
+        ]
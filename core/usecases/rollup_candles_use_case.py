@@ -0,0 +1,338 @@
+from __future__ import annotations
+
+import logging
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from core.domain.entities.candle_entity import CandleEntity
+from core.repositories.candle_repository import CandleColumns, CandleRepository
+from core.services.candle_rollup_service import CandleRollupService, RolledColumns
+from core.services.interval_service import IntervalService
+from core.services.stream_key_service import StreamKeyService
+
+
+class RollupCandlesUseCase:
+    """
+    Materializes higher-timeframe candles (5m/15m/1h/4h/1d) from closed 1m candles.
+
+    Behavior:
+      - Live: each closed 1m candle is rolled into in-progress buckets; buckets are
+        persisted as soon as they close. After a restart, the in-progress bucket is rebuilt
+        once from stored 1m candles.
+      - Catch-up: missing rollups are materialized from stored 1m history, resuming after
+        the last stored rollup candle of each interval.
+      - Re-roll: buckets covering 1m ranges filled after the fact (gap backfill) are
+        recomputed, replacing rollups emitted while those minutes were missing.
+
+    Rollups live in the same candle collection, under the stream_key of their interval.
+    """
+
+    def __init__(
+        self,
+        *,
+        candle_repository: CandleRepository,
+        rollup_service: CandleRollupService,
+        batch_size: int = 100_000,
+        logger: logging.Logger | None = None,
+    ):
+        self._candles = candle_repository
+        self._svc = rollup_service
+        self._batch_size = int(batch_size)
+        self._logger = logger or logging.getLogger(self.__class__.__name__)
+
+    @property
+    def intervals(self) -> List[str]:
+        """Materialized rollup intervals."""
+        return self._svc.intervals
+
+    def drop(self, stream_key: str) -> None:
+        """Forget the in-progress rollup buckets of a 1m stream that stopped here."""
+        self._svc.drop(stream_key)
+
+    async def on_candle_closed(self, candle: CandleEntity) -> List[CandleEntity]:
+        """
+        Roll a persisted closed 1m candle into the higher timeframes.
+
+        Returns:
+            Higher-timeframe candles closed (and persisted) by this candle.
+        """
+        if not self._svc.intervals or str(candle.interval) != IntervalService.BASE_INTERVAL:
+            return []
+
+        missing = self._svc.missing_buckets(candle)
+        if missing:
+            widest = max(missing, key=lambda x: IntervalService.INTERVAL_MS[x])
+            start = IntervalService.bucket_open(candle.open_time, widest)
+            cols = await self._read_columns(candle.stream_key, after_open_time=start - 1)
+            for itv in missing:
+                self._svc.seed_bucket(candle, itv, cols)
+
+        closed = self._svc.apply(candle)
+        if closed:
+            await self._candles.upsert_closed_candles(closed)
+        return closed
+
+    async def catch_up(
+        self,
+        *,
+        stream_key: str,
+        source: str,
+        symbol: str,
+        static_fields: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, int]:
+        """
+        Materialize closed rollup candles missing from storage for a 1m stream.
+
+        Args:
+            stream_key: 1m stream key.
+            source: Candle source.
+            symbol: Candle symbol.
+            static_fields: Extra candle fields copied to every rollup (chain, dex, pool...).
+
+        Returns:
+            Dict interval -> number of rollup candles written.
+        """
+        intervals = self._svc.intervals
+        written: Dict[str, int] = {itv: 0 for itv in intervals}
+        if not intervals:
+            return written
+
+        # Resume after the last stored rollup of each interval.
+        resume_from: Dict[str, Optional[int]] = {}
+        for itv in intervals:
+            last = await self._candles.get_last_n_closed(StreamKeyService.with_interval(stream_key, itv), 1)
+            ms = int(IntervalService.INTERVAL_MS[itv])
+            resume_from[itv] = int(last[-1].open_time) + ms if last else None
+
+        starts = [x for x in resume_from.values() if x is not None]
+        after = min(starts) - 1 if len(starts) == len(intervals) else None
+
+        # Only buckets strictly after this are emitted (avoids re-emitting carried rows).
+        emitted_upto: Dict[str, int] = {
+            itv: (int(resume_from[itv]) - 1 if resume_from[itv] is not None else -1) for itv in intervals
+        }
+
+        widest_ms = max(int(IntervalService.INTERVAL_MS[x]) for x in intervals)
+        base_ms = int(IntervalService.INTERVAL_MS[IntervalService.BASE_INTERVAL])
+        carry = CandleColumns()
+        last_seen: Optional[int] = None
+
+        async def _flush(cols: CandleColumns, *, final: bool) -> None:
+            for itv in intervals:
+                rolled = CandleRollupService.aggregate_columns(cols, itv)
+                if not len(rolled):
+                    continue
+                ms = int(IntervalService.INTERVAL_MS[itv])
+                mask = rolled.open_time > emitted_upto[itv]
+                if final:
+                    # The last bucket is only closed if its last minute was seen.
+                    mask &= rolled.open_time + ms <= int(last_seen or 0) + base_ms
+                else:
+                    # The last bucket may continue in the next batch.
+                    mask[-1] = False
+                idx = np.flatnonzero(mask)
+                if idx.shape[0] == 0:
+                    continue
+                candles = self._to_candles(
+                    rolled,
+                    idx,
+                    stream_key=StreamKeyService.with_interval(stream_key, itv),
+                    source=source,
+                    symbol=symbol,
+                    interval=itv,
+                    static_fields=static_fields or {},
+                )
+                written[itv] += await self._candles.upsert_closed_candles(candles)
+                emitted_upto[itv] = int(rolled.open_time[idx[-1]])
+
+        async for batch in self._candles.iter_closed_columns(
+            stream_key,
+            after_open_time=after,
+            batch_size=self._batch_size,
+        ):
+            cols = self._concat(carry, batch)
+            last_seen = int(cols.open_time[-1])
+            await _flush(cols, final=False)
+
+            # Keep the rows of the last (widest) bucket: it may continue in the next batch.
+            keep_from = (last_seen // widest_ms) * widest_ms
+            carry = self._tail(cols, keep_from)
+
+        if len(carry):
+            await _flush(carry, final=True)
+
+        total = sum(written.values())
+        if total:
+            self._logger.info("Rollup catch-up stream_key=%s written=%s", stream_key, written)
+        return written
+
+    async def reroll(
+        self,
+        *,
+        stream_key: str,
+        source: str,
+        symbol: str,
+        ranges: Sequence[Tuple[int, int]],
+        static_fields: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, int]:
+        """
+        Recompute the closed rollup candles of every bucket overlapping 1m ranges.
+
+        Args:
+            stream_key: 1m stream key.
+            source: Candle source.
+            symbol: Candle symbol.
+            ranges: [from, to] 1m open_time ranges whose candles changed.
+            static_fields: Extra candle fields copied to every rollup (chain, dex, pool...).
+
+        Returns:
+            Dict interval -> number of rollup candles written.
+        """
+        intervals = self._svc.intervals
+        written: Dict[str, int] = {itv: 0 for itv in intervals}
+        if not intervals or not ranges:
+            return written
+
+        base_ms = int(IntervalService.INTERVAL_MS[IntervalService.BASE_INTERVAL])
+        # Buckets still open are left to the live path
+        closed_before = (int(time.time() * 1000) // base_ms) * base_ms
+        widest = max(intervals, key=lambda x: IntervalService.INTERVAL_MS[x])
+        widest_ms = int(IntervalService.INTERVAL_MS[widest])
+
+        for r_from, r_to in ranges:
+            start = IntervalService.bucket_open(int(r_from), widest)
+            end = IntervalService.bucket_open(int(r_to), widest) + widest_ms - 1
+            cols = await self._read_columns(stream_key, after_open_time=start - 1, until_open_time=end)
+            if not len(cols):
+                continue
+            for itv in intervals:
+                ms = int(IntervalService.INTERVAL_MS[itv])
+                rolled = CandleRollupService.aggregate_columns(cols, itv)
+                mask = (rolled.open_time + ms > int(r_from)) & (rolled.open_time <= int(r_to))
+                mask &= rolled.open_time + ms <= closed_before
+                idx = np.flatnonzero(mask)
+                if idx.shape[0] == 0:
+                    continue
+                candles = self._to_candles(
+                    rolled,
+                    idx,
+                    stream_key=StreamKeyService.with_interval(stream_key, itv),
+                    source=source,
+                    symbol=symbol,
+                    interval=itv,
+                    static_fields=static_fields or {},
+                )
+                written[itv] += await self._candles.upsert_closed_candles(candles)
+
+        if sum(written.values()):
+            self._logger.info("Rollup re-roll stream_key=%s ranges=%s written=%s", stream_key, len(ranges), written)
+        return written
+
+    async def _read_columns(
+        self,
+        stream_key: str,
+        *,
+        after_open_time: int,
+        until_open_time: Optional[int] = None,
+    ) -> CandleColumns:
+        out = CandleColumns()
+        async for batch in self._candles.iter_closed_columns(
+            stream_key,
+            after_open_time=after_open_time,
+            batch_size=self._batch_size,
+        ):
+            if until_open_time is not None and len(batch) and int(batch.open_time[-1]) > until_open_time:
+                out = self._concat(out, self._head(batch, until_open_time))
+                break
+            out = self._concat(out, batch)
+        return out
+
+    @staticmethod
+    def _concat(a: CandleColumns, b: CandleColumns) -> CandleColumns:
+        if not len(a):
+            return b
+        return CandleColumns(
+            open_time=a.open_time + b.open_time,
+            close_time=a.close_time + b.close_time,
+            open=a.open + b.open,
+            high=a.high + b.high,
+            low=a.low + b.low,
+            close=a.close + b.close,
+            volume=a.volume + b.volume,
+            trades=a.trades + b.trades,
+        )
+
+    @staticmethod
+    def _head(cols: CandleColumns, until_open_time: int) -> CandleColumns:
+        i = 0
+        while i < len(cols) and int(cols.open_time[i]) <= until_open_time:
+            i += 1
+        return CandleColumns(
+            open_time=cols.open_time[:i],
+            close_time=cols.close_time[:i],
+            open=cols.open[:i],
+            high=cols.high[:i],
+            low=cols.low[:i],
+            close=cols.close[:i],
+            volume=cols.volume[:i],
+            trades=cols.trades[:i],
+        )
+
+    @staticmethod
+    def _tail(cols: CandleColumns, from_open_time: int) -> CandleColumns:
+        # open_time is ascending; the tail is short (at most one widest bucket)
+        i = len(cols)
+        while i > 0 and int(cols.open_time[i - 1]) >= from_open_time:
+            i -= 1
+        return CandleColumns(
+            open_time=cols.open_time[i:],
+            close_time=cols.close_time[i:],
+            open=cols.open[i:],
+            high=cols.high[i:],
+            low=cols.low[i:],
+            close=cols.close[i:],
+            volume=cols.volume[i:],
+            trades=cols.trades[i:],
+        )
+
+    @staticmethod
+    def _to_candles(
+        rolled: RolledColumns,
+        idx: np.ndarray,
+        *,
+        stream_key: str,
+        source: str,
+        symbol: str,
+        interval: str,
+        static_fields: Dict[str, Any],
+    ) -> List[CandleEntity]:
+        ms = int(IntervalService.INTERVAL_MS[interval])
+        return [
+            CandleEntity(
+                stream_key=stream_key,
+                source=source,
+                symbol=symbol,
+                interval=interval,
+                open_time=int(ot),
+                close_time=int(ot) + ms - 1,
+                open=o,
+                high=h,
+                low=l,
+                close=c,
+                volume=v,
+                trades=int(t),
+                is_closed=True,
+                **static_fields,
+            )
+            for ot, o, h, l, c, v, t in zip(
+                rolled.open_time[idx].tolist(),
+                rolled.open[idx].tolist(),
+                rolled.high[idx].tolist(),
+                rolled.low[idx].tolist(),
+                rolled.close[idx].tolist(),
+                rolled.volume[idx].tolist(),
+                rolled.trades[idx].tolist(),
+            )
+        ]
@@ -5,7 +5,7 @@ import logging
 from datetime import datetime, timezone
 from typing import Any, Dict, Optional
 
-from adapters.external.signals.signals_http_client import SignalsHttpClient
+from adapters.external.signals.signals_dispatcher import SignalsDispatcher
 from core.domain.entities.candle_entity import CandleEntity
 from core.repositories.candle_repository import CandleRepository
 from core.repositories.indicator_set_repository import IndicatorSetRepository
@@ -37,7 +37,7 @@ class StartPollingIngestionUseCase:
         fetch_fn,
         compute_indicators_use_case: Optional[ComputeIndicatorsUseCase] = None,
         indicator_set_repo: Optional[IndicatorSetRepository] = None,
-        signals_client: Optional[SignalsHttpClient] = None,
+        signals_dispatcher: Optional[SignalsDispatcher] = None,
         logger: logging.Logger | None = None,
         static_candle_fields: Optional[Dict[str, Any]] = None,
     ):
@@ -51,7 +51,7 @@ class StartPollingIngestionUseCase:
         self._fetch_fn = fetch_fn
         self._compute_indicators = compute_indicators_use_case
         self._indicator_set_repo = indicator_set_repo
-        self._signals_client = signals_client
+        self._signals = signals_dispatcher
         self._logger = logger or logging.getLogger(self.__class__.__name__)
         self._static_fields = static_candle_fields or {}
 
@@ -129,23 +129,18 @@ class StartPollingIngestionUseCase:
         # Compute indicators + push triggers
         if self._compute_indicators is not None and self._indicator_set_repo is not None:
             active_sets = await self._indicator_set_repo.get_active_by_stream(self._stream_key)
-            for indset in active_sets:
-                snapshot = await self._compute_indicators.execute_for_indicator_set(
-                    stream_key=self._stream_key,
-                    ema_fast=int(indset.ema_fast),
-                    ema_slow=int(indset.ema_slow),
-                    atr_window=int(indset.atr_window),
-                    indicator_set_id=indset.cfg_hash,
-                    cfg_hash=indset.cfg_hash,
-                    ts=close_time,
-                )
-                if self._signals_client is not None and snapshot is not None:
-                    # fire-and-forget to avoid blocking polling
-                    asyncio.create_task(
-                        self._signals_client.candle_closed(
-                            indicator_set_id=indset.cfg_hash,
-                            ts=close_time,
-                            indicator_set=indset.to_dict(),
-                            indicator_snapshot=snapshot.to_dict(),
-                        )
+            results = await self._compute_indicators.execute_for_stream(
+                stream_key=self._stream_key,
+                indicator_sets=active_sets,
+                ts=close_time,
+                candle=candle,
+            )
+            if self._signals is not None:
+                for indset, snapshot in results:
+                    # queued to avoid blocking polling
+                    await self._signals.candle_closed(
+                        indicator_set_id=indset.cfg_hash,
+                        ts=close_time,
+                        indicator_set=indset.to_dict(),
+                        indicator_snapshot=snapshot.to_dict(),
                     )
@@ -4,15 +4,18 @@ from __future__ import annotations
 import asyncio
 import logging
 import time
-from typing import Any, Awaitable, Callable, Dict, Optional
+from typing import Any, Awaitable, Callable, Dict, List, Optional
 
-from adapters.external.signals.signals_http_client import SignalsHttpClient
+from adapters.external.signals.signals_dispatcher import SignalsDispatcher
+from core.domain.entities.candle_entity import CandleEntity
 from core.repositories.indicator_set_repository import IndicatorSetRepository
 from core.usecases.compute_indicators_use_case import ComputeIndicatorsUseCase
+from core.usecases.rollup_candles_use_case import RollupCandlesUseCase
 
 from core.domain.entities.price_tick_entity import PriceTickEntity
 from core.usecases.build_candle_from_ticks_use_case import BuildCandleFromTicksUseCase
 from core.repositories.price_tick_repository import PriceTickRepository
+from core.services.minute_tick_accumulator import MinuteTickAccumulator
 
 
 class StartPollingTicksUseCase:
@@ -21,6 +24,14 @@ class StartPollingTicksUseCase:
     When a minute closes, it builds the 1m candle from ticks and can optionally:
       - compute indicators for active indicator sets
       - fire a candle-closed trigger to api-signals (non-blocking)
+
+    Ticks are folded into an in-memory accumulator per minute; the candle is built
+    from it directly. Minutes that started before this poller (restart) are rebuilt
+    from the stored ticks instead. Tick persistence is buffered and written with one
+    insert_many per minute (or every `tick_batch_size` ticks), and can be disabled.
+
+    Without `fetch_fn`, the poller has no loop of its own: samples are pushed with
+    on_sample() by a shared scheduler (e.g. one batched The Graph query per cycle).
     """
 
     def __init__(
@@ -33,12 +44,15 @@ class StartPollingTicksUseCase:
         poll_every_s: float,
         tick_repository: PriceTickRepository,
         build_candle_uc: BuildCandleFromTicksUseCase,
-        fetch_fn: Callable[[], Awaitable[Dict[str, Any]]],
+        fetch_fn: Optional[Callable[[], Awaitable[Dict[str, Any]]]] = None,
         static_tick_fields: Optional[Dict[str, Any]] = None,
         static_candle_fields: Optional[Dict[str, Any]] = None,
         compute_indicators_use_case: Optional[ComputeIndicatorsUseCase] = None,
         indicator_set_repo: Optional[IndicatorSetRepository] = None,
-        signals_client: Optional[SignalsHttpClient] = None,
+        signals_dispatcher: Optional[SignalsDispatcher] = None,
+        rollup_use_case: Optional[RollupCandlesUseCase] = None,
+        persist_ticks: bool = True,
+        tick_batch_size: int = 100,
         logger: logging.Logger | None = None,
     ):
         self._stream_key = stream_key
@@ -53,17 +67,28 @@ class StartPollingTicksUseCase:
         self._static_candle_fields = static_candle_fields or {}
         self._compute_indicators = compute_indicators_use_case
         self._indicator_set_repo = indicator_set_repo
-        self._signals_client = signals_client
+        self._signals = signals_dispatcher
+        self._rollups = rollup_use_case
         self._logger = logger or logging.getLogger(self.__class__.__name__)
 
+        self._persist_ticks = bool(persist_ticks)
+        self._tick_batch_size = max(1, int(tick_batch_size))
+
         self._last_flushed_minute_open_time: int | None = None
+        self._first_full_minute_open_time: int | None = None  # first minute fully observed by this poller
+        self._accumulators: Dict[int, MinuteTickAccumulator] = {}
+        self._pending_ticks: List[PriceTickEntity] = []
 
         self._task: asyncio.Task | None = None
         self._stop = asyncio.Event()
 
+    @property
+    def stream_key(self) -> str:
+        return self._stream_key
+
     def start(self) -> None:
-        """Start the polling loop in background."""
-        if self._task is None:
+        """Start the polling loop in background (no-op for externally driven pollers)."""
+        if self._task is None and self._fetch_fn is not None:
             self._task = asyncio.create_task(self._run())
 
     async def stop(self) -> None:
@@ -72,55 +97,17 @@ class StartPollingTicksUseCase:
         if self._task is not None:
             await self._task
             self._task = None
+        try:
+            await self._flush_ticks()
+        except Exception as exc:
+            self._logger.warning("Tick flush on stop failed stream_key=%s: %s", self._stream_key, exc)
 
     async def _run(self) -> None:
         while not self._stop.is_set():
             try:
                 now_ms = int(time.time() * 1000)
-                minute_open = (now_ms // 60_000) * 60_000
-
                 data = await self._fetch_fn()
-                price = float(data["price"])
-
-                tick = PriceTickEntity(
-                    stream_key=self._stream_key,
-                    source=self._source,
-                    symbol=self._symbol,
-                    interval=self._interval,
-                    ts=now_ms,
-                    minute_open_time=int(minute_open),
-                    price=price,
-                    volume=float(data.get("volume") or 0.0),
-                    trades=int(data.get("trades") or 0),
-                    raw_event_id=data.get("raw_event_id"),
-                    extras=data.get("candle_fields") or {},
-                )
-
-                for k, v in self._static_tick_fields.items():
-                    tick.extras = tick.extras or {}
-                    tick.extras[k] = v
-
-                await self._ticks.insert_tick(tick)
-
-                prev_minute_open = minute_open - 60_000
-                if self._last_flushed_minute_open_time is None:
-                    self._last_flushed_minute_open_time = prev_minute_open - 60_000
-
-                if prev_minute_open > self._last_flushed_minute_open_time:
-                    built = await self._build_candle_uc.execute(
-                        stream_key=self._stream_key,
-                        source=self._source,
-                        symbol=self._symbol,
-                        interval=self._interval,
-                        minute_open_time=int(prev_minute_open),
-                        static_fields=self._static_candle_fields,
-                    )
-                    if built is not None:
-                        self._last_flushed_minute_open_time = int(prev_minute_open)
-
-                        await self._after_candle_closed(
-                            close_time=int(built.close_time),
-                        )
+                await self.on_sample(data, ts=now_ms)
 
             except Exception as exc:
                 self._logger.exception(
@@ -131,32 +118,138 @@ class StartPollingTicksUseCase:
 
             await asyncio.sleep(self._poll_every_s)
 
-    async def _after_candle_closed(self, *, close_time: int) -> None:
+    async def on_sample(self, data: Dict[str, Any], *, ts: int) -> None:
+        """
+        Record one polled sample (price/volume/trades/raw_event_id/candle_fields) taken
+        at `ts` (ms), and build the previous minute's candle once it has closed.
+        """
+        now_ms = int(ts)
+        minute_open = (now_ms // 60_000) * 60_000
+        price = float(data["price"])
+
+        tick = PriceTickEntity(
+            stream_key=self._stream_key,
+            source=self._source,
+            symbol=self._symbol,
+            interval=self._interval,
+            ts=now_ms,
+            minute_open_time=int(minute_open),
+            price=price,
+            volume=float(data.get("volume") or 0.0),
+            trades=int(data.get("trades") or 0),
+            raw_event_id=data.get("raw_event_id"),
+            extras=data.get("candle_fields") or {},
+        )
+
+        for k, v in self._static_tick_fields.items():
+            tick.extras = tick.extras or {}
+            tick.extras[k] = v
+
+        if self._first_full_minute_open_time is None:
+            self._first_full_minute_open_time = int(minute_open) + 60_000
+
+        acc = self._accumulators.get(int(minute_open))
+        if acc is None:
+            acc = self._accumulators[int(minute_open)] = MinuteTickAccumulator(int(minute_open))
+        acc.add(tick)
+
+        if self._persist_ticks:
+            self._pending_ticks.append(tick)
+            if len(self._pending_ticks) >= self._tick_batch_size:
+                await self._flush_ticks()
+
+        prev_minute_open = minute_open - 60_000
+        if self._last_flushed_minute_open_time is None:
+            self._last_flushed_minute_open_time = prev_minute_open - 60_000
+
+        if prev_minute_open > self._last_flushed_minute_open_time:
+            built = await self._build_minute(int(prev_minute_open))
+            if built is not None:
+                self._last_flushed_minute_open_time = int(prev_minute_open)
+                for m in [m for m in self._accumulators if m <= int(prev_minute_open)]:
+                    del self._accumulators[m]
+
+                await self._after_candle_closed(candle=built)
+
+                if self._rollups is not None:
+                    for rolled in await self._rollups.on_candle_closed(built):
+                        await self._after_candle_closed(candle=rolled)
+
+        # Persist the previous minute's ticks once it is closed (off the candle path).
+        if self._pending_ticks and self._pending_ticks[0].minute_open_time < minute_open:
+            await self._flush_ticks()
+
+    async def _build_minute(self, minute_open_time: int) -> Optional[CandleEntity]:
+        """
+        Build the candle of a closed minute: from memory when this poller saw the whole
+        minute, otherwise (first minutes after start) from the stored ticks.
+        """
+        acc = self._accumulators.get(minute_open_time)
+        full = self._first_full_minute_open_time is not None and minute_open_time >= self._first_full_minute_open_time
+
+        if acc is not None and (full or not self._persist_ticks):
+            return await self._build_candle_uc.execute_from_accumulator(
+                stream_key=self._stream_key,
+                source=self._source,
+                symbol=self._symbol,
+                interval=self._interval,
+                accumulator=acc,
+                static_fields=self._static_candle_fields,
+            )
+
+        if not self._persist_ticks:
+            return None
+
+        # Recovery: ticks stored before the restart are only in Mongo.
+        await self._flush_ticks()
+        return await self._build_candle_uc.execute(
+            stream_key=self._stream_key,
+            source=self._source,
+            symbol=self._symbol,
+            interval=self._interval,
+            minute_open_time=int(minute_open_time),
+            static_fields=self._static_candle_fields,
+        )
+
+    async def _flush_ticks(self) -> None:
+        """
+        Write buffered ticks with one insert_many (kept in the buffer on failure).
+        """
+        if not self._pending_ticks:
+            return
+        batch = self._pending_ticks
+        self._pending_ticks = []
+        try:
+            await self._ticks.insert_ticks(batch)
+        except Exception:
+            self._pending_ticks = batch + self._pending_ticks
+            raise
+
+    async def _after_candle_closed(self, *, candle: CandleEntity) -> None:
         """
         After a candle is built, compute indicators for active indicator sets
-        and optionally notify api-signals (fire-and-forget).
+        and optionally notify api-signals (queued on the dispatcher).
         """
         if self._compute_indicators is None or self._indicator_set_repo is None:
             return
 
-        active_sets = await self._indicator_set_repo.get_active_by_stream(self._stream_key)
-        for indset in active_sets:
-            snapshot = await self._compute_indicators.execute_for_indicator_set(
-                stream_key=self._stream_key,
-                ema_fast=int(indset.ema_fast),
-                ema_slow=int(indset.ema_slow),
-                atr_window=int(indset.atr_window),
+        close_time = int(candle.close_time)
+
+        active_sets = await self._indicator_set_repo.get_active_by_stream(candle.stream_key)
+        results = await self._compute_indicators.execute_for_stream(
+            stream_key=candle.stream_key,
+            indicator_sets=active_sets,
+            ts=int(close_time),
+            candle=candle,
+        )
+
+        if self._signals is None:
+            return
+
+        for indset, snapshot in results:
+            await self._signals.candle_closed(
                 indicator_set_id=indset.cfg_hash,
-                cfg_hash=indset.cfg_hash,
                 ts=int(close_time),
+                indicator_set=indset.to_dict(),
+                indicator_snapshot=snapshot.to_dict(),
             )
-
-            if self._signals_client is not None and snapshot is not None:
-                asyncio.create_task(
-                    self._signals_client.candle_closed(
-                        indicator_set_id=indset.cfg_hash,
-                        ts=int(close_time),
-                        indicator_set=indset.to_dict(),
-                        indicator_snapshot=snapshot.to_dict(),
-                    )
-                )
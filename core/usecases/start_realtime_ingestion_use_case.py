@@ -1,16 +1,17 @@
 from __future__ import annotations
 
-import asyncio
 import logging
 from typing import Any, Dict, Optional
 
+from adapters.external.binance.binance_combined_stream_manager import BinanceCombinedStreamManager  # type: ignore
 from adapters.external.binance.binance_websocket_client import BinanceWebsocketClient  # type: ignore
-from adapters.external.signals.signals_http_client import SignalsHttpClient
+from adapters.external.signals.signals_dispatcher import SignalsDispatcher
 from core.domain.entities.candle_entity import CandleEntity
 from core.repositories.candle_repository import CandleRepository
 from core.repositories.indicator_set_repository import IndicatorSetRepository
 from core.repositories.processing_offset_repository import ProcessingOffsetRepository
 from core.usecases.compute_indicators_use_case import ComputeIndicatorsUseCase
+from core.usecases.rollup_candles_use_case import RollupCandlesUseCase
 
 
 class StartRealtimeIngestionUseCase:
@@ -28,13 +29,14 @@ class StartRealtimeIngestionUseCase:
         source: str,
         symbol: str,
         interval: str,
-        websocket_client: BinanceWebsocketClient,
+        websocket_client: BinanceCombinedStreamManager | BinanceWebsocketClient,
         candle_repository: CandleRepository,
         processing_offset_repository: ProcessingOffsetRepository,
         compute_indicators_use_case: Optional[ComputeIndicatorsUseCase] = None,
         indicator_set_repo: Optional[IndicatorSetRepository] = None,
         logger: logging.Logger | None = None,
-        signals_client: Optional[SignalsHttpClient] = None,
+        signals_dispatcher: Optional[SignalsDispatcher] = None,
+        rollup_use_case: Optional[RollupCandlesUseCase] = None,
     ):
         self._source = str(source).lower()
         self._symbol = symbol.upper()
@@ -46,7 +48,8 @@ class StartRealtimeIngestionUseCase:
         self._indicator_set_repo = indicator_set_repo
         self._logger = logger or logging.getLogger(self.__class__.__name__)
         self._stream_key = stream_key
-        self._signals_client = signals_client
+        self._signals = signals_dispatcher
+        self._rollups = rollup_use_case
 
     async def execute(self) -> None:
         """
@@ -60,6 +63,12 @@ class StartRealtimeIngestionUseCase:
         )
         await self._ws.subscribe_kline_1m(self._symbol, self._on_kline_closed)
 
+    async def stop(self) -> None:
+        """
+        Stop receiving klines for this stream (the shared connection stays open).
+        """
+        await self._ws.unsubscribe_kline_1m(self._symbol)
+
     async def _on_kline_closed(self, event: Dict[str, Any]) -> None:
         """
         Handle a closed kline websocket event and persist candle + offsets.
@@ -85,29 +94,37 @@ class StartRealtimeIngestionUseCase:
             await self._candle_repo.upsert_closed_candle(candle)
             await self._offset_repo.set_last_closed_open_time(self._stream_key, candle.open_time)
 
-            if self._compute_indicators is not None and self._indicator_set_repo is not None:
-                active_sets = await self._indicator_set_repo.get_active_by_stream(self._stream_key)
-                for indset in active_sets:
-                    indicator_snapshot = await self._compute_indicators.execute_for_indicator_set(
-                        stream_key=self._stream_key,
-                        ema_fast=int(indset.ema_fast),
-                        ema_slow=int(indset.ema_slow),
-                        atr_window=int(indset.atr_window),
-                        indicator_set_id=indset.cfg_hash,
-                        cfg_hash=indset.cfg_hash,
-                        ts=candle.close_time,
-                    )
-
-                    if self._signals_client is not None and indicator_snapshot is not None:
-                        # Do not block websocket ingestion; signals should process async on its side.
-                        asyncio.create_task(
-                            self._signals_client.candle_closed(
-                                indicator_set_id=indset.cfg_hash,
-                                ts=candle.close_time,
-                                indicator_set=indset.to_dict(),
-                                indicator_snapshot=indicator_snapshot.to_dict(),
-                            )
-                        )
+            await self._after_candle_closed(candle)
+
+            if self._rollups is not None:
+                for rolled in await self._rollups.on_candle_closed(candle):
+                    await self._after_candle_closed(rolled)
 
         except Exception as exc:
             self._logger.exception("Failed to process closed kline: %s", exc)
+
+    async def _after_candle_closed(self, candle: CandleEntity) -> None:
+        """
+        Compute indicators for the active indicator sets of the candle's stream
+        (1m or a materialized rollup) and notify api-signals.
+        """
+        if self._compute_indicators is None or self._indicator_set_repo is None:
+            return
+
+        active_sets = await self._indicator_set_repo.get_active_by_stream(candle.stream_key)
+        results = await self._compute_indicators.execute_for_stream(
+            stream_key=candle.stream_key,
+            indicator_sets=active_sets,
+            ts=candle.close_time,
+            candle=candle,
+        )
+
+        if self._signals is not None:
+            for indset, indicator_snapshot in results:
+                # Queued: delivery (and retries) run on the dispatcher's workers.
+                await self._signals.candle_closed(
+                    indicator_set_id=indset.cfg_hash,
+                    ts=candle.close_time,
+                    indicator_set=indset.to_dict(),
+                    indicator_snapshot=indicator_snapshot.to_dict(),
+                )
@@ -1,33 +1,41 @@
 from __future__ import annotations
 
+import asyncio
 from dataclasses import dataclass
-from decimal import Decimal, InvalidOperation, getcontext
-from typing import Optional, Set
+from decimal import Decimal, InvalidOperation
+from fractions import Fraction
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple, Union
 
 from adapters.external.thegraph.pancakeswap_v3_base_pool_client import PancakeSwapV3BasePoolClient
 from config.settings import settings
 from core.domain.entities.token_registry_entity import TokenRegistryEntity
 from core.repositories.system_config_repository import SystemConfigRepository
 from core.repositories.token_registry_repository import TokenRegistryRepository
+from core.services.price_math import price_token1_per_token0, to_decimal, to_fraction
+from core.services.ttl_cache import AsyncTTLCache
 
 
-# high precision for sqrtPrice math
-getcontext().prec = 80
-
-Q192 = Decimal(2) ** Decimal(192)
+# Quote hops allowed from a token to a USD-stable quote
+MAX_QUOTE_DEPTH = 3
 
 
 def _norm_addr(v: str) -> str:
     return (v or "").strip().lower()
 
 
-def _to_decimal(v: object, *, field: str) -> Decimal:
+def _to_fraction(v: object, *, field: str) -> Fraction:
     try:
-        return Decimal(str(v))
+        return to_fraction(v if isinstance(v, (int, float)) else str(v))
     except (InvalidOperation, ValueError, TypeError):
         raise ValueError(f"invalid_decimal_field:{field}")
 
 
+def _inverse(v: Fraction, *, field: str) -> Fraction:
+    if v == 0:
+        raise ValueError(f"invalid_zero_price:{field}")
+    return 1 / v
+
+
 def _to_int(v: object, *, field: str) -> int:
     try:
         return int(str(v))
@@ -35,20 +43,89 @@ def _to_int(v: object, *, field: str) -> int:
         raise ValueError(f"invalid_int_field:{field}")
 
 
-def _price_token1_per_token0_from_sqrt_price(
-    *,
-    sqrt_price_x96: int,
-    decimals0: int,
-    decimals1: int,
-) -> Decimal:
+def _price_in_quote(ent: TokenRegistryEntity, pool: Dict[str, Any]) -> Tuple[Fraction, int]:
     """
-    Uniswap V3 math:
-      price(token1/token0) = (sqrtPriceX96^2 / 2^192) * 10^(decimals0 - decimals1)
+    Exact spot price of `ent.token_address` in its quote token from a pool state.
+
+    Returns:
+        (quote per 1 token, token decimals)
     """
-    sp = Decimal(sqrt_price_x96)
-    ratio = (sp * sp) / Q192
-    scale = Decimal(10) ** Decimal(decimals0 - decimals1)
-    return ratio * scale
+    token0 = (pool.get("token0") or {}) if isinstance(pool.get("token0"), dict) else {}
+    token1 = (pool.get("token1") or {}) if isinstance(pool.get("token1"), dict) else {}
+
+    token0_addr = _norm_addr(str(token0.get("id") or ""))
+    token1_addr = _norm_addr(str(token1.get("id") or ""))
+
+    if not token0_addr or not token1_addr:
+        raise ValueError("pool_token_sides_missing")
+
+    decimals0 = ent.token0_decimals
+    decimals1 = ent.token1_decimals
+    if decimals0 is None or decimals1 is None:
+        raise ValueError("registry_missing_decimals")
+
+    if ent.token_address == token0_addr:
+        token_decimals = int(decimals0)
+    elif ent.token_address == token1_addr:
+        token_decimals = int(decimals1)
+    else:
+        raise ValueError("token_not_in_pool")
+    
+    price_in_quote: Fraction | None = None
+
+    sqrt_price_raw = pool.get("sqrtPrice")
+    if sqrt_price_raw is not None:
+        sqrt_price_x96 = _to_int(sqrt_price_raw, field="sqrtPrice")
+
+        token1_per_token0 = price_token1_per_token0(
+            sqrt_price_x96=sqrt_price_x96,
+            decimals0=int(decimals0),
+            decimals1=int(decimals1),
+        )
+
+        # price_in_quote = quote per 1 token(ent.token)
+        # We know ent.quote_token_address is the "other side" of the pool.
+        if ent.token_address == token0_addr and ent.quote_token_address == token1_addr:
+            # token0 priced in token1
+            price_in_quote = token1_per_token0
+        elif ent.token_address == token1_addr and ent.quote_token_address == token0_addr:
+            # token1 priced in token0
+            if token1_per_token0 == 0:
+                raise ValueError("invalid_sqrt_price_ratio")
+            price_in_quote = 1 / token1_per_token0
+        else:
+            # Registry / pool mismatch
+            raise ValueError("token_not_in_pool")
+    else:
+        # Fallback (only if sqrtPrice missing)
+        token0_price = pool.get("token0Price")
+        token1_price = pool.get("token1Price")
+        if token0_price is None and token1_price is None:
+            raise ValueError("pool_prices_missing")
+
+        # try to infer using registry quote direction:
+        if ent.token_address == token0_addr and ent.quote_token_address == token1_addr:
+            # we want quote(token1) per token0
+            # depending on subgraph semantics, it might be token0Price OR 1/token1Price
+            if token0_price is not None:
+                price_in_quote = _to_fraction(token0_price, field="token0Price")
+            elif token1_price is not None:
+                v = _to_fraction(token1_price, field="token1Price")
+                price_in_quote = _inverse(v, field="token1Price")
+        elif ent.token_address == token1_addr and ent.quote_token_address == token0_addr:
+            # we want quote(token0) per token1
+            if token1_price is not None:
+                price_in_quote = _to_fraction(token1_price, field="token1Price")
+            elif token0_price is not None:
+                v = _to_fraction(token0_price, field="token0Price")
+                price_in_quote = _inverse(v, field="token0Price")
+        else:
+            raise ValueError("token_not_in_pool")
+
+    if price_in_quote is None:
+        raise ValueError("failed_to_compute_price_in_quote")
+
+    return price_in_quote, token_decimals
 
 
 @dataclass(frozen=True)
@@ -71,6 +148,16 @@ class TokenPricingUseCase:
     Key rule:
     - Do NOT trust token0Price/token1Price semantics from subgraphs.
       Prefer sqrtPriceX96 + decimals (deterministic).
+
+    Caching (meant for one long-lived instance):
+    - USD prices per (chain, token) with TTL + stale-while-revalidate.
+    - Pool states per (subgraph, pool): concurrent lookups of the same pool (e.g. a
+      quote pool shared by many tokens) collapse into one subgraph query.
+    - The runtime config (API key) is re-read at most every `runtime_config_ttl_s`.
+    - Graph clients (httpx connection pools) are kept per (API key, subgraph); call
+      aclose() on shutdown.
+    With the default zero TTLs nothing is served from cache, but concurrent loads are
+    still coalesced.
     """
 
     def __init__(
@@ -78,10 +165,38 @@ class TokenPricingUseCase:
         *,
         system_config_repo: SystemConfigRepository,
         token_registry_repo: TokenRegistryRepository,
+        cache_ttl_s: float = 0.0,
+        cache_stale_s: float = 0.0,
+        cache_max_entries: int = 10_000,
+        runtime_config_ttl_s: float = 0.0,
     ) -> None:
         self._system_repo = system_config_repo
         self._token_repo = token_registry_repo
 
+        self._prices: AsyncTTLCache[TokenPriceResult] = AsyncTTLCache(
+            ttl_s=cache_ttl_s,
+            stale_s=cache_stale_s,
+            max_entries=cache_max_entries,
+        )
+        self._pools: AsyncTTLCache[Dict[str, Any]] = AsyncTTLCache(ttl_s=cache_ttl_s, max_entries=cache_max_entries)
+        self._runtime: AsyncTTLCache[str] = AsyncTTLCache(ttl_s=runtime_config_ttl_s, max_entries=1)
+        self._clients: Dict[Tuple[str, Optional[str]], PancakeSwapV3BasePoolClient] = {}
+
+    async def aclose(self) -> None:
+        """Close the pooled Graph clients."""
+        clients = list(self._clients.values())
+        self._clients.clear()
+        for tg in clients:
+            await tg.aclose()
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for observability."""
+        return {
+            "prices": self._prices.stats(),
+            "pools": self._pools.stats(),
+            "graph_clients": len(self._clients),
+        }
+
     async def register_from_pool(
         self,
         *,
@@ -92,10 +207,7 @@ class TokenPricingUseCase:
         subgraph_id: Optional[str] = None,
         quote_token_is_usd_stable: Optional[bool] = None,
     ) -> TokenRegistryEntity:
-        runtime = await self._system_repo.get_runtime()
-        api_key = ((runtime.thegraph_api_key if runtime else None) or "").strip()
-        if not api_key:
-            raise ValueError("thegraph_api_key_missing")
+        api_key = await self._api_key(cached=False)
 
         chain = (chain or "base").strip().lower()
 
@@ -107,11 +219,8 @@ class TokenPricingUseCase:
         token_address = _norm_addr(token_address)
         pool_address = _norm_addr(pool_address)
 
-        tg = PancakeSwapV3BasePoolClient(api_key=api_key, subgraph_id=subgraph_id)
-        try:
-            data = await tg.get_pool(pool_address=pool_address)
-        finally:
-            await tg.aclose()
+        # registration always reads the live pool (no cache)
+        data = await self._client(api_key, subgraph_id).get_pool(pool_address=pool_address)
 
         token0 = (data.get("token0") or {}) if isinstance(data.get("token0"), dict) else {}
         token1 = (data.get("token1") or {}) if isinstance(data.get("token1"), dict) else {}
@@ -164,6 +273,7 @@ class TokenPricingUseCase:
         )
 
         await self._token_repo.upsert(ent)
+        self._prices.invalidate((chain, token_address))
         stored = await self._token_repo.get_by_token_address(chain=chain, token_address=token_address)
         return stored or ent
 
@@ -171,12 +281,158 @@ class TokenPricingUseCase:
         chain = (chain or "base").strip().lower()
         token_address = _norm_addr(token_address)
 
-        ent = await self._token_repo.get_by_token_address(chain=chain, token_address=token_address)
-        if not ent:
-            raise LookupError("token_not_registered")
+        async def load() -> TokenPriceResult:
+            ent = await self._token_repo.get_by_token_address(chain=chain, token_address=token_address)
+            if not ent:
+                raise LookupError("token_not_registered")
+
+            visited: Set[str] = set()
+            return await self._resolve_usd(chain=chain, ent=ent, visited=visited, depth=0)
+
+        return await self._prices.get_or_load((chain, token_address), load)
+
+    async def get_token_usd_prices(
+        self,
+        *,
+        items: Sequence[Tuple[str, str]],
+    ) -> List[Union[TokenPriceResult, Exception]]:
+        """
+        Resolve the USD price of many (chain, token_address) pairs at once.
+
+        - Registry entries (requested tokens + their quote paths) are loaded with one
+          `$in` query per chain and quote level.
+        - Every pool involved is fetched with one batched query per subgraph.
+        - Each pool and each quote token's USD price is evaluated once and shared.
+
+        Returns:
+            One entry per item, in order: the TokenPriceResult, or the exception that
+            token failed with (same errors as get_token_usd_price).
+        """
+        keys = [((chain or "base").strip().lower(), _norm_addr(token)) for chain, token in items]
+
+        # 1) registry entries, level by level along the quote paths
+        ents: Dict[Tuple[str, str], TokenRegistryEntity] = {}
+        seen: Set[Tuple[str, str]] = set()
+        pending = set(keys)
+        for _ in range(MAX_QUOTE_DEPTH + 1):
+            seen |= pending
+            by_chain: Dict[str, List[str]] = {}
+            for chain, token in pending:
+                by_chain.setdefault(chain, []).append(token)
+            chains = list(by_chain)
+            loaded = await asyncio.gather(
+                *(self._token_repo.list_by_token_addresses(chain=c, token_addresses=by_chain[c]) for c in chains)
+            )
+            pending = set()
+            for chain, level in zip(chains, loaded):
+                for ent in level:
+                    ents[(chain, ent.token_address)] = ent
+                    quote = (chain, ent.quote_token_address)
+                    if not ent.quote_token_is_usd_stable and quote not in seen:
+                        pending.add(quote)
+            if not pending:
+                break
+
+        # 2) pool states, one batched query per subgraph
+        pools: Dict[Tuple[str, str], Union[Dict[str, Any], Exception]] = {}
+        by_subgraph: Dict[str, Set[str]] = {}
+        for ent in ents.values():
+            by_subgraph.setdefault(ent.subgraph_id or "", set()).add(_norm_addr(ent.pool_address))
+        if by_subgraph:
+            subgraphs = list(by_subgraph)
+            try:
+                api_key = await self._api_key()
+                fetched = await asyncio.gather(
+                    *(
+                        self._client(api_key, sg or None).get_pools(pool_addresses=sorted(by_subgraph[sg]))
+                        for sg in subgraphs
+                    ),
+                    return_exceptions=True,
+                )
+            except ValueError as exc:
+                fetched = [exc] * len(subgraphs)
+            for sg, res in zip(subgraphs, fetched):
+                for addr in by_subgraph[sg]:
+                    if isinstance(res, Exception):
+                        pools[(sg, addr)] = res
+                    else:
+                        pools[(sg, addr)] = res.get(addr) or {}
+                        self._pools.put((sg, addr), pools[(sg, addr)])
+
+        # 3) evaluate every token once (successes are shared along quote paths)
+        memo: Dict[Tuple[str, str], Tuple[TokenPriceResult, Fraction]] = {}  # result, exact USD price
+
+        def resolve(key: Tuple[str, str], path: Tuple[Tuple[str, str], ...]) -> Tuple[TokenPriceResult, Fraction]:
+            if key in memo:
+                return memo[key]
+            if len(path) > MAX_QUOTE_DEPTH:
+                raise ValueError("quote_resolution_depth_exceeded")
+            if key in path:
+                raise ValueError("quote_resolution_cycle")
+
+            ent = ents.get(key)
+            if ent is None:
+                raise LookupError("token_not_registered" if not path else "quote_token_not_registered")
+
+            pool = pools.get((ent.subgraph_id or "", _norm_addr(ent.pool_address))) or {}
+            if isinstance(pool, Exception):
+                raise pool
+            price_in_quote, token_decimals = _price_in_quote(ent, pool)
+
+            if ent.quote_token_is_usd_stable:
+                price_usd = price_in_quote
+            else:
+                _, quote_usd = resolve((key[0], ent.quote_token_address), path + (key,))
+                price_usd = price_in_quote * quote_usd
+
+            res = TokenPriceResult(
+                chain=key[0],
+                token_address=ent.token_address,
+                price_usd=to_decimal(price_usd),
+                quote_token_address=ent.quote_token_address,
+                quote_token_is_usd_stable=bool(ent.quote_token_is_usd_stable),
+                price_in_quote=to_decimal(price_in_quote),
+                pool_address=ent.pool_address,
+                decimals=token_decimals,
+            )
+            memo[key] = (res, price_usd)
+            return memo[key]
+
+        out: List[Union[TokenPriceResult, Exception]] = []
+        for key in keys:
+            try:
+                res, _ = resolve(key, ())
+            except Exception as exc:
+                out.append(exc)
+            else:
+                self._prices.put(key, res)
+                out.append(res)
+        return out
+
+    async def _api_key(self, *, cached: bool = True) -> str:
+        async def load() -> str:
+            runtime = await self._system_repo.get_runtime()
+            return ((runtime.thegraph_api_key if runtime else None) or "").strip()
 
-        visited: Set[str] = set()
-        return await self._resolve_usd(chain=chain, ent=ent, visited=visited, depth=0)
+        api_key = await self._runtime.get_or_load("runtime", load) if cached else await load()
+        if not api_key:
+            raise ValueError("thegraph_api_key_missing")
+        return api_key
+
+    def _client(self, api_key: str, subgraph_id: Optional[str]) -> PancakeSwapV3BasePoolClient:
+        key = (api_key, (subgraph_id or "").strip() or None)
+        tg = self._clients.get(key)
+        if tg is None:
+            tg = self._clients[key] = PancakeSwapV3BasePoolClient(api_key=api_key, subgraph_id=key[1])
+        return tg
+
+    async def _get_pool(self, *, subgraph_id: Optional[str], pool_address: str) -> Dict[str, Any]:
+        api_key = await self._api_key()
+        tg = self._client(api_key, subgraph_id)
+        return await self._pools.get_or_load(
+            (subgraph_id or "", _norm_addr(pool_address)),
+            lambda: tg.get_pool(pool_address=pool_address),
+        )
 
     async def _resolve_usd(
         self,
@@ -186,7 +442,7 @@ class TokenPricingUseCase:
         visited: Set[str],
         depth: int,
     ) -> TokenPriceResult:
-        if depth > 3:
+        if depth > MAX_QUOTE_DEPTH:
             raise ValueError("quote_resolution_depth_exceeded")
 
         key = f"{chain}:{ent.token_address}"
@@ -194,101 +450,19 @@ class TokenPricingUseCase:
             raise ValueError("quote_resolution_cycle")
         visited.add(key)
 
-        runtime = await self._system_repo.get_runtime()
-        api_key = ((runtime.thegraph_api_key if runtime else None) or "").strip()
-        if not api_key:
-            raise ValueError("thegraph_api_key_missing")
-
-        tg = PancakeSwapV3BasePoolClient(api_key=api_key, subgraph_id=ent.subgraph_id)
-        try:
-            pool = await tg.get_pool(pool_address=ent.pool_address)
-        finally:
-            await tg.aclose()
-
-        token0 = (pool.get("token0") or {}) if isinstance(pool.get("token0"), dict) else {}
-        token1 = (pool.get("token1") or {}) if isinstance(pool.get("token1"), dict) else {}
-
-        token0_addr = _norm_addr(str(token0.get("id") or ""))
-        token1_addr = _norm_addr(str(token1.get("id") or ""))
-
-        if not token0_addr or not token1_addr:
-            raise ValueError("pool_token_sides_missing")
-
-        decimals0 = ent.token0_decimals
-        decimals1 = ent.token1_decimals
-        if decimals0 is None or decimals1 is None:
-            raise ValueError("registry_missing_decimals")
-
-        if ent.token_address == token0_addr:
-            token_decimals = int(decimals0)
-        elif ent.token_address == token1_addr:
-            token_decimals = int(decimals1)
-        else:
-            raise ValueError("token_not_in_pool")
-        
-        price_in_quote: Decimal | None = None
-
-        sqrt_price_raw = pool.get("sqrtPrice")
-        if sqrt_price_raw is not None:
-            sqrt_price_x96 = _to_int(sqrt_price_raw, field="sqrtPrice")
-
-            token1_per_token0 = _price_token1_per_token0_from_sqrt_price(
-                sqrt_price_x96=sqrt_price_x96,
-                decimals0=int(decimals0),
-                decimals1=int(decimals1),
-            )
-
-            # price_in_quote = quote per 1 token(ent.token)
-            # We know ent.quote_token_address is the "other side" of the pool.
-            if ent.token_address == token0_addr and ent.quote_token_address == token1_addr:
-                # token0 priced in token1
-                price_in_quote = token1_per_token0
-            elif ent.token_address == token1_addr and ent.quote_token_address == token0_addr:
-                # token1 priced in token0
-                if token1_per_token0 == 0:
-                    raise ValueError("invalid_sqrt_price_ratio")
-                price_in_quote = Decimal(1) / token1_per_token0
-            else:
-                # Registry / pool mismatch
-                raise ValueError("token_not_in_pool")
-        else:
-            # Fallback (only if sqrtPrice missing)
-            token0_price = pool.get("token0Price")
-            token1_price = pool.get("token1Price")
-            if token0_price is None and token1_price is None:
-                raise ValueError("pool_prices_missing")
-
-            # try to infer using registry quote direction:
-            if ent.token_address == token0_addr and ent.quote_token_address == token1_addr:
-                # we want quote(token1) per token0
-                # depending on subgraph semantics, it might be token0Price OR 1/token1Price
-                if token0_price is not None:
-                    price_in_quote = _to_decimal(token0_price, field="token0Price")
-                elif token1_price is not None:
-                    v = _to_decimal(token1_price, field="token1Price")
-                    price_in_quote = Decimal(1) / v
-            elif ent.token_address == token1_addr and ent.quote_token_address == token0_addr:
-                # we want quote(token0) per token1
-                if token1_price is not None:
-                    price_in_quote = _to_decimal(token1_price, field="token1Price")
-                elif token0_price is not None:
-                    v = _to_decimal(token0_price, field="token0Price")
-                    price_in_quote = Decimal(1) / v
-            else:
-                raise ValueError("token_not_in_pool")
+        pool = await self._get_pool(subgraph_id=ent.subgraph_id, pool_address=ent.pool_address)
 
-        if price_in_quote is None:
-            raise ValueError("failed_to_compute_price_in_quote")
+        price_in_quote, token_decimals = _price_in_quote(ent, pool)
 
         # If quote token is USD-stable, USD price is direct
         if ent.quote_token_is_usd_stable:
             return TokenPriceResult(
                 chain=chain,
                 token_address=ent.token_address,
-                price_usd=price_in_quote,
+                price_usd=to_decimal(price_in_quote),
                 quote_token_address=ent.quote_token_address,
                 quote_token_is_usd_stable=True,
-                price_in_quote=price_in_quote,
+                price_in_quote=to_decimal(price_in_quote),
                 pool_address=ent.pool_address,
                 decimals=token_decimals,
             )
@@ -299,15 +473,15 @@ class TokenPricingUseCase:
             raise LookupError("quote_token_not_registered")
 
         quote_res = await self._resolve_usd(chain=chain, ent=quote_ent, visited=visited, depth=depth + 1)
-        price_usd = price_in_quote * quote_res.price_usd
+        price_usd = price_in_quote * to_fraction(quote_res.price_usd)
 
         return TokenPriceResult(
             chain=chain,
             token_address=ent.token_address,
-            price_usd=price_usd,
+            price_usd=to_decimal(price_usd),
             quote_token_address=ent.quote_token_address,
             quote_token_is_usd_stable=False,
-            price_in_quote=price_in_quote,
+            price_in_quote=to_decimal(price_in_quote),
             pool_address=ent.pool_address,
             decimals=token_decimals,
         )
@@ -10,6 +10,8 @@ from workers.ingestion_supervisor import IngestionSupervisor
 from adapters.entry.http.market_data_router import router as market_data_router
 from adapters.entry.http.admin_config_router import router as admin_config_router
 from adapters.entry.http.admin_token_router import router as admin_token_router
+from adapters.entry.http.admin_metrics_router import router as admin_metrics_router
+from adapters.entry.http.admin_cluster_router import router as admin_cluster_router
 from adapters.entry.http.token_pricing_router import router as token_pricing_router
 
 
@@ -28,12 +30,26 @@ async def lifespan(app: FastAPI):
     _setup_logging()
     logging.getLogger(__name__).info("Starting api-market-data (lifespan startup)...")
 
-    await supervisor.start()
+    # API-only replicas (several uvicorn workers) leave ingestion to workers.ingestion_worker
+    await supervisor.start(ingestion=settings.API_INGESTION_ENABLED)
     app.state.db = supervisor.db
+    app.state.indicator_recompute = supervisor.indicator_recompute
+    app.state.candle_buffer = supervisor.candle_buffer
+    app.state.indicator_sets = supervisor.indicator_sets
+    app.state.binance_ws = supervisor.binance_ws
+    app.state.tick_archive = supervisor.tick_archive
+    app.state.thegraph_poller = supervisor.thegraph_poller
+    app.state.token_pricing = supervisor.token_pricing
+    app.state.token_price_oracle = supervisor.token_price_oracle
+    app.state.signals = supervisor.signals
+    app.state.cluster = supervisor.cluster
+    app.state.stream_reconciler = supervisor.stream_reconciler
 
     app.include_router(market_data_router, prefix="/api")
     app.include_router(admin_config_router, prefix="/api")
     app.include_router(admin_token_router, prefix="/api")
+    app.include_router(admin_metrics_router, prefix="/api")
+    app.include_router(admin_cluster_router, prefix="/api")
     app.include_router(token_pricing_router, prefix="/api")
     
     try:
@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+from adapters.entry.http.dtos.candle_dtos import CandleOutDTO
+from core.domain.entities.candle_entity import CandleEntity
+from core.services.candle_ring_buffer import CandleRingBufferRegistry
+
+STREAM_KEY = "binance:BTCUSDT:1m"
+MINUTE = 60_000
+
+
+def _candle(minute: int) -> CandleEntity:
+    ot = minute * MINUTE
+    return CandleEntity(
+        stream_key=STREAM_KEY,
+        source="binance",
+        symbol="BTCUSDT",
+        interval="1m",
+        open_time=ot,
+        close_time=ot + MINUTE - 1,
+        open=1.0,
+        high=1.0,
+        low=1.0,
+        close=1.0,
+        volume=1.0,
+        trades=1,
+        is_closed=True,
+    )
+
+
+def test_last_n_rows_have_the_candle_dto_keys() -> None:
+    registry = CandleRingBufferRegistry(capacity=10)
+    registry.warm(STREAM_KEY, [_candle(m) for m in range(3)])
+
+    rows = registry.last_n_rows(STREAM_KEY, 2)
+
+    assert rows is not None and len(rows) == 2
+    assert all(set(r) == set(CandleOutDTO.model_fields) for r in rows)
+    assert rows[-1]["cfg_hash"] is None
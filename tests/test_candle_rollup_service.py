@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+from typing import List
+
+from core.domain.entities.candle_entity import CandleEntity
+from core.repositories.candle_repository import CandleColumns
+from core.services.candle_rollup_service import CandleRollupService
+
+STREAM_KEY = "binance:BTCUSDT:1m"
+MINUTE = 60_000
+
+
+def _candle(minute: int) -> CandleEntity:
+    ot = minute * MINUTE
+    return CandleEntity(
+        stream_key=STREAM_KEY,
+        source="binance",
+        symbol="BTCUSDT",
+        interval="1m",
+        open_time=ot,
+        close_time=ot + MINUTE - 1,
+        open=100.0 + minute,
+        high=100.0 + minute,
+        low=100.0 + minute,
+        close=100.0 + minute,
+        volume=1.0,
+        trades=1,
+        is_closed=True,
+    )
+
+
+def _columns(minutes: List[int]) -> CandleColumns:
+    cols = CandleColumns()
+    for m in minutes:
+        c = _candle(m)
+        cols.open_time.append(c.open_time)
+        cols.close_time.append(c.close_time)
+        cols.open.append(c.open)
+        cols.high.append(c.high)
+        cols.low.append(c.low)
+        cols.close.append(c.close)
+        cols.volume.append(c.volume)
+        cols.trades.append(c.trades)
+    return cols
+
+
+def test_reacquired_stream_reseeds_bucket_in_progress() -> None:
+    svc = CandleRollupService(["5m"])
+    for m in (0, 1):
+        svc.apply(_candle(m))
+
+    # Stream stopped here; minute 2 was ingested by another replica
+    svc.drop(STREAM_KEY)
+
+    assert svc.missing_buckets(_candle(3)) == ["5m"]
+    svc.seed_bucket(_candle(3), "5m", _columns([0, 1, 2]))
+    assert svc.apply(_candle(3)) == []
+    closed = svc.apply(_candle(4))
+
+    assert len(closed) == 1
+    assert closed[0].open_time == 0
+    assert closed[0].volume == 5.0
+    assert closed[0].open == 100.0
+    assert closed[0].close == 104.0
+
+
+def test_reacquired_stream_does_not_emit_stale_partial_bucket() -> None:
+    svc = CandleRollupService(["5m"])
+    for m in (0, 1):
+        svc.apply(_candle(m))
+
+    svc.drop(STREAM_KEY)
+
+    # Back in a later bucket: the bucket completed elsewhere must not be overwritten
+    assert svc.apply(_candle(5)) == []
+    assert svc.apply(_candle(9))[0].open_time == 5 * MINUTE
+
+
+def test_drop_keeps_other_streams() -> None:
+    svc = CandleRollupService(["5m", "15m"])
+    other = _candle(1).model_copy(update={"stream_key": "binance:ETHUSDT:1m"})
+    svc.apply(_candle(1))
+    svc.apply(other)
+
+    svc.drop(STREAM_KEY)
+
+    assert svc.missing_buckets(_candle(2)) == ["5m", "15m"]
+    assert svc.missing_buckets(other.model_copy(update={"open_time": 2 * MINUTE})) == []
@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+from adapters.external.archive.tick_archive_numpy import DAY_MS, TickArchiveNumpy
+from core.repositories.price_tick_repository import TickColumns
+
+STREAM_KEY = "binance:BTCUSDT:1m"
+
+
+def _ticks(day: int) -> TickColumns:
+    return TickColumns(ts=[day + 1_000, day + 2_000], price=[1.0, 2.0], volume=[0.5, 0.5])
+
+
+def test_read_only_archive_sees_days_archived_after_it_opened(tmp_path) -> None:
+    writer = TickArchiveNumpy(str(tmp_path))
+    reader = TickArchiveNumpy(str(tmp_path), read_only=True)
+
+    assert reader.archived_until(STREAM_KEY) is None
+
+    writer.write_day(STREAM_KEY, 0, _ticks(0))
+    assert reader.archived_until(STREAM_KEY) == DAY_MS
+    assert list(reader.read_range(STREAM_KEY, 0, DAY_MS, 10).ts) == [1_000, 2_000]
+
+    writer.write_day(STREAM_KEY, DAY_MS, _ticks(DAY_MS))
+    assert reader.archived_until(STREAM_KEY) == 2 * DAY_MS
+    assert len(reader.read_range(STREAM_KEY, 0, 2 * DAY_MS, 10)) == 4
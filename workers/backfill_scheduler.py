@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from adapters.external.binance.binance_rate_limiter import BinanceRateLimiter
+from adapters.external.binance.binance_rest_client import BinanceRestClient
+from core.repositories.candle_repository import CandleRepository
+from core.repositories.processing_offset_repository import ProcessingOffsetRepository
+from core.services.stream_key_service import StreamKeyService
+from core.usecases.backfill_candles_use_case import BackfillCandlesUseCase, GapFillResult
+
+
+@dataclass(frozen=True)
+class BackfillJob:
+    """
+    One stream to backfill on start.
+    """
+
+    source: str
+    symbol: str
+    interval: str
+    rest_base_url: str
+    initial_history_minutes: Optional[int] = None  # None -> scheduler default
+
+    @property
+    def stream_key(self) -> str:
+        return StreamKeyService.build(source=self.source, symbol=self.symbol, interval=self.interval)
+
+
+class BackfillScheduler:
+    """
+    Backfills many streams concurrently under one shared Binance weight budget.
+
+    - A bounded number of streams run at the same time (semaphore).
+    - Every REST client of the run shares the same BinanceRateLimiter, so the total
+      request weight stays within budget whatever the concurrency.
+    - Each stream is gap-filled (holes inside the lookback window + the tail).
+    - A failing stream is logged and does not stop the others.
+    """
+
+    def __init__(
+        self,
+        *,
+        candle_repository: CandleRepository,
+        processing_offset_repository: ProcessingOffsetRepository,
+        rate_limiter: BinanceRateLimiter,
+        max_concurrency: int = 8,
+        initial_history_minutes: int = 1440,
+        gap_lookback_minutes: int = 10080,
+        logger: logging.Logger | None = None,
+    ) -> None:
+        self._candles = candle_repository
+        self._offsets = processing_offset_repository
+        self._limiter = rate_limiter
+        self._max_concurrency = max(1, int(max_concurrency))
+        self._initial_history_minutes = max(0, int(initial_history_minutes))
+        self._gap_lookback_minutes = max(0, int(gap_lookback_minutes))
+        self._logger = logger or logging.getLogger(self.__class__.__name__)
+
+    async def run(self, jobs: List[BackfillJob]) -> Dict[str, GapFillResult]:
+        """
+        Backfill all jobs and wait for completion.
+
+        Returns:
+            Gap-fill result per stream_key (failed streams are omitted).
+        """
+        if not jobs:
+            return {}
+
+        clients: Dict[str, BinanceRestClient] = {}
+        sem = asyncio.Semaphore(self._max_concurrency)
+        results: Dict[str, GapFillResult] = {}
+
+        def _client(base_url: str) -> BinanceRestClient:
+            c = clients.get(base_url)
+            if c is None:
+                c = BinanceRestClient(base_url=base_url, rate_limiter=self._limiter)
+                clients[base_url] = c
+            return c
+
+        async def _one(job: BackfillJob) -> None:
+            async with sem:
+                uc = BackfillCandlesUseCase(
+                    binance_client=_client(job.rest_base_url),
+                    candle_repository=self._candles,
+                    processing_offset_repository=self._offsets,
+                    logger=self._logger,
+                )
+                history = (
+                    self._initial_history_minutes
+                    if job.initial_history_minutes is None
+                    else max(0, int(job.initial_history_minutes))
+                )
+                try:
+                    results[job.stream_key] = await uc.execute_with_gaps(
+                        source=job.source,
+                        symbol=job.symbol,
+                        interval=job.interval,
+                        initial_history_ms=history * 60_000,
+                        gap_lookback_ms=self._gap_lookback_minutes * 60_000,
+                    )
+                except asyncio.CancelledError:
+                    raise
+                except Exception as exc:
+                    self._logger.exception("Backfill error for %s: %s", job.stream_key, exc)
+
+        t0 = time.monotonic()
+        try:
+            await asyncio.gather(*(_one(j) for j in jobs))
+        finally:
+            for c in clients.values():
+                with contextlib.suppress(Exception):
+                    await c.aclose()
+
+        self._logger.info(
+            "Backfill finished streams=%s ok=%s candles=%s elapsed_s=%.2f limiter=%s",
+            len(jobs),
+            len(results),
+            sum(r.written for r in results.values()),
+            time.monotonic() - t0,
+            self._limiter.stats(),
+        )
+        return results
@@ -0,0 +1,286 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import os
+import socket
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+
+from core.domain.entities.cluster_node_entity import ClusterNodeEntity
+from core.domain.entities.ingestion_stream_entity import IngestionStreamEntity
+from core.repositories.cluster_node_repository import ClusterNodeRepository
+from core.repositories.stream_lease_repository import StreamLeaseRepository
+from core.services.rendezvous_hash_service import RendezvousHashService
+from core.services.stream_key_service import StreamKeyService
+
+
+def stream_id(stream: IngestionStreamEntity) -> str:
+    return StreamKeyService.stream_id(
+        source_type=stream.source_type,
+        source=stream.source_name,
+        symbol=stream.symbol,
+        interval=stream.interval,
+        pool_address=stream.pool_address,
+    )
+
+
+class ClusterCoordinator:
+    """
+    Splits the enabled ingestion streams across replicas with Mongo-backed leases.
+
+    Two loops run every `heartbeat_s`:
+    - heartbeat: refreshes the node in `cluster_nodes` and renews the leases of every
+      stream it holds, including streams still starting. It never waits on stream
+      start-up (backfill can take minutes), so peers do not take a busy node for dead;
+    - rebalance: maps every enabled stream onto the live nodes with rendezvous hashing
+      (same result on every node, minimal movement when nodes join or leave), stops the
+      streams now mapped to another node (or disabled) or taken over, and releases
+      their leases, restarts the held streams whose definition was edited (restart()),
+      then claims the streams mapped to it whose lease is free or expired and starts them.
+
+    A dead node stops heartbeating and renewing: its streams are re-mapped once its
+    heartbeat is older than `lease_ttl_s` and claimed once its leases expire, i.e.
+    within `lease_ttl_s + heartbeat_s`. A node that cannot renew stops its streams one
+    heartbeat before its leases expire, so a partitioned node does not keep ingesting
+    next to the new owner.
+    """
+
+    def __init__(
+        self,
+        *,
+        node_repository: ClusterNodeRepository,
+        lease_repository: StreamLeaseRepository,
+        list_streams: Callable[[], Awaitable[List[IngestionStreamEntity]]],
+        on_acquired: Callable[[List[IngestionStreamEntity]], Awaitable[None]],
+        on_released: Callable[[List[str]], Awaitable[None]],
+        node_id: Optional[str] = None,
+        heartbeat_s: float = 5.0,
+        lease_ttl_s: float = 20.0,
+        logger: logging.Logger | None = None,
+    ) -> None:
+        """
+        Args:
+            node_repository: Heartbeats of the replicas.
+            lease_repository: Stream leases.
+            list_streams: Returns the enabled streams (evaluated every cycle).
+            on_acquired: Starts streams whose leases were just claimed.
+            on_released: Stops streams by stream id (before their leases are released).
+            node_id: Stable id of this replica (default: host-pid).
+            heartbeat_s: Pause between cycles.
+            lease_ttl_s: Lease duration and heartbeat liveness window.
+        """
+        self._nodes = node_repository
+        self._leases = lease_repository
+        self._list_streams = list_streams
+        self._on_acquired = on_acquired
+        self._on_released = on_released
+        self._node_id = node_id or f"{socket.gethostname()}-{os.getpid()}"
+        self._heartbeat_s = float(heartbeat_s)
+        self._lease_ttl_s = max(float(lease_ttl_s), 2 * self._heartbeat_s)
+        self._logger = logger or logging.getLogger(self.__class__.__name__)
+
+        self._started_at = datetime.now(tz=timezone.utc)
+        self._owned: Set[str] = set()  # leased streams (running or starting)
+        self._lost: Set[str] = set()  # leases taken over, stopped by the next rebalance
+        self._restart: Set[str] = set()  # edited definitions, restarted by the next rebalance
+        self._renewed_at = time.monotonic()
+        self._alive: List[str] = []
+
+        self._tasks: List[asyncio.Task] = []
+        self._stop = asyncio.Event()
+        self._wake = asyncio.Event()
+
+        self.cycles = 0
+        self.beats = 0
+        self.errors = 0
+        self.acquired = 0
+        self.released = 0
+        self.lost = 0
+
+    @property
+    def node_id(self) -> str:
+        return self._node_id
+
+    @property
+    def owned(self) -> Set[str]:
+        """Stream ids leased to (and run by) this node."""
+        return set(self._owned)
+
+    def start(self) -> None:
+        """Start the heartbeat and rebalance loops in background (first cycles run at once)."""
+        if not self._tasks:
+            self._stop.clear()
+            self._tasks = [asyncio.create_task(self._beat_loop()), asyncio.create_task(self._run())]
+
+    async def stop(self) -> None:
+        """Stop the loops (no more claims, renewals or releases); streams keep running."""
+        self._stop.set()
+        self._wake.set()
+        for task in self._tasks:
+            with contextlib.suppress(asyncio.CancelledError, Exception):
+                await task
+        self._tasks = []
+
+    def restart(self, stream_ids: List[str]) -> None:
+        """
+        Restart streams with their current definitions at the next rebalance (now).
+        Streams no longer held by this node by then are left alone.
+        """
+        self._restart |= set(stream_ids)
+        self._wake.set()
+
+    def wake(self) -> None:
+        """Run the next rebalance now (e.g. after ingestion_streams changed)."""
+        self._wake.set()
+
+    async def leave(self) -> None:
+        """
+        Release every lease and remove the node, so other replicas take over at their
+        next cycle instead of waiting for expiry. Call after the streams are stopped.
+        """
+        with contextlib.suppress(Exception):
+            await self._leases.release(owner=self._node_id)
+        with contextlib.suppress(Exception):
+            await self._nodes.delete(self._node_id)
+        self._owned.clear()
+
+    async def run_once(self) -> None:
+        """One heartbeat + rebalance cycle."""
+        await self.beat()
+        await self.rebalance()
+
+    async def beat(self) -> None:
+        """Refresh the node heartbeat and renew the leases of every held stream."""
+        started = time.monotonic()
+        now = datetime.now(tz=timezone.utc)
+        expires_at = now + timedelta(seconds=self._lease_ttl_s)
+
+        await self._nodes.heartbeat(
+            ClusterNodeEntity(
+                id=self._node_id,
+                host=socket.gethostname(),
+                pid=os.getpid(),
+                started_at=self._started_at,
+                heartbeat_at=now,
+                streams=sorted(self._owned),
+            )
+        )
+        held = set(self._owned)
+        still_ours = await self._leases.renew(owner=self._node_id, stream_ids=sorted(held), expires_at=expires_at)
+        # Leases expire lease_ttl_s after `now`, i.e. after `started` on this clock
+        self._renewed_at = started
+
+        # Streams released meanwhile by the rebalance loop are not "lost"
+        lost = ((held - still_ours) & self._owned) - self._lost
+        if lost:
+            self.lost += len(lost)
+            self._lost |= lost
+            self._logger.warning("Stream leases taken over by another node: %s", sorted(lost))
+            self._wake.set()
+        self.beats += 1
+
+    async def rebalance(self) -> None:
+        """Stop streams no longer ours, claim and start the ones mapped to this node."""
+        now = datetime.now(tz=timezone.utc)
+        expires_at = now + timedelta(seconds=self._lease_ttl_s)
+
+        alive = await self._nodes.list_alive(since=now - timedelta(seconds=self._lease_ttl_s))
+        self._alive = sorted({str(n.id) for n in alive} | {self._node_id})
+
+        by_id: Dict[str, IngestionStreamEntity] = {stream_id(s): s for s in await self._list_streams()}
+        desired = {sid for sid in by_id if RendezvousHashService.owner(sid, self._alive) == self._node_id}
+
+        lost = self._lost & self._owned
+        self._lost.clear()
+        handoff = self._owned - desired - lost
+        if lost or handoff:
+            await self._release_local(sorted(lost | handoff))
+            if handoff:
+                await self._leases.release(owner=self._node_id, stream_ids=sorted(handoff))
+
+        restart = sorted(self._restart & self._owned & desired)
+        self._restart.clear()
+        if restart:
+            await self._on_released(restart)
+            try:
+                await self._on_acquired([by_id[sid] for sid in restart])
+            except Exception:
+                self._owned -= set(restart)
+                self.released += len(restart)
+                await self._leases.release(owner=self._node_id, stream_ids=restart)
+                raise
+            self._logger.info("Streams restarted node=%s streams=%s", self._node_id, restart)
+
+        to_claim = sorted(desired - self._owned)
+        if to_claim:
+            got = await self._leases.acquire(owner=self._node_id, stream_ids=to_claim, now=now, expires_at=expires_at)
+            if got:
+                # Held (and renewed by the heartbeat loop) while the streams start
+                self._owned |= got
+                try:
+                    await self._on_acquired([by_id[sid] for sid in sorted(got)])
+                except Exception:
+                    self._owned -= got
+                    await self._leases.release(owner=self._node_id, stream_ids=sorted(got))
+                    raise
+                self.acquired += len(got)
+                self._logger.info("Streams acquired node=%s streams=%s", self._node_id, sorted(got))
+
+        self.cycles += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for observability."""
+        return {
+            "node_id": self._node_id,
+            "alive_nodes": list(self._alive),
+            "streams": sorted(self._owned),
+            "heartbeat_s": self._heartbeat_s,
+            "lease_ttl_s": self._lease_ttl_s,
+            "cycles": self.cycles,
+            "beats": self.beats,
+            "errors": self.errors,
+            "acquired": self.acquired,
+            "released": self.released,
+            "lost": self.lost,
+        }
+
+    async def _release_local(self, ids: List[str]) -> None:
+        await self._on_released(ids)
+        self._owned -= set(ids)
+        self.released += len(ids)
+        self._logger.info("Streams released node=%s streams=%s", self._node_id, ids)
+
+    async def _beat_loop(self) -> None:
+        while not self._stop.is_set():
+            started = time.monotonic()
+            try:
+                # A hung Mongo call must not delay the self-stop check below past lease expiry
+                await asyncio.wait_for(self.beat(), timeout=self._heartbeat_s)
+            except Exception as exc:
+                self.errors += 1
+                self._logger.warning("Cluster heartbeat failed node=%s: %s", self._node_id, exc)
+                # Stop one heartbeat before the leases expire: after that another node may own them
+                deadline = self._renewed_at + self._lease_ttl_s - self._heartbeat_s
+                if self._owned and time.monotonic() >= deadline:
+                    self._logger.error("Leases not renewed for %ss: stopping local streams", self._lease_ttl_s)
+                    with contextlib.suppress(Exception):
+                        await self._release_local(sorted(self._owned))
+            delay = max(0.0, self._heartbeat_s - (time.monotonic() - started))
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self._stop.wait(), timeout=delay)
+
+    async def _run(self) -> None:
+        while not self._stop.is_set():
+            started = time.monotonic()
+            try:
+                await self.rebalance()
+            except Exception as exc:
+                self.errors += 1
+                self._logger.exception("Cluster cycle failed node=%s: %s", self._node_id, exc)
+            delay = max(0.0, self._heartbeat_s - (time.monotonic() - started))
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self._wake.wait(), timeout=delay)
+            self._wake.clear()
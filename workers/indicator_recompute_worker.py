@@ -0,0 +1,196 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import os
+import socket
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional
+
+from core.repositories.indicator_recompute_job_repository import IndicatorRecomputeJobRepository
+from core.repositories.indicator_recompute_lease_repository import IndicatorRecomputeLeaseRepository
+from core.usecases.recompute_indicators_use_case import RecomputeIndicatorsUseCase
+
+
+class IndicatorRecomputeWorker:
+    """
+    Runs historical indicator recomputes in the background.
+
+    - At most one task per cfg_hash; a bounded number of jobs run concurrently.
+    - With a lease repository, a job runs in one process at a time across replicas
+      (API workers, ingestion workers): a task first claims the job's lease, renews it
+      while running and stops if the lease is taken over.
+    - Jobs left RUNNING by a stopped process are resumed by start(): at once, then every
+      `sweep_interval_s` (their lease is free or expired by then).
+    """
+
+    def __init__(
+        self,
+        *,
+        recompute_use_case: RecomputeIndicatorsUseCase,
+        job_repository: IndicatorRecomputeJobRepository,
+        lease_repository: Optional[IndicatorRecomputeLeaseRepository] = None,
+        max_concurrency: int = 2,
+        owner: Optional[str] = None,
+        lease_ttl_s: float = 60.0,
+        sweep_interval_s: float = 30.0,
+        logger: logging.Logger | None = None,
+    ) -> None:
+        """
+        Args:
+            recompute_use_case: Runs one job.
+            job_repository: Job progress documents.
+            lease_repository: Job leases (None: no cross-process exclusion).
+            max_concurrency: Jobs running at once in this process.
+            owner: Lease owner id of this process (default: host-pid).
+            lease_ttl_s: Lease duration (renewed every third of it).
+            sweep_interval_s: Pause between scans for interrupted jobs.
+        """
+        self._uc = recompute_use_case
+        self._jobs = job_repository
+        self._leases = lease_repository
+        self._sem = asyncio.Semaphore(max(1, int(max_concurrency)))
+        self._owner = owner or f"{socket.gethostname()}-{os.getpid()}"
+        self._lease_ttl_s = float(lease_ttl_s)
+        self._sweep_interval_s = float(sweep_interval_s)
+        self._logger = logger or logging.getLogger(self.__class__.__name__)
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._submit_lock = asyncio.Lock()  # check-then-schedule is one step per submit
+        self._sweeper: asyncio.Task | None = None
+        self._stop = asyncio.Event()
+
+    def start(self) -> None:
+        """Resume interrupted jobs now and then periodically (background)."""
+        if self._sweeper is None:
+            self._stop.clear()
+            self._sweeper = asyncio.create_task(self._sweep())
+
+    def is_running(self, cfg_hash: str) -> bool:
+        """Return True if a recompute task for cfg_hash is scheduled or running."""
+        t = self._tasks.get(str(cfg_hash))
+        return t is not None and not t.done()
+
+    async def is_running_anywhere(self, cfg_hash: str) -> bool:
+        """Return True if the job runs in this process or holds a lease in another one."""
+        if self.is_running(cfg_hash):
+            return True
+        if self._leases is None:
+            return False
+        return await self._leases.holder(str(cfg_hash), now=datetime.now(tz=timezone.utc)) is not None
+
+    async def submit(self, cfg_hash: str, *, resume: bool = True, only_if_new: bool = False) -> bool:
+        """
+        Schedule a recompute for an indicator set.
+
+        Args:
+            cfg_hash: Indicator set id.
+            resume: Continue from stored progress when the previous run did not finish.
+            only_if_new: Skip when a job document already exists (used on indicator-set creation).
+
+        Returns:
+            True if a task was scheduled.
+        """
+        key = str(cfg_hash)
+        async with self._submit_lock:
+            if self.is_running(key):
+                return False
+
+            if only_if_new and await self._jobs.get_by_cfg_hash(key) is not None:
+                return False
+
+            self._tasks[key] = asyncio.create_task(self._run(key, resume=resume))
+            return True
+
+    async def resume_interrupted(self) -> int:
+        """
+        Resume jobs left RUNNING by a stopped process (jobs leased elsewhere are skipped
+        when their task fails to claim the lease).
+
+        Returns:
+            Number of jobs scheduled.
+        """
+        scheduled = 0
+        for job in await self._jobs.list_by_status("RUNNING"):
+            if await self.submit(job.cfg_hash, resume=True):
+                scheduled += 1
+        if scheduled:
+            self._logger.info("Resumed %s interrupted indicator recompute job(s).", scheduled)
+        return scheduled
+
+    async def stop(self) -> None:
+        """
+        Cancel running recomputes (progress is kept; their leases are released so
+        another replica can resume them).
+        """
+        self._stop.set()
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+            with contextlib.suppress(asyncio.CancelledError, Exception):
+                await self._sweeper
+            self._sweeper = None
+        tasks = [t for t in self._tasks.values() if not t.done()]
+        for t in tasks:
+            t.cancel()
+        for t in tasks:
+            with contextlib.suppress(asyncio.CancelledError, Exception):
+                await t
+        self._tasks.clear()
+
+    async def _run(self, cfg_hash: str, *, resume: bool) -> None:
+        keeper: asyncio.Task | None = None
+        try:
+            if self._leases is not None:
+                now = datetime.now(tz=timezone.utc)
+                expires_at = now + timedelta(seconds=self._lease_ttl_s)
+                if not await self._leases.acquire(cfg_hash, owner=self._owner, now=now, expires_at=expires_at):
+                    self._logger.debug("Indicator recompute cfg_hash=%s runs in another process.", cfg_hash)
+                    return
+                keeper = asyncio.create_task(self._keep_lease(cfg_hash, asyncio.current_task()))
+            async with self._sem:
+                await self._uc.execute(cfg_hash, resume=resume)
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            self._logger.exception("Indicator recompute task error cfg_hash=%s: %s", cfg_hash, exc)
+        finally:
+            if keeper is not None:
+                keeper.cancel()
+                with contextlib.suppress(asyncio.CancelledError, Exception):
+                    await keeper
+                with contextlib.suppress(Exception):
+                    await self._leases.release(cfg_hash, owner=self._owner)
+            current = self._tasks.get(cfg_hash)
+            if current is asyncio.current_task():
+                self._tasks.pop(cfg_hash, None)
+
+    async def _keep_lease(self, cfg_hash: str, task: asyncio.Task) -> None:
+        """Renew the job lease; cancel the job when it is lost or cannot be renewed in time."""
+        every_s = self._lease_ttl_s / 3
+        renewed_at = time.monotonic()
+        while True:
+            await asyncio.sleep(every_s)
+            started = time.monotonic()
+            try:
+                expires_at = datetime.now(tz=timezone.utc) + timedelta(seconds=self._lease_ttl_s)
+                if not await self._leases.renew(cfg_hash, owner=self._owner, expires_at=expires_at):
+                    self._logger.warning("Indicator recompute lease lost cfg_hash=%s: stopping.", cfg_hash)
+                    task.cancel()
+                    return
+                renewed_at = started
+            except Exception as exc:
+                self._logger.warning("Indicator recompute lease renew failed cfg_hash=%s: %s", cfg_hash, exc)
+                # Stop before the lease expires: another process may resume the job then
+                if time.monotonic() >= renewed_at + self._lease_ttl_s - every_s:
+                    task.cancel()
+                    return
+
+    async def _sweep(self) -> None:
+        while not self._stop.is_set():
+            try:
+                await self.resume_interrupted()
+            except Exception as exc:
+                self._logger.warning("Indicator recompute sweep failed: %s", exc)
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self._stop.wait(), timeout=self._sweep_interval_s)
@@ -1,24 +1,37 @@
 from __future__ import annotations
 
+import asyncio
 import contextlib
 import logging
-from typing import Any, Dict, List, Optional
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
 
 from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
 
 from adapters.external.database.candle_repository_mongodb import CandleRepositoryMongoDB
+from adapters.external.database.candle_repository_ring_buffer import RingBufferedCandleRepository
+from adapters.external.database.cluster_node_repository_mongodb import ClusterNodeRepositoryMongoDB
+from adapters.external.database.indicator_recompute_job_repository_mongodb import IndicatorRecomputeJobRepositoryMongoDB
+from adapters.external.database.indicator_recompute_lease_repository_mongodb import IndicatorRecomputeLeaseRepositoryMongoDB
+from adapters.external.database.index_registry import IndexRegistry
 from adapters.external.database.indicator_repository_mongodb import IndicatorRepositoryMongoDB
+from adapters.external.database.indicator_set_repository_cached import CachedIndicatorSetRepositoryMongoDB
 from adapters.external.database.indicator_set_repository_mongodb import IndicatorSetRepositoryMongoDB
 from adapters.external.database.price_tick_repository_mongodb import PriceTickRepositoryMongoDB
 from adapters.external.database.processing_offset_repository_mongodb import ProcessingOffsetRepositoryMongoDB
+from adapters.external.database.stream_lease_repository_mongodb import StreamLeaseRepositoryMongoDB
 from adapters.external.database.mongodb_client import get_mongo_client
 
 from adapters.external.database.ingestion_stream_repository_mongodb import IngestionStreamRepositoryMongoDB
 from adapters.external.database.system_config_repository_mongodb import SystemConfigRepositoryMongoDB
 
-from adapters.external.binance.binance_rest_client import BinanceRestClient
-from adapters.external.binance.binance_websocket_client import BinanceWebsocketClient
+from adapters.external.binance.binance_rate_limiter import BinanceRateLimiter
+from adapters.external.archive.tick_archive_numpy import TickArchiveNumpy
+from adapters.external.binance.binance_combined_stream_manager import BinanceCombinedStreamManager
+from adapters.external.database.token_latest_price_repository_mongodb import TokenLatestPriceRepositoryMongoDB
+from adapters.external.database.token_price_repository_mongodb import TokenPriceRepositoryMongoDB
 from adapters.external.database.token_registry_repository_mongodb import TokenRegistryRepositoryMongoDB
+from adapters.external.signals.signals_dispatcher import SignalsDispatcher
 from adapters.external.signals.signals_http_client import SignalsHttpClient
 
 from adapters.external.thegraph.pancakeswap_v3_base_pool_client import PancakeSwapV3BasePoolClient
@@ -26,14 +39,53 @@ from adapters.external.thegraph.pancakeswap_v3_base_pool_client import PancakeSw
 from config.settings import settings
 from core.domain.entities.ingestion_stream_entity import IngestionStreamEntity
 from core.domain.entities.system_config_entity import SystemConfigEntity
+from core.repositories.candle_repository import CandleRepository
+from core.repositories.indicator_set_repository import IndicatorSetRepository
+from core.services.candle_ring_buffer import CandleRingBufferRegistry
+from core.services.candle_rollup_service import CandleRollupService
+from core.services.incremental_indicator_engine import IncrementalIndicatorEngine
 from core.services.indicator_calculation_service import IndicatorCalculationService
+from core.services.interval_service import IntervalService
 from core.services.stream_key_service import StreamKeyService
-from core.usecases.backfill_candles_use_case import BackfillCandlesUseCase
 from core.usecases.build_candle_from_ticks_use_case import BuildCandleFromTicksUseCase
 from core.usecases.compute_indicators_use_case import ComputeIndicatorsUseCase
+from core.usecases.recompute_indicators_use_case import RecomputeIndicatorsUseCase
+from core.usecases.rollup_candles_use_case import RollupCandlesUseCase
 from core.usecases.start_polling_ticks_use_case import StartPollingTicksUseCase
 from core.usecases.start_realtime_ingestion_use_case import StartRealtimeIngestionUseCase
 from core.usecases.start_polling_ingestion_use_case import StartPollingIngestionUseCase
+from core.usecases.token_pricing_use_case import TokenPricingUseCase
+from workers.backfill_scheduler import BackfillJob, BackfillScheduler
+from workers.cluster_coordinator import ClusterCoordinator, stream_id
+from workers.indicator_recompute_worker import IndicatorRecomputeWorker
+from workers.stream_reconciler import StreamReconciler, start_fingerprint
+from workers.thegraph_poll_scheduler import TheGraphPollScheduler
+from workers.tick_archive_worker import TickArchiveWorker
+from workers.token_price_oracle import LatestTokenPrices, TokenPriceOracleReader, TokenPriceOracleWorker
+
+
+@dataclass
+class _StreamContext:
+    """Shared components every stream pipeline is built from."""
+
+    candle_repo: CandleRepository
+    offset_repo: ProcessingOffsetRepositoryMongoDB
+    indicator_set_repo: IndicatorSetRepository
+    compute_indicators_uc: ComputeIndicatorsUseCase
+    rollup_uc: RollupCandlesUseCase
+    runtime_cfg: SystemConfigEntity
+    indicator_engine: Optional[IncrementalIndicatorEngine] = None
+
+
+@dataclass
+class _RunningStream:
+    """What stop_streams() needs to take one running stream down."""
+
+    stream: IngestionStreamEntity
+    stream_key: str
+    ws_ingestion: Optional[StartRealtimeIngestionUseCase] = None
+    tick_poller: Optional[StartPollingTicksUseCase] = None
+    unregister: Optional[Callable[[], Awaitable[None]]] = None
 
 
 class IngestionSupervisor:
@@ -53,12 +105,37 @@ class IngestionSupervisor:
         self._db: AsyncIOMotorDatabase | None = None
 
         self._signals_client: SignalsHttpClient | None = None
+        self._signals: SignalsDispatcher | None = None
 
-        self._ws_clients: List[BinanceWebsocketClient] = []
+        self._ws_managers: Dict[str, BinanceCombinedStreamManager] = {}  # ws_base_url -> manager
         self._ws_ingestions: List[StartRealtimeIngestionUseCase] = []
         self._tick_pollers: List[StartPollingTicksUseCase] = []
 
-        self._thegraph_clients: List[PancakeSwapV3BasePoolClient] = []
+        self._thegraph_clients: Dict[str, PancakeSwapV3BasePoolClient] = {}  # api_key -> client
+        self._thegraph_poller = TheGraphPollScheduler(page_size=settings.THEGRAPH_POOLS_PER_QUERY)
+
+        self._indicator_recompute: IndicatorRecomputeWorker | None = None
+        self._rollup_catch_ups: Dict[str, asyncio.Task] = {}  # stream_key -> running catch-up
+
+        self._candle_buffer: CandleRingBufferRegistry | None = None
+        self._tick_archive: TickArchiveNumpy | None = None
+        self._tick_archive_worker: TickArchiveWorker | None = None
+        self._indicator_sets: IndicatorSetRepository | None = None
+        self._token_pricing: TokenPricingUseCase | None = None
+        self._token_price_oracle: LatestTokenPrices | None = None
+
+        # Binance streams collected during start(): backfilled together before WS subscribe
+        self._binance_rate_limiter = BinanceRateLimiter(weight_per_minute=settings.BINANCE_REQUEST_WEIGHT_BUDGET)
+        self._backfill_jobs: List[BackfillJob] = []
+        self._binance_streams: List[Tuple[IngestionStreamEntity, str]] = []
+
+        # Running streams by stream id (started/stopped as a whole, e.g. on cluster rebalance)
+        self._ctx: _StreamContext | None = None
+        self._running: Dict[str, _RunningStream] = {}
+        self._failed: Dict[str, str] = {}  # stream id -> start_fingerprint of the failed start
+        self._streams_lock = asyncio.Lock()
+        self._cluster: ClusterCoordinator | None = None
+        self._stream_reconciler: StreamReconciler | None = None
 
     @property
     def db(self) -> AsyncIOMotorDatabase | None:
@@ -67,35 +144,190 @@ class IngestionSupervisor:
         """
         return self._db
 
-    async def start(self) -> None:
+    @property
+    def candle_buffer(self) -> CandleRingBufferRegistry | None:
+        """
+        Expose the recent-candle ring buffers after start() (None when disabled).
+        """
+        return self._candle_buffer
+
+    @property
+    def tick_archive(self) -> TickArchiveNumpy | None:
+        """
+        Expose the columnar tick archive after start() (None when disabled).
+        """
+        return self._tick_archive
+
+    @property
+    def indicator_sets(self) -> IndicatorSetRepository | None:
+        """
+        Expose the indicator-set repository used by ingestion (cached registry when enabled).
+        """
+        return self._indicator_sets
+
+    @property
+    def binance_ws(self) -> Dict[str, BinanceCombinedStreamManager]:
+        """
+        Expose the Binance combined-stream managers (keyed by WS base URL).
+        """
+        return self._ws_managers
+
+    @property
+    def thegraph_poller(self) -> TheGraphPollScheduler:
+        """
+        Expose the shared The Graph pool poll scheduler.
+        """
+        return self._thegraph_poller
+
+    @property
+    def token_pricing(self) -> TokenPricingUseCase | None:
+        """
+        Expose the cached token USD pricing use case after start().
+        """
+        return self._token_pricing
+
+    @property
+    def token_price_oracle(self) -> LatestTokenPrices | None:
+        """
+        Expose the latest token prices after start(): the oracle itself, or its reader in an
+        API-only process (None when disabled).
+        """
+        return self._token_price_oracle
+
+    @property
+    def signals(self) -> SignalsDispatcher | None:
+        """
+        Expose the candle-closed trigger dispatcher after start().
+        """
+        return self._signals
+
+    @property
+    def cluster(self) -> ClusterCoordinator | None:
+        """
+        Expose the cluster coordinator after start() (None when clustering is disabled).
+        """
+        return self._cluster
+
+    @property
+    def stream_reconciler(self) -> StreamReconciler | None:
+        """
+        Expose the ingestion_streams hot-reload reconciler after start() (None when disabled).
+        """
+        return self._stream_reconciler
+
+    @property
+    def indicator_recompute(self) -> IndicatorRecomputeWorker | None:
+        """
+        Expose the historical indicator recompute worker after start().
+        """
+        return self._indicator_recompute
+
+    async def start(self, *, ingestion: bool = True) -> None:
         """
         Initialize DB, ensure indexes, load configs from Mongo, and start ingestion.
+
+        Args:
+            ingestion: False for an API-only process: only what the HTTP routes read is
+                set up (Mongo, indicator-set cache, token pricing, recompute worker);
+                streams, signals, the price oracle and the tick archiver run in the
+                ingestion worker (python -m workers.ingestion_worker); oracle prices are read
+                from what it publishes to Mongo.
         """
         self._mongo_client = get_mongo_client()
         self._db = self._mongo_client[settings.MONGODB_DB_NAME]
 
         # Core repositories
-        candle_repo = CandleRepositoryMongoDB(self._db)
+        candle_repo: CandleRepository = CandleRepositoryMongoDB(self._db)
+        # The buffer is filled by ingestion: without it, reads go to Mongo
+        if settings.CANDLE_BUFFER_ENABLED and ingestion:
+            self._candle_buffer = CandleRingBufferRegistry(capacity=settings.CANDLE_BUFFER_SIZE)
+            candle_repo = RingBufferedCandleRepository(candle_repo, self._candle_buffer)
         offset_repo = ProcessingOffsetRepositoryMongoDB(self._db)
         indicator_repo = IndicatorRepositoryMongoDB(self._db)
-        indicator_set_repo = IndicatorSetRepositoryMongoDB(self._db)
-        tick_repo = PriceTickRepositoryMongoDB(self._db)
-        
-        await tick_repo.ensure_indexes()
-        await candle_repo.ensure_indexes()
-        await offset_repo.ensure_indexes()
-        await indicator_repo.ensure_indexes()
-        await indicator_set_repo.ensure_indexes()
+        indicator_set_repo: IndicatorSetRepository = IndicatorSetRepositoryMongoDB(self._db)
+        tick_repo = PriceTickRepositoryMongoDB(
+            self._db,
+            timeseries=settings.PRICE_TICKS_TIMESERIES,
+            expire_after_seconds=settings.PRICE_TICKS_EXPIRE_AFTER_S,
+        )
+        recompute_job_repo = IndicatorRecomputeJobRepositoryMongoDB(self._db)
+
+        # Indexes of all collections, concurrently; skipped when the recorded state is current
+        if settings.INDEX_BOOTSTRAP_ON_START:
+            await IndexRegistry(self._db).apply()
+
+        # ACTIVE indicator sets are read on every candle close: keep them in memory
+        if settings.INDICATOR_SET_CACHE_ENABLED:
+            cached_sets = CachedIndicatorSetRepositoryMongoDB(
+                self._db,
+                poll_interval_s=settings.INDICATOR_SET_CACHE_POLL_S,
+            )
+            await cached_sets.start()
+            indicator_set_repo = cached_sets
+        self._indicator_sets = indicator_set_repo
+
+        # Historical indicator recompute (runs independently of the ingestion streams)
+        self._indicator_recompute = IndicatorRecomputeWorker(
+            recompute_use_case=RecomputeIndicatorsUseCase(
+                candle_repository=candle_repo,
+                indicator_repository=indicator_repo,
+                indicator_set_repository=indicator_set_repo,
+                job_repository=recompute_job_repo,
+                batch_size=settings.INDICATOR_RECOMPUTE_BATCH_SIZE,
+            ),
+            job_repository=recompute_job_repo,
+            lease_repository=IndicatorRecomputeLeaseRepositoryMongoDB(self._db),
+            max_concurrency=settings.INDICATOR_RECOMPUTE_MAX_CONCURRENCY,
+            lease_ttl_s=settings.INDICATOR_RECOMPUTE_LEASE_TTL_S,
+            sweep_interval_s=settings.INDICATOR_RECOMPUTE_SWEEP_S,
+        )
+        # Jobs requested through the API run where they were requested (leased, so once across
+        # replicas); interrupted ones are picked up by ingestion processes, keeping API replicas light
+        if ingestion:
+            self._indicator_recompute.start()
 
         # Config repositories
         system_repo = SystemConfigRepositoryMongoDB(self._db)
         streams_repo = IngestionStreamRepositoryMongoDB(self._db)
-        await streams_repo.ensure_indexes()
 
-        # Token registry (for on-demand pricing)
+        # Token registry + cached on-demand pricing (shared by the pricing endpoints)
         token_registry_repo = TokenRegistryRepositoryMongoDB(self._db)
-        await token_registry_repo.ensure_indexes()
-        
+        self._token_pricing = TokenPricingUseCase(
+            system_config_repo=system_repo,
+            token_registry_repo=token_registry_repo,
+            cache_ttl_s=settings.TOKEN_PRICE_CACHE_TTL_S,
+            cache_stale_s=settings.TOKEN_PRICE_CACHE_STALE_S,
+            cache_max_entries=settings.TOKEN_PRICE_CACHE_MAX_ENTRIES,
+            runtime_config_ttl_s=settings.TOKEN_PRICE_RUNTIME_CONFIG_TTL_S,
+        )
+
+        if not ingestion:
+            # Archived days are read from the shared archive directory
+            if settings.TICK_ARCHIVE_ENABLED:
+                self._tick_archive = TickArchiveNumpy(settings.TICK_ARCHIVE_DIR, read_only=True)
+            # The oracle runs in the ingestion worker: serve the prices it publishes to Mongo
+            if settings.TOKEN_PRICE_ORACLE_ENABLED:
+                self._token_price_oracle = TokenPriceOracleReader(
+                    latest_repository=TokenLatestPriceRepositoryMongoDB(self._db),
+                    interval_s=settings.TOKEN_PRICE_ORACLE_INTERVAL_S,
+                    max_age_s=settings.TOKEN_PRICE_ORACLE_MAX_AGE_S,
+                )
+                self._token_price_oracle.start()
+            self._logger.info("Started without ingestion (API only).")
+            return
+
+        # Price every registered token in background (constant upstream rate, O(1) reads)
+        if settings.TOKEN_PRICE_ORACLE_ENABLED:
+            self._token_price_oracle = TokenPriceOracleWorker(
+                token_pricing=self._token_pricing,
+                token_registry_repository=token_registry_repo,
+                history_repository=TokenPriceRepositoryMongoDB(self._db) if settings.TOKEN_PRICE_HISTORY_ENABLED else None,
+                latest_repository=TokenLatestPriceRepositoryMongoDB(self._db),
+                interval_s=settings.TOKEN_PRICE_ORACLE_INTERVAL_S,
+                max_age_s=settings.TOKEN_PRICE_ORACLE_MAX_AGE_S,
+            )
+            self._token_price_oracle.start()
+
         # Ensure runtime config exists (or create fallback)
         runtime_cfg = await system_repo.get_runtime()
         if runtime_cfg is None:
@@ -108,6 +340,20 @@ class IngestionSupervisor:
             await system_repo.upsert_runtime(runtime_cfg)
 
         self._signals_client = SignalsHttpClient(base_url=runtime_cfg.signals_base_url, timeout_s=30.0)
+        self._signals = SignalsDispatcher(
+            client=self._signals_client,
+            max_queue=settings.SIGNALS_QUEUE_SIZE,
+            workers=settings.SIGNALS_WORKERS,
+            max_inflight_per_target=settings.SIGNALS_MAX_INFLIGHT_PER_TARGET,
+            max_attempts=settings.SIGNALS_MAX_ATTEMPTS,
+            backoff_base_s=settings.SIGNALS_BACKOFF_BASE_S,
+            backoff_max_s=settings.SIGNALS_BACKOFF_MAX_S,
+            overflow=settings.SIGNALS_OVERFLOW,
+            drain_timeout_s=settings.SIGNALS_DRAIN_TIMEOUT_S,
+            batch_max_size=settings.SIGNALS_BATCH_MAX_SIZE,
+            batch_linger_s=settings.SIGNALS_BATCH_LINGER_MS / 1000.0,
+        )
+        self._signals.start()
 
         # Bootstrap ingestion streams if empty
         total_streams = await streams_repo.count_all()
@@ -116,38 +362,77 @@ class IngestionSupervisor:
             total_streams = await streams_repo.count_all()
             self._logger.info("Bootstrapped ingestion_streams from .env. total=%s", total_streams)
 
-        # Load enabled streams
-        streams = await streams_repo.list_enabled()
-        if not streams:
-            self._logger.error("No enabled ingestion streams found in MongoDB.")
-            return
-
         # Indicator computation
         indicator_svc = IndicatorCalculationService()
+        indicator_engine = (
+            IncrementalIndicatorEngine(indicator_svc) if settings.INCREMENTAL_INDICATORS_ENABLED else None
+        )
         compute_indicators_uc = ComputeIndicatorsUseCase(
             candle_repository=candle_repo,
             indicator_repository=indicator_repo,
             indicator_service=indicator_svc,
+            indicator_engine=indicator_engine,
         )
 
-        # Start streams
-        for stream in streams:
-            await self._start_stream(
-                stream=stream,
-                candle_repo=candle_repo,
-                offset_repo=offset_repo,
-                indicator_set_repo=indicator_set_repo,
-                compute_indicators_uc=compute_indicators_uc,
-                runtime_cfg=runtime_cfg,
+        # Higher-timeframe candles rolled up from 1m
+        rollup_uc = RollupCandlesUseCase(
+            candle_repository=candle_repo,
+            rollup_service=CandleRollupService(IntervalService.parse_rollups(settings.CANDLE_ROLLUP_INTERVALS)),
+        )
+
+        # Shared by every stream started now or later (cluster rebalance)
+        self._ctx = _StreamContext(
+            candle_repo=candle_repo,
+            offset_repo=offset_repo,
+            indicator_set_repo=indicator_set_repo,
+            compute_indicators_uc=compute_indicators_uc,
+            rollup_uc=rollup_uc,
+            runtime_cfg=runtime_cfg,
+            indicator_engine=indicator_engine,
+        )
+
+        if settings.CLUSTER_ENABLED:
+            # Streams are split across replicas: this node runs the ones it holds leases for
+            self._cluster = ClusterCoordinator(
+                node_repository=ClusterNodeRepositoryMongoDB(self._db),
+                lease_repository=StreamLeaseRepositoryMongoDB(self._db),
+                list_streams=streams_repo.list_enabled,
+                on_acquired=self.start_streams,
+                on_released=self.stop_streams,
+                node_id=settings.CLUSTER_NODE_ID or None,
+                heartbeat_s=settings.CLUSTER_HEARTBEAT_S,
+                lease_ttl_s=settings.CLUSTER_LEASE_TTL_S,
             )
+            self._cluster.start()
+        else:
+            streams = await streams_repo.list_enabled()
+            if not streams:
+                self._logger.error("No enabled ingestion streams found in MongoDB.")
+            await self.start_streams(streams)
 
-        # Start websocket subscriptions (non-blocking, the subscribe method holds its own loop)
-        for uc in self._ws_ingestions:
-            await uc.execute()
+        # Apply later ingestion_streams edits to the running pipelines (no restart)
+        if settings.STREAM_RELOAD_ENABLED:
+            self._stream_reconciler = StreamReconciler(
+                self._db,
+                running=self.running_streams,
+                failed=self.failed_streams,
+                start_streams=self.start_streams,
+                stop_streams=self.stop_streams,
+                cluster=self._cluster,
+                poll_interval_s=settings.STREAM_RELOAD_POLL_S,
+            )
+            self._stream_reconciler.start()
 
-        # Start poll loops
-        for t in self._tick_pollers:
-            t.start()
+        # Move closed days of ticks into the columnar archive
+        if settings.TICK_ARCHIVE_ENABLED:
+            self._tick_archive = TickArchiveNumpy(settings.TICK_ARCHIVE_DIR)
+            self._tick_archive_worker = TickArchiveWorker(
+                tick_repository=tick_repo,
+                tick_archive=self._tick_archive,
+                stream_keys=lambda: [t.stream_key for t in self._tick_pollers],
+                interval_s=settings.TICK_ARCHIVE_INTERVAL_S,
+            )
+            self._tick_archive_worker.start()
     
         self._logger.info("All ingestion streams started. ws=%s poll=%s", len(self._ws_ingestions), len(self._tick_pollers))
 
@@ -155,21 +440,70 @@ class IngestionSupervisor:
         """
         Stop pollers, websocket clients, and close external clients.
         """
+        # No more stream reloads, claims or releases while shutting down
+        if self._stream_reconciler is not None:
+            with contextlib.suppress(Exception):
+                await self._stream_reconciler.stop()
+        if self._cluster is not None:
+            with contextlib.suppress(Exception):
+                await self._cluster.stop()
+
+        tasks = list(self._rollup_catch_ups.values())
+        for task in tasks:
+            task.cancel()
+        for task in tasks:
+            with contextlib.suppress(asyncio.CancelledError, Exception):
+                await task
+        self._rollup_catch_ups.clear()
+
+        if self._indicator_recompute is not None:
+            with contextlib.suppress(Exception):
+                await self._indicator_recompute.stop()
+
+        if self._tick_archive_worker is not None:
+            with contextlib.suppress(Exception):
+                await self._tick_archive_worker.stop()
+
+        if self._token_price_oracle is not None:
+            with contextlib.suppress(Exception):
+                await self._token_price_oracle.stop()
+
+        if isinstance(self._indicator_sets, CachedIndicatorSetRepositoryMongoDB):
+            with contextlib.suppress(Exception):
+                await self._indicator_sets.stop()
+
         # for p in self._poll_ingestions:
         #     with contextlib.suppress(Exception):
         #         await p.stop()
+        with contextlib.suppress(Exception):
+            await self._thegraph_poller.stop()
         for t in self._tick_pollers:
             with contextlib.suppress(Exception):
                 await t.stop()
                 
-        for ws in self._ws_clients:
+        for ws in self._ws_managers.values():
             with contextlib.suppress(Exception):
                 await ws.close()
+        self._running.clear()
+
+        # Hand the streams over right away instead of at lease expiry
+        if self._cluster is not None:
+            await self._cluster.leave()
 
-        for tg in self._thegraph_clients:
+        for tg in self._thegraph_clients.values():
             with contextlib.suppress(Exception):
                 await tg.aclose()
 
+        if self._token_pricing is not None:
+            with contextlib.suppress(Exception):
+                await self._token_pricing.aclose()
+
+        # Deliver queued triggers (bounded) before closing the HTTP client
+        if self._signals is not None:
+            with contextlib.suppress(Exception):
+                await self._signals.stop()
+            self._signals = None
+
         if self._signals_client is not None:
             with contextlib.suppress(Exception):
                 await self._signals_client.aclose()
@@ -178,6 +512,164 @@ class IngestionSupervisor:
         if self._mongo_client:
             self._mongo_client.close()
 
+    def running_streams(self) -> Dict[str, IngestionStreamEntity]:
+        """
+        Definitions of the running streams by stream id.
+        """
+        return {sid: handle.stream for sid, handle in self._running.items()}
+
+    def failed_streams(self) -> Dict[str, str]:
+        """
+        start_fingerprint of the streams whose definition could not be started, by stream id.
+        """
+        return dict(self._failed)
+
+    async def start_streams(self, streams: List[IngestionStreamEntity]) -> None:
+        """
+        Start streams on the running supervisor (streams already running are skipped).
+
+        Binance streams are backfilled together (shared weight budget) and their buffers
+        warmed before the websocket subscriptions start; The Graph pools join the shared
+        poll scheduler. A stream whose definition cannot be started is logged and skipped;
+        if a shared step fails, every stream of the call is rolled back and the error raised.
+        """
+        ctx = self._ctx
+        if ctx is None:
+            raise RuntimeError("IngestionSupervisor.start() must run first")
+
+        async with self._streams_lock:
+            # Handles join _running only once the whole batch is started, so a failed
+            # start leaves nothing behind that a later claim would skip as "running"
+            started: Dict[str, _RunningStream] = {}
+
+            # Streams started now use the current runtime config (e.g. a thegraph_api_key set later)
+            try:
+                runtime_cfg = await SystemConfigRepositoryMongoDB(self._db).get_runtime()
+            except Exception as exc:
+                self._logger.warning("Runtime config reload failed (keeping the previous one): %s", exc)
+                runtime_cfg = None
+            if runtime_cfg is not None:
+                ctx.runtime_cfg = runtime_cfg
+
+            try:
+                for stream in streams:
+                    sid = stream_id(stream)
+                    if sid in self._running or sid in started:
+                        continue
+                    try:
+                        handle = await self._start_stream(
+                            stream=stream,
+                            candle_repo=ctx.candle_repo,
+                            offset_repo=ctx.offset_repo,
+                            indicator_set_repo=ctx.indicator_set_repo,
+                            compute_indicators_uc=ctx.compute_indicators_uc,
+                            rollup_uc=ctx.rollup_uc,
+                            runtime_cfg=ctx.runtime_cfg,
+                        )
+                    except Exception as exc:
+                        # A bad definition (e.g. invalid config) must not block the other streams
+                        self._logger.exception("Failed to start stream %s: %s", sid, exc)
+                        handle = None
+                    if handle is not None:
+                        started[sid] = handle
+                    else:
+                        self._failed[sid] = start_fingerprint(stream, ctx.runtime_cfg)
+
+                # Backfill Binance streams concurrently (shared weight budget), then warm buffers
+                # and materialize rollups from the completed 1m history.
+                filled = await BackfillScheduler(
+                    candle_repository=ctx.candle_repo,
+                    processing_offset_repository=ctx.offset_repo,
+                    rate_limiter=self._binance_rate_limiter,
+                    max_concurrency=settings.BACKFILL_MAX_CONCURRENCY,
+                    initial_history_minutes=settings.BACKFILL_INITIAL_HISTORY_MINUTES,
+                    gap_lookback_minutes=settings.BACKFILL_GAP_LOOKBACK_MINUTES,
+                ).run(self._backfill_jobs)
+                self._backfill_jobs.clear()
+
+                for stream, stream_key in self._binance_streams:
+                    await self._warm_candle_buffers(
+                        candle_repo=ctx.candle_repo, rollup_uc=ctx.rollup_uc, stream_key=stream_key
+                    )
+                    self._schedule_rollup_catch_up(
+                        rollup_uc=ctx.rollup_uc,
+                        stream=stream,
+                        stream_key=stream_key,
+                        static_fields={},
+                        reroll_ranges=filled[stream_key].ranges if stream_key in filled else None,
+                    )
+                self._binance_streams.clear()
+
+                # Start websocket subscriptions (non-blocking, the subscribe method holds its own loop)
+                # and poll loops (The Graph pools are polled in batches by the shared scheduler)
+                for handle in started.values():
+                    if handle.ws_ingestion is not None:
+                        await handle.ws_ingestion.execute()
+                    if handle.tick_poller is not None:
+                        handle.tick_poller.start()
+                self._thegraph_poller.start()
+            except Exception:
+                self._backfill_jobs.clear()
+                self._binance_streams.clear()
+                for sid, handle in started.items():
+                    await self._stop_handle(sid, handle)
+                raise
+
+            self._running.update(started)
+            for sid in started:
+                self._failed.pop(sid, None)
+
+    async def stop_streams(self, stream_ids: List[str]) -> None:
+        """
+        Stop running streams by stream id (unknown ids are ignored). Shared connections
+        and the poll scheduler stay up for the other streams.
+        """
+        async with self._streams_lock:
+            for sid in stream_ids:
+                self._failed.pop(sid, None)
+                handle = self._running.pop(sid, None)
+                if handle is None:
+                    continue
+                await self._stop_handle(sid, handle)
+                self._logger.info("Stream stopped: %s", sid)
+
+    async def _stop_handle(self, sid: str, handle: _RunningStream) -> None:
+        """
+        Take one stream pipeline down (also used to roll back a failed start) and drop
+        its candle buffers, in-progress rollup buckets and incremental indicator state.
+        """
+        try:
+            if handle.ws_ingestion is not None:
+                await handle.ws_ingestion.stop()
+                if handle.ws_ingestion in self._ws_ingestions:
+                    self._ws_ingestions.remove(handle.ws_ingestion)
+            if handle.unregister is not None:
+                await handle.unregister()
+            if handle.tick_poller is not None:
+                await handle.tick_poller.stop()
+                if handle.tick_poller in self._tick_pollers:
+                    self._tick_pollers.remove(handle.tick_poller)
+        except Exception as exc:
+            self._logger.exception("Failed to stop stream %s: %s", sid, exc)
+
+        # Its rollups are written by whoever ingests the stream next
+        task = self._rollup_catch_ups.pop(handle.stream_key, None)
+        if task is not None:
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError, Exception):
+                await task
+
+        # In-memory state of the stream would go stale (another replica may ingest it now)
+        keys = [handle.stream_key]
+        if self._ctx is not None:
+            self._ctx.rollup_uc.drop(handle.stream_key)
+            keys += [StreamKeyService.with_interval(handle.stream_key, itv) for itv in self._ctx.rollup_uc.intervals]
+        for key in keys:
+            if self._candle_buffer is not None:
+                self._candle_buffer.drop(key)
+            if self._ctx is not None and self._ctx.indicator_engine is not None:
+                self._ctx.indicator_engine.invalidate(key)
+
     async def _bootstrap_from_env(self, *, streams_repo: IngestionStreamRepositoryMongoDB) -> None:
         """
         Create default Binance streams from .env only if ingestion_streams is empty.
@@ -210,80 +702,90 @@ class IngestionSupervisor:
         self,
         *,
         stream: IngestionStreamEntity,
-        candle_repo: CandleRepositoryMongoDB,
+        candle_repo: CandleRepository,
         offset_repo: ProcessingOffsetRepositoryMongoDB,
-        indicator_set_repo: IndicatorSetRepositoryMongoDB,
+        indicator_set_repo: IndicatorSetRepository,
         compute_indicators_uc: ComputeIndicatorsUseCase,
+        rollup_uc: RollupCandlesUseCase,
         runtime_cfg: SystemConfigEntity,
-    ) -> None:
+    ) -> Optional[_RunningStream]:
         """
         Start a single stream based on its source_type.
+
+        Returns:
+            The running stream's handle, or None when it could not be started.
         """
         stype = (stream.source_type or "").lower().strip()
 
         if stype == "binance_ws":
-            await self._start_binance_ws_stream(
+            return await self._start_binance_ws_stream(
                 stream=stream,
                 candle_repo=candle_repo,
                 offset_repo=offset_repo,
                 indicator_set_repo=indicator_set_repo,
                 compute_indicators_uc=compute_indicators_uc,
+                rollup_uc=rollup_uc,
             )
-            return
 
         if stype == "thegraph_pancake_v3_base":
-            await self._start_thegraph_pancake_v3_base_stream(
+            return await self._start_thegraph_pancake_v3_base_stream(
                 stream=stream,
                 candle_repo=candle_repo,
                 indicator_set_repo=indicator_set_repo,
                 compute_indicators_uc=compute_indicators_uc,
+                rollup_uc=rollup_uc,
                 runtime_cfg=runtime_cfg,
             )
-            return
 
         self._logger.warning("Unknown stream source_type=%s (skipping). stream=%s", stype, stream.to_dict())
+        return None
 
     async def _start_binance_ws_stream(
         self,
         *,
         stream: IngestionStreamEntity,
-        candle_repo: CandleRepositoryMongoDB,
+        candle_repo: CandleRepository,
         offset_repo: ProcessingOffsetRepositoryMongoDB,
-        indicator_set_repo: IndicatorSetRepositoryMongoDB,
+        indicator_set_repo: IndicatorSetRepository,
         compute_indicators_uc: ComputeIndicatorsUseCase,
-    ) -> None:
+        rollup_uc: RollupCandlesUseCase,
+    ) -> _RunningStream:
         """
-        Start a Binance websocket ingestion stream.
+        Start a Binance websocket ingestion stream (subscribed by start_streams()).
         """
         cfg = stream.config or {}
         ws_base_url = str(cfg.get("ws_base_url") or settings.BOOTSTRAP_BINANCE_WS_BASE_URL)
         rest_base_url = str(cfg.get("rest_base_url") or settings.BOOTSTRAP_BINANCE_REST_BASE_URL)
 
-        # Backfill
-        if stream.enable_backfill_on_start:
-            try:
-                binance_rest = BinanceRestClient(base_url=rest_base_url)
-                backfill_uc = BackfillCandlesUseCase(
-                    binance_client=binance_rest,
-                    candle_repository=candle_repo,
-                    processing_offset_repository=offset_repo,
-                )
-                await backfill_uc.execute_for_symbol(
-                    source="binance",
-                    symbol=stream.symbol,
-                    interval=stream.interval,
-                )
-            except Exception as exc:
-                self._logger.exception("Backfill error for %s: %s", stream.symbol, exc)
-
-        ws_client = BinanceWebsocketClient(base_ws_url=ws_base_url)
+        # One multiplexed connection manager per WS endpoint, shared by all its streams
+        ws_client = self._ws_managers.get(ws_base_url)
+        if ws_client is None:
+            ws_client = BinanceCombinedStreamManager(
+                base_ws_url=ws_base_url,
+                max_streams_per_connection=settings.BINANCE_WS_MAX_STREAMS_PER_CONNECTION,
+            )
+            self._ws_managers[ws_base_url] = ws_client
 
         stream_key = StreamKeyService.build(
             source=stream.source_name,
             symbol=stream.symbol,
             interval=stream.interval,
         )
-                
+
+        # Backfill (run for all streams at once by start())
+        if stream.enable_backfill_on_start:
+            history = cfg.get("initial_history_minutes")
+            self._backfill_jobs.append(
+                BackfillJob(
+                    source=stream.source_name,
+                    symbol=stream.symbol,
+                    interval=stream.interval,
+                    rest_base_url=rest_base_url,
+                    initial_history_minutes=int(history) if history is not None else None,
+                )
+            )
+        self._binance_streams.append((stream, stream_key))
+
         uc = StartRealtimeIngestionUseCase(
             stream_key=stream_key,
             source=stream.source_name,
@@ -294,23 +796,25 @@ class IngestionSupervisor:
             processing_offset_repository=offset_repo,
             compute_indicators_use_case=compute_indicators_uc,
             indicator_set_repo=indicator_set_repo,
-            signals_client=self._signals_client if stream.push_signals else None,
+            signals_dispatcher=self._signals if stream.push_signals else None,
+            rollup_use_case=rollup_uc,
         )
 
-        self._ws_clients.append(ws_client)
         self._ws_ingestions.append(uc)
 
         self._logger.info("Binance WS stream started: %s %s %s", stream.source_name, stream.symbol, stream.interval)
+        return _RunningStream(stream=stream, stream_key=stream_key, ws_ingestion=uc)
 
     async def _start_thegraph_pancake_v3_base_stream(
         self,
         *,
         stream: IngestionStreamEntity,
-        candle_repo: CandleRepositoryMongoDB,
-        indicator_set_repo: IndicatorSetRepositoryMongoDB,
+        candle_repo: CandleRepository,
+        indicator_set_repo: IndicatorSetRepository,
         compute_indicators_uc: ComputeIndicatorsUseCase,
+        rollup_uc: RollupCandlesUseCase,
         runtime_cfg: SystemConfigEntity,
-    ) -> None:
+    ) -> Optional[_RunningStream]:
         """
         Start a The Graph polling ingestion stream for PancakeSwap V3 Base pool.
         """
@@ -320,7 +824,7 @@ class IngestionSupervisor:
                 "thegraph_api_key is missing in system_config.runtime. Cannot start %s",
                 stream.symbol,
             )
-            return
+            return None
 
         pool = (stream.pool_address or "").strip()
         if not pool:
@@ -328,10 +832,12 @@ class IngestionSupervisor:
                 "pool_address is required for thegraph_pancake_v3_base stream. symbol=%s",
                 stream.symbol,
             )
-            return
+            return None
 
-        tg = PancakeSwapV3BasePoolClient(api_key=api_key, timeout_s=20.0)
-        self._thegraph_clients.append(tg)
+        # One client (connection pool) per API key, shared by every pool of the subgraph
+        tg = self._thegraph_clients.get(api_key)
+        if tg is None:
+            tg = self._thegraph_clients[api_key] = PancakeSwapV3BasePoolClient(api_key=api_key, timeout_s=20.0)
 
         # stream_key includes pool to avoid collisions
         stream_key = StreamKeyService.build(
@@ -341,15 +847,15 @@ class IngestionSupervisor:
             pool_address=pool,
         )
 
-        async def fetch_fn() -> Dict[str, Any]:
+        await self._warm_candle_buffers(candle_repo=candle_repo, rollup_uc=rollup_uc, stream_key=stream_key)
+
+        def normalize(data: Dict[str, Any]) -> Dict[str, Any]:
             """
-            Fetch pool state and return normalized price + metadata for candle enrichment.
+            Normalize a pool state into price + metadata for candle enrichment.
 
             Returns:
             price: float -> WETH per 1 USDC
             """
-            data = await tg.get_pool(pool_address=pool)
-
             token0 = (data.get("token0") or {}) if isinstance(data.get("token0"), dict) else {}
             token1 = (data.get("token1") or {}) if isinstance(data.get("token1"), dict) else {}
 
@@ -407,7 +913,13 @@ class IngestionSupervisor:
 
         # how often to sample the pool price
         poll_every_s = float((stream.config or {}).get("poll_every_s") or 5.0)
-        tick_repo = PriceTickRepositoryMongoDB(self._db)
+        # raw ticks feed /price-ticks analytics; streams that only need candles can skip them
+        persist_ticks = bool((stream.config or {}).get("persist_ticks", True))
+        tick_repo = PriceTickRepositoryMongoDB(
+            self._db,
+            timeseries=settings.PRICE_TICKS_TIMESERIES,
+            expire_after_seconds=settings.PRICE_TICKS_EXPIRE_AFTER_S,
+        )
         
         build_candle_uc = BuildCandleFromTicksUseCase(
             tick_repository=tick_repo,
@@ -426,8 +938,9 @@ class IngestionSupervisor:
             build_candle_uc=build_candle_uc,
             compute_indicators_use_case=compute_indicators_uc,
             indicator_set_repo=indicator_set_repo,
-            signals_client=self._signals_client,
-            fetch_fn=fetch_fn,
+            signals_dispatcher=self._signals,
+            rollup_use_case=rollup_uc,
+            persist_ticks=persist_ticks,
             static_tick_fields={
                 "chain": stream.chain or "base",
                 "dex": stream.dex or "pancakeswap_v3",
@@ -443,6 +956,27 @@ class IngestionSupervisor:
 
         self._tick_pollers.append(tick_poller)
 
+        async def on_pool(data: Dict[str, Any], ts: int) -> None:
+            await tick_poller.on_sample(normalize(data), ts=ts)
+
+        self._thegraph_poller.register(client=tg, pool_address=pool, poll_every_s=poll_every_s, on_pool=on_pool)
+
+        async def unregister() -> None:
+            await self._thegraph_poller.unregister(
+                client=tg, pool_address=pool, poll_every_s=poll_every_s, on_pool=on_pool
+            )
+
+        self._schedule_rollup_catch_up(
+            rollup_uc=rollup_uc,
+            stream=stream,
+            stream_key=stream_key,
+            static_fields={
+                "chain": stream.chain or "base",
+                "dex": stream.dex or "pancakeswap_v3",
+                "pool_address": pool.lower(),
+            },
+        )
+
         self._logger.info(
             "TheGraph tick poller registered: %s pool=%s interval=%s poll_every_s=%s",
             stream.symbol,
@@ -450,3 +984,75 @@ class IngestionSupervisor:
             stream.interval,
             poll_every_s,
         )
+        return _RunningStream(stream=stream, stream_key=stream_key, tick_poller=tick_poller, unregister=unregister)
+
+    def _schedule_rollup_catch_up(
+        self,
+        *,
+        rollup_uc: RollupCandlesUseCase,
+        stream: IngestionStreamEntity,
+        stream_key: str,
+        static_fields: Dict[str, Any],
+        reroll_ranges: Optional[List[Tuple[int, int]]] = None,
+    ) -> None:
+        """
+        Materialize missing higher-timeframe candles from stored 1m history (background).
+
+        Buckets overlapping `reroll_ranges` (1m gaps just backfilled) are recomputed too:
+        they may have been emitted incomplete while those minutes were missing.
+        """
+        if not rollup_uc.intervals or str(stream.interval).lower() != IntervalService.BASE_INTERVAL:
+            return
+
+        async def _run() -> None:
+            try:
+                await rollup_uc.catch_up(
+                    stream_key=stream_key,
+                    source=stream.source_name,
+                    symbol=stream.symbol,
+                    static_fields=static_fields,
+                )
+                if reroll_ranges:
+                    await rollup_uc.reroll(
+                        stream_key=stream_key,
+                        source=stream.source_name,
+                        symbol=stream.symbol,
+                        ranges=reroll_ranges,
+                        static_fields=static_fields,
+                    )
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                self._logger.exception("Rollup catch-up error stream_key=%s: %s", stream_key, exc)
+
+        previous = self._rollup_catch_ups.pop(stream_key, None)
+        if previous is not None:
+            previous.cancel()
+        task = asyncio.create_task(_run())
+        self._rollup_catch_ups[stream_key] = task
+
+        def _forget(t: asyncio.Task) -> None:
+            if self._rollup_catch_ups.get(stream_key) is t:
+                self._rollup_catch_ups.pop(stream_key, None)
+
+        task.add_done_callback(_forget)
+
+    async def _warm_candle_buffers(
+        self,
+        *,
+        candle_repo: CandleRepository,
+        rollup_uc: RollupCandlesUseCase,
+        stream_key: str,
+    ) -> None:
+        """
+        Pre-load the ring buffers of a stream and of its rollup streams.
+        """
+        if not isinstance(candle_repo, RingBufferedCandleRepository):
+            return
+
+        keys = [stream_key] + [StreamKeyService.with_interval(stream_key, itv) for itv in rollup_uc.intervals]
+        for key in keys:
+            try:
+                await candle_repo.warm(key)
+            except Exception as exc:
+                self._logger.warning("Candle buffer warm-up failed stream_key=%s: %s", key, exc)
@@ -0,0 +1,45 @@
+"""
+Run ingestion without the HTTP API.
+
+Usage:
+    python -m workers.ingestion_worker
+
+Starts the IngestionSupervisor (streams, signals, price oracle, tick archive) and
+runs until SIGINT/SIGTERM. Pair it with API processes started with
+API_INGESTION_ENABLED=false, e.g. `uvicorn main:app --workers N`: the API then
+scales over CPU cores without duplicating ingestion. Several ingestion workers
+need CLUSTER_ENABLED=true so each stream runs on exactly one of them.
+"""
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import signal
+
+from config.settings import settings
+from workers.ingestion_supervisor import IngestionSupervisor
+
+logger = logging.getLogger("ingestion_worker")
+
+
+async def _main() -> None:
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        with contextlib.suppress(NotImplementedError):
+            loop.add_signal_handler(sig, stop.set)
+
+    supervisor = IngestionSupervisor()
+    try:
+        await supervisor.start()
+        logger.info("Ingestion worker running.")
+        await stop.wait()
+    finally:
+        logger.info("Stopping ingestion worker...")
+        await supervisor.stop()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=settings.LOG_LEVEL, format="%(asctime)s %(levelname)s [%(name)s] %(message)s")
+    asyncio.run(_main())
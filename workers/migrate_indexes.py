@@ -0,0 +1,45 @@
+"""
+Create the MongoDB indexes declared by the repositories.
+
+Usage:
+    python -m workers.migrate_indexes [--force] [--dry-run]
+
+The applied state (a fingerprint of the declared index specs) is recorded in
+`schema_migrations`; the service skips index creation at startup while it matches.
+Use --force to re-send createIndexes anyway (e.g. after dropping an index by hand).
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+
+from adapters.external.database.index_registry import IndexRegistry
+from adapters.external.database.mongodb_client import get_mongo_client
+from config.settings import settings
+
+logger = logging.getLogger("migrate_indexes")
+
+
+async def _main(args: argparse.Namespace) -> None:
+    client = get_mongo_client()
+    try:
+        registry = IndexRegistry(client[settings.MONGODB_DB_NAME])
+        if args.dry_run:
+            print(json.dumps(registry.describe(), indent=2))
+            applied = await registry.applied_fingerprint()
+            logger.info("fingerprint=%s applied=%s", registry.fingerprint(), applied)
+            return
+        changed = await registry.apply(force=args.force)
+        logger.info("Migration finished. applied=%s", changed)
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--force", action="store_true", help="Send createIndexes even if the state is current")
+    parser.add_argument("--dry-run", action="store_true", help="Print the declared indexes and exit")
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    asyncio.run(_main(parser.parse_args()))
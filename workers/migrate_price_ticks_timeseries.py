@@ -0,0 +1,121 @@
+"""
+Convert `price_ticks` into a MongoDB time-series collection.
+
+Usage:
+    python -m workers.migrate_price_ticks_timeseries [--batch-size 5000] [--drop-legacy]
+
+Steps (safe to re-run; progress is checkpointed in `schema_migrations`):
+  1. Rename the regular `price_ticks` collection to `price_ticks_legacy`.
+  2. Create the time-series `price_ticks` (PRICE_TICKS_EXPIRE_AFTER_S applies).
+  3. Copy legacy ticks in _id order, in batches, skipping ticks that would already
+     be expired.
+  4. Optionally drop `price_ticks_legacy`.
+
+The service can keep running with PRICE_TICKS_TIMESERIES=true once step 2 is done:
+new ticks go to the time-series collection while history is being copied.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import time
+from typing import Any, Dict, List
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from adapters.external.database.mongodb_client import get_mongo_client
+from adapters.external.database.price_tick_repository_mongodb import PriceTickRepositoryMongoDB
+from config.settings import settings
+
+LEGACY_COLLECTION = "price_ticks_legacy"
+MIGRATIONS_COLLECTION = "schema_migrations"
+MIGRATION_ID = "price_ticks_timeseries"
+
+logger = logging.getLogger("migrate_price_ticks_timeseries")
+
+
+async def migrate(db: AsyncIOMotorDatabase, *, batch_size: int = 5000, drop_legacy: bool = False) -> int:
+    """
+    Run the migration and return the number of ticks copied by this run.
+    """
+    target = PriceTickRepositoryMongoDB.COLLECTION
+    names = await db.list_collection_names()
+
+    if target in names:
+        info = (await db.list_collections(filter={"name": target}).to_list(length=1))[0]
+        if info.get("type") != "timeseries":
+            if LEGACY_COLLECTION in names:
+                raise RuntimeError(f"Both '{target}' (regular) and '{LEGACY_COLLECTION}' exist; resolve manually.")
+            logger.info("Renaming %s -> %s", target, LEGACY_COLLECTION)
+            await db[target].rename(LEGACY_COLLECTION)
+            names = await db.list_collection_names()
+
+    repo = PriceTickRepositoryMongoDB(
+        db,
+        timeseries=True,
+        expire_after_seconds=settings.PRICE_TICKS_EXPIRE_AFTER_S,
+    )
+    await repo.ensure_indexes()
+
+    if LEGACY_COLLECTION not in names:
+        logger.info("No legacy ticks to copy.")
+        return 0
+
+    state = await db[MIGRATIONS_COLLECTION].find_one({"_id": MIGRATION_ID}) or {}
+    last_id = state.get("last_id")
+
+    query: Dict[str, Any] = {}
+    if settings.PRICE_TICKS_EXPIRE_AFTER_S > 0:
+        query["ts"] = {"$gte": int(time.time() * 1000) - settings.PRICE_TICKS_EXPIRE_AFTER_S * 1000}
+
+    legacy = db[LEGACY_COLLECTION]
+    dest = db[target]
+    copied = 0
+    t0 = time.monotonic()
+    while True:
+        q = dict(query)
+        if last_id is not None:
+            q["_id"] = {"$gt": last_id}
+        docs: List[Dict[str, Any]] = await legacy.find(q).sort("_id", 1).limit(int(batch_size)).to_list(length=None)
+        if not docs:
+            break
+
+        await dest.insert_many([PriceTickRepositoryMongoDB.to_timeseries_doc(d) for d in docs], ordered=False)
+        last_id = docs[-1]["_id"]
+        copied += len(docs)
+        await db[MIGRATIONS_COLLECTION].update_one(
+            {"_id": MIGRATION_ID},
+            {"$set": {"last_id": last_id, "copied": int(state.get("copied") or 0) + copied}},
+            upsert=True,
+        )
+        logger.info("Copied %s ticks (%.0f/s)", copied, copied / max(time.monotonic() - t0, 1e-9))
+
+    await db[MIGRATIONS_COLLECTION].update_one({"_id": MIGRATION_ID}, {"$set": {"done": True}}, upsert=True)
+
+    if drop_legacy:
+        logger.info("Dropping %s", LEGACY_COLLECTION)
+        await legacy.drop()
+
+    return copied
+
+
+async def _main(args: argparse.Namespace) -> None:
+    client = get_mongo_client()
+    try:
+        copied = await migrate(
+            client[settings.MONGODB_DB_NAME],
+            batch_size=args.batch_size,
+            drop_legacy=args.drop_legacy,
+        )
+        logger.info("Migration finished. copied=%s", copied)
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--drop-legacy", action="store_true", help="Drop price_ticks_legacy after copying")
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    asyncio.run(_main(parser.parse_args()))
@@ -0,0 +1,218 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import hashlib
+import json
+import logging
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo.errors import OperationFailure
+
+from adapters.external.database.ingestion_stream_repository_mongodb import IngestionStreamRepositoryMongoDB
+from adapters.external.database.system_config_repository_mongodb import SystemConfigRepositoryMongoDB
+from core.domain.entities.ingestion_stream_entity import IngestionStreamEntity
+from core.domain.entities.system_config_entity import SystemConfigEntity
+from workers.cluster_coordinator import ClusterCoordinator, stream_id
+
+# Server error codes meaning "change streams are not available here" (standalone mongod, etc.)
+_CHANGE_STREAM_UNSUPPORTED = {40573, 136}
+
+# Bookkeeping fields that do not change how a stream runs
+_VOLATILE_FIELDS = ("id", "created_at", "created_at_iso", "updated_at", "updated_at_iso")
+
+# Coalesce bursts of writes (e.g. a script upserting many streams) into one pass
+_DEBOUNCE_S = 0.5
+
+
+def _digest(doc: Any) -> str:
+    payload = json.dumps(doc, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def stream_fingerprint(stream: IngestionStreamEntity) -> str:
+    """Hash of a stream definition; a different hash means the running pipeline is outdated."""
+    return _digest(stream.model_dump(mode="json", exclude=set(_VOLATILE_FIELDS)))
+
+
+def start_fingerprint(stream: IngestionStreamEntity, runtime_cfg: Optional[SystemConfigEntity]) -> str:
+    """Hash of what starting a stream depends on: its definition and the runtime config."""
+    runtime = runtime_cfg.model_dump(mode="json", exclude=set(_VOLATILE_FIELDS)) if runtime_cfg is not None else None
+    return _digest({"stream": stream_fingerprint(stream), "runtime": runtime})
+
+
+class StreamReconciler:
+    """
+    Applies `ingestion_streams` changes to the running supervisor without a restart.
+
+    - Follows the collection with a change stream (any event schedules a pass, plus a
+      full pass every `poll_interval_s` as a safety net); when change streams are
+      unavailable it simply runs a pass every `poll_interval_s`.
+    - A pass diffs the enabled definitions against the running pipelines by stream
+      id and definition fingerprint: new streams are started, disabled/deleted ones
+      stopped, edited ones restarted. Everything else keeps running untouched.
+    - In cluster mode, starting and stopping belongs to the coordinator (leases): a
+      pass hands the edited streams this node runs to the coordinator, which restarts
+      them in its own cycle (only if it still holds them), and wakes it.
+    - A definition that could not be started (e.g. missing thegraph_api_key) is retried
+      only once the definition or the runtime config changed, not on every pass.
+    """
+
+    def __init__(
+        self,
+        db: AsyncIOMotorDatabase,
+        *,
+        running: Callable[[], Dict[str, IngestionStreamEntity]],
+        start_streams: Callable[[List[IngestionStreamEntity]], Awaitable[None]],
+        stop_streams: Callable[[List[str]], Awaitable[None]],
+        failed: Optional[Callable[[], Dict[str, str]]] = None,
+        cluster: Optional[ClusterCoordinator] = None,
+        poll_interval_s: float = 10.0,
+        logger: logging.Logger | None = None,
+    ) -> None:
+        """
+        Args:
+            db: Motor database handle.
+            running: Returns the running stream definitions by stream id.
+            start_streams: Starts stream definitions.
+            stop_streams: Stops streams by stream id.
+            failed: Returns the start_fingerprint of the streams that failed to start, by stream id.
+            cluster: Coordinator owning start/stop decisions (cluster mode).
+            poll_interval_s: Full pass period (polling mode and change-stream safety net).
+        """
+        self._db = db
+        self._repo = IngestionStreamRepositoryMongoDB(db)
+        self._system = SystemConfigRepositoryMongoDB(db)
+        self._running = running
+        self._failed = failed
+        self._start_streams = start_streams
+        self._stop_streams = stop_streams
+        self._cluster = cluster
+        self._poll_interval_s = float(poll_interval_s)
+        self._logger = logger or logging.getLogger(self.__class__.__name__)
+
+        self._dirty = asyncio.Event()
+        self._stop = asyncio.Event()
+        self._tasks: List[asyncio.Task] = []
+        self._mode = "stopped"
+
+        self.passes = 0
+        self.started = 0
+        self.stopped = 0
+        self.restarted = 0
+        self.errors = 0
+
+    def start(self) -> None:
+        """Start following `ingestion_streams` in background."""
+        if not self._tasks:
+            self._stop.clear()
+            self._tasks = [asyncio.create_task(self._reconcile_loop()), asyncio.create_task(self._watch_loop())]
+
+    async def stop(self) -> None:
+        self._stop.set()
+        for task in self._tasks:
+            task.cancel()
+        for task in self._tasks:
+            with contextlib.suppress(asyncio.CancelledError, Exception):
+                await task
+        self._tasks = []
+        self._mode = "stopped"
+
+    async def reconcile(self) -> None:
+        """One diff-and-apply pass."""
+        desired = {stream_id(s): s for s in await self._repo.list_enabled()}
+        running = self._running()
+        failed = self._failed() if self._failed is not None else {}
+        runtime = await self._system.get_runtime() if failed else None
+
+        def _retry(sid: str) -> bool:
+            return sid not in failed or failed[sid] != start_fingerprint(desired[sid], runtime)
+
+        changed = [
+            sid for sid, s in running.items() if sid in desired and stream_fingerprint(s) != stream_fingerprint(desired[sid])
+        ]
+        if self._cluster is not None:
+            to_stop, to_start = [], []
+            # Held streams that failed to start are retried like edited ones
+            owned = self._cluster.owned
+            changed += [sid for sid in failed if sid in desired and sid in owned and sid not in running and _retry(sid)]
+            # A handoff may happen before the restart: the coordinator re-checks its leases
+            if changed:
+                self._cluster.restart(changed)
+            self._cluster.wake()
+        else:
+            to_stop = [sid for sid in running if sid not in desired]
+            to_start = [s for sid, s in desired.items() if sid not in running and _retry(sid)]
+            if to_stop or changed:
+                await self._stop_streams(sorted(to_stop + changed))
+            if to_start or changed:
+                await self._start_streams(to_start + [desired[sid] for sid in changed])
+            # Definitions that could not be started are not counted (nor retried until edited)
+            now_running = self._running()
+            to_start = [s for s in to_start if stream_id(s) in now_running]
+
+        self.passes += 1
+        self.started += len(to_start)
+        self.stopped += len(to_stop)
+        self.restarted += len(changed)
+        if to_start or to_stop or changed:
+            self._logger.info(
+                "Streams reconciled: started=%s stopped=%s restarted=%s",
+                [stream_id(s) for s in to_start],
+                sorted(to_stop),
+                sorted(changed),
+            )
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for observability."""
+        return {
+            "mode": self._mode,
+            "passes": self.passes,
+            "started": self.started,
+            "stopped": self.stopped,
+            "restarted": self.restarted,
+            "errors": self.errors,
+        }
+
+    async def _reconcile_loop(self) -> None:
+        while not self._stop.is_set():
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self._dirty.wait(), timeout=self._poll_interval_s)
+            if self._stop.is_set():
+                return
+            if self._dirty.is_set():
+                await asyncio.sleep(_DEBOUNCE_S)
+            self._dirty.clear()
+            try:
+                await self.reconcile()
+            except Exception as exc:
+                self.errors += 1
+                self._logger.exception("Stream reconcile failed: %s", exc)
+
+    async def _watch_loop(self) -> None:
+        backoff_s = 1.0
+        col = self._db[IngestionStreamRepositoryMongoDB.COLLECTION]
+        while not self._stop.is_set():
+            try:
+                async with col.watch() as stream:
+                    self._mode = "change_stream"
+                    # Changes made while the stream was down are picked up by this pass.
+                    self._dirty.set()
+                    async for _ in stream:
+                        self._dirty.set()
+                backoff_s = 1.0
+            except asyncio.CancelledError:
+                raise
+            except OperationFailure as exc:
+                if exc.code in _CHANGE_STREAM_UNSUPPORTED:
+                    self._logger.info("Change streams unavailable (%s); stream reconciler polls instead.", exc)
+                    self._mode = "polling"
+                    return
+                self._logger.warning("Ingestion-stream change stream failed: %s", exc)
+            except Exception as exc:
+                self._logger.warning("Ingestion-stream change stream error: %s", exc)
+
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self._stop.wait(), timeout=backoff_s)
+            backoff_s = min(backoff_s * 2.0, 30.0)
@@ -0,0 +1,192 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from adapters.external.thegraph.pancakeswap_v3_base_pool_client import MAX_POOLS_PER_QUERY, PancakeSwapV3BasePoolClient
+
+PoolCallback = Callable[[Dict[str, Any], int], Awaitable[None]]
+
+
+class _PollGroup:
+    """
+    Pools polled together: same subgraph client, same poll interval.
+    """
+
+    def __init__(
+        self,
+        *,
+        client: PancakeSwapV3BasePoolClient,
+        poll_every_s: float,
+        page_size: int,
+        logger: logging.Logger,
+    ) -> None:
+        self.client = client
+        self.poll_every_s = float(poll_every_s)
+        self._page_size = int(page_size)
+        self._logger = logger
+
+        self.subscribers: Dict[str, List[PoolCallback]] = {}  # pool id -> callbacks
+        self._task: Optional[asyncio.Task] = None
+        self._stop = asyncio.Event()
+
+        self.cycles = 0
+        self.queries = 0
+        self.errors = 0
+        self.missing = 0
+        self.last_cycle_ms: Optional[float] = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._stop.clear()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        self._stop.set()
+        if self._task is not None:
+            with contextlib.suppress(asyncio.CancelledError, Exception):
+                await self._task
+            self._task = None
+
+    async def poll_once(self) -> None:
+        """
+        One cycle: fetch every pool of the group, then fan out to the subscribers.
+        """
+        ts = int(time.time() * 1000)
+        pools = list(self.subscribers)
+        self.cycles += 1
+        self.queries += -(-len(pools) // self._page_size)
+
+        try:
+            states = await self.client.get_pools(pool_addresses=pools, page_size=self._page_size)
+        except Exception as exc:
+            self.errors += 1
+            self._logger.warning("TheGraph batched poll failed pools=%s: %s", len(pools), exc)
+            return
+
+        calls = []
+        for pool in pools:
+            data = states.get(pool)
+            if not data:
+                self.missing += 1
+                self._logger.warning("Pool missing from TheGraph response: %s", pool)
+                continue
+            calls.extend(cb(data, ts) for cb in self.subscribers.get(pool, ()))
+
+        # Streams are independent: one failing pipeline must not affect the others.
+        for res in await asyncio.gather(*calls, return_exceptions=True):
+            if isinstance(res, Exception):
+                self._logger.error("Pool sample handler failed: %s", res, exc_info=res)
+
+        self.last_cycle_ms = round(time.time() * 1000 - ts, 1)
+
+    async def _run(self) -> None:
+        while not self._stop.is_set():
+            started = time.monotonic()
+            await self.poll_once()
+            delay = max(0.0, self.poll_every_s - (time.monotonic() - started))
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self._stop.wait(), timeout=delay)
+
+
+class TheGraphPollScheduler:
+    """
+    Shared poll loop for The Graph pool streams.
+
+    - Pools registered with the same client (subgraph endpoint + API key) and the same
+      poll interval are fetched together with one `pools(where: {id_in: [...]})` query
+      per cycle (split into pages of `page_size` ids).
+    - Each pool's state is fanned out to the callbacks registered for it, concurrently
+      across pools, with the cycle timestamp.
+    """
+
+    def __init__(self, *, page_size: int = MAX_POOLS_PER_QUERY, logger: logging.Logger | None = None) -> None:
+        self._page_size = max(1, min(MAX_POOLS_PER_QUERY, int(page_size)))
+        self._logger = logger or logging.getLogger(self.__class__.__name__)
+        self._groups: Dict[Tuple[int, float], _PollGroup] = {}
+        self._started = False
+
+    def register(
+        self,
+        *,
+        client: PancakeSwapV3BasePoolClient,
+        pool_address: str,
+        poll_every_s: float,
+        on_pool: PoolCallback,
+    ) -> None:
+        """
+        Poll `pool_address` every `poll_every_s` and call `on_pool(pool_state, ts_ms)`.
+        """
+        key = (id(client), float(poll_every_s))
+        group = self._groups.get(key)
+        if group is None:
+            group = self._groups[key] = _PollGroup(
+                client=client,
+                poll_every_s=float(poll_every_s),
+                page_size=self._page_size,
+                logger=self._logger,
+            )
+            if self._started:
+                group.start()
+        group.subscribers.setdefault(str(pool_address).lower().strip(), []).append(on_pool)
+
+    async def unregister(
+        self,
+        *,
+        client: PancakeSwapV3BasePoolClient,
+        pool_address: str,
+        poll_every_s: float,
+        on_pool: PoolCallback,
+    ) -> None:
+        """
+        Remove a callback added by register(); groups left without pools are stopped.
+        """
+        key = (id(client), float(poll_every_s))
+        group = self._groups.get(key)
+        if group is None:
+            return
+        pool = str(pool_address).lower().strip()
+        callbacks = group.subscribers.get(pool, [])
+        if on_pool in callbacks:
+            callbacks.remove(on_pool)
+        if not callbacks:
+            group.subscribers.pop(pool, None)
+        if not group.subscribers:
+            del self._groups[key]
+            await group.stop()
+
+    def start(self) -> None:
+        """Start one poll loop per group."""
+        self._started = True
+        for group in self._groups.values():
+            group.start()
+        self._logger.info(
+            "TheGraph poll scheduler started: groups=%s pools=%s",
+            len(self._groups),
+            sum(len(g.subscribers) for g in self._groups.values()),
+        )
+
+    async def stop(self) -> None:
+        self._started = False
+        for group in self._groups.values():
+            await group.stop()
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for observability."""
+        return {
+            "groups": [
+                {
+                    "poll_every_s": g.poll_every_s,
+                    "pools": len(g.subscribers),
+                    "cycles": g.cycles,
+                    "queries": g.queries,
+                    "errors": g.errors,
+                    "missing": g.missing,
+                    "last_cycle_ms": g.last_cycle_ms,
+                }
+                for g in self._groups.values()
+            ],
+        }
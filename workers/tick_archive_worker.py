@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import time
+from typing import Callable, Iterable, Optional
+
+from core.repositories.price_tick_repository import PriceTickRepository
+from core.repositories.tick_archive_repository import TickArchiveRepository
+
+DAY_MS = 86_400_000
+
+# Ticks are flushed once their minute closes: leave a margin before a day counts as closed.
+_CLOSE_GRACE_MS = 10 * 60_000
+
+# Upper bound for one day of ticks of one stream (1 tick/s = 86,400).
+_MAX_TICKS_PER_DAY = 5_000_000
+
+
+class TickArchiveWorker:
+    """
+    Periodically moves closed UTC days of ticks into the columnar archive.
+
+    - Days are archived in order per stream_key, starting at the day of the first
+      stored tick, so the archive always covers one contiguous range.
+    - MongoDB keeps its ticks (expiry is the storage layer's job); reads switch to
+      the archive for everything before `archived_until`.
+    """
+
+    def __init__(
+        self,
+        *,
+        tick_repository: PriceTickRepository,
+        tick_archive: TickArchiveRepository,
+        stream_keys: Callable[[], Iterable[str]],
+        interval_s: float = 3600.0,
+        logger: logging.Logger | None = None,
+    ) -> None:
+        """
+        Args:
+            tick_repository: Source of ticks (MongoDB).
+            tick_archive: Destination archive.
+            stream_keys: Returns the tick stream_keys to archive (evaluated each run).
+            interval_s: Pause between runs.
+        """
+        self._ticks = tick_repository
+        self._archive = tick_archive
+        self._stream_keys = stream_keys
+        self._interval_s = float(interval_s)
+        self._logger = logger or logging.getLogger(self.__class__.__name__)
+
+        self._task: asyncio.Task | None = None
+        self._stop = asyncio.Event()
+
+    def start(self) -> None:
+        """Start the archive loop in background."""
+        if self._task is None:
+            self._stop.clear()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the archive loop (a day being written is finished first)."""
+        self._stop.set()
+        if self._task is not None:
+            with contextlib.suppress(asyncio.CancelledError, Exception):
+                await self._task
+            self._task = None
+
+    async def run_once(self, now_ms: Optional[int] = None) -> int:
+        """
+        Archive every closed day not archived yet.
+
+        Returns:
+            Number of days written.
+        """
+        now_ms = int(now_ms if now_ms is not None else time.time() * 1000)
+        written = 0
+        for stream_key in list(self._stream_keys()):
+            if self._stop.is_set():
+                break
+            try:
+                written += await self._archive_stream(str(stream_key), now_ms)
+            except Exception as exc:
+                self._logger.exception("Tick archive failed stream_key=%s: %s", stream_key, exc)
+        return written
+
+    async def _archive_stream(self, stream_key: str, now_ms: int) -> int:
+        day = self._archive.archived_until(stream_key)
+        if day is None:
+            first = await self._ticks.list_tick_columns_range(stream_key, 0, now_ms, 1)
+            if not len(first):
+                return 0
+            day = (int(first.ts[0]) // DAY_MS) * DAY_MS
+
+        written = 0
+        while day + DAY_MS + _CLOSE_GRACE_MS <= now_ms and not self._stop.is_set():
+            cols = await self._ticks.list_tick_columns_range(stream_key, day, day + DAY_MS - 1, _MAX_TICKS_PER_DAY)
+            await asyncio.to_thread(self._archive.write_day, stream_key, day, cols)
+            self._logger.info("Archived ticks stream_key=%s day=%s ticks=%s", stream_key, day, len(cols))
+            written += 1
+            day += DAY_MS
+        return written
+
+    async def _run(self) -> None:
+        while not self._stop.is_set():
+            await self.run_once()
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self._stop.wait(), timeout=self._interval_s)
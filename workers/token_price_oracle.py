@@ -0,0 +1,302 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import time
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Tuple
+
+from core.domain.entities.token_latest_price_entity import TokenLatestPriceEntity
+from core.domain.entities.token_price_entity import TokenPriceEntity
+from core.repositories.token_latest_price_repository import TokenLatestPriceRepository
+from core.repositories.token_price_repository import TokenPriceRepository
+from core.repositories.token_registry_repository import TokenRegistryRepository
+from core.usecases.token_pricing_use_case import TokenPriceResult, TokenPricingUseCase
+
+
+def _key(chain: str, token_address: str) -> Tuple[str, str]:
+    return (chain or "base").strip().lower(), (token_address or "").strip().lower()
+
+
+class LatestTokenPrices(ABC):
+    """
+    In-memory latest USD price per (chain, token), refreshed by a background loop.
+
+    get() is a dict lookup and returns nothing once the price is older than `max_age_s`
+    (callers then fall back to on-demand pricing). Subclasses fill `_latest` in run_once().
+    """
+
+    def __init__(self, *, interval_s: float, max_age_s: float, logger: logging.Logger | None = None) -> None:
+        self._interval_s = float(interval_s)
+        self._max_age_s = float(max_age_s)
+        self._logger = logger or logging.getLogger(self.__class__.__name__)
+
+        self._latest: Dict[Tuple[str, str], Tuple[TokenPriceResult, float]] = {}  # -> (result, monotonic ts)
+
+        self._task: asyncio.Task | None = None
+        self._stop = asyncio.Event()
+
+        self.cycles = 0
+        self.errors = 0
+        self.last_cycle_ms: Optional[float] = None
+
+    def start(self) -> None:
+        """Start the refresh loop in background."""
+        if self._task is None:
+            self._stop.clear()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the refresh loop (the running cycle is finished first)."""
+        self._stop.set()
+        if self._task is not None:
+            with contextlib.suppress(asyncio.CancelledError, Exception):
+                await self._task
+            self._task = None
+
+    def get(self, *, chain: str, token_address: str) -> Optional[TokenPriceResult]:
+        """Latest price of a token, or None when unknown or older than max_age_s."""
+        hit = self._latest.get(_key(chain, token_address))
+        if hit is None or time.monotonic() - hit[1] > self._max_age_s:
+            return None
+        return hit[0]
+
+    def invalidate(self, *, chain: str, token_address: str) -> None:
+        """Forget a token's latest price (e.g. after its pricing source changed)."""
+        self._latest.pop(_key(chain, token_address), None)
+
+    @abstractmethod
+    async def run_once(self) -> int:
+        """Refresh `_latest` once; returns the number of prices refreshed."""
+        raise NotImplementedError
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for observability."""
+        now = time.monotonic()
+        return {
+            "tokens": len(self._latest),
+            "fresh": sum(1 for _, at in self._latest.values() if now - at <= self._max_age_s),
+            "cycles": self.cycles,
+            "errors": self.errors,
+            "last_cycle_ms": self.last_cycle_ms,
+        }
+
+    async def _run(self) -> None:
+        while not self._stop.is_set():
+            started = time.monotonic()
+            try:
+                await self.run_once()
+            except Exception as exc:
+                self._logger.exception("Token price refresh cycle failed: %s", exc)
+            delay = max(0.0, self._interval_s - (time.monotonic() - started))
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self._stop.wait(), timeout=delay)
+
+
+class TokenPriceOracleWorker(LatestTokenPrices):
+    """
+    Background refresher of the USD price of every registered token.
+
+    - Each cycle prices the whole `token_registry` with one batched call
+      (quote tokens are resolved first and shared along the quote paths), so upstream
+      load depends on the number of tokens, not on API traffic.
+    - The latest result per (chain, token) is kept in memory (see LatestTokenPrices).
+    - When a latest-price repository is given, every cycle's results are upserted to it
+      in one bulk write, so API-only processes serve them (TokenPriceOracleReader).
+    - When a history repository is given, points whose USD price changed since the
+      last written one are appended to it in one insert per cycle.
+    """
+
+    def __init__(
+        self,
+        *,
+        token_pricing: TokenPricingUseCase,
+        token_registry_repository: TokenRegistryRepository,
+        history_repository: Optional[TokenPriceRepository] = None,
+        latest_repository: Optional[TokenLatestPriceRepository] = None,
+        interval_s: float = 15.0,
+        max_age_s: float = 60.0,
+        logger: logging.Logger | None = None,
+    ) -> None:
+        """
+        Args:
+            token_pricing: Pricing use case (batched resolution).
+            token_registry_repository: Source of the tokens to price (read each cycle).
+            history_repository: Destination of the price history (None disables it).
+            latest_repository: Destination of the latest prices (None keeps them in memory only).
+            interval_s: Pause between cycles.
+            max_age_s: Age after which an in-memory price is no longer served.
+        """
+        super().__init__(interval_s=interval_s, max_age_s=max_age_s, logger=logger)
+        self._pricing = token_pricing
+        self._registry = token_registry_repository
+        self._history = history_repository
+        self._published = latest_repository
+
+        self._written: Dict[Tuple[str, str], str] = {}  # last price_usd written to history
+
+        self.priced = 0
+        self.history_written = 0
+
+    async def run_once(self) -> int:
+        """
+        Price every registered token once.
+
+        Returns:
+            Number of tokens priced.
+        """
+        started = time.monotonic()
+        ts = int(time.time() * 1000)
+        ents = await self._registry.list_all()
+        keys = [(e.chain, e.token_address) for e in ents]
+        results = await self._pricing.get_token_usd_prices(items=keys) if keys else []
+
+        now = time.monotonic()
+        refreshed_at = datetime.now(tz=timezone.utc)
+        latest: List[TokenLatestPriceEntity] = []
+        points: List[TokenPriceEntity] = []
+        point_prices: Dict[Tuple[str, str], str] = {}
+        priced = 0
+        for key, res in zip(keys, results):
+            if isinstance(res, Exception):
+                self.errors += 1
+                self._logger.warning("Token price refresh failed chain=%s token=%s: %s", key[0], key[1], res)
+                continue
+            priced += 1
+            self._latest[key] = (res, now)
+            if self._published is not None:
+                latest.append(
+                    TokenLatestPriceEntity(
+                        chain=res.chain,
+                        token_address=res.token_address,
+                        price_usd=str(res.price_usd),
+                        price_in_quote=str(res.price_in_quote),
+                        quote_token_address=res.quote_token_address,
+                        quote_token_is_usd_stable=res.quote_token_is_usd_stable,
+                        pool_address=res.pool_address,
+                        decimals=res.decimals,
+                        refreshed_at=refreshed_at,
+                    )
+                )
+            if self._history is not None and self._written.get(key) != str(res.price_usd):
+                point_prices[key] = str(res.price_usd)
+                points.append(
+                    TokenPriceEntity(
+                        chain=res.chain,
+                        token_address=res.token_address,
+                        ts=ts,
+                        price_usd=float(res.price_usd),
+                        price_in_quote=float(res.price_in_quote),
+                        quote_token_address=res.quote_token_address,
+                        pool_address=res.pool_address,
+                    )
+                )
+
+        # Tokens removed from the registry are no longer served
+        for key in set(self._latest) - set(keys):
+            self._latest.pop(key, None)
+            self._written.pop(key, None)
+
+        if latest:
+            try:
+                await self._published.upsert_many(latest)
+            except Exception as exc:
+                self._logger.warning("Token latest price write failed tokens=%s: %s", len(latest), exc)
+
+        if points:
+            try:
+                self.history_written += await self._history.insert_prices(points)
+            except Exception as exc:
+                self._logger.warning("Token price history write failed points=%s: %s", len(points), exc)
+            else:
+                self._written.update(point_prices)
+
+        self.cycles += 1
+        self.priced += priced
+        self.last_cycle_ms = round((time.monotonic() - started) * 1000, 1)
+        return priced
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for observability."""
+        return {**super().stats(), "priced": self.priced, "history_written": self.history_written}
+
+
+class TokenPriceOracleReader(LatestTokenPrices):
+    """
+    Mirror of the oracle's latest prices for processes that do not run the oracle.
+
+    Each cycle reloads the prices published by TokenPriceOracleWorker that are younger
+    than `max_age_s` (one query), keeping get() a dict lookup and upstream load independent
+    of the number of API replicas. A served price is at most max_age_s old.
+    """
+
+    def __init__(
+        self,
+        *,
+        latest_repository: TokenLatestPriceRepository,
+        interval_s: float = 15.0,
+        max_age_s: float = 60.0,
+        logger: logging.Logger | None = None,
+    ) -> None:
+        """
+        Args:
+            latest_repository: Source of the latest prices (written by the oracle).
+            interval_s: Pause between reloads.
+            max_age_s: Age (since the oracle priced it) after which a price is no longer served.
+        """
+        super().__init__(interval_s=interval_s, max_age_s=max_age_s, logger=logger)
+        self._published = latest_repository
+        self._invalidated: Dict[Tuple[str, str], datetime] = {}
+
+    def invalidate(self, *, chain: str, token_address: str) -> None:
+        """Forget a token's latest price and ignore it until the oracle publishes a newer one."""
+        super().invalidate(chain=chain, token_address=token_address)
+        self._invalidated[_key(chain, token_address)] = datetime.now(tz=timezone.utc)
+
+    async def run_once(self) -> int:
+        """
+        Reload the fresh published prices.
+
+        Returns:
+            Number of prices loaded.
+        """
+        started = time.monotonic()
+        now = datetime.now(tz=timezone.utc)
+        since = now - timedelta(seconds=self._max_age_s)
+        # Anything published before `since` is not loaded anyway
+        self._invalidated = {k: at for k, at in self._invalidated.items() if at >= since}
+        try:
+            ents = await self._published.list_since(since=since)
+        except Exception:
+            self.errors += 1
+            raise
+
+        latest: Dict[Tuple[str, str], Tuple[TokenPriceResult, float]] = {}
+        for e in ents:
+            # Motor returns naive UTC datetimes unless tz_aware is set on the client
+            refreshed_at = e.refreshed_at if e.refreshed_at.tzinfo is not None else e.refreshed_at.replace(tzinfo=timezone.utc)
+            key = _key(e.chain, e.token_address)
+            invalidated_at = self._invalidated.get(key)
+            if invalidated_at is not None:
+                if refreshed_at <= invalidated_at:
+                    continue
+                self._invalidated.pop(key, None)
+            res = TokenPriceResult(
+                chain=e.chain,
+                token_address=e.token_address,
+                price_usd=Decimal(e.price_usd),
+                quote_token_address=e.quote_token_address,
+                quote_token_is_usd_stable=e.quote_token_is_usd_stable,
+                price_in_quote=Decimal(e.price_in_quote),
+                pool_address=e.pool_address,
+                decimals=e.decimals,
+            )
+            latest[key] = (res, started - (now - refreshed_at).total_seconds())
+        self._latest = latest
+
+        self.cycles += 1
+        self.last_cycle_ms = round((time.monotonic() - started) * 1000, 1)
+        return len(latest)